@@ -1,19 +1,450 @@
+import datetime
+import itertools
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import duckdb
 from pathlib import Path
 
+from analytics_engine.result_cache import get_result_cache
+from utils.sql_utils import sql_literal
+
+DEFAULT_DB_PATH = "data_sources/snapshots/latest.duckdb"
+
+
+def duckdb_settings(memory_limit: str = "", threads: int = 0) -> Dict[str, Any]:
+    """
+    Runtime settings applied to every connection (duckdb section of settings.yaml).
+
+    threads / memory_limit / temp_directory are only set when configured
+    (DuckDB defaults otherwise); memory_limit and threads arguments override
+    the configured values.
+    """
+    from utils.config_loader import get_config
+    duckdb_config = get_config().duckdb
+    settings: Dict[str, Any] = {}
+    if threads or duckdb_config.threads:
+        settings["threads"] = int(threads or duckdb_config.threads)
+    if memory_limit or duckdb_config.memory_limit:
+        settings["memory_limit"] = memory_limit or duckdb_config.memory_limit
+    if duckdb_config.temp_directory:
+        settings["temp_directory"] = duckdb_config.temp_directory
+    settings["enable_object_cache"] = bool(duckdb_config.enable_object_cache)
+    settings["preserve_insertion_order"] = bool(duckdb_config.preserve_insertion_order)
+    return settings
+
+
+def configure_connection(conn: duckdb.DuckDBPyConnection, memory_limit: str = "",
+                         threads: int = 0) -> duckdb.DuckDBPyConnection:
+    """
+    Apply duckdb_settings() to a connection. The settings are database-wide,
+    so every connection to a file applies the same values.
+    """
+    for name, value in duckdb_settings(memory_limit, threads).items():
+        try:
+            if name == "temp_directory":
+                Path(value).mkdir(parents=True, exist_ok=True)
+            conn.execute(f"SET {name} = {sql_literal(value)}")
+        except (duckdb.Error, OSError) as e:
+            print(f"[WARN] Could not set DuckDB {name} = {value}: {e}")
+    return conn
+
+
+def open_connection(path: str = DEFAULT_DB_PATH) -> duckdb.DuckDBPyConnection:
+    """duckdb.connect() to a database file with the configured runtime settings."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return configure_connection(duckdb.connect(str(path)))
+
+
 class DuckDBManager:
-    def __init__(self, path="data_sources/snapshots/latest.duckdb"):
-        # Ensure directory exists before connecting
-        db_path = Path(path)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = duckdb.connect(str(db_path))
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.conn = open_connection(path)
 
     def list_tables(self):
         return [row[0] for row in self.conn.execute("SHOW TABLES").fetchall()]
 
-    def query(self, sql: str):
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None):
+        if params:
+            return self.conn.execute(sql, list(params)).fetchdf()
         return self.conn.execute(sql).fetchdf()
 
     def get_connection(self):
         """Return the underlying DuckDB connection for advanced queries."""
         return self.conn
+
+
+# EXECUTE arguments must be plain literals; other values are bound instead
+_LITERAL_TYPES = (str, int, float, bool, datetime.date, datetime.datetime, type(None))
+
+
+class QueryTimeoutError(TimeoutError):
+    """A query ran past its time budget and was interrupted (not worth retrying)."""
+
+    def __init__(self, timeout_seconds: float, sql: str = ""):
+        super().__init__(f"Query exceeded its {timeout_seconds:g}s time budget and was interrupted")
+        self.timeout_seconds = timeout_seconds
+        self.sql = sql
+
+
+class _Deadline:
+    __slots__ = ("at", "connection", "fired")
+
+    def __init__(self, at: float, connection: duckdb.DuckDBPyConnection):
+        self.at = at
+        self.connection = connection
+        self.fired = False
+
+
+class QueryWatchdog:
+    """
+    One daemon thread that interrupts queries running past their deadline.
+
+    watch(connection, seconds) registers a deadline for the statement run
+    inside the block (execute and fetch); when it passes, the watchdog calls
+    connection.interrupt() and the statement fails with InterruptException
+    (PreparedCursor turns that into QueryTimeoutError). The interrupt is
+    issued under the watchdog lock and only while the deadline is still
+    registered, so it can never reach the next, unrelated statement of a
+    cursor that has left the block and gone back to the pool.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._deadlines: Dict[int, _Deadline] = {}
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self.interrupts = 0
+
+    @contextmanager
+    def watch(self, connection: duckdb.DuckDBPyConnection, timeout_seconds: Optional[float]):
+        if not timeout_seconds or timeout_seconds <= 0:
+            yield _Deadline(float("inf"), connection)
+            return
+        deadline = _Deadline(time.monotonic() + timeout_seconds, connection)
+        key = next(self._ids)
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="duckdb-watchdog", daemon=True)
+                self._thread.start()
+            self._deadlines[key] = deadline
+            self._cond.notify()
+        try:
+            yield deadline
+        finally:
+            with self._cond:
+                self._deadlines.pop(key, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                expired = [d for d in self._deadlines.values() if not d.fired and d.at <= now]
+                if not expired:
+                    pending = [d.at for d in self._deadlines.values() if not d.fired]
+                    self._cond.wait(min(pending) - now if pending else None)
+                    continue
+                # interrupt() only sets a flag; holding the lock keeps watch()
+                # from unregistering (and the cursor from being reused) meanwhile
+                for deadline in expired:
+                    deadline.fired = True
+                    try:
+                        deadline.connection.interrupt()
+                    except Exception as e:
+                        print(f"[WARN] Could not interrupt timed-out query: {e}")
+                self.interrupts += len(expired)
+
+
+_watchdog = QueryWatchdog()
+
+
+class PreparedCursor:
+    """
+    Pooled cursor that prepares parameterized SQL once per query shape.
+
+    execute(sql, params) PREPAREs sql ($1, $2, ... placeholders) the first
+    time this cursor sees it and afterwards only runs EXECUTE with the new
+    values, so repeated shapes skip parsing, binding and planning. DuckDB
+    re-binds a prepared statement itself if the tables it reads changed.
+    Statements are kept per cursor, least recently used evicted.
+    Every statement runs under the pool's time budget (QueryWatchdog);
+    timeout=0 runs without one. query_df / query_rows keep the budget open
+    while fetching; callers fetching from execute() themselves are only
+    covered for the execute call.
+    query_df / query_rows go through the shared ResultCache first.
+    Everything else (fetchall, fetchdf, description, ...) is the cursor's.
+    """
+
+    _names = itertools.count(1)
+
+    def __init__(self, cursor: duckdb.DuckDBPyConnection, pool: "CursorPool", max_statements: int = 64):
+        self.cursor = cursor
+        self.generation = pool._generation
+        self._pool = pool
+        self._max_statements = max(1, int(max_statements))
+        self._statements: "OrderedDict[str, str]" = OrderedDict()
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None, timeout: Optional[float] = None):
+        """
+        Run a statement (prepared per shape when it has params).
+
+        Raises:
+            QueryTimeoutError: The statement outlived its budget (timeout, or
+                the pool's query_timeout_seconds when None) and was interrupted
+        """
+        with self._budget(sql, timeout):
+            return self._execute(sql, params)
+
+    @contextmanager
+    def _budget(self, sql: str, timeout: Optional[float] = None):
+        """Time budget for everything run inside the block (execute + fetch)."""
+        budget = self._pool.timeout_seconds if timeout is None else timeout
+        with _watchdog.watch(self.cursor, budget) as deadline:
+            try:
+                yield
+            except duckdb.InterruptException as e:
+                if not deadline.fired:
+                    raise
+                self._pool._record_timeout()
+                raise QueryTimeoutError(budget, sql) from e
+
+    def _execute(self, sql: str, params: Optional[Sequence[Any]]):
+        if not params:
+            return self.cursor.execute(sql)
+        if not all(isinstance(v, _LITERAL_TYPES) for v in params) or any(
+            isinstance(v, float) and not math.isfinite(v) for v in params
+        ):
+            return self.cursor.execute(sql, list(params))
+
+        name = self._statements.get(sql)
+        if name is None:
+            name = f"stmt_{next(self._names)}"
+            self.cursor.execute(f"PREPARE {name} AS {sql}")
+            self._statements[sql] = name
+            while len(self._statements) > self._max_statements:
+                _, evicted = self._statements.popitem(last=False)
+                try:
+                    self.cursor.execute(f"DEALLOCATE {evicted}")
+                except Exception:
+                    pass
+            self._pool._record_prepared(hit=False)
+        else:
+            self._statements.move_to_end(sql)
+            self._pool._record_prepared(hit=True)
+        return self.cursor.execute(f"EXECUTE {name}({', '.join(sql_literal(v) for v in params)})")
+
+    def query_df(self, sql: str, params: Optional[Sequence[Any]] = None):
+        """Result as a DataFrame, served from the result cache when possible."""
+        cache = get_result_cache()
+        key = cache.key(sql, params, "df", self._pool.scope)
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            return cached.copy()
+        # Streaming results do part of the work while fetching: same budget
+        with self._budget(sql):
+            df = self._execute(sql, params).fetchdf()
+        if key is not None:
+            cache.put(key, df.copy())
+        return df
+
+    def query_rows(self, sql: str, params: Optional[Sequence[Any]] = None) -> Tuple[List[tuple], List[str]]:
+        """(rows, column names), served from the result cache when possible."""
+        cache = get_result_cache()
+        key = cache.key(sql, params, "rows", self._pool.scope)
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            return list(cached[0]), list(cached[1])
+        with self._budget(sql):
+            result = self._execute(sql, params)
+            columns = [desc[0] for desc in result.description] if result.description else []
+            rows = result.fetchall()
+        if key is not None:
+            cache.put(key, (tuple(rows), tuple(columns)))
+        return rows, columns
+
+    def close(self) -> None:
+        try:
+            self.cursor.close()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class CursorPool:
+    """
+    One shared connection per database file, handing out cursors to
+    concurrent readers (DuckDB cursors are independent connections to the
+    same database instance and are safe to use from different threads).
+
+    At most max_cursors are open at once; further callers wait for a slot.
+    Returned cursors are kept for reuse together with their prepared
+    statements (see PreparedCursor).
+    Statements get timeout_seconds each; the shared connection gets the
+    configured DuckDB settings (duckdb_settings), memory_limit / threads
+    overriding them when given.
+    The shared connection is reopened if the snapshot file was recreated
+    (full reset deletes and recreates latest.duckdb).
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, max_cursors: int = 10, max_statements: int = 64,
+                 timeout_seconds: float = 0, memory_limit: str = "", threads: int = 0):
+        self.path = path
+        self.scope = os.path.abspath(path)
+        self.max_cursors = max(1, int(max_cursors))
+        self.max_statements = max_statements
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self._slots = threading.BoundedSemaphore(self.max_cursors)
+        self._lock = threading.Lock()
+        self._conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._file_id = None
+        self._generation = 0
+        self._idle: List[PreparedCursor] = []
+        self._in_use = 0
+        self._acquired = 0
+        self._prepared_hits = 0
+        self._prepared_misses = 0
+        self._timeouts = 0
+
+    def _current_file_id(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_dev, stat.st_ino)
+        except OSError:
+            return None
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            file_id = self._current_file_id()
+            if self._conn is None or file_id != self._file_id:
+                self._reset_locked()
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = configure_connection(duckdb.connect(str(self.path)), self.memory_limit, self.threads)
+                self._file_id = self._current_file_id()
+            return self._conn
+
+    def _reset_locked(self) -> None:
+        """Close the shared connection and idle cursors (caller holds _lock)."""
+        for idle in self._idle:
+            idle.close()
+        self._idle = []
+        self._generation += 1
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._file_id = None
+
+    def _record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def _record_prepared(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._prepared_hits += 1
+            else:
+                self._prepared_misses += 1
+
+    @contextmanager
+    def cursor(self):
+        """Borrow a cursor (blocks while max_cursors are in use)."""
+        with self._slots:
+            conn = self._connection()
+            with self._lock:
+                cursor = self._idle.pop() if self._idle else None
+                self._in_use += 1
+                self._acquired += 1
+            if cursor is None:
+                cursor = PreparedCursor(conn.cursor(), self, self.max_statements)
+            try:
+                yield cursor
+            finally:
+                # Query errors leave a DuckDB cursor usable; only a reconnect retires it
+                with self._lock:
+                    self._in_use -= 1
+                    keep = cursor.generation == self._generation
+                    if keep:
+                        self._idle.append(cursor)
+                if not keep:
+                    cursor.close()
+
+    def query(self, sql: str):
+        """Run one query on a pooled cursor and return a DataFrame."""
+        return self.execute(sql)
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None):
+        """Run one (parameterized) query on a pooled cursor and return a DataFrame (result-cached)."""
+        with self.cursor() as cursor:
+            return cursor.query_df(sql, params)
+
+    def close(self) -> None:
+        with self._lock:
+            self._reset_locked()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_cursors": self.max_cursors,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "acquired": self._acquired,
+                "prepared_hits": self._prepared_hits,
+                "prepared_misses": self._prepared_misses,
+                "timeout_seconds": self.timeout_seconds,
+                "timeouts": self._timeouts,
+            }
+
+
+_cursor_pools: Dict[str, CursorPool] = {}
+_cursor_pools_lock = threading.Lock()
+
+
+def get_cursor_pool(path: str = DEFAULT_DB_PATH) -> CursorPool:
+    """
+    Process-wide cursor pool for a database file (sized by duckdb.max_connections,
+    query budget from query.query_timeout_seconds).
+    """
+    key = os.path.abspath(path)
+    with _cursor_pools_lock:
+        pool = _cursor_pools.get(key)
+        if pool is None:
+            from utils.config_loader import get_config
+            config = get_config()
+            pool = CursorPool(
+                path,
+                max_cursors=config.duckdb.max_connections,
+                max_statements=config.duckdb.prepared_statements_per_cursor,
+                timeout_seconds=config.query.query_timeout_seconds,
+            )
+            _cursor_pools[key] = pool
+        return pool
+
+
+def close_cursor_pools() -> None:
+    """Close pooled connections (before the snapshot file is deleted)."""
+    with _cursor_pools_lock:
+        for pool in _cursor_pools.values():
+            pool.close()
+
+
+def get_duckdb_status(path: str = DEFAULT_DB_PATH) -> Dict[str, Any]:
+    """Configured and effective DuckDB settings (for /api/health)."""
+    status: Dict[str, Any] = {"configured": duckdb_settings()}
+    if os.path.exists(path):
+        names = ("threads", "memory_limit", "temp_directory", "enable_object_cache", "preserve_insertion_order")
+        with get_cursor_pool(path).cursor() as cursor:
+            row = cursor.execute(
+                "SELECT " + ", ".join(f"current_setting('{name}')" for name in names)
+            ).fetchone()
+        status["effective"] = dict(zip(names, row))
+    return status
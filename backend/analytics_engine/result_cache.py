@@ -0,0 +1,190 @@
+"""
+Result Cache - query results keyed by canonical SQL and table generations.
+
+The same SQL often runs several times within seconds: another conversation
+asks the same question, a correction re-executes the previous plan, a
+projection follow-up re-reads the trend. ResultCache keeps materialized
+results (DataFrames for CursorPool.execute, row lists for the advanced and
+multi-step executors) in a byte-size-aware LRU.
+
+Keys are the SQL with whitespace canonicalized (outside literals and quoted
+identifiers), the bound params, the result form, and the generation of
+every table named after FROM/JOIN. The snapshot loader bumps a table's
+generation whenever it rewrites or drops the table (rollup rebuilds bump
+the rollup tables), so stale entries are never looked up again and are
+evicted right away. Only SELECT/WITH statements without volatile functions
+(now(), random(), ...) are cached, and hits return copies.
+
+Sizes come from pandas memory_usage(deep=True) or an estimate for row
+lists; results above a quarter of the budget are not cached.
+"""
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Sequence, Tuple
+
+# Literals / quoted identifiers (kept verbatim) or whitespace runs
+_CANONICAL_RE = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\s+""")
+_TABLE_RE = re.compile(
+    r"""\b(?:FROM|JOIN)\s+((?:"(?:[^"]|"")*"|\w+)(?:\.(?:"(?:[^"]|"")*"|\w+))*)""", re.IGNORECASE
+)
+_VOLATILE_RE = re.compile(
+    r"\b(?:now|random|uuid|gen_random_uuid|current_date|current_time|current_timestamp|today|nextval)\b",
+    re.IGNORECASE,
+)
+
+
+def canonical_sql(sql: str) -> str:
+    """SQL with whitespace runs outside literals collapsed to one space."""
+    return _CANONICAL_RE.sub(lambda m: " " if m.group(0).isspace() else m.group(0), sql).strip()
+
+
+def referenced_tables(sql: str) -> FrozenSet[str]:
+    """Lower-cased names (last part, unquoted) of tables after FROM/JOIN."""
+    tables = set()
+    for match in _TABLE_RE.finditer(sql):
+        name = match.group(1)
+        last = re.findall(r'"(?:[^"]|"")*"|\w+', name)[-1]
+        if last.startswith('"'):
+            last = last[1:-1].replace('""', '"')
+        tables.add(last.lower())
+    return frozenset(tables)
+
+
+def estimate_bytes(value: Any) -> int:
+    """Memory held by a cached result."""
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple) and len(value) == 2:
+        rows, columns = value
+        size = sys.getsizeof(rows) + sum(sys.getsizeof(c) for c in columns)
+        for row in rows:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row)
+        return size
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    LRU of query results bounded by total bytes.
+
+    Args:
+        max_bytes: Budget for all cached results (0 disables caching)
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_entry_bytes = self.max_bytes // 4
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, FrozenSet[str]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0, "uncacheable": 0}
+
+    def key(self, sql: str, params: Optional[Sequence[Any]], form: str, scope: str = "") -> Optional[Hashable]:
+        """Cache key for a statement on database scope, or None if it must not be cached."""
+        if self.max_bytes <= 0:
+            return None
+        text = canonical_sql(sql)
+        head = text[:6].upper()
+        if not (head.startswith("SELECT") or head.startswith("WITH")) or _VOLATILE_RE.search(text):
+            with self._lock:
+                self._stats["uncacheable"] += 1
+            return None
+        tables = referenced_tables(text)
+        with self._lock:
+            generations = tuple(sorted((t, self._generations.get(t, 0)) for t in tables))
+            epoch = self._epoch
+        bound = tuple((type(v).__name__, repr(v)) for v in params) if params else ()
+        return (form, scope, text, bound, generations, epoch)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = estimate_bytes(value)
+        if size > self.max_entry_bytes:
+            return
+        generations, epoch = key[-2], key[-1]
+        tables = frozenset(t for t, _ in generations)
+        with self._lock:
+            if epoch != self._epoch or any(self._generations.get(t, 0) != g for t, g in generations):
+                return  # a table changed while the query ran
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, tables)
+            self._bytes += size
+            self._stats["stores"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def invalidate_table(self, table: str) -> None:
+        """Bump a table's generation (after it was rewritten or dropped)."""
+        name = table.lower()
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self._stats["invalidations"] += 1
+            for key in [k for k, entry in self._entries.items() if name in entry[2]]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def invalidate_all(self) -> None:
+        """Drop every entry (the snapshot database was recreated)."""
+        with self._lock:
+            self._epoch += 1
+            self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache (budget from cache.result_cache_max_mb, 0 when disabled)."""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                from utils.config_loader import get_config
+                cache_config = get_config().cache
+                max_mb = cache_config.result_cache_max_mb if cache_config.result_cache_enabled else 0
+                _result_cache = ResultCache(int(max_mb * 1024 * 1024))
+    return _result_cache
+
+
+def invalidate_tables(*tables: str) -> None:
+    """Bump generations after tables were created, replaced or dropped."""
+    cache = get_result_cache()
+    for table in tables:
+        cache.invalidate_table(table)
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """Hit rate, entries and bytes (for /api/health)."""
+    stats = get_result_cache().stats()
+    stats["enabled"] = stats["max_bytes"] > 0
+    return stats
@@ -0,0 +1,368 @@
+"""
+Rollups - pre-aggregated metric x dimension x date-grain tables.
+
+Most questions are sums, averages or counts of a metric column by a
+dimension (branch, category, state) by day or month, and each one used to
+scan the raw transactional table. After profiling, RollupManager.build()
+uses the ProfileStore roles (metric / dimension / date) to materialize, per
+transactional table:
+
+    GROUP BY <date column truncated to day | month> [, <one dimension>]
+    -> <date column>, <dimension>, __rows, <metric>__sum/__count/__min/__max
+
+Rollups live in the _rollup schema, which SHOW TABLES does not list, so
+routing and profiling never see them. A rollup keeps the base table's
+column names, so a compiled WHERE clause runs on it unchanged; callers only
+swap the source table and the aggregate expressions (Rollup.aggregate()).
+sql_compiler (grouped rank plans) and advanced_executor (trends) ask
+find() for the smallest rollup that answers a plan; anything else (other
+columns, COUNT DISTINCT, date filters on a month rollup) stays on the raw
+table.
+
+load_snapshot drops a table's rollups whenever it rewrites the table, and
+build() after re-profiling only aggregates tables without rollups, so a
+sheet change rebuilds just that sheet's rollups. The catalog is kept in
+_rollup.catalog and survives restarts.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import duckdb
+
+from analytics_engine.duckdb_manager import DEFAULT_DB_PATH, get_cursor_pool
+from analytics_engine.result_cache import invalidate_tables
+
+ROLLUP_SCHEMA = "_rollup"
+
+# How a plan uses the table's date column (strictest last)
+USE_MONTH = "month"  # only through DATE_TRUNC('month' | 'quarter' | 'year', TRY_CAST(col AS DATE))
+USE_DAY = "day"      # only through TRY_CAST(col AS DATE) (or week truncation)
+USE_VALUE = "value"  # raw values (plain grouping, filters)
+_USE_ORDER = {USE_MONTH: 0, USE_DAY: 1, USE_VALUE: 2}
+
+_NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+                  "UINTEGER", "UBIGINT", "FLOAT", "DOUBLE", "REAL", "DECIMAL")
+_DATE_TYPES = ("DATE", "TIMESTAMP", "VARCHAR")
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def stricter_use(a: Optional[str], b: str) -> str:
+    """Combine two usages of the same column."""
+    if a is None:
+        return b
+    return a if _USE_ORDER.get(a, 2) >= _USE_ORDER.get(b, 2) else b
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """One materialized rollup of a base table."""
+
+    name: str
+    base_table: str
+    grain: str  # day | month
+    date_column: str
+    date_type: str
+    dimension: Optional[str]
+    metrics: Tuple[str, ...]
+    row_count: int
+    base_rows: int
+
+    @property
+    def source(self) -> str:
+        """Qualified table name for FROM clauses."""
+        return f"{ROLLUP_SCHEMA}.{_quote(self.name)}"
+
+    def aggregate(self, func: str, column: str) -> Optional[str]:
+        """
+        Expression over this rollup equal to func(column) over the base rows
+        it covers, or None if the rollup cannot compute it.
+        """
+        func = (func or "").upper()
+        if func == "COUNT" and column == "*":
+            return "CAST(SUM(__rows) AS BIGINT)"
+        if column not in self.metrics:
+            return None
+        part = {suffix: _quote(f"{column}__{suffix}") for suffix in ("sum", "count", "min", "max")}
+        if func == "SUM":
+            return f"SUM({part['sum']})"
+        if func == "AVG":
+            return f"CAST(SUM({part['sum']}) AS DOUBLE) / NULLIF(SUM({part['count']}), 0)"
+        if func == "MIN":
+            return f"MIN({part['min']})"
+        if func == "MAX":
+            return f"MAX({part['max']})"
+        if func == "COUNT":
+            return f"CAST(SUM({part['count']}) AS BIGINT)"
+        return None
+
+    def non_null(self, column: str) -> str:
+        """Condition equal to "<column> IS NOT NULL" for the rows that contribute to aggregates."""
+        return f"{_quote(column + '__count')} > 0"
+
+    def answers(self, columns: Dict[str, str], aggregates: Iterable[Tuple[str, str]]) -> bool:
+        """Whether the rollup covers every column use and aggregate of a query."""
+        for column, use in columns.items():
+            if column == self.dimension:
+                continue
+            if column != self.date_column:
+                return False
+            if use != USE_MONTH and self.grain != "day":
+                return False
+            if use == USE_VALUE and self.date_type != "DATE":
+                return False
+        return all(self.aggregate(func, column) is not None for func, column in aggregates)
+
+
+class RollupManager:
+    """
+    Builds, finds and drops rollups of one database file.
+
+    Args:
+        path: DuckDB database file (rollups are read through its cursor pool)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rollups: Dict[str, List[Rollup]] = {}
+        self._loaded = False
+        self._stats = {"lookups": 0, "rewrites": 0, "rows_avoided": 0, "builds": 0, "build_ms": 0.0}
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+        rollups: Dict[str, List[Rollup]] = {}
+        try:
+            with get_cursor_pool(self.path).cursor() as cursor:
+                rows = cursor.execute(
+                    f"SELECT name, base_table, grain, date_column, date_type, dimension, metrics, "
+                    f"row_count, base_rows FROM {ROLLUP_SCHEMA}.catalog"
+                ).fetchall()
+            for row in rows:
+                rollup = Rollup(row[0], row[1], row[2], row[3], row[4], row[5],
+                                tuple(json.loads(row[6])), row[7], row[8])
+                rollups.setdefault(rollup.base_table, []).append(rollup)
+        except duckdb.Error:
+            pass  # no catalog yet
+        with self._lock:
+            if not self._loaded:
+                self._rollups = rollups
+                self._loaded = True
+
+    def find(self, table: str, columns: Dict[str, str],
+             aggregates: Iterable[Tuple[str, str]]) -> Optional[Rollup]:
+        """
+        Smallest rollup of table that answers a query.
+
+        Args:
+            table: Base table name
+            columns: Every column the query filters or groups on -> USE_MONTH |
+                USE_DAY | USE_VALUE (how the date column is used; other
+                columns must be the rollup's dimension)
+            aggregates: (function, column) pairs; column "*" for COUNT(*)
+
+        Returns:
+            Rollup or None (query stays on the base table)
+        """
+        from utils.config_loader import get_config
+        if not table or not get_config().query.rollups_enabled:
+            return None
+        self._ensure_loaded()
+        aggregates = list(aggregates)
+        with self._lock:
+            self._stats["lookups"] += 1
+            candidates = [r for r in self._rollups.get(table, []) if r.answers(columns, aggregates)]
+            if not candidates:
+                return None
+            best = min(candidates, key=lambda r: r.row_count)
+            self._stats["rewrites"] += 1
+            self._stats["rows_avoided"] += max(0, best.base_rows - best.row_count)
+        print(f"  [Rollup] {table} -> {best.grain}"
+              f"{' x ' + best.dimension if best.dimension else ''} rollup "
+              f"({best.row_count} of {best.base_rows} rows)")
+        return best
+
+    def build(self, profile_store, tables: Optional[List[str]] = None) -> int:
+        """
+        Build rollups for profiled transactional tables that have none.
+
+        Args:
+            profile_store: ProfileStore with column roles
+            tables: Limit to these tables (default: every profiled table)
+
+        Returns:
+            Number of rollups built
+        """
+        from utils.config_loader import get_config
+        query_config = get_config().query
+        if not query_config.rollups_enabled:
+            return 0
+        self._ensure_loaded()
+
+        built = 0
+        start = time.time()
+        with self._build_lock, get_cursor_pool(self.path).cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {ROLLUP_SCHEMA}")
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {ROLLUP_SCHEMA}.catalog ("
+                f"name VARCHAR, base_table VARCHAR, grain VARCHAR, date_column VARCHAR, "
+                f"date_type VARCHAR, dimension VARCHAR, metrics VARCHAR, row_count BIGINT, "
+                f"base_rows BIGINT, built_at TIMESTAMP)"
+            )
+            for table in tables or profile_store.get_table_names():
+                with self._lock:
+                    if table in self._rollups:
+                        continue
+                profile = profile_store.get_profile(table)
+                if not profile or profile.get("table_type") != "transactional":
+                    continue
+                try:
+                    rollups = self._build_table(cursor, table, profile, query_config)
+                except duckdb.Error as e:
+                    print(f"  [Rollup] Warning: Could not build rollups for {table}: {e}")
+                    continue
+                with self._lock:
+                    self._rollups[table] = rollups
+                built += len(rollups)
+
+        elapsed_ms = (time.time() - start) * 1000
+        with self._lock:
+            self._stats["builds"] += built
+            self._stats["build_ms"] += elapsed_ms
+        if built:
+            print(f"  [Rollup] Built {built} rollup(s) in {elapsed_ms:.0f}ms")
+        return built
+
+    def _build_table(self, cursor, table: str, profile: dict, query_config) -> List[Rollup]:
+        types = {row[0]: str(row[1]).upper() for row in cursor.execute(f"DESCRIBE {_quote(table)}").fetchall()}
+        base_rows = cursor.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+        if base_rows < query_config.rollup_min_rows:
+            return []
+
+        columns = profile.get("columns", {})
+        date_columns = [c for c, info in columns.items()
+                        if info.get("role") == "date" and types.get(c, "").startswith(_DATE_TYPES)]
+        metrics = tuple(c for c, info in columns.items()
+                        if info.get("role") == "metric" and types.get(c, "").startswith(_NUMERIC_TYPES))
+        if not date_columns or not metrics:
+            return []
+        date_column = date_columns[0]
+        dimensions = sorted(
+            (c for c, info in columns.items()
+             if info.get("role") == "dimension" and c in types and c != date_column),
+            key=lambda c: columns[c].get("cardinality") or 0,
+        )[:max(0, int(query_config.rollup_max_dimensions))]
+
+        quoted_date = _quote(date_column)
+        aggregates = ["COUNT(*) AS __rows"]
+        for metric in metrics:
+            quoted_metric = _quote(metric)
+            for func, suffix in (("SUM", "sum"), ("COUNT", "count"), ("MIN", "min"), ("MAX", "max")):
+                aggregates.append(f"{func}({quoted_metric}) AS {_quote(f'{metric}__{suffix}')}")
+
+        rollups = []
+        too_large = set()
+        max_rows = base_rows * query_config.rollup_max_size_ratio
+        for grain in ("month", "day"):
+            if grain == "day":
+                period = f"TRY_CAST({quoted_date} AS DATE)"
+            else:
+                period = f"CAST(DATE_TRUNC('month', TRY_CAST({quoted_date} AS DATE)) AS DATE)"
+            for dimension in [None] + dimensions:
+                if dimension in too_large:
+                    continue  # day grain is never smaller than month
+                keys = [f"{period} AS {quoted_date}"] + ([_quote(dimension)] if dimension else [])
+                name = "r_" + hashlib.sha1(f"{table}\x00{grain}\x00{dimension}".encode("utf-8")).hexdigest()[:16]
+                source = f"{ROLLUP_SCHEMA}.{_quote(name)}"
+                cursor.execute(
+                    f"CREATE OR REPLACE TABLE {source} AS "
+                    f"SELECT {', '.join(keys + aggregates)} FROM {_quote(table)} GROUP BY ALL",
+                    timeout=0,  # full scan of the base table, runs after loads (not per question)
+                )
+                invalidate_tables(name)
+                row_count = cursor.execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0]
+                if row_count > max_rows:
+                    cursor.execute(f"DROP TABLE {source}")
+                    too_large.add(dimension)
+                    continue
+                rollup = Rollup(name, table, grain, date_column, types[date_column].split("(")[0],
+                                dimension, metrics, row_count, base_rows)
+                cursor.execute(
+                    f"INSERT INTO {ROLLUP_SCHEMA}.catalog VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, now())",
+                    [rollup.name, table, grain, date_column, rollup.date_type, dimension,
+                     json.dumps(list(metrics)), row_count, base_rows],
+                )
+                rollups.append(rollup)
+        return rollups
+
+    def forget(self, table: str) -> None:
+        """Stop using a table's rollups (before they are dropped)."""
+        with self._lock:
+            self._rollups.pop(table, None)
+
+    def clear(self) -> None:
+        """Forget every rollup (the database file was recreated)."""
+        with self._lock:
+            self._rollups = {}
+            self._loaded = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            rollups = [r for table_rollups in self._rollups.values() for r in table_rollups]
+            stats["tables"] = sum(1 for table_rollups in self._rollups.values() if table_rollups)
+        stats["rollups"] = len(rollups)
+        stats["rollup_rows"] = sum(r.row_count for r in rollups)
+        stats["build_ms"] = round(stats["build_ms"], 1)
+        return stats
+
+
+_rollup_manager: Optional[RollupManager] = None
+_rollup_manager_lock = threading.Lock()
+
+
+def get_rollup_manager() -> RollupManager:
+    """Process-wide rollup manager for the snapshot database."""
+    global _rollup_manager
+    if _rollup_manager is None:
+        with _rollup_manager_lock:
+            if _rollup_manager is None:
+                _rollup_manager = RollupManager()
+    return _rollup_manager
+
+
+def drop_rollups(conn, table: str) -> None:
+    """
+    Drop a table's rollups (call before the table is rewritten or dropped).
+
+    Args:
+        conn: Open DuckDB connection to the snapshot database
+        table: Base table name
+    """
+    get_rollup_manager().forget(table)
+    try:
+        names = conn.execute(f"SELECT name FROM {ROLLUP_SCHEMA}.catalog WHERE base_table = ?", [table]).fetchall()
+    except duckdb.Error:
+        return  # no rollups built yet
+    for (name,) in names:
+        conn.execute(f"DROP TABLE IF EXISTS {ROLLUP_SCHEMA}.{_quote(name)}")
+        invalidate_tables(name)
+    conn.execute(f"DELETE FROM {ROLLUP_SCHEMA}.catalog WHERE base_table = ?", [table])
+
+
+def get_rollup_stats() -> Dict[str, Any]:
+    """Rollup counts, sizes and rewrite hits (for /api/health)."""
+    from utils.config_loader import get_config
+    stats = get_rollup_manager().stats()
+    stats["enabled"] = get_config().query.rollups_enabled
+    return stats
@@ -0,0 +1,222 @@
+"""
+Schema Catalog - in-memory table -> column -> type map of the snapshot.
+
+The validator and the query healer used to DESCRIBE tables and SHOW TABLES
+on fresh connections for every plan they checked or repaired. The schema
+only changes when the snapshot loader rewrites tables, so SchemaCatalog
+reads every user table's columns in one duckdb_columns() scan and answers
+lookups from memory: exact and case-insensitive column/table resolution,
+column types, and fuzzy (difflib) column matching, whose best match per
+(table, name) is memoized.
+
+The snapshot loader calls invalidate() once before it creates, replaces or
+drops tables, which bumps the catalog generation, and refresh() once it is
+done. Rebuilds are single-flight: the first lookup after a bump scans
+duckdb_columns() while concurrent lookups wait for its result instead of
+running their own scan. A build records the generation it started from, so
+a bump during the scan triggers one more rebuild on the next lookup. Rollup
+tables live in the _rollup schema and are not part of the catalog.
+"""
+
+import os
+import threading
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from analytics_engine.duckdb_manager import DEFAULT_DB_PATH, get_cursor_pool
+
+NUMERIC_TYPES = ("INT", "FLOAT", "DOUBLE", "DECIMAL", "NUMERIC")
+
+_COLUMNS_SQL = (
+    "SELECT table_name, column_name, data_type FROM duckdb_columns() "
+    "WHERE database_name = current_database() AND schema_name = 'main' AND NOT internal "
+    "ORDER BY table_name, column_index"
+)
+
+
+def is_numeric_type(column_type: str) -> bool:
+    """True for integer, floating point and decimal column types."""
+    column_type = (column_type or "").upper()
+    return any(t in column_type for t in NUMERIC_TYPES)
+
+
+class _Snapshot:
+    """One build of the catalog: columns plus lower-case indexes and the fuzzy memo."""
+
+    def __init__(self, columns: Dict[str, Dict[str, str]]):
+        self.columns = columns
+        self.lower_tables = {t.lower(): t for t in columns}
+        self.lower_columns = {t: {c.lower(): c for c in cols} for t, cols in columns.items()}
+        self.fuzzy: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+
+    def table(self, table: str) -> Optional[str]:
+        if table in self.columns:
+            return table
+        return self.lower_tables.get((table or "").lower())
+
+    def column(self, table: str, column: str) -> Optional[str]:
+        name = self.table(table)
+        if name is None or not column:
+            return None
+        return self.lower_columns[name].get(column.lower())
+
+
+class SchemaCatalog:
+    """
+    Column names and types of every table in a snapshot database.
+
+    Args:
+        path: DuckDB file the catalog describes (read through its cursor pool)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._built = threading.Condition(self._lock)
+        self._building = False
+        self._generation = 0
+        self._built_generation = -1
+        self._snapshot = _Snapshot({})
+        self._stats = {"builds": 0, "lookups": 0, "fuzzy_hits": 0, "fuzzy_misses": 0, "invalidations": 0}
+
+    def invalidate(self) -> None:
+        """Bump the generation (a table was created, replaced or dropped)."""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def refresh(self) -> None:
+        """Rebuild now (after a snapshot load) instead of on the next lookup."""
+        with self._lock:
+            self._generation += 1  # a build already in flight may predate the load
+        self._current()
+
+    def _ensure(self) -> "_Snapshot":
+        with self._lock:
+            self._stats["lookups"] += 1
+        return self._current()
+
+    def _current(self) -> "_Snapshot":
+        """Snapshot of the current generation, building it (once) if needed."""
+        with self._built:
+            while self._built_generation != self._generation:
+                if not self._building:
+                    self._building = True
+                    generation = self._generation
+                    break
+                self._built.wait()  # another caller is building
+            else:
+                return self._snapshot
+        try:
+            self._build(generation)
+        finally:
+            with self._built:
+                self._building = False
+                self._built.notify_all()
+        with self._lock:
+            return self._snapshot
+
+    def _build(self, generation: int) -> None:
+        rows: List[tuple] = []
+        if os.path.exists(self.path):
+            with get_cursor_pool(self.path).cursor() as cursor:
+                rows = cursor.execute(_COLUMNS_SQL, timeout=0).fetchall()
+
+        columns: Dict[str, Dict[str, str]] = {}
+        for table, column, column_type in rows:
+            columns.setdefault(table, {})[column] = column_type
+        snapshot = _Snapshot(columns)
+
+        with self._lock:
+            # Newer than what we had even if invalidated meanwhile (then the
+            # next lookup rebuilds once more)
+            self._snapshot = snapshot
+            self._built_generation = generation
+            self._stats["builds"] += 1
+
+    def list_tables(self) -> List[str]:
+        """Names of all user tables (what SHOW TABLES lists)."""
+        return sorted(self._ensure().columns)
+
+    def resolve_table(self, table: str) -> Optional[str]:
+        """Actual name of a table, matched case-insensitively."""
+        return self._ensure().table(table)
+
+    def table_schema(self, table: str) -> Dict[str, str]:
+        """{column: type} in table order; ValueError if the table does not exist."""
+        snapshot = self._ensure()
+        name = snapshot.table(table)
+        if name is None:
+            raise ValueError(f"Table '{table}' does not exist in database")
+        return dict(snapshot.columns[name])
+
+    def resolve_column(self, table: str, column: str) -> Optional[str]:
+        """Actual name of a column, matched case-insensitively."""
+        return self._ensure().column(table, column)
+
+    def column_type(self, table: str, column: str) -> Optional[str]:
+        """Declared type of a column (e.g. 'DECIMAL(18,3)'), or None if unknown."""
+        snapshot = self._ensure()
+        actual = snapshot.column(table, column)
+        if actual is None:
+            return None
+        return snapshot.columns[snapshot.table(table)][actual]
+
+    def closest_column(self, table: str, column: str) -> Tuple[Optional[str], float]:
+        """
+        Most similar column name (difflib ratio on lower-cased names) and its
+        ratio; callers apply their own threshold.
+        """
+        snapshot = self._ensure()
+        name = snapshot.table(table)
+        if name is None or not column:
+            return None, 0.0
+        key = (name, column.lower())
+        with self._lock:
+            cached = snapshot.fuzzy.get(key)
+            if cached is not None:
+                self._stats["fuzzy_hits"] += 1
+                return cached
+            self._stats["fuzzy_misses"] += 1
+
+        best: Tuple[Optional[str], float] = (None, 0.0)
+        matcher = SequenceMatcher(None, "", key[1])  # b (the name) is analysed once
+        for lower, actual in snapshot.lower_columns[name].items():
+            matcher.set_seq1(lower)
+            ratio = matcher.ratio()
+            if ratio > best[1]:
+                best = (actual, ratio)
+
+        with self._lock:
+            snapshot.fuzzy[key] = best
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            snapshot = self._snapshot
+            stats["tables"] = len(snapshot.columns)
+            stats["columns"] = sum(len(cols) for cols in snapshot.columns.values())
+            stats["fuzzy_entries"] = len(snapshot.fuzzy)
+            stats["generation"] = self._generation
+            stats["current"] = self._built_generation == self._generation
+        return stats
+
+
+_schema_catalogs: Dict[str, SchemaCatalog] = {}
+_schema_catalogs_lock = threading.Lock()
+
+
+def get_schema_catalog(path: str = DEFAULT_DB_PATH) -> SchemaCatalog:
+    """Process-wide schema catalog for a database file."""
+    key = os.path.abspath(path)
+    with _schema_catalogs_lock:
+        catalog = _schema_catalogs.get(key)
+        if catalog is None:
+            catalog = _schema_catalogs[key] = SchemaCatalog(path)
+        return catalog
+
+
+def get_schema_catalog_stats() -> Dict[str, Any]:
+    """Tables, columns, builds and fuzzy-match memo hits (for /api/health)."""
+    return get_schema_catalog().stats()
@@ -308,14 +308,103 @@ async def health_check():
 
     # Check DuckDB
     try:
+        from analytics_engine.duckdb_manager import get_duckdb_status
         snapshot_path = _BACKEND_DIR / "data_sources" / "snapshots" / "latest.duckdb"
         health["checks"]["duckdb"] = {
             "status": "ok" if snapshot_path.exists() else "warning",
-            "snapshot_exists": snapshot_path.exists()
+            "snapshot_exists": snapshot_path.exists(),
+            "settings": get_duckdb_status(str(snapshot_path)),
         }
     except Exception as e:
         health["checks"]["duckdb"] = {"status": "error", "message": str(e)}
 
+    # Check embedding model (loaded in the background at startup)
+    try:
+        from schema_intelligence.embedding_service import get_embedding_service
+        embeddings = get_embedding_service().status()
+        embeddings["status"] = "ok" if embeddings["ready"] else "warning"
+        health["checks"]["embeddings"] = embeddings
+    except Exception as e:
+        health["checks"]["embeddings"] = {"status": "error", "message": str(e)}
+
+    # LLM calls avoided by the rule-based planner and template explanations
+    try:
+        from api.services import app_state
+        from explanation_layer.template_explainer import get_template_stats
+        health["checks"]["llm_bypass"] = {
+            "status": "ok",
+            "fast_planner": app_state.fast_planner.stats(),
+            "template_explanations": get_template_stats(),
+        }
+    except Exception as e:
+        health["checks"]["llm_bypass"] = {"status": "error", "message": str(e)}
+
+    # Speculative planning cost (extra planner calls) and DuckDB cursor pool usage
+    try:
+        from api.services import app_state
+        from analytics_engine.duckdb_manager import get_cursor_pool
+        health["checks"]["speculative_planning"] = {
+            "status": "ok",
+            **app_state.speculative_planner.stats(),
+            "cursor_pool": get_cursor_pool().status(),
+        }
+    except Exception as e:
+        health["checks"]["speculative_planning"] = {"status": "error", "message": str(e)}
+
+    # Prompt sizes (static prefix vs dynamic part) and provider context caching
+    try:
+        from utils.prompt_assembly import get_prompt_stats
+        health["checks"]["prompt_assembly"] = {"status": "ok", "families": get_prompt_stats()}
+    except Exception as e:
+        health["checks"]["prompt_assembly"] = {"status": "error", "message": str(e)}
+
+    # LLM calls shared by single-flight dedup and coalesced translations
+    try:
+        from utils.single_flight import get_single_flight
+        from utils.translation import get_translation_stats
+        health["checks"]["llm_dedup"] = {
+            "status": "ok",
+            "single_flight": get_single_flight().stats(),
+            "translation_batching": get_translation_stats(),
+        }
+    except Exception as e:
+        health["checks"]["llm_dedup"] = {"status": "error", "message": str(e)}
+
+    # LLM backend routing and per provider/role call latency
+    try:
+        from utils.llm_provider import get_provider_stats
+        health["checks"]["llm_provider"] = {"status": "ok", **get_provider_stats()}
+    except Exception as e:
+        health["checks"]["llm_provider"] = {"status": "error", "message": str(e)}
+
+    # Per-stage query pipeline timings over recent queries
+    try:
+        from utils.query_pipeline import get_stage_stats
+        health["checks"]["query_pipeline"] = {"status": "ok", **get_stage_stats()}
+    except Exception as e:
+        health["checks"]["query_pipeline"] = {"status": "error", "message": str(e)}
+
+    # Pre-aggregated rollups and plans answered from them
+    try:
+        from analytics_engine.rollups import get_rollup_stats
+        health["checks"]["rollups"] = {"status": "ok", **get_rollup_stats()}
+    except Exception as e:
+        health["checks"]["rollups"] = {"status": "error", "message": str(e)}
+
+    # SQL result cache (hit rate, bytes held)
+    try:
+        from analytics_engine.result_cache import get_result_cache_stats
+        health["checks"]["result_cache"] = {"status": "ok", **get_result_cache_stats()}
+    except Exception as e:
+        health["checks"]["result_cache"] = {"status": "error", "message": str(e)}
+
+    # In-memory schema catalog (tables, columns, fuzzy-match memo)
+    try:
+        from analytics_engine.schema_catalog import get_schema_catalog_stats
+        health["checks"]["schema_catalog"] = {"status": "ok", **get_schema_catalog_stats()}
+    except Exception as e:
+        health["checks"]["schema_catalog"] = {"status": "error", "message": str(e)}
+
     # Overall status
     statuses = [c.get("status") for c in health["checks"].values()]
     if "error" in statuses:
@@ -1011,6 +1100,14 @@ async def startup_event():
 
     print()
 
+    # Warm up the shared embedding model without blocking startup
+    try:
+        from schema_intelligence.embedding_service import get_embedding_service
+        get_embedding_service().start_background_load()
+        print("  Embeddings: loading in background")
+    except Exception as e:
+        print(f"  [WARN]  Could not start embedding warm-up: {e}")
+
     # Pre-load spreadsheet_id from config to enable caching
     try:
         from utils.config_loader import get_config
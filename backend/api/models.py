@@ -138,6 +138,7 @@ class ProcessQueryResponse(BaseModel):
     # Data visualization
     visualization: Optional[VisualizationConfig] = None  # Chart config for visual analytics
     # Debug fields
+    timings: Optional[dict] = None  # Per-stage pipeline timings (see utils/query_pipeline.py)
     debug_server: Optional[str] = None
     debug_data_count: Optional[int] = None
 
@@ -65,7 +65,7 @@ _setup_utf8_output()
 from pathlib import Path
 import re
 from typing import Dict, Any, Optional, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -77,28 +77,32 @@ from schema_intelligence.data_profiler import DataProfiler
 from planning_layer.table_router import TableRouter, RoutingResult
 from planning_layer.entity_extractor import EntityExtractor
 from planning_layer.planner_client import generate_plan
+from planning_layer.fast_planner import FastPlanner
+from planning_layer.speculative_planner import SpeculativePlanner
 from validation_layer.plan_validator import validate_plan
 from execution_layer.executor import execute_plan
 from execution_layer.query_healer import QueryHealer, QueryExecutionError
-from execution_layer.sql_compiler import compile_sql
+from execution_layer.sql_compiler import compile_sql_params
 from explanation_layer.explainer_client import explain_results
+from explanation_layer.template_explainer import render_template_explanation
 from data_sources.gsheet.connector import fetch_sheets_with_tables
 from utils.translation import translate_to_english, translate_to_tamil
 from data_sources.gsheet.change_detector import needs_refresh
 from data_sources.gsheet.snapshot_loader import load_snapshot
-from schema_intelligence.chromadb_client import SchemaVectorStore
+from schema_intelligence.chromadb_client import SchemaVectorStore, get_schema_vector_store
 from utils.voice_utils import transcribe_audio
-from utils.memory_detector import detect_memory_intent
 from utils.permanent_memory import update_memory, load_memory
-from utils.greeting_detector import is_greeting, get_greeting_response, detect_schema_inquiry, is_non_query_conversational, get_non_query_response, is_date_context_statement, get_date_context_response
+from utils.greeting_detector import get_greeting_response, get_non_query_response, get_date_context_response
 from explanation_layer.explainer_client import generate_off_topic_response
 from utils.query_context import QueryContext, QueryTurn, ConversationManager, PendingClarification, PendingCorrection
+from utils.query_analysis import QueryAnalysis
+from utils.query_pipeline import QueryPipeline
 from utils.personality import TharaPersonality
 from utils.visualization import determine_visualization
 from utils.onboarding import OnboardingManager, get_user_name
 from utils.query_cache import get_query_cache, cache_query_result, get_cached_query_result, invalidate_spreadsheet_cache
 from utils.config_loader import get_config
-from analytics_engine.duckdb_manager import DuckDBManager
+from analytics_engine.duckdb_manager import DuckDBManager, QueryTimeoutError
 import yaml
 import numpy as np
 import math
@@ -290,6 +294,8 @@ class AppState:
         self._table_router: Optional[TableRouter] = None
         self._query_healer: Optional[QueryHealer] = None
         self._correction_detector = None  # Lazy-initialized
+        self._fast_planner: Optional[FastPlanner] = None
+        self._speculative_planner: Optional[SpeculativePlanner] = None
 
         # Light components - initialize immediately (cheap)
         self.conversation_manager: ConversationManager = ConversationManager()
@@ -358,7 +364,7 @@ class AppState:
     def vector_store(self) -> SchemaVectorStore:
         """Lazy-load vector store on first access"""
         if self._vector_store is None:
-            self._vector_store = SchemaVectorStore()
+            self._vector_store = get_schema_vector_store()
         return self._vector_store
 
     @vector_store.setter
@@ -380,7 +386,7 @@ class AppState:
     def table_router(self) -> TableRouter:
         """Lazy-load table router on first access"""
         if self._table_router is None:
-            self._table_router = TableRouter(self.profile_store)
+            self._table_router = TableRouter(self.profile_store, entity_extractor=self.entity_extractor)
         return self._table_router
 
     @table_router.setter
@@ -398,6 +404,40 @@ class AppState:
     def query_healer(self, value):
         self._query_healer = value
 
+    @property
+    def fast_planner(self) -> FastPlanner:
+        """Lazy-load rule-based planner on first access"""
+        if self._fast_planner is None:
+            query_config = get_config().query
+            self._fast_planner = FastPlanner(
+                self.profile_store,
+                min_confidence=query_config.fast_planner_min_confidence,
+                enabled=query_config.fast_planner_enabled,
+            )
+        return self._fast_planner
+
+    @fast_planner.setter
+    def fast_planner(self, value):
+        self._fast_planner = value
+
+    @property
+    def speculative_planner(self) -> SpeculativePlanner:
+        """Lazy-load parallel planner for low-confidence routing on first access"""
+        if self._speculative_planner is None:
+            query_config = get_config().query
+            self._speculative_planner = SpeculativePlanner(
+                self.table_router,
+                max_branches=query_config.speculative_max_branches,
+                max_concurrency=query_config.speculative_max_concurrency,
+                max_score_gap=query_config.speculative_max_score_gap,
+                enabled=query_config.speculative_planning_enabled,
+            )
+        return self._speculative_planner
+
+    @speculative_planner.setter
+    def speculative_planner(self, value):
+        self._speculative_planner = value
+
     @property
     def correction_detector(self):
         """Lazy-load correction intent detector on first access"""
@@ -596,6 +636,7 @@ def load_dataset_service(url: str, user_id: str = None, append: bool = False) ->
         # Save profiles to disk
         app_state.profile_store.save_profiles()
         print(f"[Dataset] Profiled {profile_count} tables")
+        _build_rollups()
 
         # Refresh entity extractor with learned values from profiles
         app_state.entity_extractor.refresh_from_profiles(app_state.profile_store)
@@ -795,6 +836,7 @@ def load_dataset_from_source(url: str, user_id: str = None, append: bool = False
                 print(f"[Source] Warning: Could not profile {table_name}: {e}")
 
         app_state.profile_store.save_profiles()
+        _build_rollups()
         app_state.entity_extractor.refresh_from_profiles(app_state.profile_store)
 
         # Build response
@@ -955,6 +997,7 @@ def sync_drive_folder(folder_url: str, replace: bool = True) -> Dict[str, Any]:
                 print(f"[FolderSync] Warning: Could not profile {table_name}: {e}")
 
         app_state.profile_store.save_profiles()
+        _build_rollups()
         app_state.entity_extractor.refresh_from_profiles(app_state.profile_store)
 
         # Build response
@@ -1138,6 +1181,7 @@ def _reprofile_tables(changed_sheets: List[str], sheets_with_tables: Dict):
                     print(f"  [Reprofile] Warning: Could not reprofile {table_name}: {error}")
 
         app_state.profile_store.save_profiles()
+        _build_rollups()
 
         # Refresh entity extractor with learned values from profiles
         app_state.entity_extractor.refresh_from_profiles(app_state.profile_store)
@@ -1145,6 +1189,15 @@ def _reprofile_tables(changed_sheets: List[str], sheets_with_tables: Dict):
         print(f"[Reprofile] Error: {e}")
 
 
+def _build_rollups():
+    """Build rollups for profiled tables that have none (tables rewritten by a sync lost theirs)."""
+    try:
+        from analytics_engine.rollups import get_rollup_manager
+        get_rollup_manager().build(app_state.profile_store)
+    except Exception as e:
+        print(f"[Rollup] Warning: Could not build rollups: {e}")
+
+
 # ============================================================================
 # PROJECTION HANDLERS - Handle projection/forecast queries
 # ============================================================================
@@ -1981,7 +2034,7 @@ def _execute_with_modified_plan(
     """
     import time
     from execution_layer.executor import execute_plan, ADVANCED_QUERY_TYPES
-    from execution_layer.sql_compiler import compile_sql
+    from execution_layer.sql_compiler import compile_sql_params
     from explanation_layer.explainer_client import explain_results
     from utils.query_context import QueryTurn
     import copy
@@ -2010,9 +2063,9 @@ def _execute_with_modified_plan(
             elif isinstance(result, dict) and 'analysis' in result:
                 modified_plan['analysis'] = result.get('analysis', {})
         else:
-            sql = compile_sql(modified_plan)
+            sql, params = compile_sql_params(modified_plan)
             print(f"    -> SQL: {sql[:150]}...")
-            result, final_sql = app_state.query_healer.execute_with_healing(sql, modified_plan)
+            result, final_sql = app_state.query_healer.execute_with_healing(sql, modified_plan, params)
 
         print(f"    [OK] Query executed ({time.time() - step_start:.2f}s)")
 
@@ -2029,19 +2082,25 @@ def _execute_with_modified_plan(
         print("  [Step 2/2] Generating explanation (LLM call)...")
         step_start = time.time()
         emotional_message = user_correction_message if user_correction_message else original_question
-        explanation = explain_results(
-            result,
-            query_plan=modified_plan,
-            original_question=original_question,
-            raw_user_message=emotional_message,
-            user_name=app_state.personality.user_name
+        explanation = render_template_explanation(
+            result, modified_plan, language='ta' if is_tamil else 'en', user_name=app_state.personality.user_name,
+            profile=app_state.profile_store.get_profile(modified_plan.get('table')),
         )
+        templated = explanation is not None
+        if not templated:
+            explanation = explain_results(
+                result,
+                query_plan=modified_plan,
+                original_question=original_question,
+                raw_user_message=emotional_message,
+                user_name=app_state.personality.user_name
+            )
         print(f"    [OK] Explanation generated ({time.time() - step_start:.2f}s)")
 
         # NOTE: explain_results() already handles empty results - no double response needed
 
-        # Translate if Tamil
-        if is_tamil:
+        # Translate if Tamil (templates already answer in Tamil)
+        if is_tamil and not templated:
             from utils.translation import translate_to_tamil
             explanation = translate_to_tamil(explanation)
 
@@ -2699,7 +2758,7 @@ def _execute_with_forced_table(
         step_start = time.time()
         from planning_layer.planner_client import generate_plan
         from validation_layer.plan_validator import validate_plan
-        from execution_layer.sql_compiler import compile_sql
+        from execution_layer.sql_compiler import compile_sql_params
         from execution_layer.executor import execute_plan, ADVANCED_QUERY_TYPES
 
         plan = generate_plan(processing_query, schema_context, entities=entities)
@@ -2734,9 +2793,9 @@ def _execute_with_forced_table(
             elif isinstance(result, dict) and 'analysis' in result:
                 plan['analysis'] = result.get('analysis', {})
         else:
-            sql = compile_sql(plan)
+            sql, params = compile_sql_params(plan)
             print(f"    -> SQL: {sql[:100]}...")
-            result, final_sql = app_state.query_healer.execute_with_healing(sql, plan)
+            result, final_sql = app_state.query_healer.execute_with_healing(sql, plan, params)
         print(f"    [OK] Query executed ({time.time() - step_start:.2f}s)")
 
         # Check for empty results
@@ -2755,19 +2814,25 @@ def _execute_with_forced_table(
         # Use correction_message (angry message) for emotion detection if available
         # Otherwise fall back to original_question
         emotional_message = correction_message if correction_message else original_question
-        explanation = explain_results(
-            result,
-            query_plan=plan,
-            original_question=processing_query,
-            raw_user_message=emotional_message,  # Correction message or original for emotion
-            user_name=app_state.personality.user_name
+        explanation = render_template_explanation(
+            result, plan, language='ta' if is_tamil else 'en', user_name=app_state.personality.user_name,
+            profile=app_state.profile_store.get_profile(plan.get('table')),
         )
+        templated = explanation is not None
+        if not templated:
+            explanation = explain_results(
+                result,
+                query_plan=plan,
+                original_question=processing_query,
+                raw_user_message=emotional_message,  # Correction message or original for emotion
+                user_name=app_state.personality.user_name
+            )
         print(f"    [OK] Explanation generated ({time.time() - step_start:.2f}s)")
 
         # NOTE: explain_results() already handles empty results - no double response needed
 
-        # Translate if Tamil
-        if is_tamil:
+        # Translate if Tamil (templates already answer in Tamil)
+        if is_tamil and not templated:
             from utils.translation import translate_to_tamil
             explanation = translate_to_tamil(explanation)
 
@@ -2934,15 +2999,29 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         conversation_id: Optional conversation ID for context tracking
         user_name: Session-based name for "Call me X" feature (passed from frontend)
     """
+    # Stage scheduler: overlaps independent stages and records structured timings
+    pipeline = QueryPipeline()
+    try:
+        response = _process_query(question, conversation_id, user_name, pipeline)
+    finally:
+        # Every exit (answers, clarifications, errors) releases the stage
+        # workers and reports its per-stage timings
+        timings = pipeline.finish()
+    if isinstance(response, dict):
+        response['timings'] = timings
+    return response
+
+
+def _process_query(question: str, conversation_id: Optional[str], user_name: Optional[str],
+                   pipeline: QueryPipeline) -> Dict[str, Any]:
+    """Body of process_query_service; pipeline is finished by the caller."""
     import time as _time
     _query_start = _time.time()
-    _timings = {}
 
     def _log_timing(step_name: str, step_start: float):
         """Log timing for a step and update cumulative total."""
-        elapsed = (_time.time() - step_start) * 1000
+        elapsed = pipeline.record(step_name, step_start)
         cumulative = (_time.time() - _query_start) * 1000
-        _timings[step_name] = elapsed
         print(f"  [TIME]  {step_name}: {elapsed:.0f}ms (total: {cumulative:.0f}ms)")
 
     try:
@@ -2962,6 +3041,9 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         ctx = app_state.conversation_manager.get_context(conversation_id)
         print(f"  [OK] Context loaded (conversation: {conversation_id or 'default'})")
 
+        # Per-request analysis: normalize once, memoize every detector result
+        query_analysis = QueryAnalysis(question, entity_extractor=app_state.entity_extractor)
+
         # Apply session-based name if provided from frontend
         if user_name:
             app_state.personality.set_name(user_name)
@@ -3031,7 +3113,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 pending_correction=pending_correction,
                 ctx=ctx,
                 app_state=app_state,
-                is_tamil=bool(re.search(r'[\u0B80-\u0BFF]', question))
+                is_tamil=query_analysis.is_tamil
             )
             if correction_response:
                 ctx.clear_pending_correction_state()
@@ -3047,15 +3129,14 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             _step_start = _time.time()
             print("\n[STEP 0.6b/9] CORRECTION INTENT DETECTION...")
             previous_turn = ctx.get_last_turn()
-            correction_intent = app_state.correction_detector.detect(question, previous_turn)
+            correction_intent = query_analysis.correction(app_state.correction_detector, previous_turn)
 
             if correction_intent:
                 print(f"  [OK] Correction detected: {correction_intent.correction_type.value}")
                 print(f"    Confidence: {correction_intent.confidence:.0%}")
                 _log_timing("correction_detection", _step_start)
 
-                # Detect Tamil
-                is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
+                is_tamil = query_analysis.is_tamil
 
                 # Handle the correction
                 correction_result = _handle_correction(
@@ -3081,6 +3162,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 print(f"\n[STEP 0.65/9] TOP REFERENCE RESOLUTION...")
                 print(f"  [OK] Resolved: '{question[:50]}...' -> '{resolved_question[:50]}...'")
                 question = resolved_question  # Use resolved question for rest of pipeline
+                query_analysis = query_analysis.for_question(question)
 
         # === CHECK FOR PROJECTION INTENT (NEW STEP 0.7) ===
         if ctx.turns:
@@ -3088,8 +3170,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             print("\n[STEP 0.7/9] PROJECTION INTENT DETECTION...")
             previous_turn = ctx.get_last_turn()
 
-            from utils.projection_detector import detect_projection_intent
-            projection_intent = detect_projection_intent(question, previous_turn)
+            projection_intent = query_analysis.projection(previous_turn)
 
             if projection_intent:
                 print(f"  [OK] Projection intent detected: {projection_intent.projection_type.value}")
@@ -3097,8 +3178,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 print(f"    Confidence: {projection_intent.confidence:.0%}")
                 _log_timing("projection_detection", _step_start)
 
-                # Detect Tamil
-                is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
+                is_tamil = query_analysis.is_tamil
 
                 # Handle the projection
                 projection_result = _handle_projection(
@@ -3112,7 +3192,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 if projection_result:
                     _total_time = (_time.time() - _query_start) * 1000
                     print(f"\n  [TIME]  TIMING SUMMARY (PROJECTION):")
-                    for step, ms in _timings.items():
+                    for step, ms in pipeline.durations().items():
                         print(f"      {step}: {ms:.0f}ms")
                     print(f"      TOTAL: {_total_time:.0f}ms ({_total_time/1000:.2f}s)")
                     print("=" * 60 + "\n")
@@ -3125,10 +3205,10 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         # ALL conversational responses now use LLM for natural, contextual replies
         _step_start = _time.time()
         print("\n[STEP 1/8] GREETING/CONVERSATIONAL DETECTION...")
-        is_tamil_text = bool(re.search(r'[\u0B80-\u0BFF]', question))
+        is_tamil_text = query_analysis.is_tamil
 
-        if is_greeting(question) or is_non_query_conversational(question):
-            greeting_type = "greeting" if is_greeting(question) else "conversational"
+        if query_analysis.is_greeting or query_analysis.is_non_query_conversational:
+            greeting_type = "greeting" if query_analysis.is_greeting else "conversational"
             print(f"  [OK] {greeting_type.title()} detected - generating LLM response")
 
             # Use LLM for ALL conversational responses (natural, not hardcoded)
@@ -3138,7 +3218,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             _total_time = (_time.time() - _query_start) * 1000
             print("  -> Returning LLM-generated conversational response")
             print(f"\n  [TIME]  TIMING SUMMARY (CONVERSATIONAL PATH):")
-            for step, ms in _timings.items():
+            for step, ms in pipeline.durations().items():
                 print(f"      {step}: {ms:.0f}ms")
             print(f"      TOTAL: {_total_time:.0f}ms ({_total_time/1000:.2f}s)")
             print("=" * 60 + "\n")
@@ -3159,14 +3239,13 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         # === FAST PATH: Date Context Detection (BEFORE Memory) ===
         _step_start = _time.time()
         print("\n[STEP 1.8/8] DATE CONTEXT DETECTION...")
-        is_date_ctx, date_info = is_date_context_statement(question)
+        is_date_ctx, date_info = query_analysis.date_context
         if is_date_ctx:
             print(f"  [OK] Date context detected: {date_info}")
             # Store date context in conversation for subsequent queries
             if date_info:
                 ctx.set_date_context(date_info)
-            is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
-            response = get_date_context_response(date_info, is_tamil=is_tamil)
+            response = get_date_context_response(date_info, is_tamil=query_analysis.is_tamil)
             _log_timing("date_context", _step_start)
             print("  -> Returning date context acknowledgment")
             print("=" * 60 + "\n")
@@ -3186,7 +3265,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         # === FAST PATH: Memory Intent ===
         _step_start = _time.time()
         print("\n[STEP 2/8] MEMORY INTENT DETECTION...")
-        memory_result = detect_memory_intent(question)
+        memory_result = query_analysis.memory_intent
         if memory_result and memory_result.get("has_memory_intent"):
             print(f"  [OK] Memory intent detected!")
             category = memory_result["category"]
@@ -3266,15 +3345,14 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         # Handles questions like "what is sheet 1", "describe the data", "what tables do I have"
         # Uses template-based responses - NO LLM (prevents hallucination)
         print("\n[STEP 3/8] SCHEMA INQUIRY DETECTION...")
-        schema_intent = detect_schema_inquiry(question)
+        schema_intent = query_analysis.schema_inquiry
         if schema_intent:
             print(f"  [OK] Schema inquiry detected: {schema_intent}")
             table_ref = schema_intent.get('table')
             is_detailed = schema_intent.get('detailed', False)
 
             # Get user language preference
-            is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
-            language = 'ta' if is_tamil else 'en'
+            language = 'ta' if query_analysis.is_tamil else 'en'
 
             # Generate response from profile store (template-based, no LLM)
             if app_state.profile_store:
@@ -3343,7 +3421,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 _log_timing("early_cache_check", _step_start)
 
                 # Translate cached explanation if Tamil input
-                is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
+                is_tamil = query_analysis.is_tamil
                 cached_explanation = cached_result.get('explanation', '')
                 if is_tamil and cached_explanation:
                     cached_explanation = translate_to_tamil(cached_explanation)
@@ -3378,7 +3456,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         print("\n[STEP 4-5/8] PARALLEL: TRANSLATION + ENTITY EXTRACTION...")
 
         processing_query = question
-        is_tamil = bool(re.search(r'[\u0B80-\u0BFF]', question))
+        is_tamil = query_analysis.is_tamil
         entities = {}
 
         if is_tamil:
@@ -3386,36 +3464,49 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             print(f"    Original: {question[:50]}...")
             ctx.set_language('ta')
 
-            # Run translation and entity extraction in parallel
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                # Submit both tasks
-                future_translation = executor.submit(translate_to_english, question)
-                future_entities = executor.submit(app_state.entity_extractor.extract, question)
+            pipeline.start("translate", translate_to_english, question)
+            pipeline.start("extract_entities", query_analysis.entities)
+            # New conversations: route on the original text while translation runs
+            # (the LLM table selector reads Tamil); used in STEP 7 if confident.
+            # Only once the cache was checked - a later cache hit would waste it
+            if not ctx.active_table and early_cache_checked:
+                pipeline.start(
+                    "route_original",
+                    lambda: app_state.table_router.route(question, None, entities=query_analysis.entities()),
+                    after=("extract_entities",)
+                )
 
-                # Get results
-                try:
-                    processing_query = future_translation.result(timeout=10)
-                    print(f"    Translated: {processing_query[:50]}...")
-                except Exception as e:
-                    print(f"  ! Translation failed: {e}, using original")
-                    processing_query = question
+            # Timeouts are recorded by the pipeline (response timings['timeouts'])
+            try:
+                processing_query = pipeline.result("translate", timeout=10)
+                print(f"    Translated: {processing_query[:50]}...")
+            except FutureTimeoutError:
+                print(f"  [WARN] Translation timed out - using original text")
+                processing_query = question
+            except Exception as e:
+                print(f"  ! Translation failed: {e}, using original")
+                processing_query = question
 
-                try:
-                    entities = future_entities.result(timeout=5)
-                except Exception as e:
-                    print(f"  ! Entity extraction failed: {e}")
-                    entities = {}
+            try:
+                # Copy: the merge below must not mutate the memoized extraction
+                entities = dict(pipeline.result("extract_entities", timeout=5))
+            except FutureTimeoutError:
+                print(f"  [WARN] Entity extraction timed out - using translated text only")
+                entities = {}
+            except Exception as e:
+                print(f"  ! Entity extraction failed: {e}")
+                entities = {}
 
             # Re-extract entities from translated text for better accuracy
             if processing_query != question:
-                translated_entities = app_state.entity_extractor.extract(processing_query)
+                translated_entities = query_analysis.entities(processing_query)
                 # Merge: prefer translated entities but keep Tamil-detected ones
                 for key, value in translated_entities.items():
                     if value and (not entities.get(key) or key in ['time_period', 'locations', 'categories']):
                         entities[key] = value
         else:
             print("  [FAIL] No translation needed (English) - extracting entities")
-            entities = app_state.entity_extractor.extract(processing_query)
+            entities = dict(query_analysis.entities(processing_query))
 
         entity_summary = app_state.entity_extractor.get_entities_summary(entities)
         print(f"  [OK] Entities extracted: {entity_summary}")
@@ -3431,6 +3522,32 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
 
         _log_timing("parallel_translation_entities", _step_start)
 
+        # Table routing only needs the question, entities and follow-up state.
+        # When the cache was already checked, start it now so it overlaps the
+        # data-freshness check below; otherwise STEP 6 may still return a
+        # cached answer, and routing runs after it (STEP 7).
+        previous_context = {
+            'entities': ctx.active_entities,
+            'table': ctx.active_table
+        } if is_followup else None
+        if pipeline.has_stage("route_original") and is_followup:
+            pipeline.discard("route_original")  # follow-ups re-route with context
+        if early_cache_checked:
+            route_original_confident = False
+            if pipeline.has_stage("route_original") and pipeline.done("route_original"):
+                try:
+                    route_original_confident = pipeline.result("route_original").is_confident
+                except Exception:
+                    pass
+            # A Tamil route_original that is still running may turn out not to be
+            # confident: route the translated question alongside it, not after it
+            if not route_original_confident:
+                pipeline.start(
+                    "route",
+                    app_state.table_router.route,
+                    processing_query, previous_context, entities=query_analysis.entities(processing_query)
+                )
+
         # === CHECK FOR DATA CHANGES (INVALIDATE STALE CACHE) ===
         _step_start = _time.time()
         print("\n[STEP 6/8] CACHE & DATA CHECK...")
@@ -3497,12 +3614,32 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         _step_start = _time.time()
         print("\n[STEP 7/8] TABLE ROUTING & PLANNING...")
         # This is the CORE FIX - no more top_k=50 schema dump!
-        previous_context = {
-            'entities': ctx.active_entities,
-            'table': ctx.active_table
-        } if is_followup else None
-
-        routing_result = app_state.table_router.route(processing_query, previous_context)
+        # Routing was started in the background after entity extraction; its
+        # result is only used if the data did not change underneath it
+        routing_result = None
+        for early_stage in ("route_original", "route"):
+            if routing_result is not None or not pipeline.has_stage(early_stage):
+                continue
+            if data_was_refreshed:
+                pipeline.discard(early_stage)
+                continue
+            try:
+                routing_result = pipeline.result(early_stage)
+            except Exception as e:
+                print(f"  ! Background routing failed: {e}")
+            if early_stage == "route_original" and routing_result is not None:
+                if not routing_result.is_confident:
+                    routing_result = None  # use the translated question's routing
+                    pipeline.discard(early_stage)
+                else:
+                    print(f"  [OK] Using routing of the original (Tamil) question")
+                    if pipeline.has_stage("route"):
+                        pipeline.discard("route")
+        if routing_result is None:
+            routing_result = pipeline.run(
+                "route_sync", app_state.table_router.route,
+                processing_query, previous_context, entities=query_analysis.entities(processing_query)
+            )
 
         # Unpack routing result
         best_table = routing_result.table
@@ -3532,13 +3669,12 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 # No data intent + very low confidence = unclear/conversational message
                 # Route to LLM for a friendly response instead of table selection
                 print(f"  ! Very low confidence ({confidence:.0%}) with no data intent - using LLM response")
-                is_tamil_text = bool(re.search(r'[\u0B80-\u0BFF]', question))
-                response = generate_off_topic_response(question, is_tamil=is_tamil_text)
+                response = generate_off_topic_response(question, is_tamil=query_analysis.is_tamil)
 
                 _total_time = (_time.time() - _query_start) * 1000
                 print("  -> Returning conversational LLM response (low confidence path)")
                 print(f"\n  [TIME]  TIMING SUMMARY (LOW CONFIDENCE CONVERSATIONAL):")
-                for step, ms in _timings.items():
+                for step, ms in pipeline.durations().items():
                     print(f"      {step}: {ms:.0f}ms")
                 print(f"      TOTAL: {_total_time:.0f}ms ({_total_time/1000:.2f}s)")
                 print("=" * 60 + "\n")
@@ -3570,7 +3706,9 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             print(f"  [OK] Using focused schema for: {best_table}")
         elif routing_result.should_fallback:
             # Very low confidence - use top 5 candidate tables
-            schema_context = app_state.table_router.get_fallback_schema(processing_query, top_k=5)
+            schema_context = app_state.table_router.get_fallback_schema(
+                processing_query, top_k=5, entities=query_analysis.entities(processing_query)
+            )
             print(f"  ! Very low confidence - using fallback schema (top 5 candidates)")
         else:
             # Medium confidence - use the best match
@@ -3584,11 +3722,28 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                 schema_context = f"{context_prompt}\n\n---\n\n{schema_context}"
 
         # === PLANNING ===
+        # Simple, high-confidence questions get a rule-based plan; the LLM
+        # planner handles everything else (and any fast plan that fails validation)
         _step_start = _time.time()
-        print("  -> Generating query plan via LLM...")
-        plan = generate_plan(processing_query, schema_context, entities=entities)
-        validate_plan(plan)
-        _log_timing("llm_planning", _step_start)
+        plan = None
+        if best_table and routing_result.is_confident and not is_followup:
+            plan = app_state.fast_planner.plan(
+                processing_query, best_table, entities, confidence, validate=validate_plan
+            )
+            if plan is not None:
+                _log_timing("fast_planning", _step_start)
+        # Unsure routing between close candidates: plan (and cheaply execute)
+        # them in parallel instead of one prompt over a multi-table schema
+        if plan is None and not routing_result.is_confident and not is_followup:
+            speculative = app_state.speculative_planner.run(processing_query, routing_result, entities)
+            if speculative is not None:
+                plan = speculative.plan
+                _log_timing("speculative_planning", _step_start)
+        if plan is None:
+            print("  -> Generating query plan via LLM...")
+            plan = generate_plan(processing_query, schema_context, entities=entities)
+            validate_plan(plan)
+            _log_timing("llm_planning", _step_start)
         print(f"  [OK] Plan generated:")
         print(f"    Query type: {plan.get('query_type', 'unknown')}")
         print(f"    Table: {plan.get('table', 'unknown')}")
@@ -3604,6 +3759,9 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             
             query_type = plan.get('query_type')
             
+            # A speculative winner runs below like any other plan (with
+            # healing); its branch execution left the result in the cache
+
             # Route multi-step queries to cross-table executor
             if query_type in MULTI_STEP_QUERY_TYPES or plan.get('steps') is not None:
                 print(f"  -> Executing multi-step query: {query_type}")
@@ -3641,16 +3799,28 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
                     print(f"    ! No analysis found in result (type: {type(result).__name__})")
             else:
                 # Standard query execution with healing
-                sql = compile_sql(plan)
+                sql, params = compile_sql_params(plan)
                 print(f"  [OK] SQL compiled: {sql[:100]}{'...' if len(sql) > 100 else ''}")
                 print("  -> Executing with self-healing...")
-                result, final_sql = app_state.query_healer.execute_with_healing(sql, plan)
+                result, final_sql = app_state.query_healer.execute_with_healing(sql, plan, params)
 
             # Add healing info to debug
             healing_history = app_state.query_healer.get_healing_history()
             if healing_history:
                 print(f"  ! Applied {len(healing_history)} healing fix(es)")
 
+        except QueryTimeoutError as e:
+            # Interrupted by the query watchdog - healing would not help
+            print(f"  [FAIL] EXECUTION TIMED OUT after {e.timeout_seconds:g}s")
+            print("=" * 60 + "\n")
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'timeout',
+                'explanation': app_state.personality.handle_error('timeout'),
+                'healing_attempts': []
+            }
+
         except QueryExecutionError as e:
             # All healing attempts failed
             print(f"  [FAIL] EXECUTION FAILED after all healing attempts")
@@ -3680,16 +3850,34 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
             print(f"  [OK] Query returned {row_count} rows")
         _log_timing("sql_execution", _step_start)
 
+        # === VISUALIZATION (runs while the explanation is generated) ===
+        # Sanitize numpy types for JSON serialization
+        data_list = None
+        if result is not None and hasattr(result, 'to_dict'):
+            data_list = _sanitize_for_json(result.to_dict('records'))
+
+        # Determine visualization type based on query type and data
+        # NOTE: Removed len(data_list) > 1 gate to allow metric cards for single-value results
+        if data_list:
+            pipeline.start("visualize", determine_visualization, plan, data_list, entities)
+
         # === EXPLANATION WITH PERSONALITY ===
         _step_start = _time.time()
         print("\n[RESPONSE] Generating explanation...")
-        explanation = explain_results(
-            result,
-            query_plan=plan,
-            original_question=processing_query,
-            raw_user_message=question,  # Original message with emotional tone
-            user_name=app_state.personality.user_name
+        # Simple result shapes are answered from EN/TA templates (no LLM, no translation)
+        explanation = render_template_explanation(
+            result, plan, language='ta' if is_tamil else 'en', user_name=app_state.personality.user_name,
+            profile=app_state.profile_store.get_profile(plan.get('table')),
         )
+        templated = explanation is not None
+        if not templated:
+            explanation = explain_results(
+                result,
+                query_plan=plan,
+                original_question=processing_query,
+                raw_user_message=question,  # Original message with emotional tone
+                user_name=app_state.personality.user_name
+            )
 
         # NOTE: explain_results() already handles empty results with friendly messages
         # No need to append additional no_data_hint - that caused DOUBLE responses
@@ -3709,7 +3897,7 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
 
         # === TRANSLATION (POST-PROCESS) ===
         _step_start = _time.time()
-        if is_tamil:
+        if is_tamil and not templated:
             print("  -> Translating response to Tamil...")
             explanation = translate_to_tamil(explanation)
             print("  [OK] Response translated")
@@ -3757,23 +3945,16 @@ def process_query_service(question: str, conversation_id: str = None, user_name:
         print(f"  Rows: {row_count}")
         print(f"  Confidence: {confidence:.0%}")
         print(f"\n  [TIME]  TIMING SUMMARY:")
-        for step, ms in _timings.items():
+        for step, ms in pipeline.durations().items():
             print(f"      {step}: {ms:.0f}ms")
         print(f"      ────────────────────")
         print(f"      TOTAL: {_total_time:.0f}ms ({_total_time/1000:.2f}s)")
         print("=" * 60 + "\n")
 
-        # Sanitize numpy types for JSON serialization
-        data_list = None
-        if result is not None and hasattr(result, 'to_dict'):
-            data_list = _sanitize_for_json(result.to_dict('records'))
-
-        # Determine visualization type based on query type and data
-        # NOTE: Removed len(data_list) > 1 gate to allow metric cards for single-value results
         visualization = None
         if data_list:
             try:
-                visualization = determine_visualization(plan, data_list, entities)
+                visualization = pipeline.result("visualize")
             except Exception as viz_err:
                 print(f"[Visualization] Warning: Could not determine visualization: {viz_err}")
 
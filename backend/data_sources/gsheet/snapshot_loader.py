@@ -1,8 +1,11 @@
-import duckdb
 import os
 import json
 from pathlib import Path
 from typing import Dict, List, Any
+from analytics_engine.duckdb_manager import open_connection
+from analytics_engine.result_cache import get_result_cache, invalidate_tables
+from analytics_engine.schema_catalog import get_schema_catalog
+from analytics_engine.rollups import drop_rollups
 from data_sources.gsheet.connector import fetch_sheets_with_tables
 from utils.sql_utils import quote_identifier
 
@@ -98,7 +101,7 @@ def delete_tables_by_source_id(source_id: str, conn=None):
     """
     close_conn = False
     if conn is None:
-        conn = duckdb.connect(DB_PATH)
+        conn = open_connection(DB_PATH)
         close_conn = True
     
     try:
@@ -114,7 +117,9 @@ def delete_tables_by_source_id(source_id: str, conn=None):
         for table_name in tables_to_delete:
             try:
                 quoted_table = quote_identifier(table_name)
+                drop_rollups(conn, table_name)
                 conn.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+                invalidate_tables(table_name)
                 print(f"   Deleted table: {table_name}")
                 
                 # Remove from metadata
@@ -125,6 +130,7 @@ def delete_tables_by_source_id(source_id: str, conn=None):
         # Save updated metadata
         if tables_to_delete:
             save_table_metadata(metadata)
+            get_schema_catalog().invalidate()
         
         return len(tables_to_delete)
         
@@ -143,9 +149,13 @@ def drop_all_tables(conn):
         # Drop each table
         for table in tables:
             quoted_table = quote_identifier(table)
+            drop_rollups(conn, table)
             conn.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+            invalidate_tables(table)
             print(f"   Dropped table: {table}")
-        
+
+        if tables:
+            get_schema_catalog().invalidate()
         return len(tables)
     except Exception as e:
         print(f"[WARN]  Error dropping tables: {e}")
@@ -159,11 +169,18 @@ def reset_duckdb_snapshot():
         Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
 
         if Path(DB_PATH).exists():
+            # Pooled read connections would keep the old file open
+            from analytics_engine.duckdb_manager import close_cursor_pools
+            from analytics_engine.rollups import get_rollup_manager
+            close_cursor_pools()
             os.remove(DB_PATH)
+            get_rollup_manager().clear()
+            get_result_cache().invalidate_all()
+            get_schema_catalog().invalidate()
             print(f"   Deleted old DuckDB file: {DB_PATH}")
 
         # Create new empty database
-        conn = duckdb.connect(DB_PATH)
+        conn = open_connection(DB_PATH)
         conn.close()
         print(f"   Created fresh DuckDB file: {DB_PATH}")
         
@@ -211,7 +228,7 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
             table_metadata = {}
 
             # Connect to fresh database
-            conn = duckdb.connect(DB_PATH)
+            conn = open_connection(DB_PATH)
 
             # Rebuild all sheets
             sheets_to_rebuild = sorted(sheets_with_tables.keys())
@@ -220,7 +237,7 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
             print(f"[SYNC] Performing INCREMENTAL REBUILD for {len(changed_sheets)} sheet(s)...")
 
             # Connect to existing database
-            conn = duckdb.connect(DB_PATH)
+            conn = open_connection(DB_PATH)
 
             # Delete tables from changed sheets
             for sheet_name in changed_sheets:
@@ -238,13 +255,17 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
         else:
             # Legacy incremental refresh (rebuild all)
             print("[SYNC] Performing LEGACY INCREMENTAL REFRESH...")
-            conn = duckdb.connect(DB_PATH)
+            conn = open_connection(DB_PATH)
             sheets_to_rebuild = sorted(sheets_with_tables.keys())
 
         # Track used names to ensure uniqueness per snapshot load
         # Map: base_name -> count
         name_counts = {}
 
+        # Tables are rewritten below; one catalog bump covers the whole load
+        # (refresh() rebuilds it once they are all in place)
+        get_schema_catalog().invalidate()
+
         # Load tables from sheets to rebuild
         for sheet_name in sheets_to_rebuild:
             if sheet_name not in sheets_with_tables:
@@ -276,8 +297,10 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
                 # Get the dataframe for this table
                 df = table_info['dataframe']
 
-                # Drop table if it exists (for incremental refresh)
+                # Drop table if it exists (for incremental refresh), with its rollups
+                drop_rollups(conn, final_name)
                 conn.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+                invalidate_tables(final_name)
 
                 # Create table in DuckDB
                 conn.execute(f"CREATE TABLE {quoted_table} AS SELECT * FROM df")
@@ -303,6 +326,12 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
     # Save updated table metadata
     save_table_metadata(table_metadata)
 
+    # Rebuild the in-memory schema catalog for the validator and healer
+    try:
+        get_schema_catalog().refresh()
+    except Exception as e:
+        print(f"[WARN]  Could not build schema catalog: {e}")
+
     if full_reset:
         print("[OK] Full reset complete")
     elif changed_sheets:
@@ -314,7 +343,7 @@ def load_snapshot(sheets_with_tables=None, full_reset=False, changed_sheets=None
     print("\n[DATA] Table Statistics:")
 
     try:
-        conn = duckdb.connect(DB_PATH)
+        conn = open_connection(DB_PATH)
 
         for sheet_name in sorted(sheets_to_rebuild):
             if sheet_name not in sheets_with_tables:
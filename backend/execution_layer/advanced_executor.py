@@ -13,6 +13,18 @@ from datetime import datetime
 import statistics
 import re
 
+from analytics_engine.duckdb_manager import QueryTimeoutError
+from analytics_engine.rollups import USE_DAY, USE_VALUE, get_rollup_manager
+
+# Trend classification thresholds (normalized slope = % change per period).
+# Shared by _analyze_trend and the SQL classification in execute_grouped_trend.
+TREND_STABLE_PCT = 1.0         # |slope| below this -> stable
+TREND_STABLE_HIGH_PCT = 0.5    # stable with high confidence below this
+TREND_HIGH_PCT = 5.0           # increasing/decreasing with high confidence above this
+TREND_MEDIUM_PCT = 2.0         # ... medium confidence above this, low otherwise
+
+_TREND_EMOJI = {"increasing": "UP", "decreasing": "DOWN", "stable": "STABLE"}
+
 
 def execute_advanced_query(
     plan: Dict[str, Any],
@@ -45,41 +57,43 @@ def execute_comparison(
     conn: duckdb.DuckDBPyConnection
 ) -> Dict[str, Any]:
     """
-    Execute comparison query - compare two periods/values.
+    Execute comparison query - compare two (or more) periods/values.
 
     Example question: "How did August sales compare to December?"
+
+    comparison.periods (optional) lists 3+ periods for N-period comparisons
+    ("month-over-month this year"); period_a / period_b are the first and
+    last period. Periods on the same table are aggregated in one scan.
     """
     comparison = plan.get("comparison", {})
-    period_a = comparison.get("period_a", {})
-    period_b = comparison.get("period_b", {})
+    periods = comparison.get("periods") or [comparison.get("period_a", {}), comparison.get("period_b", {})]
     compare_type = comparison.get("compare_type", "difference")
 
-    # Execute query for period A
-    value_a = _get_aggregated_value(
-        conn,
-        period_a.get("table", plan.get("table")),
-        period_a.get("column"),
-        period_a.get("filters", []),
-        period_a.get("aggregation", "SUM")
-    )
-
-    # Execute query for period B
-    value_b = _get_aggregated_value(
-        conn,
-        period_b.get("table", plan.get("table")),
-        period_b.get("column"),
-        period_b.get("filters", []),
-        period_b.get("aggregation", "SUM")
-    )
+    labels = [
+        period.get("label") or (f"Period {chr(ord('A') + i)}" if len(periods) <= 26 else f"Period {i + 1}")
+        for i, period in enumerate(periods)
+    ]
+
+    values = _get_aggregated_values(conn, [
+        {
+            "table": period.get("table", plan.get("table")),
+            "column": period.get("column"),
+            "filters": period.get("filters", []),
+            "aggregation": period.get("aggregation", "SUM"),
+        }
+        for period in periods
+    ])
+    period_a, period_b = periods[0], periods[-1]
+    label_a, label_b = labels[0], labels[-1]
+    value_a, value_b = values[0], values[-1]
 
     # Calculate comparison
-    if value_a is None or value_b is None:
+    if any(value is None for value in values):
         # Provide specific error about which data is missing
-        missing_info = []
-        if value_a is None:
-            missing_info.append(f"{period_a.get('label', 'Period A')} ({period_a.get('column', 'unknown column')})")
-        if value_b is None:
-            missing_info.append(f"{period_b.get('label', 'Period B')} ({period_b.get('column', 'unknown column')})")
+        missing_info = [
+            f"{label} ({period.get('column', 'unknown column')})"
+            for label, period, value in zip(labels, periods, values) if value is None
+        ]
 
         error_msg = f"Couldn't find data for: {', '.join(missing_info)}. The column might not exist or have NULL values."
         print(f"[Comparison] {error_msg}")
@@ -109,23 +123,40 @@ def execute_comparison(
         direction = "unchanged"
         direction_emoji = "STABLE"
 
+    analysis = {
+        "period_a_label": label_a,
+        "period_a_value": value_a,
+        "period_b_label": label_b,
+        "period_b_value": value_b,
+        "difference": value_b - value_a,
+        "percentage_change": ((value_b - value_a) / value_a * 100) if value_a != 0 else None,
+        "direction": direction,
+        "direction_emoji": direction_emoji,
+        "compare_type": compare_type
+    }
+
+    if len(periods) > 2:
+        # Period-over-period changes for N-period comparisons
+        analysis["periods"] = [
+            {
+                "label": label,
+                "value": value,
+                "change_from_previous": (value - values[i - 1]) if i else None,
+                "percentage_change_from_previous": (
+                    (value - values[i - 1]) / values[i - 1] * 100 if i and values[i - 1] != 0 else None
+                ),
+            }
+            for i, (label, value) in enumerate(zip(labels, values))
+        ]
+        highest = max(range(len(values)), key=lambda i: values[i])
+        lowest = min(range(len(values)), key=lambda i: values[i])
+        analysis["highest_period"] = {"label": labels[highest], "value": values[highest]}
+        analysis["lowest_period"] = {"label": labels[lowest], "value": values[lowest]}
+
     return {
-        "data": [
-            {period_a.get("label", "Period A"): value_a},
-            {period_b.get("label", "Period B"): value_b}
-        ],
+        "data": [{label: value} for label, value in zip(labels, values)],
         "calculation_result": result,
-        "analysis": {
-            "period_a_label": period_a.get("label", "Period A"),
-            "period_a_value": value_a,
-            "period_b_label": period_b.get("label", "Period B"),
-            "period_b_value": value_b,
-            "difference": value_b - value_a,
-            "percentage_change": ((value_b - value_a) / value_a * 100) if value_a != 0 else None,
-            "direction": direction,
-            "direction_emoji": direction_emoji,
-            "compare_type": compare_type
-        }
+        "analysis": analysis
     }
 
 
@@ -137,31 +168,30 @@ def execute_percentage(
     Execute percentage query - calculate percentage contribution.
 
     Example question: "What percentage of sales comes from top 10 items?"
+    Numerator and denominator are aggregated in one scan of the table.
     """
     percentage = plan.get("percentage", {})
     numerator = percentage.get("numerator", {})
     denominator = percentage.get("denominator", {})
     table = plan.get("table")
 
-    # Get numerator value (e.g., top 10 items sales)
-    numerator_value = _get_aggregated_value(
-        conn,
-        table,
-        numerator.get("column"),
-        numerator.get("filters", []),
-        numerator.get("aggregation", "SUM"),
-        order_by=numerator.get("order_by"),
-        limit=numerator.get("limit")
-    )
-
-    # Get denominator value (e.g., total sales)
-    denominator_value = _get_aggregated_value(
-        conn,
-        table,
-        denominator.get("column"),
-        denominator.get("filters", []),
-        denominator.get("aggregation", "SUM")
-    )
+    # Numerator (e.g., top 10 items sales) and denominator (e.g., total sales)
+    numerator_value, denominator_value = _get_aggregated_values(conn, [
+        {
+            "table": table,
+            "column": numerator.get("column"),
+            "filters": numerator.get("filters", []),
+            "aggregation": numerator.get("aggregation", "SUM"),
+            "order_by": numerator.get("order_by"),
+            "limit": numerator.get("limit"),
+        },
+        {
+            "table": table,
+            "column": denominator.get("column"),
+            "filters": denominator.get("filters", []),
+            "aggregation": denominator.get("aggregation", "SUM"),
+        },
+    ])
 
     if numerator_value is None or denominator_value is None or denominator_value == 0:
         return {
@@ -236,30 +266,29 @@ def execute_trend(
     quoted_date = f'"{date_column}"' if date_column and (' ' in date_column or '-' in date_column) else date_column
     quoted_value = f'"{value_column}"' if value_column and (' ' in value_column or '-' in value_column) else value_column
 
-    # Build filter clause from plan filters
-    filter_conditions = [f"{quoted_date} IS NOT NULL", f"{quoted_value} IS NOT NULL"]
-    for f in filters:
-        col = f.get("column", "")
-        op = f.get("operator", "=")
-        val = f.get("value")
-
-        # Quote column name if needed
-        quoted_col = f'"{col}"' if col and (' ' in col or '-' in col) else col
-
-        if val is not None:
-            if isinstance(val, str):
-                filter_conditions.append(f"{quoted_col} {op} '{val}'")
-            else:
-                filter_conditions.append(f"{quoted_col} {op} {val}")
+    # Check if date_column is a text-based quarter column (e.g., "Q3 2025")
+    is_quarter = _is_quarter_column(conn, table, date_column)
 
+    # Daily series can come from a pre-aggregated rollup (same column names)
+    rollup = None
+    if not is_quarter:
+        rollup = _trend_rollup(table, {date_column: USE_VALUE}, filters, aggregation, value_column)
+    value_expr = rollup.aggregate(aggregation, value_column) if rollup else f"{aggregation}({quoted_value})"
+    if rollup:
+        quoted_table = rollup.source
+
+    # Build filter clause from plan filters (values bound as parameters)
+    params: List[Any] = []
+    filter_conditions = [
+        f"{quoted_date} IS NOT NULL",
+        rollup.non_null(value_column) if rollup else f"{quoted_value} IS NOT NULL",
+    ]
+    filter_conditions.extend(_build_filter_list(filters, params))
     where_clause = " AND ".join(filter_conditions)
 
     if filters:
         print(f"  [FILTER] Applying {len(filters)} filter(s) to trend query")
 
-    # Check if date_column is a text-based quarter column (e.g., "Q3 2025")
-    is_quarter = _is_quarter_column(conn, table, date_column)
-
     if is_quarter:
         # Sort quarters chronologically: extract year and quarter number
         # "Q3 2025" -> year=2025, quarter=3
@@ -275,7 +304,7 @@ def execute_trend(
         print(f"  [DATE] Quarter column detected - using chronological sort")
     else:
         sql = f"""
-            SELECT {quoted_date} as date, {aggregation}({quoted_value}) as value
+            SELECT {quoted_date} as date, {value_expr} as value
             FROM {quoted_table}
             WHERE {where_clause}
             GROUP BY {quoted_date}
@@ -283,7 +312,7 @@ def execute_trend(
         """
 
     try:
-        result = conn.execute(sql).fetchall()
+        result = _fetch_rows(conn, sql, params)
         if not result:
             return {
                 "data": [],
@@ -383,6 +412,8 @@ def execute_trend(
             }
         }
 
+    except QueryTimeoutError:
+        raise
     except Exception as e:
         return {
             "data": [],
@@ -408,7 +439,7 @@ def _is_quarter_column(
         quoted_col = f'"{column}"' if ' ' in column or '-' in column else column
 
         sql = f"SELECT DISTINCT {quoted_col} FROM {quoted_table} WHERE {quoted_col} IS NOT NULL LIMIT 10"
-        result = conn.execute(sql).fetchall()
+        result = _fetch_rows(conn, sql)
 
         if not result:
             return False
@@ -423,30 +454,74 @@ def _is_quarter_column(
         # If most values match the pattern, it's a quarter column
         return matches >= len(result) * 0.8  # 80% threshold
 
+    except QueryTimeoutError:
+        raise
     except Exception as e:
         print(f"  [WARN] Error checking quarter column: {e}")
         return False
 
 
-def _get_aggregated_value(
-    conn: duckdb.DuckDBPyConnection,
-    table: str,
-    column: str,
-    filters: List[Dict],
-    aggregation: str = "SUM",
-    order_by: Optional[List] = None,
-    limit: Optional[int] = None
-) -> Optional[float]:
-    """Execute a simple aggregation query and return the value."""
-    if not table or not column:
+def _quote(identifier: str) -> str:
+    """Quote a table/column name containing spaces, dashes or a leading digit."""
+    if identifier and (' ' in identifier or '-' in identifier or identifier[0].isdigit()):
+        return f'"{identifier}"'
+    return identifier
+
+
+def _trend_rollup(table: str, columns: Dict[str, str], filters: List[Dict],
+                  aggregation: str, value_column: str):
+    """Rollup that holds a trend's series (filters must be on rollup columns), or None."""
+    columns = dict(columns)
+    for f in filters:
+        columns[f.get("column")] = USE_VALUE
+    try:
+        return get_rollup_manager().find(table, columns, [(aggregation, value_column)])
+    except Exception as e:
+        print(f"[AdvancedExecutor] Rollup lookup failed: {e}")
         return None
 
-    # Quote identifiers
-    quoted_table = f'"{table}"' if ' ' in table or '-' in table or (table and table[0].isdigit()) else table
-    quoted_column = f'"{column}"' if ' ' in column or '-' in column else column
 
-    # Build WHERE clause with proper AND/OR logic
-    # Group filters by column - same column filters use OR, different columns use AND
+def _fetch_rows(conn, sql: str, params: Optional[List[Any]] = None) -> List[tuple]:
+    """Result rows, through the result cache when conn is a pooled cursor."""
+    if hasattr(conn, "query_rows"):
+        return conn.query_rows(sql, params)[0]
+    return conn.execute(sql, params).fetchall() if params else conn.execute(sql).fetchall()
+
+
+def _param(params: List[Any], value: Any) -> str:
+    """Bind value as the next positional parameter and return its placeholder."""
+    params.append(value)
+    return f"${len(params)}"
+
+
+def _filter_sql(quoted_col: str, op: str, value: Any, params: List[Any]) -> str:
+    """One filter condition with its value bound as a parameter."""
+    if isinstance(value, (list, tuple)):
+        return f"{quoted_col} {op} ({', '.join(_param(params, v) for v in value)})"
+    return f"{quoted_col} {op} {_param(params, value)}"
+
+
+def _build_filter_list(filters: List[Dict], params: List[Any]) -> List[str]:
+    """AND-ed trend filter conditions (filters without a value are skipped)."""
+    conditions = []
+    for f in filters:
+        col = f.get("column", "")
+        val = f.get("value")
+        # Quote column name if needed
+        quoted_col = f'"{col}"' if col and (' ' in col or '-' in col) else col
+        if val is not None:
+            conditions.append(_filter_sql(quoted_col, f.get("operator", "="), val, params))
+    return conditions
+
+
+def _build_filter_condition(filters: List[Dict], params: List[Any]) -> str:
+    """
+    Boolean SQL condition for a filter list ("1=1" when empty).
+    Values are bound as parameters (appended to params).
+
+    Filters are grouped by column - same column filters use OR, different
+    columns use AND (range operators on one column use AND, for date ranges).
+    """
     filters_by_column = {}
     for f in filters:
         col = f.get("column", "")
@@ -458,40 +533,41 @@ def _get_aggregated_value(
     conditions = []
     for col, col_filters in filters_by_column.items():
         quoted_col = f'"{col}"' if ' ' in col or '-' in col else col
+        parts = [_filter_sql(quoted_col, f.get("operator", "="), f.get("value"), params) for f in col_filters]
 
-        if len(col_filters) > 1:
+        if len(parts) > 1:
             # Multiple filters for same column
             # Use AND for range operators (>=, <=, >, <) - needed for date ranges
             # Use OR for equality/LIKE operators - needed for "Category = A OR Category = B"
-            parts = []
-            operators = [f.get("operator", "=") for f in col_filters]
             range_operators = {'>=', '<=', '>', '<'}
-
-            for f in col_filters:
-                op = f.get("operator", "=")
-                val = f.get("value")
-                if isinstance(val, str):
-                    parts.append(f"{quoted_col} {op} '{val}'")
-                else:
-                    parts.append(f"{quoted_col} {op} {val}")
-
-            # If ALL operators are range operators, use AND (for date ranges like >= and <)
-            # Otherwise use OR (for value matching like Category = A OR Category = B)
-            if all(op in range_operators for op in operators):
+            if all(f.get("operator", "=") in range_operators for f in col_filters):
                 conditions.append(f"({' AND '.join(parts)})")
             else:
                 conditions.append(f"({' OR '.join(parts)})")
         else:
-            # Single filter for this column
-            f = col_filters[0]
-            op = f.get("operator", "=")
-            val = f.get("value")
-            if isinstance(val, str):
-                conditions.append(f"{quoted_col} {op} '{val}'")
-            else:
-                conditions.append(f"{quoted_col} {op} {val}")
+            conditions.append(parts[0])
+
+    return " AND ".join(conditions) if conditions else "1=1"
 
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+def _get_aggregated_value(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    column: str,
+    filters: List[Dict],
+    aggregation: str = "SUM",
+    order_by: Optional[List] = None,
+    limit: Optional[int] = None
+) -> Optional[float]:
+    """Execute a simple aggregation query and return the value."""
+    if not table or not column:
+        return None
+
+    # Quote identifiers
+    quoted_table = _quote(table)
+    quoted_column = f'"{column}"' if ' ' in column or '-' in column else column
+    params: List[Any] = []
+    where_clause = _build_filter_condition(filters, params)
 
     # Build query
     if limit and order_by:
@@ -518,8 +594,10 @@ def _get_aggregated_value(
         """
 
     try:
-        result = conn.execute(sql).fetchone()
-        return result[0] if result else None
+        result = _fetch_rows(conn, sql, params)
+        return result[0][0] if result else None
+    except QueryTimeoutError:
+        raise
     except Exception as e:
         # Log detailed error for debugging - likely column doesn't exist
         print(f"[AdvancedExecutor] Error in aggregation for column '{column}' in table '{table}': {e}")
@@ -527,6 +605,97 @@ def _get_aggregated_value(
         return None
 
 
+def _get_aggregated_values(
+    conn: duckdb.DuckDBPyConnection,
+    measures: List[Dict[str, Any]]
+) -> List[Optional[float]]:
+    """
+    Evaluate several aggregations with one scan per table.
+
+    Each measure is {table, column, filters, aggregation, order_by?, limit?}.
+    Measures on the same table become one query:
+
+        SELECT SUM(col) FILTER (WHERE <a>), SUM(col) FILTER (WHERE <b>), ...
+        FROM table WHERE (<a>) OR (<b>) ...
+
+    A top-N measure (order_by + limit) ranks its matching rows with
+    ROW_NUMBER() in the same scan. If the combined query fails (e.g. one
+    measure names a missing column) each measure is retried on its own so
+    the caller still learns which one is missing.
+
+    Returns:
+        Values in measure order (None where a measure could not be computed)
+    """
+    values: List[Optional[float]] = [None] * len(measures)
+    by_table: Dict[str, List[int]] = {}
+    for i, measure in enumerate(measures):
+        if measure.get("table") and measure.get("column"):
+            by_table.setdefault(measure["table"], []).append(i)
+
+    for table, indexes in by_table.items():
+        if len(indexes) == 1:
+            m = measures[indexes[0]]
+            values[indexes[0]] = _get_aggregated_value(
+                conn, table, m["column"], m.get("filters") or [], m.get("aggregation", "SUM"),
+                order_by=m.get("order_by"), limit=m.get("limit")
+            )
+            continue
+
+        selects = []
+        conditions = []
+        windows = []
+        params: List[Any] = []
+        for n, i in enumerate(indexes):
+            m = measures[i]
+            column = m["column"]
+            quoted_column = f'"{column}"' if ' ' in column or '-' in column else column
+            condition = _build_filter_condition(m.get("filters") or [], params)
+            order_by, limit = m.get("order_by"), m.get("limit")
+
+            if limit and order_by:
+                # Rank rows matching this measure's filters; keep the top N
+                order_col = order_by[0][0]
+                order_dir = order_by[0][1] if len(order_by[0]) > 1 else "DESC"
+                quoted_order = f'"{order_col}"' if ' ' in order_col or '-' in order_col else order_col
+                windows.append(
+                    f"ROW_NUMBER() OVER (PARTITION BY COALESCE({condition}, FALSE) "
+                    f"ORDER BY {quoted_order} {order_dir}) AS _rn{n}"
+                )
+                condition = f"({condition}) AND _rn{n} <= {int(limit)}"
+
+            selects.append(f"{m.get('aggregation', 'SUM')}({quoted_column}) FILTER (WHERE {condition}) AS v{n}")
+            conditions.append(f"({condition})")
+
+        source = _quote(table)
+        if windows:
+            source = f"(SELECT *, {', '.join(windows)} FROM {source}) ranked"
+        where_clause = "" if "(1=1)" in conditions else f"WHERE {' OR '.join(conditions)}"
+        sql = f"""
+            SELECT {', '.join(selects)}
+            FROM {source}
+            {where_clause}
+        """
+
+        try:
+            rows = _fetch_rows(conn, sql, params)
+            row = rows[0] if rows else None
+            for n, i in enumerate(indexes):
+                values[i] = row[n] if row else None
+            print(f"  [DATA] {len(indexes)} aggregates on {table} in one scan")
+        except QueryTimeoutError:
+            raise  # separate scans would each get a fresh budget and time out too
+        except Exception as e:
+            print(f"[AdvancedExecutor] Combined aggregation on '{table}' failed ({e}) - evaluating separately")
+            for i in indexes:
+                m = measures[i]
+                values[i] = _get_aggregated_value(
+                    conn, table, m["column"], m.get("filters") or [], m.get("aggregation", "SUM"),
+                    order_by=m.get("order_by"), limit=m.get("limit")
+                )
+
+    return values
+
+
 def _calculate_comparison(value_a: float, value_b: float, compare_type: str) -> float:
     """Calculate comparison result based on type."""
     if compare_type == "difference":
@@ -595,22 +764,19 @@ def _analyze_trend(values: List[float]) -> Dict[str, Any]:
     normalized_slope = (slope / y_mean * 100) if y_mean != 0 else 0
 
     # Determine direction and confidence
-    if abs(normalized_slope) < 1:  # Less than 1% change per period
+    if abs(normalized_slope) < TREND_STABLE_PCT:  # Less than 1% change per period
         direction = "stable"
-        emoji = "STABLE"
-        confidence = "high" if abs(normalized_slope) < 0.5 else "medium"
+        confidence = "high" if abs(normalized_slope) < TREND_STABLE_HIGH_PCT else "medium"
     elif normalized_slope > 0:
         direction = "increasing"
-        emoji = "UP"
-        confidence = "high" if normalized_slope > 5 else "medium" if normalized_slope > 2 else "low"
+        confidence = "high" if normalized_slope > TREND_HIGH_PCT else "medium" if normalized_slope > TREND_MEDIUM_PCT else "low"
     else:
         direction = "decreasing"
-        emoji = "DOWN"
-        confidence = "high" if normalized_slope < -5 else "medium" if normalized_slope < -2 else "low"
+        confidence = "high" if normalized_slope < -TREND_HIGH_PCT else "medium" if normalized_slope < -TREND_MEDIUM_PCT else "low"
 
     return {
         "direction": direction,
-        "emoji": emoji,
+        "emoji": _TREND_EMOJI[direction],
         "slope": round(slope, 2),
         "normalized_slope": round(normalized_slope, 2),
         "confidence": confidence
@@ -659,92 +825,120 @@ def execute_grouped_trend(
     quoted_value = f'"{value_column}"' if value_column and (' ' in value_column or '-' in value_column) else value_column
     quoted_group = f'"{group_by}"' if group_by and (' ' in group_by or '-' in group_by) else group_by
 
-    # Build filter clause
-    filter_conditions = [f"{quoted_date} IS NOT NULL", f"{quoted_value} IS NOT NULL", f"{quoted_group} IS NOT NULL"]
-    for f in filters:
-        col = f.get("column", "")
-        op = f.get("operator", "=")
-        val = f.get("value")
-        quoted_col = f'"{col}"' if col and (' ' in col or '-' in col) else col
-        if val is not None:
-            if isinstance(val, str):
-                filter_conditions.append(f"{quoted_col} {op} '{val}'")
-            else:
-                filter_conditions.append(f"{quoted_col} {op} {val}")
-
+    # Per-group daily series can come from a pre-aggregated rollup (same column names)
+    rollup = _trend_rollup(table, {date_column: USE_DAY, group_by: USE_VALUE}, filters, aggregation, value_column)
+    value_expr = rollup.aggregate(aggregation, value_column) if rollup else f"{aggregation}({quoted_value})"
+    if rollup:
+        quoted_table = rollup.source
+
+    # Build filter clause (values bound as parameters)
+    params: List[Any] = []
+    filter_conditions = [
+        f"{quoted_date} IS NOT NULL",
+        rollup.non_null(value_column) if rollup else f"{quoted_value} IS NOT NULL",
+        f"{quoted_group} IS NOT NULL",
+    ]
+    filter_conditions.extend(_build_filter_list(filters, params))
     where_clause = " AND ".join(filter_conditions)
 
-    # First, get all distinct groups
-    groups_sql = f"""
-        SELECT DISTINCT {quoted_group} as group_name
-        FROM {quoted_table}
-        WHERE {quoted_group} IS NOT NULL
-        ORDER BY {quoted_group}
+    # One statement for all groups: aggregate per (group, date), number each
+    # group's periods 0..n-1 and fit the same least-squares slope as
+    # _analyze_trend with regr_slope. Group count no longer affects query count.
+    # Use TRY_CAST to handle VARCHAR date columns
+    sql = f"""
+        WITH series AS (
+            SELECT {quoted_group} AS group_name,
+                   TRY_CAST({quoted_date} AS DATE) AS period,
+                   {value_expr} AS value
+            FROM {quoted_table}
+            WHERE {where_clause}
+            GROUP BY 1, 2
+        ),
+        indexed AS (
+            SELECT group_name, period, CAST(value AS DOUBLE) AS value,
+                   ROW_NUMBER() OVER (PARTITION BY group_name ORDER BY period) - 1 AS idx
+            FROM series
+            WHERE period IS NOT NULL AND value IS NOT NULL
+        ),
+        fitted AS (
+            SELECT group_name,
+                   COALESCE(regr_slope(value, idx), 0) AS slope,
+                   regr_count(value, idx) AS data_points,
+                   avg(value) AS mean_value,
+                   arg_min(value, idx) AS start_value,
+                   arg_max(value, idx) AS end_value
+            FROM indexed
+            GROUP BY group_name
+            HAVING count(*) >= 2
+        ),
+        totals AS (
+            SELECT count(DISTINCT {quoted_group}) AS total_groups
+            FROM {quoted_table}
+            WHERE {quoted_group} IS NOT NULL AND CAST({quoted_group} AS VARCHAR) != ''
+        ),
+        classified AS (
+            SELECT *,
+                   CASE WHEN mean_value != 0 THEN slope / mean_value * 100 ELSE 0 END AS normalized_slope
+            FROM fitted
+        )
+        SELECT group_name, slope, normalized_slope, data_points, start_value, end_value,
+               CASE
+                   WHEN abs(normalized_slope) < {TREND_STABLE_PCT} THEN 'stable'
+                   WHEN normalized_slope > 0 THEN 'increasing'
+                   ELSE 'decreasing'
+               END AS direction,
+               CASE
+                   WHEN abs(normalized_slope) < {TREND_STABLE_PCT} THEN
+                       CASE WHEN abs(normalized_slope) < {TREND_STABLE_HIGH_PCT} THEN 'high' ELSE 'medium' END
+                   WHEN abs(normalized_slope) > {TREND_HIGH_PCT} THEN 'high'
+                   WHEN abs(normalized_slope) > {TREND_MEDIUM_PCT} THEN 'medium'
+                   ELSE 'low'
+               END AS confidence,
+               total_groups
+        FROM totals LEFT JOIN classified ON TRUE
+        ORDER BY group_name
     """
 
     try:
-        groups_result = conn.execute(groups_sql).fetchall()
-        if not groups_result:
-            return {"data": [], "analysis": {"error": f"No groups found for {group_by}"}}
+        # Always one row per analyzed group, or a single NULL-group row carrying total_groups
+        result = _fetch_rows(conn, sql, params)
+        total_groups = result[0][8]
+        print(f"  [DATA] Analyzed trend for {total_groups} {group_by} groups in one query")
 
-        groups = [row[0] for row in groups_result if row[0]]
-        print(f"  [DATA] Analyzing trend for {len(groups)} {group_by} groups")
-
-        # Analyze trend for each group
         group_trends = []
         increasing_groups = []
         decreasing_groups = []
         stable_groups = []
 
-        for group_name in groups:
-            # Get time series data for this group
-            # Use TRY_CAST to handle VARCHAR date columns
-            sql = f"""
-                SELECT TRY_CAST({quoted_date} AS DATE) as date, {aggregation}({quoted_value}) as value
-                FROM {quoted_table}
-                WHERE {where_clause} AND {quoted_group} = '{_sanitize_string_value(group_name)}'
-                GROUP BY TRY_CAST({quoted_date} AS DATE)
-                ORDER BY TRY_CAST({quoted_date} AS DATE)
-            """
-
-            result = conn.execute(sql).fetchall()
-            if not result or len(result) < 2:
-                # Not enough data points for this group
+        for group_name, slope, normalized_slope, data_points, start_value, end_value, direction, confidence, _ in result:
+            if not group_name:
                 continue
 
-            # Filter out None values
-            filtered_data = [(row[0], row[1]) for row in result if row[0] is not None and row[1] is not None]
-            if len(filtered_data) < 2:
-                continue
-
-            values = [r[1] for r in filtered_data]
-
-            # Analyze trend for this group
-            trend_analysis = _analyze_trend(values)
-
             group_info = {
                 "group": group_name,
-                "direction": trend_analysis["direction"],
-                "direction_emoji": trend_analysis["emoji"],
-                "slope": trend_analysis["slope"],
-                "normalized_slope": trend_analysis["normalized_slope"],
-                "confidence": trend_analysis["confidence"],
-                "start_value": values[0],
-                "end_value": values[-1],
-                "data_points": len(values),
-                "percentage_change": ((values[-1] - values[0]) / values[0] * 100) if values[0] != 0 else 0
+                "direction": direction,
+                "direction_emoji": _TREND_EMOJI[direction],
+                "slope": round(slope, 2),
+                "normalized_slope": round(normalized_slope, 2),
+                "confidence": confidence,
+                "start_value": start_value,
+                "end_value": end_value,
+                "data_points": data_points,
+                "percentage_change": ((end_value - start_value) / start_value * 100) if start_value != 0 else 0
             }
             group_trends.append(group_info)
 
             # Categorize by direction
-            if trend_analysis["direction"] == "increasing":
+            if direction == "increasing":
                 increasing_groups.append(group_name)
-            elif trend_analysis["direction"] == "decreasing":
+            elif direction == "decreasing":
                 decreasing_groups.append(group_name)
             else:
                 stable_groups.append(group_name)
 
         if not group_trends:
+            if not total_groups:
+                return {"data": [], "analysis": {"error": f"No groups found for {group_by}"}}
             return {"data": [], "analysis": {"error": f"Not enough data to analyze trends by {group_by}"}}
 
         # Sort groups by slope (most declining first for "which is declining" questions)
@@ -755,7 +949,7 @@ def execute_grouped_trend(
             "calculation_result": len(decreasing_groups),
             "analysis": {
                 "group_by": group_by,
-                "total_groups": len(groups),
+                "total_groups": total_groups,
                 "analyzed_groups": len(group_trends),
                 "increasing_groups": increasing_groups,
                 "decreasing_groups": decreasing_groups,
@@ -768,15 +962,8 @@ def execute_grouped_trend(
             }
         }
 
+    except QueryTimeoutError:
+        raise
     except Exception as e:
         print(f"[GroupedTrend] Error: {e}")
         return {"data": [], "analysis": {"error": f"Error analyzing grouped trend: {str(e)}"}}
-
-
-def _sanitize_string_value(value: str) -> str:
-    """Sanitize a string value for SQL by escaping single quotes."""
-    if not isinstance(value, str):
-        return str(value)
-    return value.replace("'", "''")
-
-
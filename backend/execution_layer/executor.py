@@ -1,5 +1,5 @@
-from analytics_engine.duckdb_manager import DuckDBManager
-from execution_layer.sql_compiler import compile_sql
+from analytics_engine.duckdb_manager import QueryTimeoutError, get_cursor_pool
+from execution_layer.sql_compiler import compile_sql_params
 from analytics_engine.sanity_checks import run_sanity_checks
 import pandas as pd
 
@@ -30,9 +30,8 @@ def execute_plan(plan: dict):
         return execute_advanced_plan(plan)
 
     # Standard query execution
-    sql = compile_sql(plan)
-    db = DuckDBManager()
-    result_df = db.query(sql)
+    sql, params = compile_sql_params(plan)
+    result_df = get_cursor_pool().execute(sql, params)
 
     # Pass query_type to sanity checks to allow empty results for filter/lookup queries
     run_sanity_checks(result_df, query_type=query_type)
@@ -60,11 +59,9 @@ def execute_advanced_plan(plan: dict):
     """
     from execution_layer.advanced_executor import execute_advanced_query
 
-    db = DuckDBManager()
-    conn = db.get_connection()
-
     try:
-        result = execute_advanced_query(plan, conn)
+        with get_cursor_pool().cursor() as conn:
+            result = execute_advanced_query(plan, conn)
 
         # Convert to DataFrame with analysis metadata
         data = result.get("data", [])
@@ -78,6 +75,8 @@ def execute_advanced_plan(plan: dict):
 
         return df
 
+    except QueryTimeoutError:
+        raise  # reported as a timeout by the caller
     except Exception as e:
         print(f"[Executor] Advanced query failed: {e}")
         # Return empty DataFrame with error info
@@ -92,8 +91,8 @@ def execute_multi_step_plan(plan: dict):
     """
     Execute multi-step query plans (cross-table queries).
 
-    These queries require sequential execution of multiple steps,
-    with intermediate results passed between steps.
+    These queries run multiple steps, with intermediate results passed
+    between steps (independent steps run in parallel).
     
     Example: "Who worked on peak sales dates in Chennai?"
     - Step 1: Find peak sales date from Sales table
@@ -5,22 +5,35 @@ This module enables cross-table queries like:
 - "Who worked on peak sales dates in Chennai?"
 - "What products were sold on days with best attendance?"
 
-It breaks complex queries into sequential steps, executes each step,
-and passes results between steps using variable substitution.
+It breaks complex queries into steps, executes each step, and passes
+results between steps using variable substitution. Steps form a dependency
+graph (a step depends on the steps whose output_variable it references):
+independent steps run concurrently on pooled cursors and dependents start
+as soon as their variables resolve.
+
+Plans whose steps only pass single-row scalars into comparison filters are
+fused into one statement (a CTE per step, variables compared exactly as
+the substituted text would be) so DuckDB optimizes the whole chain in one
+round trip; other plans, or a fused statement that fails, run step by step.
 
 ARCHITECTURE NOTES:
 - Follows existing pattern: module-level functions (not classes)
-- Uses DuckDBManager for database connections
+- Uses pooled cursors (get_cursor_pool) with the shared result cache
 - Returns dict with 'data', 'analysis' keys like advanced_executor
 - Integrates with execute_plan() in executor.py
 """
 
 import json
-from typing import Dict, List, Any, Optional
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 
-from analytics_engine.duckdb_manager import DuckDBManager
-from execution_layer.sql_compiler import compile_sql
+from analytics_engine.duckdb_manager import QueryTimeoutError, get_cursor_pool
+from analytics_engine.schema_catalog import get_schema_catalog
+from execution_layer.sql_compiler import compile_sql_params
+from utils.sql_utils import compact_params, quote_identifier, shift_params, sql_literal
 
 
 # ============================================
@@ -28,6 +41,8 @@ from execution_layer.sql_compiler import compile_sql
 # ============================================
 MULTI_STEP_QUERY_TYPES = ['multi_step', 'cross_table']
 
+_VARIABLE_RE = re.compile(r"\$\{([^}]+)\}")
+
 
 def is_multi_step_query(plan: dict) -> bool:
     """Check if this plan requires multi-step execution."""
@@ -43,7 +58,8 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
     
     The plan should contain a 'steps' array, where each step is a sub-plan
     that follows the standard plan schema. Results from earlier steps
-    can be referenced in later steps using ${variable_name} syntax.
+    can be referenced in later steps using ${variable_name} syntax; steps
+    that reference no earlier output run in parallel.
     
     Args:
         plan: Multi-step query plan with 'steps' array
@@ -51,7 +67,9 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
     Returns:
         Dict with:
         - data: Final result data (list of dicts)
-        - analysis: Metadata about execution
+        - analysis: Metadata about execution (total_elapsed_ms is wall time,
+          critical_path_ms the slowest dependency chain, total_step_ms the
+          sum of all step times)
         - steps_executed: Details of each step
         - variables: All extracted intermediate values
     
@@ -84,7 +102,6 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
         ]
     }
     """
-    import time
     start_time = time.time()
     
     steps = plan.get("steps", [])
@@ -99,69 +116,126 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
     print(f"[MULTI-STEP] Starting execution of {len(steps)} steps")
     print(f"{'='*60}\n")
     
-    # Get DuckDB connection
-    db = DuckDBManager()
-    conn = db.get_connection()
+    producers = _variable_producers(steps)
+    dependencies = [set(refs.values()) for refs in producers]
+    
+    # Chains that only pass scalars into filters run as one statement
+    from utils.config_loader import get_config
+    if get_config().query.multi_step_fusion_enabled:
+        fused = _fuse_steps(steps, producers)
+        if fused is not None:
+            result = _execute_fused(steps, dependencies, fused, start_time)
+            if result is not None:
+                return result
+    
+    max_parallel = max(1, min(len(steps), get_cursor_pool().max_cursors))
     
     # Track variables and executed steps
-    variables = {}
-    executed_steps = []
+    values: Dict[int, Dict[str, Any]] = {}   # step index -> {output_variable: value}
+    finished: Dict[int, Dict[str, Any]] = {}  # step index -> executed step record
+    path_ms: Dict[int, float] = {}            # step index -> longest dependency chain ending here
+    failure = None
+    
+    def run_step(index: int) -> Tuple[Dict[str, Any], float]:
+        step_start = time.time()
+        step = steps[index]
+        step_id = step.get('step_id', index + 1)
+        print(f"\n[STEP {index + 1}/{len(steps)}] {step.get('description', f'Step {step_id}')}")
+        print(f"  Table: {step.get('table', 'N/A')}")
+        print(f"  Type: {step.get('query_type', 'N/A')}")
+        
+        # Substitute variables resolved by the steps this one depends on
+        step_variables = {}
+        for dep in sorted(dependencies[index]):
+            step_variables.update(values.get(dep, {}))
+        substituted_step = _substitute_variables(step, step_variables)
+        
+        # Execute the step
+        return _execute_single_step(substituted_step), (time.time() - step_start) * 1000
     
     try:
-        for i, step in enumerate(steps, 1):
-            step_start = time.time()
-            step_id = step.get('step_id', i)
-            description = step.get('description', f'Step {step_id}')
-            
-            print(f"\n[STEP {i}/{len(steps)}] {description}")
-            print(f"  Table: {step.get('table', 'N/A')}")
-            print(f"  Type: {step.get('query_type', 'N/A')}")
-            
-            # Substitute variables in this step
-            substituted_step = _substitute_variables(step, variables)
-            
-            # Execute the step
-            step_result = _execute_single_step(substituted_step, conn)
-            
-            if step_result.get('error'):
-                error_msg = step_result.get('error')
-                print(f"  [FAIL] Step {step_id} failed: {error_msg}")
-                return {
-                    "data": [],
-                    "analysis": {
-                        "error": f"Step {step_id} failed: {error_msg}",
-                        "failed_step": step_id
-                    },
-                    "success": False,
-                    "steps_executed": executed_steps
-                }
-            
-            # Extract output variable if specified
-            output_var = step.get('output_variable')
-            if output_var:
-                extract_col = step.get('extract_column')
-                extracted_value = _extract_variable(step_result, extract_col)
-                if extracted_value is not None:
-                    variables[output_var] = extracted_value
-                    print(f"  [OK] Extracted ${{{output_var}}} = {extracted_value}")
-                else:
-                    print(f"  [WARN] Could not extract ${{{output_var}}}")
-            
-            step_elapsed = (time.time() - step_start) * 1000
-            print(f"  [TIME] Step completed in {step_elapsed:.0f}ms")
-            print(f"  [DATA] Rows returned: {len(step_result.get('data', []))}")
-            
-            # Store step result
-            executed_steps.append({
-                'step_id': step_id,
-                'description': description,
-                'data': step_result.get('data', []),
-                'elapsed_ms': step_elapsed
-            })
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="multi-step") as pool:
+            running = {}
+            pending = set(range(len(steps)))
+            while pending or running:
+                # Start every step whose dependencies have all resolved
+                if failure is None:
+                    for index in sorted(pending):
+                        if dependencies[index] <= finished.keys():
+                            pending.discard(index)
+                            running[pool.submit(run_step, index)] = index
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    step = steps[index]
+                    step_id = step.get('step_id', index + 1)
+                    step_result, step_elapsed = future.result()
+                    
+                    if step_result.get('error'):
+                        error_msg = step_result.get('error')
+                        print(f"  [FAIL] Step {step_id} failed: {error_msg}")
+                        if failure is None:
+                            failure = (step_id, error_msg)
+                        continue
+                    
+                    # Extract output variable if specified
+                    output_var = step.get('output_variable')
+                    if output_var:
+                        extract_col = step.get('extract_column')
+                        extracted_value = _extract_variable(step_result, extract_col)
+                        if extracted_value is not None:
+                            values[index] = {output_var: extracted_value}
+                            print(f"  [OK] Extracted ${{{output_var}}} = {extracted_value}")
+                        else:
+                            print(f"  [WARN] Could not extract ${{{output_var}}}")
+                    
+                    path_ms[index] = step_elapsed + max((path_ms[d] for d in dependencies[index]), default=0.0)
+                    print(f"  [TIME] Step {step_id} completed in {step_elapsed:.0f}ms")
+                    print(f"  [DATA] Rows returned: {len(step_result.get('data', []))}")
+                    
+                    # Store step result
+                    finished[index] = {
+                        'step_id': step_id,
+                        'description': step.get('description', f'Step {step_id}'),
+                        'data': step_result.get('data', []),
+                        'elapsed_ms': step_elapsed,
+                        'depends_on': [steps[d].get('step_id', d + 1) for d in sorted(dependencies[index])],
+                    }
+        
+        executed_steps = [finished[i] for i in sorted(finished)]
+        if failure is not None:
+            step_id, error_msg = failure
+            return {
+                "data": [],
+                "analysis": {
+                    "error": f"Step {step_id} failed: {error_msg}",
+                    "failed_step": step_id
+                },
+                "success": False,
+                "steps_executed": executed_steps
+            }
+        
+        # Variables in plan order (a later step's output wins, as when run sequentially)
+        variables = {}
+        for index in sorted(values):
+            variables.update(values[index])
+        
+        # Critical path: the dependency chain with the largest summed step time
+        critical_path = []
+        index = max(path_ms, key=path_ms.get) if path_ms else None
+        while index is not None:
+            critical_path.insert(0, steps[index].get('step_id', index + 1))
+            index = max(dependencies[index], key=path_ms.get, default=None)
+        critical_path_ms = max(path_ms.values(), default=0.0)
+        total_step_ms = sum(record['elapsed_ms'] for record in executed_steps)
         
         total_elapsed = (time.time() - start_time) * 1000
         print(f"\n{'='*60}")
-        print(f"[MULTI-STEP] All steps completed in {total_elapsed:.0f}ms")
+        print(f"[MULTI-STEP] All steps completed in {total_elapsed:.0f}ms "
+              f"(critical path {critical_path_ms:.0f}ms, step time {total_step_ms:.0f}ms)")
         print(f"{'='*60}\n")
         
         # Return final step's data as main result
@@ -174,7 +248,10 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
                 "total_steps": len(steps),
                 "steps_executed": len(executed_steps),
                 "variables": variables,
-                "total_elapsed_ms": total_elapsed
+                "total_elapsed_ms": total_elapsed,
+                "critical_path_ms": critical_path_ms,
+                "critical_path": critical_path,
+                "total_step_ms": total_step_ms
             },
             "success": True,
             "steps_executed": executed_steps,
@@ -192,10 +269,285 @@ def execute_multi_step_query(plan: dict) -> Dict[str, Any]:
                 "multi_step": True
             },
             "success": False,
-            "steps_executed": executed_steps
+            "steps_executed": [finished[i] for i in sorted(finished)]
         }
 
 
+def _variable_producers(steps: List[Dict[str, Any]]) -> List[Dict[str, int]]:
+    """
+    For each step, the ${variables} it references mapped to the index of the
+    step producing them (the closest earlier step with that output_variable).
+    """
+    producers = []
+    latest: Dict[str, int] = {}
+    for index, step in enumerate(steps):
+        referenced = set(_VARIABLE_RE.findall(json.dumps(step)))
+        producers.append({name: latest[name] for name in referenced if name in latest})
+        if step.get('output_variable'):
+            latest[step['output_variable']] = index
+    return producers
+
+
+# ============================================
+# STEP FUSION
+# ============================================
+# Steps compiled by compile_sql_params (advanced types run in Python)
+_COMPILED_QUERY_TYPES = ('lookup', 'filter', 'metric', 'extrema_lookup', 'rank', 'list', 'aggregation_on_subset')
+_FUSABLE_OPERATORS = ('=', '!=', '<', '>', '<=', '>=')
+# Producer types whose CAST(... AS VARCHAR) is the text _substitute_variables
+# writes (dates and timestamps keep their first 10 characters)
+_FUSABLE_DATE_TYPES = ('DATE', 'TIMESTAMP')
+_FUSABLE_TEXT_TYPES = (
+    'VARCHAR', 'DOUBLE', 'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+    'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT',
+)
+
+
+def _is_single_row(step: Dict[str, Any]) -> bool:
+    """True if the step's SQL yields at most one row (so its scalar is well defined)."""
+    query_type = step.get('query_type', 'metric')
+    if query_type == 'aggregation_on_subset':
+        return True
+    if query_type == 'metric':
+        return not step.get('group_by')
+    if query_type in ('lookup', 'extrema_lookup'):
+        return str(step.get('limit', 1)) == '1'
+    return False
+
+
+def _scalar_sql(step: Dict[str, Any], index: int) -> str:
+    """Scalar subquery reading a fused step's output variable from its CTE."""
+    column = step.get('extract_column')
+    expression = '"' + column.replace('"', '""') + '"' if column else "#1"
+    return f"(SELECT {expression} FROM __step_{index} LIMIT 1)"
+
+
+def _variable_text_sql(step: Dict[str, Any], index: int) -> str:
+    """
+    Query for the text that _substitute_variables writes in place of the
+    step's ${output_variable}: the placeholder itself when the step found
+    no value, the date part of dates/timestamps, str() of numbers and strings.
+    Other producer types, and text the JSON substitution would mangle,
+    raise, so the fused statement fails and the steps run one by one.
+    """
+    placeholder = sql_literal(f"${{{step['output_variable']}}}")
+    date_types = ", ".join(sql_literal(t) for t in _FUSABLE_DATE_TYPES)
+    text_types = ", ".join(sql_literal(t) for t in _FUSABLE_TEXT_TYPES)
+    text = (
+        f"CASE WHEN x IS NULL THEN {placeholder} "
+        f"WHEN typeof(x) IN ({date_types}) THEN left(CAST(x AS VARCHAR), 10) "
+        f"WHEN typeof(x) IN ({text_types}) THEN CAST(x AS VARCHAR) "
+        f"ELSE error('fused variable has type ' || typeof(x)) END"
+    )
+    return (
+        f"SELECT CASE WHEN regexp_matches(text, '[\"\\\\[:cntrl:]]') "
+        f"THEN error('fused variable is not JSON-safe') ELSE text END AS text "
+        f"FROM (SELECT {text} AS text FROM (SELECT {_scalar_sql(step, index)} AS x))"
+    )
+
+
+def _fused_condition(column: str, column_type: str, operator: str, text: str) -> str:
+    """
+    The filter compile_sql_params builds for "column <op> <substituted text>":
+    ISO dates compare against the column's own type (except !=), anything
+    else compares as VARCHAR.
+    """
+    as_text = f"CAST({column} AS VARCHAR) {operator} {text}"
+    if operator == '!=':
+        return as_text
+    return (
+        f"(CASE WHEN regexp_full_match({text}, '\\d{{4}}-\\d{{2}}-\\d{{2}}') "
+        f"THEN {column} {operator} CAST({text} AS {column_type}) ELSE {as_text} END)"
+    )
+
+
+def _fuse_steps(
+    steps: List[Dict[str, Any]],
+    producers: List[Dict[str, int]]
+) -> Optional[Tuple[str, List[Any], Dict[int, str]]]:
+    """
+    Compile a plan whose steps only pass scalars into filters as one statement.
+    
+    Each step before the last becomes a CTE (__step_<index>) and each
+    variable a CTE (__var_<index>) holding the text the step-by-step path
+    would substitute; a filter "column <op> ${var}" compares the column with
+    that text the way compile_sql_params would, so both paths return the
+    same rows while DuckDB plans the whole chain at once. The output
+    variables are returned next to the final rows (POSITIONAL JOIN keeps
+    the final step's row order).
+    
+    Returns:
+        (sql, params, {step index: output_variable}) or None when the plan has
+        steps that don't feed the final step, multi-row or non-SQL steps,
+        variables used anywhere but as a whole comparison value, or compared
+        with a column of unknown type
+    """
+    last = len(steps) - 1
+    if last < 1:
+        return None
+    
+    # Every earlier step must feed the final step (directly or via other steps)
+    needed = {last}
+    for index in range(last, -1, -1):
+        if index in needed:
+            needed.update(producers[index].values())
+    if len(needed) != len(steps):
+        return None
+    
+    catalog = get_schema_catalog()
+    ctes: List[str] = []
+    variable_ctes: Dict[int, str] = {}
+    params: List[Any] = []
+    body = ""
+    try:
+        for index, step in enumerate(steps):
+            if step.get('query_type', 'metric') not in _COMPILED_QUERY_TYPES:
+                return None
+            if index < last and not _is_single_row(step):
+                return None
+            
+            # Mark each variable with a sentinel value, compile, then swap the
+            # sentinel's comparison for the producer's scalar subquery
+            sentinels = {}
+            step_json = json.dumps(step)
+            for name, producer in producers[index].items():
+                sentinel = f"__fused_{producer}__"
+                sentinels[sentinel] = producer
+                step_json = step_json.replace(f"${{{name}}}", sentinel)
+            marked_step = json.loads(step_json)
+            sql, step_params = compile_sql_params(marked_step)
+            
+            for f in (marked_step.get('filters') or []) + (marked_step.get('subset_filters') or []):
+                value = f.get('value') if isinstance(f, dict) else None
+                if not isinstance(value, str) or value not in sentinels:
+                    continue
+                if f['operator'] not in _FUSABLE_OPERATORS:
+                    return None
+                column_type = catalog.column_type(marked_step.get('table', ''), f['column'])
+                if column_type is None:
+                    return None
+                producer = sentinels[value]
+                if producer not in variable_ctes:
+                    variable_ctes[producer] = f"__var_{producer} AS MATERIALIZED ({_variable_text_sql(steps[producer], producer)})"
+                column = quote_identifier(f['column'])
+                condition = _fused_condition(column, column_type, f['operator'], f"(SELECT text FROM __var_{producer})")
+                
+                def to_condition(match, value=value, condition=condition):
+                    if step_params[int(match.group(1)) - 1] != value:
+                        return match.group(0)
+                    return condition
+                
+                pattern = re.escape(f"CAST({column} AS VARCHAR) {f['operator']} ") + r"\$(\d+)\b"
+                sql = re.sub(pattern, to_condition, sql)
+            
+            sql, step_params = compact_params(sql, step_params)
+            if "__fused_" in sql or any(isinstance(v, str) and "__fused_" in v for v in step_params):
+                return None  # a variable is used some other way (LIKE pattern, list, column name)
+            
+            sql = shift_params(sql, len(params))
+            params.extend(step_params)
+            ctes.extend(variable_ctes.pop(producer) for producer in sorted(variable_ctes))
+            if index < last:
+                ctes.append(f"__step_{index} AS MATERIALIZED ({sql})")
+            else:
+                body = sql
+    except Exception:
+        return None  # invalid step - the step-by-step path reports it
+    
+    outputs = {index: steps[index]['output_variable'] for index in range(last) if steps[index].get('output_variable')}
+    scalars = ", ".join(f"{_scalar_sql(steps[i], i)} AS __fused_var_{i}" for i in outputs)
+    sql = (
+        f"WITH {', '.join(ctes)} "
+        f"SELECT * FROM (SELECT *, TRUE AS __fused_row FROM ({body})) "
+        f"POSITIONAL JOIN (SELECT {scalars or 'NULL AS __fused_none'})"
+    )
+    return sql, params, outputs
+
+
+def _execute_fused(
+    steps: List[Dict[str, Any]],
+    dependencies: List[Set[int]],
+    fused: Tuple[str, List[Any], Dict[int, str]],
+    start_time: float
+) -> Optional[Dict[str, Any]]:
+    """Run a fused plan; None if the statement fails (caller runs the steps instead) other than by timing out."""
+    sql, params, outputs = fused
+    print(f"[MULTI-STEP] Fused {len(steps)} steps into one statement")
+    print(f"  [SQL] {sql[:100]}..." if len(sql) > 100 else f"  [SQL] {sql}")
+    
+    fused_start = time.time()
+    try:
+        with get_cursor_pool().cursor() as conn:
+            rows, columns = conn.query_rows(sql, params)
+    except QueryTimeoutError as e:
+        # Running the steps separately would scan the same data again
+        print(f"  [FAIL] Fused statement timed out: {e}")
+        return {
+            "data": [],
+            "analysis": {"error": str(e), "timeout": True, "multi_step": True},
+            "success": False,
+            "steps_executed": []
+        }
+    except Exception as e:
+        print(f"  [WARN] Fused statement failed ({e}) - running steps separately")
+        return None
+    elapsed = (time.time() - fused_start) * 1000
+    
+    # Split the final step's columns from the row marker and variable columns
+    row_marker = columns.index("__fused_row")
+    data_positions = list(range(row_marker))
+    data = [
+        {columns[k]: row[k] for k in data_positions}
+        for row in rows if row[row_marker]
+    ]
+    values = {index: rows[0][columns.index(f"__fused_var_{index}")] for index in outputs} if rows else {}
+    
+    variables = {}
+    executed_steps = []
+    for index, step in enumerate(steps):
+        step_id = step.get('step_id', index + 1)
+        record = {
+            'step_id': step_id,
+            'description': step.get('description', f'Step {step_id}'),
+            'data': data if index == len(steps) - 1 else [],
+            'elapsed_ms': elapsed if index == len(steps) - 1 else 0.0,
+            'depends_on': [steps[d].get('step_id', d + 1) for d in sorted(dependencies[index])],
+            'fused': True,
+        }
+        if values.get(index) is not None:
+            output_var = outputs[index]
+            variables[output_var] = values[index]
+            record['data'] = [{step.get('extract_column') or output_var: values[index]}]
+            print(f"  [OK] Extracted ${{{output_var}}} = {values[index]}")
+        elif index in outputs:
+            print(f"  [WARN] Could not extract ${{{outputs[index]}}}")
+        executed_steps.append(record)
+    
+    total_elapsed = (time.time() - start_time) * 1000
+    print(f"  [DATA] Rows returned: {len(data)}")
+    print(f"\n{'='*60}")
+    print(f"[MULTI-STEP] Fused statement completed in {elapsed:.0f}ms")
+    print(f"{'='*60}\n")
+    
+    return {
+        "data": data,
+        "analysis": {
+            "multi_step": True,
+            "fused": True,
+            "total_steps": len(steps),
+            "steps_executed": len(executed_steps),
+            "variables": variables,
+            "total_elapsed_ms": total_elapsed,
+            "critical_path_ms": elapsed,
+            "critical_path": [record['step_id'] for record in executed_steps],
+            "total_step_ms": elapsed
+        },
+        "success": True,
+        "steps_executed": executed_steps,
+        "variables": variables
+    }
+
+
 def _substitute_variables(step: Dict[str, Any], variables: Dict[str, Any]) -> Dict[str, Any]:
     """
     Substitute ${variable_name} placeholders with actual values.
@@ -219,24 +571,23 @@ def _substitute_variables(step: Dict[str, Any], variables: Dict[str, Any]) -> Di
     return json.loads(step_json)
 
 
-def _execute_single_step(step: Dict[str, Any], conn) -> Dict[str, Any]:
+def _execute_single_step(step: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute a single step of the multi-step plan.
     
-    Compiles the step plan to SQL and executes it.
+    Compiles the step plan to SQL and executes it on a pooled cursor
+    (repeated steps are answered from the result cache).
     Returns dict with 'data' and optional 'error'.
     """
     try:
         # Use standard SQL compiler
-        sql = compile_sql(step)
+        sql, params = compile_sql_params(step)
         
         print(f"  [SQL] {sql[:100]}..." if len(sql) > 100 else f"  [SQL] {sql}")
         
         # Execute query
-        result = conn.execute(sql).fetchall()
-        
-        # Get column names
-        columns = [desc[0] for desc in conn.description]
+        with get_cursor_pool().cursor() as conn:
+            result, columns = conn.query_rows(sql, params)
         
         # Convert to list of dicts
         data = [dict(zip(columns, row)) for row in result]
@@ -8,6 +8,10 @@ from typing import Tuple, Optional, Dict, Any, List
 from dataclasses import dataclass
 import pandas as pd
 
+from analytics_engine.duckdb_manager import QueryTimeoutError
+from analytics_engine.schema_catalog import get_schema_catalog, is_numeric_type
+from utils.sql_utils import compact_params, inline_params
+
 
 @dataclass
 class HealingAttempt:
@@ -39,6 +43,9 @@ class QueryHealer:
     4. Syntax errors - Fix common issues (quotes, operators)
     5. Empty results - Relax filters progressively
     6. Binder errors - Fix column references
+
+    Timeouts (QueryTimeoutError) are raised as they are: a rewritten query
+    would most likely run out of time again.
     """
 
     MAX_RETRIES = 3
@@ -79,6 +86,9 @@ class QueryHealer:
     def __init__(self, db_manager=None, profile_store=None):
         # Lazy imports to avoid circular dependencies
         self._db = db_manager
+        # Without an injected manager queries run on the shared cursor pool
+        # (prepared statements per query shape)
+        self._use_pool = db_manager is None
         self._profile_store = profile_store
         self._healing_history: List[HealingAttempt] = []
 
@@ -96,16 +106,25 @@ class QueryHealer:
             self._profile_store = ProfileStore()
         return self._profile_store
 
-    def execute_with_healing(self, sql: str, plan: Dict[str, Any]) -> Tuple[pd.DataFrame, str]:
+    def _execute(self, sql: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
+        if self._use_pool:
+            from analytics_engine.duckdb_manager import get_cursor_pool
+            return get_cursor_pool().execute(sql, params)
+        return self.db.query(sql, params)
+
+    def execute_with_healing(self, sql: str, plan: Dict[str, Any],
+                             params: Optional[List[Any]] = None) -> Tuple[pd.DataFrame, str]:
         """
         Execute SQL with automatic error recovery.
 
         Args:
-            sql: The SQL query to execute
+            sql: The SQL query to execute ($n placeholders when params are given)
             plan: The query plan (for context about table, columns, etc.)
+            params: Values bound to the placeholders (see compile_sql_params)
 
         Returns:
             (result_df, final_sql) - The result and the SQL that worked
+            (final_sql has the params inlined)
         """
         self._healing_history = []
         # Defensive check: ensure plan is a dict
@@ -115,31 +134,44 @@ class QueryHealer:
         profile = self.profile_store.get_profile(table_name) if table_name else None
 
         current_sql = sql
+        current_params = list(params) if params else None
         last_error = None
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                result = self.db.query(current_sql)
+                result = self._execute(current_sql, current_params)
 
                 # Check for empty results
                 if result.empty and attempt < self.MAX_RETRIES - 1:
                     # Only relax if we have filters to relax
                     if plan.get('filters') or plan.get('subset_filters'):
-                        relaxed_sql = self._relax_filters(current_sql, plan)
-                        if relaxed_sql != current_sql:
+                        relaxed_sql, relaxed_params = self._relax_filters(current_sql, plan, current_params)
+                        if relaxed_sql != current_sql or relaxed_params != current_params:
                             print(f"  [Healer] Empty result, relaxing filters (attempt {attempt + 2})")
-                            self._record_attempt(attempt + 1, current_sql, relaxed_sql,
+                            self._record_attempt(attempt + 1, inline_params(current_sql, current_params),
+                                                inline_params(relaxed_sql, relaxed_params),
                                                 "Empty result", "relax_filters", False)
-                            current_sql = relaxed_sql
+                            current_sql, current_params = relaxed_sql, relaxed_params
                             continue
 
                 # Success!
-                return result, current_sql
+                return result, inline_params(current_sql, current_params)
+
+            except QueryTimeoutError as e:
+                print(f"  [Healer] Query timed out on attempt {attempt + 1} - not retrying")
+                self._record_attempt(attempt + 1, inline_params(current_sql, current_params),
+                                    inline_params(current_sql, current_params), str(e), "timeout", False)
+                raise
 
             except Exception as e:
                 last_error = str(e)
                 print(f"  [Healer] Error on attempt {attempt + 1}: {last_error[:100]}")
 
+                # Text-based fixes work on the literal form of the query
+                if current_params:
+                    current_sql = inline_params(current_sql, current_params)
+                    current_params = None
+
                 # Fast-fail for unrecoverable errors (saves 1-3 seconds)
                 if self.is_unrecoverable_error(last_error):
                     print(f"  [Healer] FAST-FAIL: Unrecoverable error detected")
@@ -283,33 +315,20 @@ class QueryHealer:
                 if missing_col.lower() in actual_col.lower() or actual_col.lower() in missing_col.lower():
                     return self._replace_column_in_sql(sql, missing_col, actual_col)
 
-            # Try fuzzy matching for typos (80% similarity threshold)
-            from difflib import SequenceMatcher
-            best_match = None
-            best_ratio = 0.75  # Minimum threshold
-
-            for actual_col in columns.keys():
-                ratio = SequenceMatcher(None, missing_col.lower(), actual_col.lower()).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = actual_col
-
-            if best_match:
-                print(f"    [Healer] Fuzzy matched '{missing_col}' to '{best_match}' ({best_ratio:.0%})")
-                return self._replace_column_in_sql(sql, missing_col, best_match)
-
-        # Try getting columns from database directly
+        # Fall back to the table's actual columns (schema catalog, no DESCRIBE)
         table_name = plan.get('table')
         if table_name:
             try:
-                # Query to get actual column names
-                schema_sql = f'DESCRIBE "{table_name}"'
-                schema_df = self.db.query(schema_sql)
-                actual_columns = schema_df['column_name'].tolist() if 'column_name' in schema_df.columns else []
+                catalog = get_schema_catalog()
+                actual_col = catalog.resolve_column(table_name, missing_col)
+                if actual_col:
+                    return self._replace_column_in_sql(sql, missing_col, actual_col)
 
-                for actual_col in actual_columns:
-                    if actual_col.lower() == missing_col.lower():
-                        return self._replace_column_in_sql(sql, missing_col, actual_col)
+                # Try fuzzy matching for typos (75% similarity threshold, memoized)
+                best_match, best_ratio = catalog.closest_column(table_name, missing_col)
+                if best_match and best_ratio > 0.75:
+                    print(f"    [Healer] Fuzzy matched '{missing_col}' to '{best_match}' ({best_ratio:.0%})")
+                    return self._replace_column_in_sql(sql, missing_col, best_match)
 
             except Exception:
                 pass
@@ -348,24 +367,20 @@ class QueryHealer:
         matches = re.findall(comparison_pattern, sql)
 
         for col_name, operator, value in matches:
-            if profile:
-                columns = profile.get('columns', {})
-                col_info = columns.get(col_name, {})
-
-                # If column is numeric, try casting the value
-                if col_info.get('role') == 'metric':
-                    try:
-                        # If value looks numeric, cast column comparison
-                        float(value.replace(',', '').replace('$', '').replace('₹', ''))
-                        old_pattern = f'"{col_name}" {operator} \'{value}\''
-                        new_pattern = f'"{col_name}" {operator} {value.replace(",", "")}'
-                        modified = modified.replace(old_pattern, new_pattern)
-                    except ValueError:
-                        # Value is not numeric, cast column to string
-                        old_pattern = f'"{col_name}" {operator} \'{value}\''
-                        new_pattern = f'CAST("{col_name}" AS VARCHAR) {operator} \'{value}\''
-                        modified = modified.replace(old_pattern, new_pattern)
-            else:
+            # If column is numeric, try casting the value
+            if self._is_numeric_column(plan.get('table'), col_name, profile):
+                try:
+                    # If value looks numeric, cast column comparison
+                    float(value.replace(',', '').replace('$', '').replace('₹', ''))
+                    old_pattern = f'"{col_name}" {operator} \'{value}\''
+                    new_pattern = f'"{col_name}" {operator} {value.replace(",", "")}'
+                    modified = modified.replace(old_pattern, new_pattern)
+                except ValueError:
+                    # Value is not numeric, cast column to string
+                    old_pattern = f'"{col_name}" {operator} \'{value}\''
+                    new_pattern = f'CAST("{col_name}" AS VARCHAR) {operator} \'{value}\''
+                    modified = modified.replace(old_pattern, new_pattern)
+            elif not profile:
                 # Without profile, try safe cast approach
                 old_pattern = f'"{col_name}" {operator} \'{value}\''
                 new_pattern = f'CAST("{col_name}" AS VARCHAR) {operator} \'{value}\''
@@ -383,6 +398,20 @@ class QueryHealer:
 
         return None
 
+    @staticmethod
+    def _is_numeric_column(table_name: Optional[str], col_name: str, profile: Optional[Dict]) -> bool:
+        """Numeric per the column's actual type (schema catalog), else its profile role."""
+        if table_name:
+            try:
+                column_type = get_schema_catalog().column_type(table_name, col_name)
+                if column_type is not None:
+                    return is_numeric_type(column_type)
+            except Exception:
+                pass
+        if profile:
+            return profile.get('columns', {}).get(col_name, {}).get('role') == 'metric'
+        return False
+
     def _fix_table_not_found(self, sql: str, plan: Dict[str, Any]) -> Optional[str]:
         """
         Fix table not found by trying case-insensitive and partial matches.
@@ -395,9 +424,9 @@ class QueryHealer:
         all_profiles = self.profile_store.get_all_profiles()
         all_tables = list(all_profiles.keys())
 
-        # Also try getting tables from database
+        # Also add tables from the schema catalog
         try:
-            db_tables = self.db.list_tables()
+            db_tables = get_schema_catalog().list_tables()
             all_tables = list(set(all_tables + db_tables))
         except Exception:
             pass
@@ -494,11 +523,18 @@ class QueryHealer:
 
         return sql.replace(old_pattern, new_pattern)
 
-    def _relax_filters(self, sql: str, plan: Dict[str, Any]) -> str:
+    def _relax_filters(self, sql: str, plan: Dict[str, Any],
+                       params: Optional[List[Any]] = None) -> Tuple[str, Optional[List[Any]]]:
         """
         Relax filters progressively to get more results.
+
+        Works on inline literals and on bound $n params alike.
+
+        Returns:
+            (sql, params) - relaxed query and its params
         """
         modified = sql
+        new_params = list(params) if params else params
 
         # Strategy 1: Increase LIMIT
         limit_match = re.search(r'LIMIT\s+(\d+)', modified, re.IGNORECASE)
@@ -514,6 +550,12 @@ class QueryHealer:
         # Match LIKE with a value that doesn't already have % at both ends
         like_pattern = r"LIKE\s+'(?!%)([^']+)(?<!%)'"
         modified = re.sub(like_pattern, r"LIKE '%\1%'", modified, flags=re.IGNORECASE)
+        if new_params:
+            for match in re.finditer(r"LIKE\s+\$(\d+)", modified, re.IGNORECASE):
+                index = int(match.group(1)) - 1
+                value = new_params[index]
+                if isinstance(value, str) and value and not (value.startswith('%') and value.endswith('%')):
+                    new_params[index] = f"%{value.strip('%')}%"
 
         # Strategy 3: Convert exact matches to LIKE for text columns
         # e.g., = 'Chennai' -> LIKE '%Chennai%'
@@ -533,8 +575,18 @@ class QueryHealer:
                     replacement = rf'"{col}" LIKE \'%\1%\''
                     modified = re.sub(pattern, replacement, modified)
 
-        if modified != sql:
-            return modified
+                    # Pattern: "Column" = $n (bound string value)
+                    if new_params:
+                        def to_like(match, col=col):
+                            index = int(match.group(1)) - 1
+                            if not isinstance(new_params[index], str):
+                                return match.group(0)
+                            new_params[index] = f"%{new_params[index]}%"
+                            return f'"{col}" LIKE ${match.group(1)}'
+                        modified = re.sub(rf'"{re.escape(col)}"\s*=\s*\$(\d+)', to_like, modified)
+
+        if modified != sql or new_params != params:
+            return modified, new_params
 
         # Strategy 4: Remove one filter at a time
         # This is aggressive - only do if other strategies didn't help
@@ -549,8 +601,10 @@ class QueryHealer:
                 if len(conditions) > 1:
                     new_where = ' AND '.join(conditions[:-1])
                     modified = sql.replace(where_clause, new_where)
+                    if new_params:
+                        modified, new_params = compact_params(modified, new_params)
 
-        return modified
+        return modified, new_params
 
     def _get_fix_type(self, error: str) -> str:
         """Get human-readable description of fix type"""
@@ -1,7 +1,21 @@
+"""
+SQL Compiler - converts validated query plans into DuckDB SQL.
+
+compile_sql_params(plan) returns (sql, params): filter values are bound as
+$1, $2, ... placeholders instead of being spliced into the SQL text, so
+they need no escaping or injection scan, and every plan with the same
+shape compiles to the same SQL (see CursorPool prepared statements in
+analytics_engine/duckdb_manager.py).
+
+compile_sql(plan) returns the same query with the values inlined as
+escaped literals, for logs, API responses and text-based healing.
+"""
+
 import re
-from typing import Any, List, Dict, Union
+from typing import Any, List, Dict, Tuple, Union
 from analytics_engine.metric_registry import MetricRegistry
-from utils.sql_utils import quote_identifier
+from analytics_engine.rollups import USE_DAY, USE_MONTH, USE_VALUE, get_rollup_manager, stricter_use
+from utils.sql_utils import inline_params, quote_identifier
 
 
 # =============================================================================
@@ -46,25 +60,8 @@ def _validate_value(value: Any, context: str = "value") -> None:
             raise ValueError(f"Invalid {context}: value too long (max 10000 characters)")
 
 
-def _sanitize_string(value: str) -> str:
-    """
-    Sanitize a string value for SQL.
-    Escapes single quotes and removes null bytes.
-    """
-    if not isinstance(value, str):
-        return str(value)
-
-    # Remove null bytes (potential attack vector)
-    value = value.replace('\x00', '')
-
-    # Escape single quotes (SQL standard escaping)
-    value = value.replace("'", "''")
-
-    return value
-
-
 def _validate_filter(f: Dict) -> None:
-    """Validate a filter dictionary."""
+    """Validate a filter dictionary (structure, column name and operator)."""
     if not isinstance(f, dict):
         raise ValueError(f"Invalid filter: expected dict, got {type(f).__name__}")
 
@@ -86,37 +83,64 @@ def _validate_filter(f: Dict) -> None:
     if operator not in allowed_operators:
         raise ValueError(f"Invalid filter: operator '{operator}' not allowed")
 
-    # Validate value
-    _validate_value(f["value"], context="filter value")
+    # Values are bound as parameters; only guard against oversized input
+    if isinstance(f["value"], str) and len(f["value"]) > 10000:
+        raise ValueError("Invalid filter value: value too long (max 10000 characters)")
 
 
 def compile_sql(plan: dict) -> str:
     """
-    Converts a validated query plan into SQL.
+    Converts a validated query plan into SQL with inlined literal values.
     Deterministic. Template-based. Safe.
+
+    Use compile_sql_params() for execution; this form is for display and
+    text-based fixes, so its string values are also scanned for injection
+    patterns before being inlined.
+    """
+    sql, params = compile_sql_params(plan)
+    for value in params:
+        _validate_value(value, context="filter value")
+    return inline_params(sql, params)
+
+
+def compile_sql_params(plan: dict) -> Tuple[str, List[Any]]:
+    """
+    Converts a validated query plan into parameterized SQL.
+
+    Returns:
+        (sql, params) - sql uses $1, $2, ... for filter values, params lists
+        them in placeholder order
     """
-    
     query_type = plan.get("query_type", "metric")
-    
+    params: List[Any] = []
+
     if query_type == "lookup":
-        return _compile_lookup(plan)
+        sql = _compile_lookup(plan, params)
     elif query_type == "filter":
-        return _compile_filter(plan)
+        sql = _compile_filter(plan, params)
     elif query_type == "metric":
-        return _compile_metric(plan)
+        sql = _compile_metric(plan, params)
     elif query_type == "extrema_lookup":
-        return _compile_extrema_lookup(plan)
+        sql = _compile_extrema_lookup(plan, params)
     elif query_type == "rank":
-        return _compile_rank(plan)
+        sql = _compile_rank(plan, params)
     elif query_type == "list":
-        return _compile_list(plan)
+        sql = _compile_list(plan, params)
     elif query_type == "aggregation_on_subset":
-        return _compile_aggregation_on_subset(plan)
+        sql = _compile_aggregation_on_subset(plan, params)
     else:
         raise ValueError(f"Unknown query type: {query_type}")
 
+    return sql, params
+
 
-def _compile_lookup(plan):
+def _param(params: List[Any], value: Any) -> str:
+    """Bind value as the next positional parameter and return its placeholder."""
+    params.append(value)
+    return f"${len(params)}"
+
+
+def _compile_lookup(plan, params):
     """Compile row lookup query"""
     table = quote_identifier(plan["table"])
     columns = plan.get("select_columns", ["*"])
@@ -134,13 +158,13 @@ def _compile_lookup(plan):
             columns = [columns]
         quoted_columns = ", ".join([quote_identifier(col) for col in columns])
 
-    where = _build_where_clause(plan["filters"])
+    where = _build_where_clause(plan["filters"], params)
     limit = plan.get("limit", 1)
 
     return f"SELECT {quoted_columns} FROM {table} {where} LIMIT {limit}".strip()
 
 
-def _compile_filter(plan):
+def _compile_filter(plan, params):
     """Compile filter query"""
     table = quote_identifier(plan["table"])
     columns = plan.get("select_columns", ["*"])
@@ -154,26 +178,25 @@ def _compile_filter(plan):
             columns = [columns]
         columns = ", ".join([quote_identifier(col) for col in columns])
     
-    where = _build_where_clause(plan["filters"])
+    where = _build_where_clause(plan["filters"], params)
     limit = plan.get("limit", 100)
     
     return f"SELECT {columns} FROM {table} {where} LIMIT {limit}".strip()
 
 
 
-def _build_where_clause(filters):
+def _build_where_clause(filters, params):
     """
     Build WHERE clause from filters.
-    Handles both numeric and text values with proper escaping.
+    Values are bound as parameters (appended to params), never spliced in.
     Uses flexible matching for names to handle spelling variations.
-    Includes SQL injection validation for security.
     """
     if not filters:
         return ""
 
     conditions = []
     for f in filters:
-        # Validate filter structure and values
+        # Validate filter structure, column name and operator
         _validate_filter(f)
 
         column = quote_identifier(f["column"])
@@ -188,6 +211,18 @@ def _build_where_clause(filters):
                 conditions.append(f"{column} IS NOT NULL")
             continue
 
+        # IN / NOT IN with a list of values
+        if isinstance(value, (list, tuple)) and operator.upper() in ("IN", "NOT IN"):
+            if not value:
+                continue
+            if all(isinstance(v, str) for v in value):
+                placeholders = ", ".join(_param(params, v) for v in value)
+                conditions.append(f"CAST({column} AS VARCHAR) {operator} ({placeholders})")
+            else:
+                placeholders = ", ".join(_param(params, v) for v in value)
+                conditions.append(f"{column} {operator} ({placeholders})")
+            continue
+
         # Handle different value types
         if isinstance(value, str):
             if operator == "LIKE":
@@ -195,11 +230,10 @@ def _build_where_clause(filters):
                 # First, normalize the value by removing apostrophes and special chars
                 # This fixes translation issues like "ladies' wear" vs "Ladies Wear"
                 normalized_value = value.replace("'", "").replace("'", "").replace("`", "")
-                safe_value = _sanitize_string(normalized_value)
 
                 # For name matching, try to be more flexible
                 # Extract the core part of the search term (remove % wildcards)
-                search_term = safe_value.strip('%')
+                search_term = normalized_value.strip('%')
 
                 # If it's a name search (common patterns), use flexible matching
                 # This helps with variations like "Meenakshi" vs "Meenakchi"
@@ -207,28 +241,26 @@ def _build_where_clause(filters):
                     # Try multiple patterns:
                     # 1. Original pattern
                     # 2. Pattern with common variations (ksh -> kch, sh -> ch, etc.)
-                    patterns = [safe_value]
+                    patterns = [normalized_value]
 
                     # Add variation patterns for common Tamil name spellings
                     if 'ksh' in search_term.lower():
-                        patterns.append(safe_value.replace('ksh', 'kch').replace('Ksh', 'Kch'))
-                        patterns.append(safe_value.replace('ksh', 'kchi').replace('Ksh', 'Kchi'))
+                        patterns.append(normalized_value.replace('ksh', 'kch').replace('Ksh', 'Kch'))
+                        patterns.append(normalized_value.replace('ksh', 'kchi').replace('Ksh', 'Kchi'))
                     if 'sh' in search_term.lower():
-                        patterns.append(safe_value.replace('sh', 'ch').replace('Sh', 'Ch'))
+                        patterns.append(normalized_value.replace('sh', 'ch').replace('Sh', 'Ch'))
 
                     # Create OR condition for all patterns
                     pattern_conditions = [
-                        f"LOWER(CAST({column} AS VARCHAR)) LIKE LOWER('{pattern}')"
+                        f"LOWER(CAST({column} AS VARCHAR)) LIKE LOWER({_param(params, pattern)})"
                         for pattern in patterns
                     ]
                     conditions.append(f"({' OR '.join(pattern_conditions)})")
                 else:
                     # For short terms, use original pattern
-                    conditions.append(f"LOWER(CAST({column} AS VARCHAR)) LIKE LOWER('{safe_value}')")
+                    conditions.append(f"LOWER(CAST({column} AS VARCHAR)) LIKE LOWER({_param(params, normalized_value)})")
             else:
                 # Use actual operator (=, >=, <=, !=, etc.) for string comparisons
-                safe_value = _sanitize_string(value)
-
                 # Check if this looks like a date value (ISO format: YYYY-MM-DD)
                 # For date comparisons, don't cast column to VARCHAR - compare directly
                 is_date_value = bool(re.match(r'^\d{4}-\d{2}-\d{2}$', value))
@@ -236,25 +268,21 @@ def _build_where_clause(filters):
                 if is_date_value and operator in ('>=', '<=', '>', '<', '='):
                     # Date comparison - compare directly without casting
                     # DuckDB handles string dates well with datetime columns
-                    conditions.append(f"{column} {operator} '{safe_value}'")
+                    conditions.append(f"{column} {operator} {_param(params, value)}")
                 else:
                     # Non-date string - cast column to VARCHAR for safety
-                    conditions.append(f"CAST({column} AS VARCHAR) {operator} '{safe_value}'")
+                    conditions.append(f"CAST({column} AS VARCHAR) {operator} {_param(params, value)}")
         elif isinstance(value, (int, float)):
-            # Numeric value - safe to use directly
-            conditions.append(f"{column} {operator} {value}")
-        elif isinstance(value, bool):
-            # Boolean value
-            conditions.append(f"{column} {operator} {str(value).upper()}")
+            # Numeric (and boolean) value
+            conditions.append(f"{column} {operator} {_param(params, value)}")
         else:
-            # Unsupported type - convert to string safely
-            safe_value = _sanitize_string(str(value))
-            conditions.append(f"CAST({column} AS VARCHAR) {operator} '{safe_value}'")
+            # Unsupported type - compare as string
+            conditions.append(f"CAST({column} AS VARCHAR) {operator} {_param(params, str(value))}")
 
     return "WHERE " + " AND ".join(conditions) if conditions else ""
 
 
-def _compile_metric(plan):
+def _compile_metric(plan, params):
     """Compile metric-based aggregation query"""
     registry = MetricRegistry()
 
@@ -275,7 +303,7 @@ def _compile_metric(plan):
         group_by_clause = " GROUP BY " + ", ".join(plan["group_by"])
         select_clause += ", " + ", ".join(plan["group_by"])
 
-    where_clause = _build_where_clause(plan.get("filters", []))
+    where_clause = _build_where_clause(plan.get("filters", []), params)
 
     sql = f"""
         SELECT {select_clause}
@@ -287,7 +315,7 @@ def _compile_metric(plan):
     return sql.strip()
 
 
-def _compile_extrema_lookup(plan):
+def _compile_extrema_lookup(plan, params):
     """Compile extrema lookup query (min/max with ordering)"""
     table = quote_identifier(plan["table"])
     select_cols = plan.get("select_columns", ["*"])
@@ -305,7 +333,7 @@ def _compile_extrema_lookup(plan):
     limit = plan.get("limit", 1)
     
     # Build WHERE clause if filters exist
-    where_clause = _build_where_clause(plan.get("filters", []))
+    where_clause = _build_where_clause(plan.get("filters", []), params)
     
     order_clause = ""
     if order_by:
@@ -315,7 +343,44 @@ def _compile_extrema_lookup(plan):
     return f"SELECT {columns} FROM {table} {where_clause} {order_clause} LIMIT {limit}".strip()
 
 
-def _compile_rank(plan):
+# Columns that _compile_rank truncates with date_grouping
+_DATE_GROUPING_COLUMNS = ('date', 'datetime', 'timestamp', 'created_at', 'order_date', 'transaction_date')
+
+
+def _rank_rollup(plan, group_by, date_grouping, aggregates):
+    """Smallest rollup that answers a grouped rank plan, or None."""
+    if any(func == "COUNT_DISTINCT" for func, _, _ in aggregates):
+        return None
+    columns = {}
+    for col in group_by:
+        if date_grouping in ("MONTH", "QUARTER", "YEAR") and col.lower() in _DATE_GROUPING_COLUMNS:
+            use = USE_MONTH
+        elif date_grouping == "WEEK" and col.lower() in _DATE_GROUPING_COLUMNS:
+            use = USE_DAY
+        else:
+            use = USE_VALUE
+        columns[col] = stricter_use(columns.get(col), use)
+    for f in plan.get("filters", []):
+        columns[f.get("column")] = USE_VALUE
+    try:
+        return get_rollup_manager().find(plan["table"], columns, [(func, col) for func, col, _ in aggregates])
+    except Exception as e:
+        print(f"[WARN]  Rollup lookup failed: {e}")
+        return None
+
+
+def _aggregate_sql(func, col, rollup):
+    """Aggregate expression on the base table, or its equivalent on a rollup."""
+    if rollup is not None:
+        return rollup.aggregate(func, col)
+    if func == "COUNT_DISTINCT":
+        return f"COUNT(DISTINCT {quote_identifier(col)})"
+    if col == "*":
+        return f"{func}(*)"
+    return f"{func}({quote_identifier(col)})"
+
+
+def _compile_rank(plan, params):
     """Compile rank query (ordered list, with optional GROUP BY for aggregation)"""
     table = quote_identifier(plan["table"])
 
@@ -332,7 +397,7 @@ def _compile_rank(plan):
     agg_func = plan.get("aggregation_function", "").upper()
 
     # Build WHERE clause if filters exist
-    where_clause = _build_where_clause(plan.get("filters", []))
+    where_clause = _build_where_clause(plan.get("filters", []), params)
 
     # If we have group_by, we need to aggregate
     if group_by:
@@ -343,7 +408,7 @@ def _compile_rank(plan):
 
         for col in group_by:
             quoted_col = quote_identifier(col)
-            if date_grouping and col.lower() in ('date', 'datetime', 'timestamp', 'created_at', 'order_date', 'transaction_date'):
+            if date_grouping and col.lower() in _DATE_GROUPING_COLUMNS:
                 # Use DATE_TRUNC to extract time period
                 # DuckDB DATE_TRUNC returns a date, we also extract readable format
                 # Use TRY_CAST to handle VARCHAR date columns safely
@@ -374,19 +439,20 @@ def _compile_rank(plan):
         is_count_query = agg_func == "COUNT"
         is_count_distinct_query = agg_func == "COUNT_DISTINCT"
 
-        # Add aggregated metrics
+        # Aggregated metrics as (function, column, alias)
+        aggregates = []
         if metrics:
             for metric in metrics:
                 quoted_metric = quote_identifier(metric)
                 if is_count_distinct_query:
                     # COUNT(DISTINCT column) for unique item counts
-                    select_parts.append(f"COUNT(DISTINCT {quoted_metric}) AS unique_{metric}")
+                    aggregates.append(("COUNT_DISTINCT", metric, f"unique_{metric}"))
                 elif is_count_query or agg_func == "COUNT":
-                    select_parts.append(f"COUNT(*) AS {quoted_metric}")
+                    aggregates.append(("COUNT", "*", quoted_metric))
                 elif agg_func and agg_func in ("SUM", "AVG", "MIN", "MAX"):
-                    select_parts.append(f"{agg_func}({quoted_metric}) AS {quoted_metric}")
+                    aggregates.append((agg_func, metric, quoted_metric))
                 else:
-                    select_parts.append(f"SUM({quoted_metric}) AS {quoted_metric}")
+                    aggregates.append(("SUM", metric, quoted_metric))
 
         # If no explicit metrics but order_by has a column not in group_by
         if not metrics:
@@ -395,22 +461,28 @@ def _compile_rank(plan):
                     # For count queries or ID columns, use COUNT(*)
                     if is_count_distinct_query:
                         # COUNT(DISTINCT column) for unique item counts
-                        quoted_col = quote_identifier(col)
-                        select_parts.append(f"COUNT(DISTINCT {quoted_col}) AS unique_count")
+                        aggregates.append(("COUNT_DISTINCT", col, "unique_count"))
                         # Update order_by to use "unique_count" instead of the original column
                         order_by = [("unique_count", direction) for _, direction in order_by]
                     elif is_count_query:
-                        select_parts.append(f"COUNT(*) AS count")
+                        aggregates.append(("COUNT", "*", "count"))
                         # Update order_by to use "count" instead of the original column
                         order_by = [("count", direction) for _, direction in order_by]
                     else:
                         quoted_col = quote_identifier(col)
                         if agg_func and agg_func in ("SUM", "AVG", "MIN", "MAX", "COUNT"):
-                            select_parts.append(f"{agg_func}({quoted_col}) AS {quoted_col}")
+                            aggregates.append((agg_func, col, quoted_col))
                         else:
-                            select_parts.append(f"SUM({quoted_col}) AS {quoted_col}")
+                            aggregates.append(("SUM", col, quoted_col))
                     break  # Only need one aggregation
 
+        # Answer from a pre-aggregated rollup when one covers every column used
+        rollup = _rank_rollup(plan, group_by, date_grouping, aggregates)
+        for func, col, alias in aggregates:
+            select_parts.append(f"{_aggregate_sql(func, col, rollup)} AS {alias}")
+        if rollup is not None:
+            table = rollup.source
+
         columns = ", ".join(select_parts)
 
         # Build GROUP BY clause - use group_by_parts which handles date_grouping
@@ -423,7 +495,7 @@ def _compile_rank(plan):
             order_parts = []
             for col, direction in order_by:
                 # If ordering by a date column with date_grouping, use the alias
-                if date_grouping and col.lower() in ('date', 'datetime', 'timestamp', 'created_at', 'order_date', 'transaction_date'):
+                if date_grouping and col.lower() in _DATE_GROUPING_COLUMNS:
                     alias = date_grouping.lower()  # month, year, week, quarter
                     order_parts.append(f"{alias} {direction}")
                 else:
@@ -451,7 +523,7 @@ def _compile_rank(plan):
     return f"SELECT {columns} FROM {table} {where_clause} {order_clause} LIMIT {limit}".strip()
 
 
-def _compile_list(plan):
+def _compile_list(plan, params):
     """Compile list/show all query"""
     table = quote_identifier(plan["table"])
 
@@ -471,7 +543,7 @@ def _compile_list(plan):
     return f"SELECT {columns} FROM {table} LIMIT {limit}".strip()
 
 
-def _compile_aggregation_on_subset(plan):
+def _compile_aggregation_on_subset(plan, params):
     """Compile aggregation on subset query (e.g., AVG of first 5 items)"""
     table = quote_identifier(plan["table"])
     aggregation_function = plan["aggregation_function"]
@@ -500,7 +572,7 @@ def _compile_aggregation_on_subset(plan):
     # We'll select * from the subset to get all columns for the breakdown
     
     # Build WHERE clause for subset
-    where_clause = _build_where_clause(subset_filters)
+    where_clause = _build_where_clause(subset_filters, params)
     
     # Build ORDER BY clause for subset
     order_clause = ""
@@ -1,15 +1,17 @@
-import os
 import json
 import yaml
 import threading
-import google.generativeai as genai
 from pathlib import Path
 from explanation_layer.explanation_prompt import EXPLANATION_SYSTEM_PROMPT
 
 # Backend directory for relative paths
 _BACKEND_DIR = Path(__file__).parent.parent
 from dotenv import load_dotenv
-from utils.permanent_memory import format_memory_for_prompt
+from utils.llm_provider import create_model, resolve_provider
+from utils.prompt_assembly import get_prompt_assembler
+
+# Static explainer prefix (system prompt + memory), reused across calls
+_explainer_prompt = get_prompt_assembler("explainer", EXPLANATION_SYSTEM_PROMPT)
 
 # Load environment variables
 load_dotenv()
@@ -22,15 +24,20 @@ class CompatibleGenerativeModel:
     """
     Wrapper for GenerativeModel that supports system prompts
     on older versions of google-generativeai (< 0.4.0).
+
+    The system prompt is the prompt assembler's static prefix (reused
+    across calls, provider-cached where supported).
     """
-    def __init__(self, model, system_prompt: str):
+    def __init__(self, model, model_name: str, generation_config: dict):
         self._model = model
-        self._system_prompt = system_prompt
+        self._model_name = model_name
+        self._generation_config = generation_config
 
     def generate_content(self, prompt, **kwargs):
-        """Prepend system prompt to user message."""
-        full_prompt = f"{self._system_prompt}\n\n---\n\nUser Query:\n{prompt}"
-        return self._model.generate_content(full_prompt, **kwargs)
+        """Send static system prefix + user message."""
+        return _explainer_prompt.generate(
+            self._model, self._model_name, self._generation_config, prompt, **kwargs
+        )
 
     def __getattr__(self, name):
         """Forward other attributes to underlying model."""
@@ -41,7 +48,7 @@ class CompatibleGenerativeModel:
 # SINGLETON PATTERN FOR LLM CLIENT
 # Saves 2-4 seconds per query by reusing model
 # ============================================
-_explainer_model = None
+_explainer_models = {}  # provider -> model
 _explainer_model_lock = threading.Lock()
 _config_cache = None
 
@@ -59,29 +66,36 @@ def load_config():
     return _config_cache
 
 
-def get_explainer_model():
+def get_explainer_model(complexity=None):
     """
-    Get or create singleton Gemini model instance for explanations.
+    Get or create singleton model instance for explanations.
     Thread-safe with double-checked locking pattern.
 
+    Args:
+        complexity: 'simple' / 'complex' - simple queries may use
+                    llm.simple_query_provider (one instance per provider)
+
     Returns:
-        GenerativeModel: Reusable Gemini model instance
+        CompatibleGenerativeModel: Reusable model instance
     """
-    global _explainer_model
+    provider = resolve_provider(complexity)
 
     # Fast path - model already exists
-    if _explainer_model is not None:
-        return _explainer_model
+    model = _explainer_models.get(provider)
+    if model is not None:
+        return model
 
     # Slow path - need to create model (thread-safe)
     with _explainer_model_lock:
         # Double-check after acquiring lock
-        if _explainer_model is not None:
-            return _explainer_model
+        model = _explainer_models.get(provider)
+        if model is not None:
+            return model
 
         config = load_config()
-        _explainer_model = initialize_gemini_client(config)
-        return _explainer_model
+        model = initialize_gemini_client(config, complexity)
+        _explainer_models[provider] = model
+        return model
 
 
 def invalidate_explainer_model():
@@ -89,24 +103,15 @@ def invalidate_explainer_model():
     Invalidate the cached model (e.g., when memory/config changes).
     Call this when permanent memory is updated.
     """
-    global _explainer_model, _config_cache
+    global _config_cache
     with _explainer_model_lock:
-        _explainer_model = None
+        _explainer_models.clear()
         _config_cache = None
+    _explainer_prompt.invalidate()
 
 
-def initialize_gemini_client(config):
-    """Initialize Gemini API client with configuration and memory injection"""
-    api_key_env = config.get("api_key_env", "GEMINI_API_KEY")
-    api_key = os.getenv(api_key_env)
-
-    if not api_key:
-        raise ValueError(
-            f"Gemini API key not found. Please set the {api_key_env} environment variable."
-        )
-
-    genai.configure(api_key=api_key)
-
+def initialize_gemini_client(config, complexity=None):
+    """Initialize explainer LLM client (configured provider) with memory injection"""
     model_name = config.get("model", "gemini-2.0-flash")
     temperature = config.get("temperature", 0.0)
 
@@ -118,18 +123,12 @@ def initialize_gemini_client(config):
         "max_output_tokens": max_tokens,
     }
 
-    # Load and inject permanent memory into system prompt
-    memory_constraints = format_memory_for_prompt()
-    system_prompt = EXPLANATION_SYSTEM_PROMPT + memory_constraints
-
     # Create base model without system_instruction (for compatibility with 0.3.x)
-    base_model = genai.GenerativeModel(
-        model_name=model_name,
-        generation_config=generation_config,
-    )
+    base_model = create_model("explainer", model_name, generation_config, complexity=complexity)
 
-    # Wrap with our compatible model that handles system prompts
-    return CompatibleGenerativeModel(base_model, system_prompt)
+    # Wrap with our compatible model that adds the static system prefix
+    # (system prompt + permanent memory) to every call
+    return CompatibleGenerativeModel(base_model, model_name, generation_config)
 
 
 def _format_number_indian(value, use_word=True):
@@ -414,8 +413,10 @@ GOOD (natural): "about 63 lakhs"
 Generate a crispy, TTS-friendly response:"""
     
     try:
-        # Get singleton LLM (saves 2-4s per query)
-        model = get_explainer_model()
+        # Get singleton LLM (saves 2-4s per query); simple queries may run on-box
+        from planning_layer.planner_client import estimate_query_complexity
+        complexity = estimate_query_complexity(original_question or "")
+        model = get_explainer_model(complexity)
 
         # Generate explanation
         response = model.generate_content(prompt)
@@ -651,7 +652,7 @@ For UNCLEAR/GIBBERISH:
 Generate a natural, conversational response:"""
 
     try:
-        model = get_explainer_model()
+        model = get_explainer_model("simple")
         response = model.generate_content(prompt)
         result = response.text.strip()
 
@@ -0,0 +1,466 @@
+"""
+Template Explainer - deterministic English/Tamil answers for simple result shapes.
+
+A single total, an extrema winner, a short top-N list or a two-period
+comparison does not need Gemini to be put into words. For Tamil users it used
+to cost two calls (explain_results + translate_to_tamil). These results are
+rendered from templates instead, in the user's language:
+- English numbers use the Indian system via _format_number_indian ("about 12 lakhs")
+- Tamil numbers are spelled out in Tamil words ("சுமார் பன்னிரண்டு லட்சம்"),
+  matching what translate_to_tamil produces for TTS (no digits)
+- Ratio columns (margin, rate, %) are read as percentages. Whether a column
+  holds fractions (0.46) or percents (46) comes from its profiled min/max;
+  without a profile entry the LLM explains it.
+
+Which query types may be templated is configured in settings.yaml:
+    explanation:
+      template_fast_path: true
+      template_query_types: [aggregation_on_subset, metric, extrema_lookup, rank, comparison]
+
+Anything that is not clearly simple returns None and the caller uses the LLM.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from explanation_layer.explainer_client import _format_number_indian
+
+MAX_TEMPLATE_ROWS = 5
+
+_RATIO_HINTS = ('%', 'percent', 'pct', 'margin', 'rate', 'ratio')
+
+# Tamil words for common column-label words; a label with any other word is
+# left to the LLM rather than read out in English. Phrases are matched first
+# so "profit margin" is not read as "profit, profit margin".
+_TA_LABEL_PHRASES = {
+    ('profit', 'margin'): 'லாப வரம்பு',
+    ('gross', 'margin'): 'மொத்த லாப வரம்பு',
+    ('net', 'margin'): 'நிகர லாப வரம்பு',
+}
+_TA_LABEL_WORDS = {
+    'sale': 'விற்பனை', 'sales': 'விற்பனை', 'amount': 'தொகை', 'revenue': 'வருவாய்',
+    'income': 'வருமானம்', 'profit': 'லாபம்', 'margin': 'லாப வரம்பு', 'cost': 'செலவு',
+    'expense': 'செலவு', 'expenses': 'செலவுகள்', 'price': 'விலை', 'quantity': 'அளவு',
+    'qty': 'அளவு', 'units': 'அலகுகள்', 'count': 'எண்ணிக்கை', 'orders': 'ஆர்டர்கள்',
+    'order': 'ஆர்டர்', 'discount': 'தள்ளுபடி', 'tax': 'வரி', 'value': 'மதிப்பு',
+    'total': 'மொத்த', 'net': 'நிகர', 'gross': 'மொத்த', 'stock': 'இருப்பு',
+    'salary': 'சம்பளம்', 'customers': 'வாடிக்கையாளர்கள்', 'rate': 'விகிதம்',
+    'percentage': 'சதவீதம்', 'percent': 'சதவீதம்', 'pct': 'சதவீதம்', 'average': 'சராசரி', 'avg': 'சராசரி',
+}
+
+# ---------------------------------------------------------------------------
+# Tamil number words
+# ---------------------------------------------------------------------------
+
+_TA_UNITS = ['பூஜ்ஜியம்', 'ஒன்று', 'இரண்டு', 'மூன்று', 'நான்கு', 'ஐந்து', 'ஆறு', 'ஏழு', 'எட்டு', 'ஒன்பது']
+_TA_TEENS = ['பத்து', 'பதினொன்று', 'பன்னிரண்டு', 'பதிமூன்று', 'பதினான்கு', 'பதினைந்து',
+             'பதினாறு', 'பதினேழு', 'பதினெட்டு', 'பத்தொன்பது']
+_TA_TENS = ['', '', 'இருபது', 'முப்பது', 'நாற்பது', 'ஐம்பது', 'அறுபது', 'எழுபது', 'எண்பது', 'தொண்ணூறு']
+_TA_TENS_PREFIX = ['', '', 'இருபத்து', 'முப்பத்து', 'நாற்பத்து', 'ஐம்பத்து', 'அறுபத்து', 'எழுபத்து',
+                   'எண்பத்து', 'தொண்ணூற்று']
+_TA_HUNDREDS = ['', 'நூறு', 'இருநூறு', 'முந்நூறு', 'நானூறு', 'ஐநூறு', 'அறுநூறு', 'எழுநூறு',
+                'எண்ணூறு', 'தொள்ளாயிரம்']
+_TA_HUNDREDS_PREFIX = ['', 'நூற்று', 'இருநூற்று', 'முந்நூற்று', 'நானூற்று', 'ஐநூற்று', 'அறுநூற்று',
+                       'எழுநூற்று', 'எண்ணூற்று', 'தொள்ளாயிரத்து']
+
+# (size, standalone word, word when followed by a remainder)
+_TA_SCALES = [
+    (10000000, 'கோடி', 'கோடியே'),
+    (100000, 'லட்சம்', 'லட்சத்து'),
+    (1000, 'ஆயிரம்', 'ஆயிரத்து'),
+]
+
+
+def tamil_number_words(n: int) -> str:
+    """
+    Spell a non-negative integer in Tamil words (Indian grouping).
+
+    Examples:
+        12      -> "பன்னிரண்டு"
+        6450    -> "ஆறு ஆயிரத்து நானூற்று ஐம்பது"
+        1500000 -> "பதினைந்து லட்சம்"
+    """
+    n = int(n)
+    if n < 0:
+        return 'கழித்தல் ' + tamil_number_words(-n)
+    if n < 10:
+        return _TA_UNITS[n]
+    if n < 20:
+        return _TA_TEENS[n - 10]
+    if n < 100:
+        tens, unit = divmod(n, 10)
+        return _TA_TENS[tens] if unit == 0 else f"{_TA_TENS_PREFIX[tens]} {_TA_UNITS[unit]}"
+    if n < 1000:
+        hundreds, rest = divmod(n, 100)
+        return _TA_HUNDREDS[hundreds] if rest == 0 else f"{_TA_HUNDREDS_PREFIX[hundreds]} {tamil_number_words(rest)}"
+
+    for size, word, joined in _TA_SCALES:
+        if n >= size:
+            count, rest = divmod(n, size)
+            if count == 1:
+                head = 'ஒரு' if size > 1000 else ''
+            else:
+                head = tamil_number_words(count)
+            scale = joined if rest else word
+            text = f"{head} {scale}".strip()
+            return f"{text} {tamil_number_words(rest)}" if rest else text
+    return str(n)
+
+
+def _tamil_decimal_words(value: float, digits: int = 1) -> str:
+    """12.5 -> "பன்னிரண்டு புள்ளி ஐந்து" (trailing zeros dropped)."""
+    text = f"{value:.{digits}f}".rstrip('0').rstrip('.')
+    if '.' not in text:
+        return tamil_number_words(int(text))
+    whole, fraction = text.split('.')
+    return f"{tamil_number_words(int(whole))} புள்ளி " + ' '.join(_TA_UNITS[int(d)] for d in fraction)
+
+
+def format_number_tamil(value) -> str:
+    """
+    Tamil counterpart of _format_number_indian: rounded crores/lakhs/thousands,
+    spelled out in words so TTS never reads digits.
+    """
+    if not isinstance(value, (int, float)):
+        return str(value)
+
+    sign = 'கழித்தல் ' if value < 0 else ''
+    abs_value = abs(value)
+
+    if abs_value >= 10000000:
+        crores = abs_value / 10000000
+        return f"{sign}சுமார் {_tamil_decimal_words(crores, 0 if crores >= 10 else 1)} கோடி"
+    if abs_value >= 100000:
+        lakhs = abs_value / 100000
+        return f"{sign}சுமார் {_tamil_decimal_words(lakhs, 0 if lakhs >= 10 else 1)} லட்சம்"
+    if abs_value >= 1000:
+        return f"{sign}சுமார் {tamil_number_words(round(abs_value / 1000))} ஆயிரம்"
+    if isinstance(value, float) and not float(abs_value).is_integer():
+        return f"{sign}{_tamil_decimal_words(abs_value, 2)}"
+    return f"{sign}{tamil_number_words(int(abs_value))}"
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {'templated': 0, 'llm_calls_skipped': 0, 'by_query_type': {}}
+
+
+def _record(query_type: str, language: str) -> None:
+    with _stats_lock:
+        _stats['templated'] += 1
+        # explain_results + (for Tamil) translate_to_tamil
+        _stats['llm_calls_skipped'] += 2 if language == 'ta' else 1
+        by_type = _stats['by_query_type']
+        by_type[query_type] = by_type.get(query_type, 0) + 1
+
+
+def get_template_stats() -> Dict[str, Any]:
+    """Templated answers and LLM calls skipped since startup."""
+    with _stats_lock:
+        return {
+            'templated': _stats['templated'],
+            'llm_calls_skipped': _stats['llm_calls_skipped'],
+            'by_query_type': dict(_stats['by_query_type']),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _label(column: str) -> str:
+    """Sale_Amount -> "sale amount"."""
+    return str(column).replace('_', ' ').replace('%', ' percentage').strip().lower()
+
+
+def _tamil_label(column: str) -> Optional[str]:
+    """Sale_Amount -> "விற்பனை தொகை"; None if a word has no Tamil entry."""
+    english = _label(column).split()
+    words: List[str] = []
+    i = 0
+    while i < len(english):
+        phrase = _TA_LABEL_PHRASES.get(tuple(english[i:i + 2]))
+        word = phrase or _TA_LABEL_WORDS.get(english[i])
+        if word is None:
+            return None
+        if not words or words[-1] != word:  # "gross total" -> one "மொத்த"
+            words.append(word)
+        i += 2 if phrase else 1
+    return ' '.join(words) or None
+
+
+def _column_label(column: str, language: str) -> Optional[str]:
+    return _tamil_label(column) if language == 'ta' else _label(column)
+
+
+def _is_ratio(column: str) -> bool:
+    column = str(column).lower()
+    return any(hint in column for hint in _RATIO_HINTS)
+
+
+_UNKNOWN_SCALE = object()
+
+
+def _percent_scale(column: str, profile: Optional[dict]):
+    """
+    Multiplier that turns a ratio column's values into percents: 100 when the
+    profiled values lie in [-1, 1] (fractions), 1 otherwise. None for columns
+    that are not ratios; _UNKNOWN_SCALE when the profile cannot tell.
+    """
+    if not _is_ratio(column):
+        return None
+    columns = (profile or {}).get('columns') or {}
+    info = columns.get(column) or next(
+        (v for k, v in columns.items() if str(k).lower() == str(column).lower()), None
+    )
+    if not info or info.get('min') is None or info.get('max') is None:
+        return _UNKNOWN_SCALE
+    return 100 if -1 <= info['min'] and info['max'] <= 1 else 1
+
+
+def _number(value, language: str, scale=None) -> str:
+    """Rounded number words; with a percent scale, "about 46 percent"."""
+    if hasattr(value, 'item'):
+        value = value.item()  # numpy scalar -> python
+    if scale and isinstance(value, (int, float)):
+        percent = value * scale
+        digits = 1 if abs(percent) < 10 else 0
+        if language == 'ta':
+            sign = 'கழித்தல் ' if percent < 0 else ''
+            return f"சுமார் {sign}{_tamil_decimal_words(abs(percent), digits)} சதவீதம்"
+        return f"about {round(percent, digits):g} percent"
+    return format_number_tamil(value) if language == 'ta' else _format_number_indian(value)
+
+
+def _scope(plan: dict, language: str) -> Optional[str]:
+    """
+    Equality/LIKE filter values as a "for X" phrase (e.g. branch or payment mode).
+    None if a filter cannot be phrased that way (ranges, IN lists, ...).
+    """
+    values = []
+    for f in (plan.get('subset_filters') or []) + (plan.get('filters') or []):
+        if str(f.get('operator', '')).upper() not in ('=', 'LIKE'):
+            return None
+        value = str(f.get('value', '')).strip('%').strip()
+        if value and value not in values:
+            values.append(value)
+    if not values:
+        return ''
+    joined = ', '.join(values)
+    return f"{joined} க்கான " if language == 'ta' else f" for {joined}"
+
+
+# Label words that already say what the aggregation says ("Total_Sales" summed)
+_AGG_LABEL_WORDS = {
+    'SUM': {'total', 'sum'},
+    'AVG': {'average', 'avg', 'mean'},
+    'MAX': {'highest', 'max', 'maximum'},
+    'MIN': {'lowest', 'min', 'minimum'},
+}
+
+
+def _render_aggregation(df, plan, language, profile):
+    if len(df) != 1 or 'result' not in df.columns:
+        return None
+    value = df['result'].iloc[0]
+    if pd.isna(value):
+        return None
+
+    agg = (plan.get('aggregation_function') or df.attrs.get('aggregation_function') or '').upper()
+    column = plan.get('aggregation_column') or df.attrs.get('aggregation_column') or ''
+    label, scope = _column_label(column, language), _scope(plan, language)
+    if scope is None:
+        return None
+
+    if agg == 'COUNT':
+        count = _number(int(value), language)
+        if language == 'ta':
+            return f"{scope}மொத்தம் {count} பதிவுகள் உள்ளன."
+        return f"So, there are {count} matching records{scope}."
+
+    # A summed ratio is not a percentage of anything
+    scale = _percent_scale(column, profile) if agg in ('AVG', 'MAX', 'MIN') else None
+    if scale is _UNKNOWN_SCALE:
+        return None
+
+    words = {
+        'SUM': ('total', 'மொத்த'),
+        'AVG': ('average', 'சராசரி'),
+        'MAX': ('highest', 'அதிகபட்ச'),
+        'MIN': ('lowest', 'குறைந்தபட்ச'),
+    }.get(agg)
+    if words is None or not label:
+        return None
+    number = _number(value, language, scale)
+    if _label(column).split()[0] not in _AGG_LABEL_WORDS[agg]:  # "total sales", not "total total sales"
+        label = f"{words[1 if language == 'ta' else 0]} {label}"
+    if language == 'ta':
+        return f"{scope}{label} {number}."
+    return f"So, the {label}{scope} is {number}."
+
+
+def _render_metric(df, plan, language, profile):
+    if len(df) != 1 or len(df.columns) != 1:
+        return None
+    column = df.columns[0]
+    value = df[column].iloc[0]
+    if not pd.api.types.is_numeric_dtype(df[column]) or pd.isna(value):
+        return None
+    label, scope = _column_label(column, language), _scope(plan, language)
+    scale = _percent_scale(column, profile)
+    if scope is None or label is None or scale is _UNKNOWN_SCALE:
+        return None
+    number = _number(value, language, scale)
+    if language == 'ta':
+        return f"{scope}{label} {number}."
+    return f"So, the {label}{scope} is {number}."
+
+
+def _label_and_metric_columns(df):
+    """(label column, numeric column) for a two-column ranked result."""
+    if len(df.columns) != 2:
+        return None
+    numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+    text = [c for c in df.columns if c not in numeric]
+    if len(numeric) != 1 or len(text) != 1:
+        return None
+    return text[0], numeric[0]
+
+
+def _render_ranked(df, plan, language, profile):
+    if not 1 <= len(df) <= MAX_TEMPLATE_ROWS or plan.get('date_grouping'):
+        return None
+    columns = _label_and_metric_columns(df)
+    order_by = plan.get('order_by') or []
+    if columns is None or not order_by:
+        return None
+    name_col, value_col = columns
+    if df[value_col].isna().any():
+        return None
+    # "Top"/"Bottom" only describe the rows when they are ordered by the value
+    if str(order_by[0][0]).lower() != str(value_col).lower():
+        return None
+
+    scope = _scope(plan, language)
+    label = _column_label(value_col, language)
+    scale = _percent_scale(value_col, profile)
+    if scope is None or label is None or scale is _UNKNOWN_SCALE:
+        return None
+
+    descending = str(order_by[0][1]).upper() == 'DESC'
+    rows = [(str(name), _number(value, language, scale)) for name, value in zip(df[name_col], df[value_col])]
+
+    if len(rows) == 1:
+        name, number = rows[0]
+        if language == 'ta':
+            return f"{scope}{name} தான் {'அதிக' if descending else 'குறைந்த'} {label} கொண்டது - {number}."
+        return f"So, {name} has the {'highest' if descending else 'lowest'} {label}{scope}, at {number}."
+
+    listing = ', '.join(f"{name} ({number})" for name, number in rows)
+    if language == 'ta':
+        position = 'முதல்' if descending else 'கடைசி'
+        return f"{scope}{label} அடிப்படையில் {position} {tamil_number_words(len(rows))}: {listing}."
+    position = 'Top' if descending else 'Bottom'
+    return f"{position} {len(rows)} by {label}{scope}: {listing}."
+
+
+def _render_comparison(df, plan, language, profile):
+    analysis = df.attrs.get('analysis') or {}
+    if analysis.get('error') or 'period_a_value' not in analysis:
+        return None
+    if analysis.get('periods'):
+        return None  # N-period comparisons are left to the LLM explainer
+    value_a, value_b = analysis.get('period_a_value'), analysis.get('period_b_value')
+    if not isinstance(value_a, (int, float)) or not isinstance(value_b, (int, float)):
+        return None
+
+    column = (plan.get('comparison') or {}).get('period_a', {}).get('column', '')
+    scale = _percent_scale(column, profile)
+    if scale is _UNKNOWN_SCALE:
+        return None
+    label_a, label_b = analysis.get('period_a_label', 'A'), analysis.get('period_b_label', 'B')
+    number_a, number_b = _number(value_a, language, scale), _number(value_b, language, scale)
+    direction = analysis.get('direction')
+    pct = analysis.get('percentage_change')
+
+    if language == 'ta':
+        text = f"{label_a}: {number_a}, {label_b}: {number_b}."
+        if direction in ('increased', 'decreased') and pct is not None:
+            change = 'அதிகம்' if direction == 'increased' else 'குறைவு'
+            text += f" {label_b} சுமார் {tamil_number_words(round(abs(pct)))} சதவீதம் {change}."
+        return text
+
+    if direction in ('increased', 'decreased') and pct is not None:
+        change = 'higher' if direction == 'increased' else 'lower'
+        return f"So, {label_b} is at {number_b} versus {number_a} for {label_a} - about {abs(pct):.0f}% {change}."
+    return f"So, {label_a} and {label_b} are level at {number_b}."
+
+
+_RENDERERS = {
+    'aggregation_on_subset': _render_aggregation,
+    'metric': _render_metric,
+    'extrema_lookup': _render_ranked,
+    'rank': _render_ranked,
+    'comparison': _render_comparison,
+}
+
+
+def render_template_explanation(
+    result_df,
+    query_plan: Optional[dict],
+    language: str = 'en',
+    user_name: Optional[str] = None,
+    enabled_types: Optional[List[str]] = None,
+    profile: Optional[dict] = None,
+) -> Optional[str]:
+    """
+    Deterministic explanation for simple results, or None to use the LLM.
+
+    Args:
+        result_df: Query result (DataFrame, attrs may carry advanced analysis)
+        query_plan: The validated plan that produced it
+        language: 'en' or 'ta' - Tamil output needs no further translation
+        user_name: Session name from "Call me X"
+        enabled_types: Query types allowed to use templates
+                       (default: explanation.template_query_types)
+        profile: Profile of the plan's table; its column min/max decide
+                 whether ratio columns hold fractions or percents
+
+    Returns:
+        Explanation text, or None if the result is not a simple shape
+    """
+    if result_df is None or len(result_df) == 0 or not query_plan:
+        return None
+    if result_df.attrs.get('is_multi_step'):
+        return None
+
+    if enabled_types is None:
+        from utils.config_loader import get_config
+        explanation_config = get_config().explanation
+        if not explanation_config.template_fast_path:
+            return None
+        enabled_types = explanation_config.template_query_types
+
+    query_type = query_plan.get('query_type') or result_df.attrs.get('query_type')
+    renderer = _RENDERERS.get(query_type)
+    if renderer is None or query_type not in enabled_types:
+        return None
+
+    try:
+        text = renderer(result_df, query_plan, language, profile)
+    except Exception as e:
+        print(f"[WARN]  Template explanation failed ({e}), using LLM")
+        return None
+    if not text:
+        return None
+
+    _record(query_type, language)
+    print(f"[YES] Template explanation ({query_type}, {language}) - LLM skipped")
+    if user_name:
+        text = f"{user_name}, {text[0].lower()}{text[1:]}" if language == 'en' else f"{user_name}, {text}"
+    return text
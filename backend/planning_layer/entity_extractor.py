@@ -11,6 +11,8 @@ import re
 from typing import Dict, Optional, List, Any, Set
 from datetime import datetime, timedelta
 
+from utils.phrase_matcher import PhraseMatcher, PhraseMatch
+
 
 class EntityExtractor:
     """
@@ -146,6 +148,9 @@ class EntityExtractor:
         self._learned_products: Set[str] = set()
         self._learned_custom_entities: Dict[str, Set[str]] = {}
         self._profiles_loaded = False
+        # Aho-Corasick automaton over locations/categories/custom values.
+        # Built once per refresh_from_profiles (lazily for the defaults).
+        self._matcher: Optional[PhraseMatcher] = None
 
     def refresh_from_profiles(self, profile_store=None):
         """
@@ -225,11 +230,47 @@ class EntityExtractor:
                             self._learned_custom_entities[entity_key].add(val.lower().strip())
 
         self._profiles_loaded = True
+        self._matcher = self._build_matcher()
         print(f"  [OK] Learned entities from profiles:")
         print(f"    - {len(self._learned_locations)} locations")
         print(f"    - {len(self._learned_categories)} categories")
         print(f"    - {len(self._learned_products)} products")
         print(f"    - {len(self._learned_custom_entities)} custom dimensions")
+        print(f"    - {len(self._matcher)} phrases in entity matcher")
+
+    def _build_matcher(self) -> PhraseMatcher:
+        """
+        Build one automaton over every value the value-based extractors look for.
+
+        Payloads: ('location', None), ('category', None), ('custom', entity_type).
+        Metric keywords are never registered as categories.
+        """
+        matcher = PhraseMatcher()
+        for loc in self.LOCATIONS:
+            matcher.add(loc, ('location', None))
+        for cat in self.CATEGORIES:
+            if cat.lower() in self.METRIC_EXCLUSIONS:
+                continue
+            matcher.add(cat, ('category', None))
+        for entity_type, values in self._learned_custom_entities.items():
+            for val in values:
+                matcher.add(val.lower(), ('custom', entity_type))
+        return matcher.build()
+
+    def _entity_hits(self, text_lower: str) -> List[PhraseMatch]:
+        """Scan the question once for all known location/category/custom values."""
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self._matcher = self._build_matcher()
+        return matcher.find_all(text_lower)
+
+    @staticmethod
+    def _best_hit(hits: List[PhraseMatch], kind: str, entity_type: str = None) -> Optional[PhraseMatch]:
+        """Longest (then earliest) hit carrying the given payload kind."""
+        return PhraseMatcher.longest(
+            h for h in hits
+            if any(p[0] == kind and (entity_type is None or p[1] == entity_type) for p in h.payloads)
+        )
 
     @property
     def LOCATIONS(self) -> Set[str]:
@@ -335,13 +376,14 @@ class EntityExtractor:
         - explicit_table: If user mentions specific table/sheet
         """
         q_lower = question.lower()
+        hits = self._entity_hits(q_lower)
 
         return {
             'month': self._extract_month(q_lower),
             'all_months': self._extract_all_months(q_lower),
             'metric': self._extract_metric(q_lower),
-            'category': self._extract_category(q_lower, question),
-            'location': self._extract_location(q_lower),
+            'category': self._extract_category(q_lower, question, hits),
+            'location': self._extract_location(q_lower, hits),
             'aggregation': self._extract_aggregation(q_lower),
             'comparison': self._is_comparison(q_lower),
             'multi_month_comparison': self._is_multi_month_comparison(q_lower),
@@ -351,7 +393,7 @@ class EntityExtractor:
             'time_period': self._extract_time_period(q_lower),
             'explicit_table': self._extract_explicit_table(question),
             'date_specific': self._extract_specific_date(q_lower),
-            'custom_entities': self._extract_custom_entities(q_lower),
+            'custom_entities': self._extract_custom_entities(q_lower, hits),
             # Analytical intent detection
             'trend_intent': self._is_trend_query(q_lower),
             'summary_intent': self._is_summary_query(q_lower),
@@ -410,7 +452,8 @@ class EntityExtractor:
         'total', 'average', 'count', 'sum', 'net', 'gross'
     }
 
-    def _extract_category(self, text_lower: str, original: str) -> Optional[str]:
+    def _extract_category(self, text_lower: str, original: str,
+                          hits: Optional[List[PhraseMatch]] = None) -> Optional[str]:
         """
         Extract product category from text.
         Checks quoted terms first, then known categories.
@@ -428,29 +471,15 @@ class EntityExtractor:
         if single_quoted:
             return single_quoted[0]
 
-        # Collect all matching categories with their position and length
-        matches = []
-        for cat in self.CATEGORIES:
-            # Skip if this is a metric keyword (not a real product category)
-            if cat.lower() in self.METRIC_EXCLUSIONS:
-                continue
-
-            pattern = r'\b' + re.escape(cat) + r'\b'
-            match = re.search(pattern, text_lower)
-            if match:
-                matches.append((cat, len(cat), match.start()))
-
-        if not matches:
-            return None
-
-        # Sort by: 1) Length descending (longer = more specific)
-        #          2) Position ascending (earlier in text = more likely intended)
+        # Known categories (metric keywords are excluded when the matcher is built).
+        # Longest match wins (more specific), earlier position breaks ties.
         # This ensures "Sarees" beats "sales" and earlier mentions win ties
-        matches.sort(key=lambda x: (-x[1], x[2]))
-
-        return matches[0][0].title()
+        if hits is None:
+            hits = self._entity_hits(text_lower)
+        best = self._best_hit(hits, 'category')
+        return best.phrase.title() if best else None
 
-    def _extract_location(self, text: str) -> Optional[str]:
+    def _extract_location(self, text: str, hits: Optional[List[PhraseMatch]] = None) -> Optional[str]:
         """Extract location/city from text with fuzzy matching support.
 
         Handles cases like:
@@ -458,12 +487,13 @@ class EntityExtractor:
         - "Bangalore" matching "Bangalore Central"
         """
         text_lower = text.lower()
+        if hits is None:
+            hits = self._entity_hits(text_lower)
 
-        # First try exact match on learned locations
-        for loc in self.LOCATIONS:
-            pattern = r'\b' + re.escape(loc) + r'\b'
-            if re.search(pattern, text_lower):
-                return loc.title()
+        # First try exact match on learned locations (longest match wins)
+        best = self._best_hit(hits, 'location')
+        if best:
+            return best.phrase.title()
 
         # FUZZY MATCH: Check if user's input is a PREFIX of any learned location
         # e.g., "chennai" should match "chennai main"
@@ -484,12 +514,12 @@ class EntityExtractor:
         location_entity_types = ['area_name', 'area', 'location', 'city', 'zone', 'region']
         for entity_type in location_entity_types:
             if entity_type in self._learned_custom_entities:
+                # Exact match
+                best = self._best_hit(hits, 'custom', entity_type)
+                if best:
+                    return best.phrase.title()
                 for val in self._learned_custom_entities[entity_type]:
                     val_lower = val.lower()
-                    # Exact match
-                    pattern = r'\b' + re.escape(val_lower) + r'\b'
-                    if re.search(pattern, text_lower):
-                        return val.title()
                     # Fuzzy: check if user input contains start of location
                     for city in common_cities:
                         if city in text_lower and val_lower.startswith(city):
@@ -765,19 +795,25 @@ class EntityExtractor:
 
         return None
 
-    def _extract_custom_entities(self, text: str) -> Dict[str, str]:
+    def _extract_custom_entities(self, text: str, hits: Optional[List[PhraseMatch]] = None) -> Dict[str, str]:
         """
         Extract custom entities learned from dimension columns.
         Returns dict mapping entity_type -> matched_value
         """
-        found = {}
-        for entity_type, values in self._learned_custom_entities.items():
-            for val in values:
-                pattern = r'\b' + re.escape(val) + r'\b'
-                if re.search(pattern, text):
-                    found[entity_type] = val.title()
-                    break  # Only one match per entity type
-        return found
+        if hits is None:
+            hits = self._entity_hits(text)
+
+        # Only one match per entity type: longest, then earliest
+        best_by_type: Dict[str, PhraseMatch] = {}
+        for hit in hits:
+            for kind, entity_type in hit.payloads:
+                if kind != 'custom':
+                    continue
+                current = best_by_type.get(entity_type)
+                if current is None or PhraseMatcher.longest((current, hit)) is hit:
+                    best_by_type[entity_type] = hit
+
+        return {entity_type: hit.phrase.title() for entity_type, hit in best_by_type.items()}
 
     def _is_trend_query(self, text: str) -> bool:
         """
@@ -0,0 +1,454 @@
+"""
+Fast Planner - deterministic plans for simple, unambiguous questions.
+
+Most single-table questions ("total sales in Chennai", "which branch has the
+highest profit", "top 5 branches by revenue") map onto one plan template once
+the metric, dimension and filter values are resolved against the routed
+table's profile. Building those plans from rules skips a Gemini round-trip.
+
+The fast path is deliberately conservative. It only answers when:
+- the router is confident about the table
+- estimate_query_complexity() says the question is simple
+- every content word of the question is explained by the table profile
+  (a metric column, a dimension column, a known dimension value) or by the
+  small planning vocabulary below
+- each column reference resolves to exactly one column
+
+Anything else returns None and the caller falls back to the LLM planner.
+Fast plans go through the same validate_plan() as LLM plans (pass it as
+plan(..., validate=validate_plan) so rejections are counted per pattern).
+
+Patterns:
+- aggregate:  "total sales in Chennai"            -> aggregation_on_subset SUM/AVG
+- count:      "how many transactions using UPI"   -> aggregation_on_subset COUNT
+              (counting alongside a metric, "count of sales", goes to the LLM)
+- extrema:    "which branch has the highest profit" -> rank (group_by, LIMIT 1)
+- rank:       "top 5 branches by revenue"         -> rank (group_by, LIMIT N)
+- breakdown:  "total profit for each state"       -> rank (group_by, all groups)
+- row_extrema: "transaction with the highest profit" -> extrema_lookup
+              (also a bare "highest profit": the single highest row, not a total)
+- list:       "list all categories"               -> rank (distinct dimension values)
+
+Report: scripts/fast_planner_report.py
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from utils.phrase_matcher import PhraseMatcher
+
+# Signals that need the LLM planner (filters on numbers/dates, ratios, comparisons)
+_LLM_ONLY_RE = re.compile(
+    r"\b(compare|comparison|versus|vs|trend|growth|over time|why|forecast|predict|project(ed|ion)?|"
+    r"between|share|contribution|ratio|percent of|percentage of|where|greater|less|more than|fewer|"
+    r"above|below|at least|at most|unique|distinct|except|excluding|without|not|"
+    r"last|previous|this|next|today|yesterday|week|quarter|year|date|daily|monthly|"
+    r"negative|positive|zero|and|or)\b"
+)
+
+_COUNT_RE = re.compile(r"\b(how many|number of|count of|count)\b")
+_AVG_RE = re.compile(r"\b(average|avg|mean)\b")
+_SUM_RE = re.compile(r"\b(total|sum|overall)\b")
+_DESC_RE = re.compile(r"\b(highest|most|maximum|max|top|best|largest|biggest)\b")
+_ASC_RE = re.compile(r"\b(lowest|least|minimum|min|bottom|worst|smallest)\b")
+_BREAKDOWN_RE = re.compile(r"\b(by|per|each|every|wise|grouped)\b")
+_LIST_RE = re.compile(r"^\s*(show|list|display|get|give)\b")
+
+_NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+}
+_LIMIT_RE = re.compile(r"\b(top|bottom|first)\s+(\d+|" + "|".join(_NUMBER_WORDS) + r")\b")
+
+# Words that carry no column meaning in a simple question
+_FILLER_WORDS = {
+    'a', 'an', 'the', 'of', 'for', 'in', 'at', 'on', 'to', 'from', 'by', 'per',
+    'each', 'every', 'all', 'what', 'which', 'who', 'is', 'are', 'was', 'were',
+    'has', 'have', 'had', 'with', 'show', 'list', 'display', 'give', 'get', 'me',
+    'find', 'tell', 'total', 'sum', 'overall', 'average', 'avg', 'mean', 'how',
+    'many', 'number', 'count', 'highest', 'most', 'maximum', 'max', 'top', 'best',
+    'largest', 'biggest', 'lowest', 'least', 'minimum', 'min', 'bottom', 'worst',
+    'smallest', 'first', 'made', 'using', 'via', 'through', 'across', 'generated',
+    'recorded', 'earned', 'sold', 'collected', 'there', 'do', 'does', 'did', 'i',
+    'we', 'our', 'my', 'please', 'wise', 'grouped', 'present', 'performing',
+    'performance', 'value', 'amount', 'can', 'you', 'it', 'its', 'be', 'been',
+    'identify', 'much', 'whole', 'entire', 'data', 'record', 'row', 'entry',
+} | set(_NUMBER_WORDS)
+
+# Column-name tokens that do not need to appear in the question
+_GENERIC_COLUMN_TOKENS = {'amount', 'total', 'value', 'sum', 'name', 'no', 'num', 'inr', 'rs', 'id'}
+
+# Metrics that must be averaged, never summed
+_RATIO_TOKENS = {'percentage', 'percent', 'pct', 'margin', 'rate', 'ratio', 'avg', 'average'}
+_RATIO_METRIC_TYPES = {'percentage', 'grade', 'score', 'rank', 'pressure', 'pulse'}
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding so "branches" matches "Branch" and "sales" matches "Sale"."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercase, stemmed word tokens ("%" reads as "percentage")."""
+    text = text.replace('%', ' percentage ')
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text).lower()
+    return [_stem(t) for t in re.findall(r"[a-z0-9]+", text)]
+
+
+class _TableVocabulary:
+    """Per-table lookup structures derived from one profile."""
+
+    def __init__(self, table: str, profile: dict):
+        self.table = table
+        self.table_type = profile.get('table_type', 'unknown')
+        self.table_tokens = set(_tokens(table))
+
+        self.metrics: Dict[str, dict] = {}
+        self.dimensions: Dict[str, dict] = {}
+        self.identifiers: List[str] = []
+        self.column_tokens: Dict[str, Set[str]] = {}
+        self.synonym_tokens: Dict[str, Set[str]] = {}
+
+        values = PhraseMatcher()
+        for col, info in profile.get('columns', {}).items():
+            role = info.get('role')
+            tokens = set(_tokens(col))
+            self.column_tokens[col] = tokens
+            self.synonym_tokens[col] = {t for syn in info.get('synonyms', []) for t in _tokens(str(syn))}
+            if role == 'metric':
+                self.metrics[col] = info
+            elif role == 'dimension':
+                self.dimensions[col] = info
+                for value in info.get('unique_values', []):
+                    value = str(value).strip().lower()
+                    if len(value) >= 2 and not value.replace('.', '').isdigit():
+                        values.add(value, col)
+            elif role == 'identifier':
+                self.identifiers.append(col)
+        self.values = values.build()
+
+        # Row nouns: "transaction" explains itself on a table with Transaction_ID
+        self.row_tokens: Set[str] = set()
+        for col in self.identifiers:
+            self.row_tokens |= self.column_tokens[col] - _GENERIC_COLUMN_TOKENS
+
+    def is_ratio_metric(self, col: str) -> bool:
+        info = self.metrics.get(col, {})
+        return bool(self.column_tokens[col] & _RATIO_TOKENS) or info.get('metric_type') in _RATIO_METRIC_TYPES
+
+    def mentioned_columns(self, columns, question_tokens: Set[str]) -> List[Tuple[str, Set[str]]]:
+        """
+        Columns whose distinctive name tokens all appear in the question.
+
+        Returns (column, matched tokens) pairs, most specific first. Falls back
+        to profile synonyms when no column name matches.
+        """
+        hits = []
+        for col in columns:
+            required = self.column_tokens[col] - _GENERIC_COLUMN_TOKENS
+            if required and required <= question_tokens:
+                hits.append((col, required))
+        if not hits:
+            for col in columns:
+                matched = self.synonym_tokens[col] & question_tokens
+                if matched:
+                    hits.append((col, matched))
+        hits.sort(key=lambda hit: -len(hit[1]))
+        return hits
+
+
+def _pick_one(hits: List[Tuple[str, Set[str]]]) -> Optional[Tuple[str, Set[str]]]:
+    """The single most specific hit, or None when there is a tie."""
+    if not hits:
+        return None
+    if len(hits) > 1 and len(hits[1][1]) == len(hits[0][1]):
+        return None
+    return hits[0]
+
+
+class FastPlanner:
+    """
+    Rule-based planner for the simple, high-confidence slice of questions.
+
+    Vocabularies are cached per table and rebuilt when ProfileStore.version changes.
+    """
+
+    def __init__(self, profile_store, min_confidence: float = 0.7, enabled: bool = True):
+        """
+        Args:
+            profile_store: ProfileStore with table profiles
+            min_confidence: Minimum routing confidence to attempt a fast plan
+            enabled: Master switch (query.fast_planner_enabled)
+        """
+        self.profile_store = profile_store
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+
+        self._vocab: Dict[str, _TableVocabulary] = {}
+        self._vocab_version = None
+        self._lock = threading.Lock()
+
+        self._attempts = 0
+        self._bypassed = 0
+        self._rejected = 0
+        self._by_pattern: Dict[str, int] = {}
+
+    def _vocabulary(self, table: str) -> Optional[_TableVocabulary]:
+        version = getattr(self.profile_store, 'version', None)
+        with self._lock:
+            if version != self._vocab_version:
+                self._vocab = {}
+                self._vocab_version = version
+            vocab = self._vocab.get(table)
+            if vocab is None:
+                profile = self.profile_store.get_profile(table)
+                if not profile:
+                    return None
+                vocab = self._vocab[table] = _TableVocabulary(table, profile)
+        return vocab
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def plan(
+        self,
+        question: str,
+        table: str,
+        entities: dict = None,
+        confidence: float = 1.0,
+        validate: Optional[Callable[[dict], Any]] = None,
+    ) -> Optional[dict]:
+        """
+        Build a plan without the LLM, or return None if the question is not
+        simple enough to be sure.
+
+        Args:
+            question: English question (translated for Tamil input)
+            table: Table chosen by the router
+            entities: Entities from EntityExtractor
+            confidence: Routing confidence for table
+            validate: validate_plan; a plan it rejects (ValueError) is counted
+                as rejected and None is returned
+
+        Returns:
+            Plan dict (validated when validate is given) or None
+        """
+        if not self.enabled or not table or confidence < self.min_confidence:
+            return None
+
+        with self._lock:
+            self._attempts += 1
+
+        plan, pattern = self._build(question, table, entities or {})
+        if plan is None:
+            return None
+
+        if validate is not None:
+            try:
+                validate(plan)
+            except ValueError as e:
+                print(f"  [FastPlanner] {pattern} plan rejected by validator: {e} - using LLM planner")
+                with self._lock:
+                    self._rejected += 1
+                return None
+
+        with self._lock:
+            self._bypassed += 1
+            self._by_pattern[pattern] = self._by_pattern.get(pattern, 0) + 1
+        print(f"  [FastPlanner] {pattern} plan for {table}")
+        return plan
+
+    def stats(self) -> Dict[str, Any]:
+        """Bypass counters for logging and the report script."""
+        with self._lock:
+            return {
+                'attempts': self._attempts,
+                'bypassed': self._bypassed,
+                'rejected': self._rejected,
+                'bypass_rate': round(self._bypassed / self._attempts, 3) if self._attempts else 0.0,
+                'by_pattern': dict(self._by_pattern),
+            }
+
+    # ------------------------------------------------------------------
+    # Plan construction
+    # ------------------------------------------------------------------
+
+    def _build(self, question: str, table: str, entities: dict) -> Tuple[Optional[dict], Optional[str]]:
+        from planning_layer.planner_client import estimate_query_complexity
+
+        q_lower = question.lower().strip().rstrip('?.! ')
+        if not q_lower or _LLM_ONLY_RE.search(q_lower):
+            return None, None
+        if estimate_query_complexity(question, entities) != 'simple':
+            return None, None
+        if any(entities.get(key) for key in (
+            'month', 'all_months', 'date_specific', 'comparison', 'multi_month_comparison',
+            'cross_table_intent', 'multi_domain_query', 'trend_intent', 'impact_intent',
+        )):
+            return None, None
+        time_period = entities.get('time_period')
+        if time_period and not str(time_period).startswith(('top_', 'bottom_', 'first_')):
+            return None, None
+
+        vocab = self._vocabulary(table)
+        if vocab is None:
+            return None, None
+
+        # 1. Dimension values -> filters (each value must belong to one column)
+        filters = []
+        consumed: Set[str] = set()
+        filtered_columns = set()
+        for match in vocab.values.find_all(q_lower):
+            if len(match.payloads) != 1:
+                return None, None
+            column = match.payloads[0]
+            filters.append({"column": column, "operator": "LIKE", "value": f"%{match.phrase}%"})
+            filtered_columns.add(column)
+            consumed.update(_tokens(match.phrase))
+
+        # Extracted location/category must be one of this table's values
+        for key in ('location', 'category'):
+            value = entities.get(key)
+            if value and not any(str(value).lower() in f["value"].lower() for f in filters):
+                return None, None
+
+        question_tokens = set(_tokens(q_lower)) - consumed
+
+        # 2. Metric and dimension columns named in the question
+        metric_hits = vocab.mentioned_columns(vocab.metrics, question_tokens)
+        metric_hit = _pick_one(metric_hits)
+        if metric_hits and metric_hit is None:
+            return None, None  # ambiguous metric
+
+        dim_hits = [
+            hit for hit in vocab.mentioned_columns(vocab.dimensions, question_tokens)
+            if hit[0] not in filtered_columns
+        ]
+        if len(dim_hits) > 1:
+            return None, None  # multi-dimension grouping is LLM territory
+        dim_hit = dim_hits[0] if dim_hits else None
+
+        # 3. Every remaining word must be explained
+        explained = set(_FILLER_WORDS) | vocab.table_tokens | vocab.row_tokens
+        for hit in (metric_hit, dim_hit):
+            if hit:
+                explained |= vocab.column_tokens[hit[0]] | hit[1]
+        limit_match = _LIMIT_RE.search(q_lower)
+        if limit_match:
+            explained.add(limit_match.group(2))
+        if question_tokens - explained:
+            return None, None
+
+        metric = metric_hit[0] if metric_hit else None
+        dimension = dim_hit[0] if dim_hit else None
+        return self._template(q_lower, vocab, metric, dimension, filters, limit_match)
+
+    def _template(self, q_lower, vocab, metric, dimension, filters, limit_match):
+        """Map the resolved columns + intent words onto one plan template."""
+        wants_count = bool(_COUNT_RE.search(q_lower))
+        wants_avg = bool(_AVG_RE.search(q_lower))
+        wants_sum = bool(_SUM_RE.search(q_lower))
+        direction = None
+        if _DESC_RE.search(q_lower):
+            direction = "DESC"
+        if _ASC_RE.search(q_lower):
+            if direction:
+                return None, None
+            direction = "ASC"
+        if limit_match and limit_match.group(1) == 'bottom':
+            direction = "ASC"
+
+        limit = None
+        if limit_match:
+            raw = limit_match.group(2)
+            limit = int(raw) if raw.isdigit() else _NUMBER_WORDS[raw]
+
+        # "count of sales" / "how many sales": rows, distinct values or a
+        # summed quantity - the COUNT template only covers rows without a metric
+        if wants_count and metric:
+            return None, None
+
+        if metric:
+            agg = "AVG" if wants_avg or vocab.is_ratio_metric(metric) else "SUM"
+        else:
+            agg = None
+
+        # Grouped patterns: extrema / rank / breakdown / list
+        if dimension:
+            if filters:
+                return None, None
+            if metric and direction:
+                pattern = "rank" if limit else "extrema"
+                return self._rank_plan(vocab.table, dimension, metric, agg, direction, limit or 1), pattern
+            if metric and _BREAKDOWN_RE.search(q_lower):
+                return self._rank_plan(vocab.table, dimension, metric, agg, "DESC", 100), "breakdown"
+            if not metric and not direction and not wants_count and _LIST_RE.search(q_lower):
+                return {
+                    "query_type": "rank",
+                    "table": vocab.table,
+                    "select_columns": [dimension],
+                    "group_by": [dimension],
+                    "order_by": [[dimension, "ASC"]],
+                    "limit": 100,
+                }, "list"
+            return None, None
+
+        # Ungrouped patterns: aggregate / count / row extrema
+        if metric and direction and not (wants_sum or wants_avg or wants_count) and not limit:
+            return {
+                "query_type": "extrema_lookup",
+                "table": vocab.table,
+                "select_columns": [],
+                "filters": filters,
+                "order_by": [[metric, direction]],
+                "limit": 1,
+            }, "row_extrema"
+
+        if direction or limit:
+            return None, None
+
+        if metric and (wants_sum or wants_avg):
+            return self._subset_plan(vocab.table, agg, metric, filters), "aggregate"
+
+        if not metric and wants_count:
+            # Counting rows only makes sense on row-level data
+            if vocab.table_type in ('summary', 'pivot', 'category_breakdown'):
+                return None, None
+            count_column = vocab.identifiers[0] if vocab.identifiers else None
+            if count_column is None:
+                return None, None
+            return self._subset_plan(vocab.table, "COUNT", count_column, filters), "count"
+
+        return None, None
+
+    @staticmethod
+    def _rank_plan(table, dimension, metric, agg, direction, limit):
+        return {
+            "query_type": "rank",
+            "table": table,
+            "select_columns": [dimension, metric],
+            "group_by": [dimension],
+            "order_by": [[metric, direction]],
+            "aggregation_function": agg,
+            "limit": limit,
+        }
+
+    @staticmethod
+    def _subset_plan(table, agg, column, filters):
+        return {
+            "query_type": "aggregation_on_subset",
+            "table": table,
+            "aggregation_function": agg,
+            "aggregation_column": column,
+            "subset_filters": filters,
+            "subset_order_by": [],
+            "subset_limit": None,
+        }
@@ -11,12 +11,13 @@ Key advantages:
 4. Provides explanation for debugging
 """
 
-import os
 import json
 import threading
 from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 
+from utils.single_flight import generate_once
+
 # Load environment variables
 load_dotenv()
 
@@ -37,7 +38,8 @@ class CompatibleGenerativeModel:
     def generate_content(self, prompt, **kwargs):
         """Prepend system prompt to user message."""
         full_prompt = f"{self._system_prompt}\n\n---\n\nUser Query:\n{prompt}"
-        return self._model.generate_content(full_prompt, **kwargs)
+        # Identical concurrent/recent selections share one call
+        return generate_once(self._model, full_prompt, **kwargs)
 
     def __getattr__(self, name):
         """Forward other attributes to underlying model."""
@@ -161,18 +163,13 @@ def get_selector_model():
         if _selector_model is not None:
             return _selector_model
 
-        import google.generativeai as genai
-
-        api_key = (os.getenv("GEMINI_API_KEY") or "").strip()
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment")
-
-        genai.configure(api_key=api_key)
+        from utils.llm_provider import create_model
 
         # Create base model without system_instruction (for compatibility with 0.3.x)
-        base_model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
-            generation_config={
+        base_model = create_model(
+            "selector",
+            "gemini-2.0-flash",
+            {
                 "temperature": 0.0,  # Deterministic
                 "response_mime_type": "application/json",
                 "max_output_tokens": 500,
@@ -185,6 +182,103 @@ def get_selector_model():
         return _selector_model
 
 
+def _build_table_section(table_name: str, profile: Dict) -> str:
+    """
+    Markdown description of one table for the selector prompt.
+    Marks whether the table has a Date column for trend analysis.
+    """
+    lines = []
+
+    row_count = profile.get('row_count', 0)
+    table_type = profile.get('table_type', 'unknown')
+    columns = profile.get('columns', {})
+
+    # CRITICAL: Check if table has a Date column (for trend analysis)
+    date_column_name = None
+    has_date_column = False
+    for col_name, col_info in columns.items():
+        col_lower = col_name.lower()
+        col_role = col_info.get('role', '')
+        # Check for actual date columns (not ID columns!)
+        is_date_col = (
+            col_role == 'date' or
+            any(d in col_lower for d in ['date', 'datetime', 'timestamp', 'created_at', 'order_date'])
+        )
+        # Exclude ID columns that might contain "date" in name
+        is_id_col = any(id_pat in col_lower for id_pat in ['_id', 'id_', 'sku_', 'transaction_id', 'order_id'])
+        if is_date_col and not is_id_col:
+            has_date_column = True
+            date_column_name = col_name
+            break
+
+    # Check if this is a partial data or aggregated table
+    name_lower = table_name.lower()
+    is_partial = any(x in name_lower for x in ['top_', 'top20', 'top10'])
+    is_aggregated = any(x in name_lower for x in ['summary', 'quarterly', 'monthly', 'yearly', 'performance', 'overview', 'analysis'])
+    is_transaction = any(x in name_lower for x in ['transaction', 'daily', 'detail', 'raw', 'order', 'sale'])
+
+    # Detect specific summary types for comparison/percentage queries
+    is_state_summary = 'state' in name_lower and is_aggregated
+    is_category_summary = 'category' in name_lower and is_aggregated
+    is_payment_summary = 'payment' in name_lower and is_aggregated
+    is_branch_summary = 'branch' in name_lower and is_aggregated
+
+    # Build notes list
+    notes = []
+
+    # Date column indicator (CRITICAL for trend queries)
+    if has_date_column:
+        notes.append(f"[YES] HAS DATE COLUMN ({date_column_name}) - USE FOR TRENDS")
+    else:
+        notes.append("[WARN] NO DATE COLUMN - CANNOT USE FOR TREND ANALYSIS")
+
+    # Table type indicators with specific usage hints
+    if is_partial:
+        notes.append("PARTIAL DATA - Top N only, NOT for totals")
+    elif is_state_summary:
+        notes.append("STATE SUMMARY - USE FOR state comparisons & percentages")
+    elif is_category_summary:
+        notes.append("CATEGORY SUMMARY - USE FOR category comparisons & percentages")
+    elif is_payment_summary:
+        notes.append("PAYMENT SUMMARY - USE FOR payment mode comparisons & percentages")
+    elif is_branch_summary:
+        notes.append("BRANCH SUMMARY - USE FOR branch comparisons")
+    elif is_aggregated:
+        notes.append("AGGREGATED/SUMMARY - Pre-computed, USE FOR comparisons/percentages")
+    elif is_transaction and row_count > 100:
+        notes.append("TRANSACTION-LEVEL - Use for totals/counts/trends")
+
+    note = " [" + " | ".join(notes) + "]" if notes else ""
+
+    lines.append(f"## {table_name}{note}")
+    lines.append(f"- Rows: {row_count}")
+    lines.append(f"- Type: {table_type}")
+    lines.append(f"- Has Date Column: {'YES (' + date_column_name + ')' if has_date_column else 'NO'}")
+
+    # Add semantic summary if available
+    if profile.get('semantic_summary'):
+        lines.append(f"- Summary: {profile['semantic_summary']}")
+
+    # Add columns with their roles and sample values
+    columns = profile.get('columns', {})
+    if columns:
+        lines.append("- Columns:")
+        for col_name, col_info in list(columns.items())[:15]:  # Limit columns shown
+            role = col_info.get('role', 'unknown')
+            unique_values = col_info.get('unique_values', [])
+
+            col_desc = f"  - {col_name} [{role}]"
+            if unique_values and role == 'dimension':
+                # Show sample values for dimensions
+                sample = ', '.join(str(v) for v in unique_values[:5])
+                col_desc += f" (values: {sample})"
+            lines.append(col_desc)
+
+    lines.append("")  # Blank line between tables
+
+    return "\n".join(lines)
+
+
 def build_rich_table_context(profiles: Dict[str, Dict]) -> str:
     """
     Build a rich context string describing all tables for the LLM.
@@ -195,94 +289,146 @@ def build_rich_table_context(profiles: Dict[str, Dict]) -> str:
         return "No tables available."
 
     lines = ["# Available Tables\n"]
-
     for table_name, profile in profiles.items():
-        row_count = profile.get('row_count', 0)
-        table_type = profile.get('table_type', 'unknown')
-        columns = profile.get('columns', {})
+        lines.append(_build_table_section(table_name, profile))
 
-        # CRITICAL: Check if table has a Date column (for trend analysis)
-        date_column_name = None
-        has_date_column = False
-        for col_name, col_info in columns.items():
-            col_lower = col_name.lower()
-            col_role = col_info.get('role', '')
-            # Check for actual date columns (not ID columns!)
-            is_date_col = (
-                col_role == 'date' or
-                any(d in col_lower for d in ['date', 'datetime', 'timestamp', 'created_at', 'order_date'])
-            )
-            # Exclude ID columns that might contain "date" in name
-            is_id_col = any(id_pat in col_lower for id_pat in ['_id', 'id_', 'sku_', 'transaction_id', 'order_id'])
-            if is_date_col and not is_id_col:
-                has_date_column = True
-                date_column_name = col_name
-                break
-
-        # Check if this is a partial data or aggregated table
-        name_lower = table_name.lower()
-        is_partial = any(x in name_lower for x in ['top_', 'top20', 'top10'])
-        is_aggregated = any(x in name_lower for x in ['summary', 'quarterly', 'monthly', 'yearly', 'performance', 'overview', 'analysis'])
-        is_transaction = any(x in name_lower for x in ['transaction', 'daily', 'detail', 'raw', 'order', 'sale'])
-
-        # Detect specific summary types for comparison/percentage queries
-        is_state_summary = 'state' in name_lower and is_aggregated
-        is_category_summary = 'category' in name_lower and is_aggregated
-        is_payment_summary = 'payment' in name_lower and is_aggregated
-        is_branch_summary = 'branch' in name_lower and is_aggregated
-
-        # Build notes list
-        notes = []
-
-        # Date column indicator (CRITICAL for trend queries)
-        if has_date_column:
-            notes.append(f"[YES] HAS DATE COLUMN ({date_column_name}) - USE FOR TRENDS")
-        else:
-            notes.append("[WARN] NO DATE COLUMN - CANNOT USE FOR TREND ANALYSIS")
-
-        # Table type indicators with specific usage hints
-        if is_partial:
-            notes.append("PARTIAL DATA - Top N only, NOT for totals")
-        elif is_state_summary:
-            notes.append("STATE SUMMARY - USE FOR state comparisons & percentages")
-        elif is_category_summary:
-            notes.append("CATEGORY SUMMARY - USE FOR category comparisons & percentages")
-        elif is_payment_summary:
-            notes.append("PAYMENT SUMMARY - USE FOR payment mode comparisons & percentages")
-        elif is_branch_summary:
-            notes.append("BRANCH SUMMARY - USE FOR branch comparisons")
-        elif is_aggregated:
-            notes.append("AGGREGATED/SUMMARY - Pre-computed, USE FOR comparisons/percentages")
-        elif is_transaction and row_count > 100:
-            notes.append("TRANSACTION-LEVEL - Use for totals/counts/trends")
-
-        note = " [" + " | ".join(notes) + "]" if notes else ""
-
-        lines.append(f"## {table_name}{note}")
-        lines.append(f"- Rows: {row_count}")
-        lines.append(f"- Type: {table_type}")
-        lines.append(f"- Has Date Column: {'YES (' + date_column_name + ')' if has_date_column else 'NO'}")
-
-        # Add semantic summary if available
-        if profile.get('semantic_summary'):
-            lines.append(f"- Summary: {profile['semantic_summary']}")
-
-        # Add columns with their roles and sample values
-        columns = profile.get('columns', {})
-        if columns:
-            lines.append("- Columns:")
-            for col_name, col_info in list(columns.items())[:15]:  # Limit columns shown
-                role = col_info.get('role', 'unknown')
-                unique_values = col_info.get('unique_values', [])
+    return "\n".join(lines)
+
+
+# ============================================
+# CACHED TABLE CATALOG
+# Table sections are built once per profile-store version; each query only
+# picks and joins the sections of its top candidates.
+# ============================================
+
+# Rough chars-per-token ratio for budget checks (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+
+_catalog_cache: Dict[str, Any] = {"key": None, "sections": {}}
+_catalog_lock = threading.Lock()
+
+
+def _catalog_key(profiles: Dict[str, Dict], profile_version: Optional[int]) -> Any:
+    """Cache key: the store version when known, else a cheap profile signature."""
+    if profile_version is not None:
+        return ("version", profile_version, tuple(profiles.keys()))
+    return ("signature", tuple(
+        (name, profile.get('profiled_at'), profile.get('row_count'))
+        for name, profile in profiles.items()
+    ))
+
+
+def get_table_catalog(profiles: Dict[str, Dict], profile_version: Optional[int] = None) -> Dict[str, str]:
+    """
+    Per-table markdown sections for the selector prompt, cached until the
+    profiles change.
+
+    Args:
+        profiles: Dict of table_name -> profile
+        profile_version: ProfileStore.version (None = derive from profiles)
+
+    Returns:
+        Dict of table_name -> section text
+    """
+    key = _catalog_key(profiles, profile_version)
+    with _catalog_lock:
+        if _catalog_cache["key"] == key:
+            return _catalog_cache["sections"]
+
+    sections = {name: _build_table_section(name, profile) for name, profile in profiles.items()}
+
+    with _catalog_lock:
+        _catalog_cache["key"] = key
+        _catalog_cache["sections"] = sections
+    return sections
+
+
+def _rank_tables_for_prompt(
+    question: str,
+    profiles: Dict[str, Dict],
+    candidate_scores: Optional[List[Tuple[str, int]]] = None
+) -> List[str]:
+    """
+    Order tables by how likely they answer the question.
+
+    Rule-based candidate scores come first, then embedding similarity (when the
+    shared model is loaded), then row count. The largest tables are always kept
+    near the front because the selector rules steer totals/trends to them.
+    """
+    rule_scores = {name: score for name, score in (candidate_scores or []) if name in profiles}
+    similarities = _embedding_similarities(question, profiles)
+
+    def sort_key(name):
+        return (
+            rule_scores.get(name, float('-inf')),
+            similarities.get(name, 0.0),
+            profiles[name].get('row_count', 0),
+        )
+
+    ranked = sorted(profiles.keys(), key=sort_key, reverse=True)
+
+    largest = sorted(profiles.keys(), key=lambda n: profiles[n].get('row_count', 0), reverse=True)[:2]
+    anchors = [name for name in largest if name not in ranked[:2]]
+    return ranked[:2] + anchors + [name for name in ranked[2:] if name not in anchors]
+
+
+def build_pruned_table_context(
+    question: str,
+    profiles: Dict[str, Dict],
+    profile_version: Optional[int] = None,
+    candidate_scores: Optional[List[Tuple[str, int]]] = None,
+    max_tables: Optional[int] = None,
+    token_budget: Optional[int] = None
+) -> str:
+    """
+    Selector context limited to the top-N candidate tables and a token budget.
+
+    Keeps prompt size (and LLM latency) flat as the number of tables grows.
+    With few tables (<= max_tables) this is identical to
+    build_rich_table_context(profiles); the token budget only applies to the
+    relevance-ranked list once tables are pruned.
+
+    Args:
+        question: User's question
+        profiles: Dict of table_name -> profile
+        profile_version: ProfileStore.version for catalog caching
+        candidate_scores: Rule-based (table_name, score) list, best first
+        max_tables: Max tables in the prompt (default: config)
+        token_budget: Approximate token cap for table sections (default: config)
+    """
+    if not profiles:
+        return "No tables available."
+
+    if max_tables is None or token_budget is None:
+        from utils.config_loader import get_config
+        si_config = get_config().schema_intelligence
+        max_tables = si_config.selector_max_tables if max_tables is None else max_tables
+        token_budget = si_config.selector_token_budget if token_budget is None else token_budget
 
-                col_desc = f"  - {col_name} [{role}]"
-                if unique_values and role == 'dimension':
-                    # Show sample values for dimensions
-                    sample = ', '.join(str(v) for v in unique_values[:5])
-                    col_desc += f" (values: {sample})"
-                lines.append(col_desc)
+    sections = get_table_catalog(profiles, profile_version)
 
-        lines.append("")  # Blank line between tables
+    if len(profiles) <= max_tables:
+        # Nothing to prune: every table, no budget cut (there is no relevance
+        # order to decide which ones a budget would drop)
+        chosen = list(profiles.keys())
+        token_budget = 0
+    else:
+        chosen = _rank_tables_for_prompt(question, profiles, candidate_scores)[:max_tables]
+
+    lines = ["# Available Tables\n"]
+    used_tokens = 0
+    included = 0
+    for name in chosen:
+        section_tokens = len(sections[name]) // CHARS_PER_TOKEN
+        if included and token_budget and used_tokens + section_tokens > token_budget:
+            break
+        lines.append(sections[name])
+        used_tokens += section_tokens
+        included += 1
+
+    omitted = len(profiles) - included
+    if omitted:
+        lines.append(f"({omitted} less relevant table(s) omitted)")
 
     return "\n".join(lines)
 
@@ -391,7 +537,9 @@ def select_table_hybrid(
     entities: Dict[str, Any] = None,
     use_llm: bool = True,
     llm_timeout: int = 10,
-    verbose: bool = True
+    verbose: bool = True,
+    profile_version: Optional[int] = None,
+    candidate_scores: Optional[List[Tuple[str, int]]] = None
 ) -> Tuple[Optional[str], float, str]:
     """
     LLM-first table selection. No hardcoded rules.
@@ -405,6 +553,9 @@ def select_table_hybrid(
         use_llm: Whether to use LLM (set False for testing)
         llm_timeout: Max seconds for LLM call
         verbose: Print detailed logs
+        profile_version: ProfileStore.version, used to cache the table catalog
+        candidate_scores: Rule-based (table_name, score) list used to prune
+                          the prompt to the most relevant tables
 
     Returns:
         Tuple of (table_name, confidence, reason)
@@ -418,10 +569,14 @@ def select_table_hybrid(
             row_count = prof.get('row_count', 0)
             print(f"   • {name} ({row_count} rows)")
 
-    # Build rich context for LLM
-    table_context = build_rich_table_context(profiles)
     # Use LLM for selection
     if use_llm:
+        # Cached catalog, pruned to the top candidates within the token budget
+        table_context = build_pruned_table_context(
+            question, profiles,
+            profile_version=profile_version,
+            candidate_scores=candidate_scores
+        )
         llm_result = select_table_with_llm(question, table_context, llm_timeout, verbose=verbose)
 
         if llm_result.get("selected_table") and not llm_result.get("error"):
@@ -467,6 +622,49 @@ def select_table_hybrid(
     return (None, 0.0, "No tables available")
 
 
+# Embeddings of table descriptors for prompt ranking, keyed by descriptor text
+_TABLE_DESCRIPTOR_EMBEDDINGS: Dict[str, Any] = {}
+_TABLE_DESCRIPTOR_LOCK = threading.Lock()
+
+
+def _embedding_similarities(question: str, profiles: Dict[str, Dict]) -> Dict[str, float]:
+    """
+    Cosine similarity between the question and each table's name + columns,
+    using the shared embedding service.
+
+    Only used when the model is already loaded - the fallback must never
+    wait for a cold model. Returns {} otherwise.
+    """
+    try:
+        from schema_intelligence.embedding_service import get_embedding_service
+        import numpy as np
+
+        service = get_embedding_service()
+        if not service.is_ready:
+            return {}
+
+        descriptors = {
+            table_name: f"Table {table_name.replace('_', ' ')}. Columns: {', '.join(profile.get('columns', {}).keys())}"
+            for table_name, profile in profiles.items()
+        }
+
+        with _TABLE_DESCRIPTOR_LOCK:
+            missing = [d for d in set(descriptors.values()) if d not in _TABLE_DESCRIPTOR_EMBEDDINGS]
+            if missing:
+                if len(_TABLE_DESCRIPTOR_EMBEDDINGS) + len(missing) > 1024:
+                    _TABLE_DESCRIPTOR_EMBEDDINGS.clear()
+                for text, vector in zip(missing, service.encode(missing)):
+                    _TABLE_DESCRIPTOR_EMBEDDINGS[text] = vector / (np.linalg.norm(vector) or 1.0)
+            table_vectors = {t: _TABLE_DESCRIPTOR_EMBEDDINGS[d] for t, d in descriptors.items()}
+
+        query_vector = service.encode_query(question)
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+        return {t: float(np.dot(v, query_vector)) for t, v in table_vectors.items()}
+    except Exception as e:
+        print(f"[WARN]  Embedding similarity unavailable for fallback: {e}")
+        return {}
+
+
 def _semantic_fallback_selection(
     question: str,
     profiles: Dict[str, Dict],
@@ -474,7 +672,8 @@ def _semantic_fallback_selection(
 ) -> Tuple[Optional[str], int]:
     """
     Semantic similarity fallback when LLM fails.
-    Uses keyword matching between question and table metadata.
+    Uses keyword matching between question and table metadata; row count and
+    then name break ties, so the choice never depends on model warm-up.
 
     Returns: (table_name, score) or (None, 0)
     """
@@ -555,8 +754,8 @@ def _semantic_fallback_selection(
     if not table_scores:
         return (None, 0)
 
-    # Sort by score descending
-    table_scores.sort(key=lambda x: x[1], reverse=True)
+    # Sort by score descending; ties go to the larger table, then by name
+    table_scores.sort(key=lambda x: (-x[1], -profiles[x[0]].get('row_count', 0), x[0]))
 
     if verbose:
         print(f"[DATA] Semantic fallback scores:")
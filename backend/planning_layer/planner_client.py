@@ -1,16 +1,18 @@
-import os
 import json
 import yaml
 import threading
 import concurrent.futures
-import google.generativeai as genai
 from pathlib import Path
 from planning_layer.planner_prompt import PLANNER_SYSTEM_PROMPT
 from dotenv import load_dotenv
 
 # Backend directory for relative paths
 _BACKEND_DIR = Path(__file__).parent.parent
-from utils.permanent_memory import format_memory_for_prompt
+from utils.llm_provider import create_model
+from utils.prompt_assembly import get_prompt_assembler
+
+# Static planner prefix (system prompt + memory), trimmed per example profile
+_planner_prompt = get_prompt_assembler("planner", PLANNER_SYSTEM_PROMPT, trim_examples=True)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,15 +26,23 @@ class CompatibleGenerativeModel:
     """
     Wrapper for GenerativeModel that supports system prompts
     on older versions of google-generativeai (< 0.4.0).
+
+    The system prompt is the static prefix of the prompt assembler (reused
+    across calls, provider-cached where supported); example_types selects
+    which worked examples it keeps.
     """
-    def __init__(self, model, system_prompt: str):
+    def __init__(self, model, model_name: str, generation_config: dict, example_types=None):
         self._model = model
-        self._system_prompt = system_prompt
+        self._model_name = model_name
+        self._generation_config = generation_config
+        self._example_types = example_types
 
     def generate_content(self, prompt, **kwargs):
-        """Prepend system prompt to user message."""
-        full_prompt = f"{self._system_prompt}\n\n---\n\nUser Query:\n{prompt}"
-        return self._model.generate_content(full_prompt, **kwargs)
+        """Send static system prefix + user message."""
+        return _planner_prompt.generate(
+            self._model, self._model_name, self._generation_config, prompt,
+            example_types=self._example_types, **kwargs
+        )
 
     def __getattr__(self, name):
         """Forward other attributes to underlying model."""
@@ -95,20 +105,11 @@ def invalidate_planner_model():
     with _planner_model_lock:
         _planner_model = None
         _config_cache = None
+    _planner_prompt.invalidate()
 
 
 def initialize_gemini_client(config):
-    """Initialize Gemini API client with configuration and memory injection"""
-    api_key_env = config.get("api_key_env", "GEMINI_API_KEY")
-    api_key = os.getenv(api_key_env)
-    
-    if not api_key:
-        raise ValueError(
-            f"Gemini API key not found. Please set the {api_key_env} environment variable."
-        )
-    
-    genai.configure(api_key=api_key)
-    
+    """Initialize planner LLM client (configured provider) with memory injection"""
     model_name = config.get("model", "gemini-2.0-flash")
     temperature = config.get("temperature", 0.0)
     
@@ -122,18 +123,32 @@ def initialize_gemini_client(config):
         "max_output_tokens": max_tokens,
     }
 
-    # Load and inject permanent memory into system prompt
-    memory_constraints = format_memory_for_prompt()
-    system_prompt = PLANNER_SYSTEM_PROMPT + memory_constraints
-
     # Create base model without system_instruction (for compatibility with 0.3.x)
-    base_model = genai.GenerativeModel(
-        model_name=model_name,
-        generation_config=generation_config,
-    )
+    base_model = create_model("planner", model_name, generation_config)
 
-    # Wrap with our compatible model that handles system prompts
-    return CompatibleGenerativeModel(base_model, system_prompt)
+    # Wrap with our compatible model that adds the static system prefix
+    # (system prompt + permanent memory) to every call
+    return CompatibleGenerativeModel(base_model, model_name, generation_config)
+
+
+# ============================================
+# PROMPT TRIMMING BY QUERY TYPE
+# Worked examples make up half of the planner prompt
+# ============================================
+
+# Examples always sent (single-table plan types)
+BASE_EXAMPLE_TYPES = (
+    'metric', 'lookup', 'filter', 'extrema_lookup', 'rank', 'list', 'aggregation_on_subset',
+)
+
+# Question phrases that make an advanced plan type likely
+ADVANCED_EXAMPLE_TRIGGERS = {
+    'comparison': ('compare', 'comparison', ' vs', 'versus', ' than ', 'difference', 'between',
+                   'go up', 'go down', 'dropped', 'better', 'worse'),
+    'percentage': ('percent', '%', 'share', 'contribut', 'proportion', 'ratio', 'portion'),
+    'trend': ('trend', 'over time', 'growing', 'growth', 'declin', 'pattern', 'seasonal',
+              'increase', 'decrease', 'across months', 'month over month', 'by month', 'over the'),
+}
 
 
 # ============================================
@@ -180,7 +195,37 @@ def estimate_query_complexity(question: str, entities: dict = None) -> str:
     return 'simple'
 
 
-def get_model_for_complexity(complexity: str, config: dict):
+def select_example_types(question: str, entities: dict = None, complexity: str = 'simple'):
+    """
+    Query types whose worked examples the planner prompt should keep.
+
+    Single-table types are always kept. Comparison, percentage and trend
+    examples are only sent when the question (or its entities) hints at
+    them; complex questions without a specific hint keep every example.
+
+    Returns:
+        frozenset of query types, or None to keep the full prompt
+    """
+    if not load_config().get("trim_prompt_examples", True):
+        return None
+
+    q_lower = question.lower()
+    entities = entities or {}
+    types = set(BASE_EXAMPLE_TYPES)
+    for query_type, triggers in ADVANCED_EXAMPLE_TRIGGERS.items():
+        if any(trigger in q_lower for trigger in triggers):
+            types.add(query_type)
+    if entities.get('comparison'):
+        types.add('comparison')
+    if entities.get('trend_intent') or entities.get('cross_table_intent'):
+        types.add('trend')
+
+    if complexity == 'complex' and types == set(BASE_EXAMPLE_TYPES):
+        return None
+    return frozenset(types)
+
+
+def get_model_for_complexity(complexity: str, config: dict, example_types=None):
     """
     Get appropriate model based on query complexity.
     Creates a new model instance (not singleton) for adaptive selection.
@@ -188,12 +233,11 @@ def get_model_for_complexity(complexity: str, config: dict):
     Args:
         complexity: 'simple' or 'complex'
         config: LLM configuration
+        example_types: Worked-example profile for the prompt (None = all)
 
     Returns:
         tuple: (model, model_name)
     """
-    api_key = (os.getenv(config.get("api_key_env", "GEMINI_API_KEY")) or "").strip()
-    genai.configure(api_key=api_key)
     temperature = config.get("temperature", 0.0)
 
     if complexity == 'simple':
@@ -211,19 +255,14 @@ def get_model_for_complexity(complexity: str, config: dict):
         "max_output_tokens": max_tokens,
     }
 
-    # Load memory constraints
-    memory_constraints = format_memory_for_prompt()
-    system_prompt = PLANNER_SYSTEM_PROMPT + memory_constraints
-
-    # Create base model without system_instruction (for compatibility with 0.3.x)
-    base_model = genai.GenerativeModel(
-        model_name=model_name,
-        generation_config=generation_config,
-    )
+    # Configured provider; simple queries may be routed to a local backend
+    base_model = create_model("planner", model_name, generation_config, complexity=complexity)
 
-    # Wrap with our compatible model that handles system prompts
-    model = CompatibleGenerativeModel(base_model, system_prompt)
+    # Wrap with our compatible model that adds the (cached) static system prefix
+    model = CompatibleGenerativeModel(base_model, model_name, generation_config, example_types)
 
+    if base_model.provider != "gemini":
+        return model, f"{base_model.model_name} ({base_model.provider})"
     return model, model_name
 
 
@@ -326,7 +365,7 @@ def parse_json_response(response_text: str) -> dict:
             raise ValueError(f"Failed to parse JSON from LLM response: {e}\nResponse: {text}")
 
 
-def call_llm_with_timeout(model, prompt: str, timeout_seconds: int = 60):
+def call_llm_with_timeout(model, prompt: str, timeout_seconds: int = 60, dedupe: bool = True):
     """
     Call LLM with a timeout to prevent hanging.
 
@@ -334,6 +373,7 @@ def call_llm_with_timeout(model, prompt: str, timeout_seconds: int = 60):
         model: The Gemini model instance
         prompt: The prompt to send
         timeout_seconds: Maximum time to wait (default 60s from config)
+        dedupe: Share identical in-flight/recent calls (False for retries)
 
     Returns:
         The model response
@@ -343,7 +383,7 @@ def call_llm_with_timeout(model, prompt: str, timeout_seconds: int = 60):
         Exception: Any error from the model
     """
     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(model.generate_content, prompt)
+        future = executor.submit(model.generate_content, prompt, dedupe=dedupe)
         try:
             return future.result(timeout=timeout_seconds)
         except concurrent.futures.TimeoutError:
@@ -381,7 +421,8 @@ def generate_plan(question: str, schema_context: list, max_retries: int = None,
 
     # ADAPTIVE MODEL SELECTION: Use faster model for simple queries
     complexity = estimate_query_complexity(question, entities)
-    model, model_name = get_model_for_complexity(complexity, config)
+    example_types = select_example_types(question, entities, complexity)
+    model, model_name = get_model_for_complexity(complexity, config, example_types)
     print(f"  [Planner] Query complexity: {complexity} -> using {model_name}")
 
     # Format schema context
@@ -481,8 +522,9 @@ Output the query plan as JSON:"""
     last_error = None
     for attempt in range(max_retries):
         try:
-            # Call Gemini API with timeout protection
-            response = call_llm_with_timeout(model, user_prompt, timeout_seconds)
+            # Call Gemini API with timeout protection; retries after a rejected
+            # response must not reuse it from the single-flight cache
+            response = call_llm_with_timeout(model, user_prompt, timeout_seconds, dedupe=(attempt == 0))
 
             # Extract text from response
             response_text = response.text
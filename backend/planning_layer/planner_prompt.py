@@ -26,6 +26,7 @@ You must output ONLY valid JSON matching this exact schema:
 "comparison": {
   "period_a": {"label": "string", "table": "string", "column": "string", "filters": [], "aggregation": "SUM"},
   "period_b": {"label": "string", "table": "string", "column": "string", "filters": [], "aggregation": "SUM"},
+  "periods": [{"label": "string", "table": "string", "column": "string", "filters": [], "aggregation": "SUM"}],
   "compare_type": "difference | percentage_change | ratio"
 },
 "percentage": {
@@ -64,6 +65,7 @@ You must output ONLY valid JSON matching this exact schema:
 - **list**: Show all rows. No special requirements.
 - **aggregation_on_subset**: Calculate aggregation (AVG, SUM, etc.) on a filtered or ranked subset. Requires "aggregation_function", "aggregation_column". Use "subset_filters" for filtering, "subset_order_by" for ranking, and "subset_limit" ONLY when the question explicitly asks for "top N", "first N", "bottom N", etc. If aggregating ALL matching data, set "subset_limit" to null or omit it.
 - **comparison**: Compare two time periods or values. Use for questions like "How did X compare to Y?", "Did sales go up or down?", "August vs December". Requires "comparison" object with period_a, period_b, and compare_type.
+  - For 3 or more periods ("month-over-month this year", "sales for each of the last 6 months compared"), use "periods": a list of period objects in chronological order, instead of period_a/period_b.
   - **CRITICAL: Use EXACT column names from schema context** - Don't guess column names like "Cost_Amount" or "Revenue". Look at the schema context and use the EXACT column names (e.g., "Cost", "Sale_Amount", "Total_Revenue"). If a column doesn't exist, the comparison will fail!
 - **percentage**: Calculate percentage contribution. Use for questions like "What percentage comes from X?", "What % of total is Y?". Requires "percentage" object with numerator and denominator.
   - **CRITICAL for time-bounded percentages**: If the question mentions a specific time period (e.g., "August sales", "this month", "last week"), BOTH numerator AND denominator MUST have the same time filter! Otherwise you'll divide by ALL-TIME totals and get wrong percentages.
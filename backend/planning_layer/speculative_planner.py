@@ -0,0 +1,186 @@
+"""
+Speculative Planner - plan and execute the top candidate tables in parallel.
+
+When routing is not confident, the old path sent one prompt with the schemas
+of the top 5 tables and, if the plan picked the wrong table, paid for it in
+serial heal-and-retry rounds. When the top routing scores are close (within
+max_score_gap of the best, relative), speculative mode instead runs one
+branch per close candidate table (2-3), each doing:
+
+    focused schema -> generate_plan -> validate_plan -> execute (pooled cursor)
+
+The branches run concurrently, so wall-clock latency is the slowest branch
+rather than the sum. The winner is picked by:
+1. non-empty result (plans that were not executed here rank below non-empty
+   results but above empty ones)
+2. routing score of the branch's table
+3. candidate order
+
+Only cheap single-SQL plan types are executed speculatively, and only to rank
+the branches: the caller executes the winning plan through the query healer
+like any other plan. The branch execution went through the pooled cursor's
+result cache, so that run is normally a cache hit.
+
+Costs: every branch is an extra planner LLM call. stats() counts runs, LLM
+calls, executions, questions skipped because one candidate clearly led, and
+how often speculation overturned the router's top pick.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from analytics_engine.duckdb_manager import get_cursor_pool
+from execution_layer.sql_compiler import compile_sql_params
+from planning_layer.planner_client import generate_plan
+from utils.sql_utils import inline_params
+from validation_layer.plan_validator import validate_plan
+
+# Plan types that compile to one SQL statement (cheap to run speculatively)
+SPECULATIVE_EXECUTION_TYPES = (
+    "metric", "lookup", "filter", "extrema_lookup", "rank", "list", "aggregation_on_subset",
+)
+
+
+class SpeculativeBranch:
+    """One candidate table's plan and (optional) result."""
+
+    def __init__(self, table: str, routing_score: float, order: int):
+        self.table = table
+        self.routing_score = routing_score
+        self.order = order
+        self.plan: Optional[dict] = None
+        self.sql: Optional[str] = None
+        self.result = None
+        self.error: Optional[str] = None
+
+    @property
+    def executed(self) -> bool:
+        return self.result is not None
+
+    def rank_key(self):
+        """Higher is better: (outcome class, routing score, earlier candidate)."""
+        if self.executed:
+            outcome = 2 if len(self.result) > 0 else 0
+        else:
+            outcome = 1  # valid plan, left to the caller to execute
+        return (outcome, self.routing_score, -self.order)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "routing_score": self.routing_score,
+            "query_type": (self.plan or {}).get("query_type"),
+            "rows": len(self.result) if self.executed else None,
+            "error": self.error,
+        }
+
+
+class SpeculativePlanner:
+    """
+    Runs planning branches for the top routing candidates concurrently.
+
+    A single executor is shared by all requests, so max_concurrency caps the
+    number of branches (and planner LLM calls) in flight process-wide.
+    """
+
+    def __init__(self, table_router, max_branches: int = 3, max_concurrency: int = 3,
+                 max_score_gap: float = 0.25, enabled: bool = True):
+        """
+        Args:
+            table_router: TableRouter (provides focused per-table schemas)
+            max_branches: Candidate tables per question (2-3 is the sweet spot)
+            max_concurrency: Branches running at once across all requests
+            max_score_gap: Candidates scoring more than this relative gap
+                below the best get no branch
+            enabled: Master switch (query.speculative_planning_enabled)
+        """
+        self.table_router = table_router
+        self.max_branches = max(2, int(max_branches))
+        self.max_score_gap = max_score_gap
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_concurrency)),
+                                            thread_name_prefix="speculative-plan")
+        self._lock = threading.Lock()
+        self._stats = {"runs": 0, "skipped_clear_leader": 0, "llm_calls": 0, "executions": 0,
+                       "failed_branches": 0, "overturned": 0}
+
+    def _run_branch(self, question: str, entities: dict, branch: SpeculativeBranch) -> SpeculativeBranch:
+        try:
+            schema_context = self.table_router.get_table_schema(branch.table)
+            with self._lock:
+                self._stats["llm_calls"] += 1
+            plan = generate_plan(question, schema_context, entities=dict(entities or {}))
+            validate_plan(plan)
+            branch.plan = plan
+
+            if plan.get("query_type") in SPECULATIVE_EXECUTION_TYPES and plan.get("steps") is None:
+                sql, params = compile_sql_params(plan)
+                branch.result = get_cursor_pool().execute(sql, params)
+                branch.sql = inline_params(sql, params)
+                with self._lock:
+                    self._stats["executions"] += 1
+        except Exception as e:
+            branch.error = str(e)
+            with self._lock:
+                self._stats["failed_branches"] += 1
+        return branch
+
+    def run(self, question: str, routing_result, entities: dict = None) -> Optional[SpeculativeBranch]:
+        """
+        Plan (and cheaply execute) the top candidate tables in parallel.
+
+        Args:
+            question: English question
+            routing_result: RoutingResult with scored alternatives
+            entities: Extracted entities
+
+        Returns:
+            Winning branch (plan set; result/sql set if executed here),
+            or None if speculation is disabled, fewer than two candidates
+            score within max_score_gap of the best, or no branch produced a
+            valid plan
+        """
+        candidates = [(t, s) for t, s in (routing_result.alternatives or []) if t]
+        if not self.enabled or len(candidates) < 2:
+            return None
+
+        # Close calls only: a clear leader is planned once by the caller
+        best = candidates[0][1]
+        close = [(t, s) for t, s in candidates if best > 0 and (best - s) / best <= self.max_score_gap]
+        candidates = close[:self.max_branches]
+        if len(candidates) < 2:
+            with self._lock:
+                self._stats["skipped_clear_leader"] += 1
+            return None
+
+        with self._lock:
+            self._stats["runs"] += 1
+
+        branches = [SpeculativeBranch(table, score, i) for i, (table, score) in enumerate(candidates)]
+        print(f"  [Speculative] Planning {len(branches)} candidate tables in parallel: "
+              f"{', '.join(b.table for b in branches)}")
+        futures = [self._executor.submit(self._run_branch, question, entities, b) for b in branches]
+        done = [f.result() for f in futures]
+
+        for branch in done:
+            print(f"    - {branch.summary()}")
+
+        valid = [b for b in done if b.plan is not None]
+        if not valid:
+            return None
+
+        winner = max(valid, key=SpeculativeBranch.rank_key)
+        if winner.order != 0:
+            with self._lock:
+                self._stats["overturned"] += 1
+        print(f"  [Speculative] Winner: {winner.table} "
+              f"({'executed' if winner.executed else 'plan only'})")
+        return winner
+
+    def stats(self) -> Dict[str, Any]:
+        """Cost counters (each branch costs one planner LLM call)."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["llm_calls_per_run"] = round(stats["llm_calls"] / stats["runs"], 2) if stats["runs"] else 0.0
+        return stats
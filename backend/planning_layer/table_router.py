@@ -22,9 +22,8 @@ LLM_SELECTION_TIMEOUT = 8  # Seconds to wait for LLM response
 def _get_actual_duckdb_tables() -> List[str]:
     """Get list of tables that actually exist in DuckDB (not just in profiles)."""
     try:
-        from analytics_engine.duckdb_manager import DuckDBManager
-        db = DuckDBManager()
-        return db.list_tables()
+        from analytics_engine.schema_catalog import get_schema_catalog
+        return get_schema_catalog().list_tables()
     except Exception as e:
         print(f"[TableRouter] Warning: Could not get DuckDB tables: {e}")
         return []
@@ -41,18 +40,22 @@ class TableRouter:
     3. Return only the best table's schema
     """
 
-    def __init__(self, profile_store: ProfileStore = None):
+    def __init__(self, profile_store: ProfileStore = None, entity_extractor: EntityExtractor = None):
         self.profile_store = profile_store or ProfileStore()
-        self.entity_extractor = EntityExtractor()
+        # Share the app-wide extractor when given so learned entities are used
+        self.entity_extractor = entity_extractor or EntityExtractor()
         self._last_routing_debug = {}
 
-    def route(self, question: str, previous_context: Dict[str, Any] = None) -> 'RoutingResult':
+    def route(self, question: str, previous_context: Dict[str, Any] = None,
+              entities: Dict[str, Any] = None) -> 'RoutingResult':
         """
         Find the best table for a question.
 
         Args:
             question: User's natural language question
             previous_context: Optional context from previous query (for follow-ups)
+            entities: Pre-extracted entities for question (e.g. from QueryAnalysis);
+                      extracted here when not provided
 
         Returns:
             RoutingResult with:
@@ -66,8 +69,8 @@ class TableRouter:
         - needs_clarification: True if 0.3 <= confidence < 0.6 with multiple alternatives
         - should_fallback: True if confidence < 0.3 or no table found
         """
-        # Extract entities from question
-        entities = self.entity_extractor.extract(question)
+        # Extract entities from question (copy so follow-up merging never mutates caller's dict)
+        entities = dict(entities) if entities is not None else self.entity_extractor.extract(question)
 
         # Check if this is a follow-up question
         is_followup = previous_context and self.entity_extractor.is_followup_question(question, True)
@@ -148,6 +151,9 @@ class TableRouter:
                     alternatives=[(explicit_match, 100)]
                 )
 
+        # Rule-based scores: prune the LLM prompt now, reused as the fallback below
+        rule_candidates = None
+
         # NEW: Try LLM-based semantic selection for better accuracy
         if USE_LLM_SELECTION:
             try:
@@ -155,12 +161,15 @@ class TableRouter:
 
                 profiles = self.profile_store.get_all_profiles()
                 if profiles:
+                    rule_candidates = self.profile_store.find_best_table_for_query(entities)
                     selected_table, confidence, reason = select_table_hybrid(
                         question=question,
                         profiles=profiles,
                         entities=entities,
                         use_llm=True,
-                        llm_timeout=LLM_SELECTION_TIMEOUT
+                        llm_timeout=LLM_SELECTION_TIMEOUT,
+                        profile_version=self.profile_store.version,
+                        candidate_scores=rule_candidates
                     )
 
                     if selected_table and confidence >= 0.6:
@@ -201,8 +210,8 @@ class TableRouter:
 
         # NEW: Try RAG-based semantic search as secondary method
         try:
-            from schema_intelligence.chromadb_client import SchemaVectorStore
-            vector_store = SchemaVectorStore()
+            from schema_intelligence.chromadb_client import get_schema_vector_store
+            vector_store = get_schema_vector_store()
             rag_tables = vector_store.get_relevant_tables(question, top_k=3)
 
             if rag_tables and rag_tables[0][1] > 0.3:  # Confidence threshold
@@ -230,7 +239,9 @@ class TableRouter:
             print(f"[TableRouter] RAG search skipped: {e}")
 
         # FALLBACK: Get candidate tables with rule-based scoring
-        candidates = self.profile_store.find_best_table_for_query(entities)
+        candidates = rule_candidates
+        if candidates is None:
+            candidates = self.profile_store.find_best_table_for_query(entities)
 
         # CRITICAL: Filter candidates to only include tables that actually exist in DuckDB
         # This prevents errors from stale profiles referencing non-existent tables
@@ -523,14 +534,16 @@ class TableRouter:
 
         return "\n".join(schema_parts)
 
-    def get_fallback_schema(self, question: str, top_k: int = 5) -> str:
+    def get_fallback_schema(self, question: str, top_k: int = 5,
+                            entities: Dict[str, Any] = None) -> str:
         """
         Fallback: Get schemas for top K candidate tables.
         Used when routing confidence is low or table not found.
 
         This is still much better than top_k=50!
         """
-        entities = self.entity_extractor.extract(question)
+        if entities is None:
+            entities = self.entity_extractor.extract(question)
         candidates = self.profile_store.find_best_table_for_query(entities)
 
         if not candidates:
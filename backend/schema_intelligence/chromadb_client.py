@@ -1,5 +1,10 @@
 """
-ChromaDB client for schema-level semantic retrieval.
+Schema vector store for schema-level semantic retrieval.
+
+Backends (schema_intelligence.vector_backend in settings.yaml):
+- numpy (default): in-process NumpyVectorIndex (schema_intelligence/vector_index.py),
+  a normalized float32 matrix memory-mapped from disk
+- chromadb: the original ChromaDB PersistentClient collection (optional dependency)
 
 CRITICAL: This module uses Hugging Face embeddings ONLY.
 ONNX embeddings are explicitly disabled to ensure Streamlit compatibility on Windows.
@@ -11,12 +16,23 @@ Embedding Model: sentence-transformers/all-MiniLM-L6-v2
 - Streamlit-safe and Windows-safe
 """
 
-import chromadb
-from chromadb.config import Settings
-from chromadb.api.types import EmbeddingFunction
 from schema_intelligence.embedding_builder import build_schema_documents
-from typing import List
-import os
+from typing import List, Optional
+import threading
+
+# ChromaDB is optional - only needed for vector_backend: chromadb
+try:
+    import chromadb
+    from chromadb.config import Settings
+    from chromadb.api.types import EmbeddingFunction
+    CHROMADB_AVAILABLE = True
+except ImportError:
+    chromadb = None
+    Settings = None
+    EmbeddingFunction = object
+    CHROMADB_AVAILABLE = False
+
+VECTOR_BACKENDS = ("numpy", "chromadb")
 
 
 class CustomSentenceTransformerEmbedding(EmbeddingFunction):
@@ -25,25 +41,39 @@ class CustomSentenceTransformerEmbedding(EmbeddingFunction):
     This avoids ChromaDB's built-in wrapper which has PyTorch compatibility issues.
     """
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        try:
-            from sentence_transformers import SentenceTransformer
-            import torch
-            
-            # Set environment variable to avoid tokenizers parallelism warning
-            os.environ["TOKENIZERS_PARALLELISM"] = "false"
-            
-            # Load model with explicit device configuration
-            self.model = SentenceTransformer(model_name, device='cpu')
-        except Exception as e:
+        import importlib.util
+        from schema_intelligence.embedding_service import get_embedding_service
+
+        if importlib.util.find_spec("sentence_transformers") is None:
             raise RuntimeError(
-                f"Failed to initialize SentenceTransformer model. "
-                f"Error: {e}"
+                "Failed to initialize SentenceTransformer model. "
+                "Error: sentence-transformers is not installed"
             )
+
+        # Shared process-wide model (warmed up in the background at startup)
+        self.service = get_embedding_service()
+        if model_name != self.service.model_name:
+            from schema_intelligence.embedding_service import EmbeddingService
+            self.service = EmbeddingService(model_name)
+        self.model_name = model_name
+        self.service.start_background_load()
+
+    @property
+    def model(self):
+        """The SentenceTransformer model (blocks until the service has loaded it)."""
+        return self.service.model
     
     def __call__(self, input: List[str]) -> List[List[float]]:
         """Generate embeddings for input texts."""
-        embeddings = self.model.encode(input, convert_to_numpy=True)
-        return embeddings.tolist()
+        return self.encode(input).tolist()
+
+    def encode(self, texts: List[str], batch_size: int = 32):
+        """Generate embeddings as a float32 numpy matrix."""
+        return self.service.encode(texts, batch_size=batch_size)
+
+    def encode_query(self, text: str):
+        """Embedding for a single question (served from the service's LRU)."""
+        return self.service.encode_query(text)
 
 
 class SchemaVectorStore:
@@ -54,20 +84,46 @@ class SchemaVectorStore:
     ChromaDB's default embedding function (ONNX) causes DLL errors on Windows/Streamlit.
     """
     
-    def __init__(self, persist_dir="schema_store"):
+    def __init__(self, persist_dir="schema_store", backend: Optional[str] = None):
         """
-        Initialize ChromaDB with explicit Hugging Face embeddings.
+        Initialize the vector backend with explicit Hugging Face embeddings.
         
         GUARDRAIL: This constructor NEVER allows ChromaDB to use default embeddings.
         If embedding initialization fails, the system will fail fast with a clear error.
+
+        Args:
+            persist_dir: Directory holding the persisted index
+            backend: "numpy" or "chromadb" (default: schema_intelligence.vector_backend)
         """
-        # Use PersistentClient for proper disk persistence with settings
-        settings = Settings(
-            allow_reset=True,
-            is_persistent=True
-        )
-        self.client = chromadb.PersistentClient(path=persist_dir, settings=settings)
+        if backend is None:
+            from utils.config_loader import get_config
+            backend = get_config().schema_intelligence.vector_backend
+        backend = (backend or "numpy").lower()
+        if backend not in VECTOR_BACKENDS:
+            print(f"[WARN]  Unknown vector_backend '{backend}', using numpy")
+            backend = "numpy"
+        if backend == "chromadb" and not CHROMADB_AVAILABLE:
+            print("[WARN]  vector_backend 'chromadb' requested but chromadb is not installed, using numpy")
+            backend = "numpy"
+
+        self.backend = backend
+        self.persist_dir = persist_dir
         self.collection_name = "schema"
+        self.client = None
+        self.index = None
+        self._collection = None  # Cached ChromaDB collection handle
+        self._embedding_cache = None
+
+        if backend == "chromadb":
+            # Use PersistentClient for proper disk persistence with settings
+            settings = Settings(
+                allow_reset=True,
+                is_persistent=True
+            )
+            self.client = chromadb.PersistentClient(path=persist_dir, settings=settings)
+        else:
+            from schema_intelligence.vector_index import NumpyVectorIndex
+            self.index = NumpyVectorIndex(persist_dir=persist_dir)
         
         # CRITICAL: Create Hugging Face embedding function explicitly
         # This prevents ChromaDB from defaulting to ONNX embeddings
@@ -89,12 +145,69 @@ class SchemaVectorStore:
                 f"ONNX embeddings detected ({embedding_type}). "
                 f"This is not allowed. The system must use Hugging Face embeddings only."
             )
-    
+
+    def _embed_documents(self, texts: List[str]):
+        """
+        Embed schema documents through the content-addressed cache.
+
+        Only texts not embedded before (by this model) are encoded, in batches
+        of schema_intelligence.embedding_batch_size.
+        """
+        from utils.config_loader import get_config
+        from schema_intelligence.embedding_cache import EmbeddingCache
+
+        batch_size = get_config().schema_intelligence.embedding_batch_size
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(
+                persist_dir=self.persist_dir,
+                model_name=self.embedding_function.service.variant
+            )
+        return self._embedding_cache.encode(
+            texts,
+            lambda batch: self.embedding_function.encode(batch, batch_size=batch_size),
+            batch_size=batch_size
+        )
+
+    def _get_collection(self, create: bool = False):
+        """
+        Return the cached ChromaDB collection handle.
+
+        The handle is fetched once and reused by query/count/delete instead of
+        calling client.get_collection() on every request.
+
+        Args:
+            create: Create the collection if it does not exist
+
+        Returns:
+            Collection, or None if it does not exist and create is False
+        """
+        if self._collection is not None:
+            return self._collection
+        try:
+            self._collection = self.client.get_collection(
+                name=self.collection_name,
+                embedding_function=self.embedding_function  # EXPLICIT: No ONNX fallback
+            )
+        except Exception:
+            if not create:
+                return None
+            self._collection = self.client.create_collection(
+                name=self.collection_name,
+                embedding_function=self.embedding_function  # EXPLICIT: No ONNX fallback
+            )
+        return self._collection
+
     def clear_collection(self):
         """
         Clear all schema embeddings from the collection.
         Used during full reset to remove old schema references.
         """
+        if self.index is not None:
+            self.index.clear()
+            print("   Cleared schema vector index")
+            return
+
+        self._collection = None
         try:
             # Delete the collection
             self.client.delete_collection(self.collection_name)
@@ -116,14 +229,17 @@ class SchemaVectorStore:
         Returns:
             Number of documents deleted
         """
+        if self.index is not None:
+            deleted = self.index.delete(where={"source_id": source_id})
+            if deleted:
+                print(f"   Deleted {deleted} vector document(s) for source_id: {source_id}")
+            else:
+                print(f"   No vector documents found for source_id: {source_id}")
+            return deleted
+
         try:
-            # Get or create collection
-            try:
-                collection = self.client.get_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function
-                )
-            except Exception:
+            collection = self._get_collection()
+            if collection is None:
                 # Collection doesn't exist, nothing to delete
                 return 0
             
@@ -162,49 +278,37 @@ class SchemaVectorStore:
                        If provided: Delete only documents matching these source_ids, then rebuild
         """
         if source_ids is None:
-            # FULL REBUILD: Delete entire collection and rebuild from scratch
-            print("   Performing FULL ChromaDB rebuild...")
+            # FULL REBUILD: Delete everything and rebuild from scratch
+            print(f"   Performing FULL vector store rebuild ({self.backend})...")
             
-            # Delete existing collection if present
-            try:
-                self.client.delete_collection(self.collection_name)
-            except Exception:
-                pass  # Collection may not exist yet
-
-            # Create fresh collection WITH EXPLICIT EMBEDDING FUNCTION
-            # This is critical - never allow ChromaDB to use default embeddings
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                embedding_function=self.embedding_function  # EXPLICIT: No ONNX fallback
-            )
+            if self.index is not None:
+                self.index.clear()
+            else:
+                # Delete existing collection if present
+                self._collection = None
+                try:
+                    self.client.delete_collection(self.collection_name)
+                except Exception:
+                    pass  # Collection may not exist yet
+
+                # Create fresh collection WITH EXPLICIT EMBEDDING FUNCTION
+                # This is critical - never allow ChromaDB to use default embeddings
+                self._get_collection(create=True)
         else:
             # PARTIAL REBUILD: Delete only documents for specified source_ids
-            print(f"   Performing PARTIAL ChromaDB rebuild for {len(source_ids)} source(s)...")
+            print(f"   Performing PARTIAL vector store rebuild for {len(source_ids)} source(s)...")
             
-            # Get or create collection
-            try:
-                self.collection = self.client.get_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function
-                )
-            except Exception:
-                # Collection doesn't exist, create it
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function
-                )
+            if self.index is None:
+                self._get_collection(create=True)
             
             # Delete documents for each source_id
             for source_id in source_ids:
                 self.delete_by_source_id(source_id)
 
-        # Build documents from schema
-        documents = build_schema_documents()
+        # Build documents from schema (partial rebuilds only DESCRIBE affected tables)
+        documents = build_schema_documents(source_ids=source_ids)
         
-        # Filter documents if partial rebuild
         if source_ids is not None:
-            # Only rebuild documents for specified source_ids
-            documents = [doc for doc in documents if doc.get("source_id") in source_ids]
             print(f"   Rebuilding {len(documents)} document(s) for specified source_ids")
 
         # Build clean metadata (NO None values)
@@ -224,23 +328,37 @@ class SchemaVectorStore:
 
             metadatas.append(meta)
 
-        # Add embeddings (auto-persisted by Chroma)
-        # Embeddings are generated using Hugging Face model (all-MiniLM-L6-v2)
-        if documents:  # Only add if there are documents to add
-            self.collection.add(
-                ids=[doc["id"] for doc in documents],
-                documents=[doc["text"] for doc in documents],
-                metadatas=metadatas
+        if not documents:  # Only add if there are documents to add
+            return
+
+        ids = [doc["id"] for doc in documents]
+        texts = [doc["text"] for doc in documents]
+
+        # Embeddings are generated using Hugging Face model (all-MiniLM-L6-v2),
+        # reusing cached vectors for documents whose text did not change
+        embeddings = self._embed_documents(texts)
+
+        if self.index is not None:
+            self.index.add(ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings)
+            print(f"   Added {len(documents)} document(s) to vector index")
+        else:
+            # Add embeddings (auto-persisted by Chroma)
+            self._get_collection(create=True).add(
+                ids=ids,
+                documents=texts,
+                metadatas=metadatas,
+                embeddings=embeddings.tolist()
             )
             print(f"   Added {len(documents)} document(s) to ChromaDB")
 
     def count(self):
         """Get the number of documents in the collection."""
-        # Get collection WITH EXPLICIT EMBEDDING FUNCTION
-        collection = self.client.get_collection(
-            name=self.collection_name,
-            embedding_function=self.embedding_function  # EXPLICIT: No ONNX fallback
-        )
+        if self.index is not None:
+            return self.index.count()
+
+        collection = self._get_collection()
+        if collection is None:
+            raise ValueError(f"Collection {self.collection_name} does not exist.")
         return collection.count()
 
     def query(self, question: str, top_k: int = 5) -> List[dict]:
@@ -261,19 +379,21 @@ class SchemaVectorStore:
             - distance: Similarity distance (lower = more similar)
         """
         try:
-            # Get collection
-            try:
-                collection = self.client.get_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function
-                )
-            except Exception:
+            if self.index is not None:
+                if self.index.count() == 0:
+                    print("[RAG] Vector index is empty - returning empty results")
+                    return []
+                embedding = self.embedding_function.encode_query(question)
+                return self.index.query(embedding, top_k=top_k)
+
+            collection = self._get_collection()
+            if collection is None:
                 print("[RAG] No ChromaDB collection found - returning empty results")
                 return []
 
             # Query for similar documents
             results = collection.query(
-                query_texts=[question],
+                query_embeddings=[self.embedding_function.encode_query(question).tolist()],
                 n_results=top_k,
                 include=["documents", "metadatas", "distances"]
             )
@@ -353,3 +473,18 @@ class SchemaVectorStore:
             context_parts.append(f"{i}. [{table}] ({doc_type}): {result['document']}")
 
         return "\n".join(context_parts)
+
+
+# Shared store (one index + one embedding model per process)
+_schema_vector_store = None
+_schema_vector_store_lock = threading.Lock()
+
+
+def get_schema_vector_store() -> SchemaVectorStore:
+    """Get or create the process-wide SchemaVectorStore."""
+    global _schema_vector_store
+    if _schema_vector_store is None:
+        with _schema_vector_store_lock:
+            if _schema_vector_store is None:
+                _schema_vector_store = SchemaVectorStore()
+    return _schema_vector_store
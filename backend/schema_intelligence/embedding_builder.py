@@ -1,13 +1,18 @@
 from schema_intelligence.schema_extractor import extract_schema
 
 
-def build_schema_documents():
+def build_schema_documents(source_ids=None):
     """
     Converts schema metadata into text blocks for embedding.
     No data values included.
+
+    Args:
+        source_ids: Optional iterable of source_ids. When given, only the tables
+                    of those sources are described and metric documents (which
+                    carry no source_id) are skipped.
     """
 
-    schema = extract_schema()
+    schema = extract_schema(source_ids=source_ids)
     documents = []
 
     # Table-level documents
@@ -42,6 +47,9 @@ def build_schema_documents():
         
         documents.append(doc)
 
+    if source_ids is not None:
+        return documents
+
     # Metric-level documents
     for metric, meta in schema["metrics"].items():
         text = (
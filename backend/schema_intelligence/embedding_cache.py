@@ -0,0 +1,149 @@
+"""
+Content-addressed embedding cache for schema documents.
+
+Full vector store rebuilds used to re-embed every table and metric document even
+though most descriptions do not change between dataset reloads. Vectors are
+keyed by a hash of (embedding model, document text), so an unchanged document
+is never encoded twice - across rebuilds and across restarts.
+
+Persistence (next to the vector index):
+    <persist_dir>/embedding_cache.npy        float32 matrix, one row per entry
+    <persist_dir>/embedding_cache_keys.json  row-aligned content hashes
+
+Misses are encoded in batches of `batch_size` (schema_intelligence.embedding_batch_size).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+CACHE_MATRIX_FILENAME = "embedding_cache.npy"
+CACHE_KEYS_FILENAME = "embedding_cache_keys.json"
+
+
+def content_key(model_name: str, text: str) -> str:
+    """Stable cache key for one document under one embedding model."""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Hash-of-text -> vector cache, persisted as a .npy matrix + key list.
+
+    Entries are kept in least-recently-used order and trimmed to max_entries
+    when saved, so documents of tables that no longer exist age out.
+    """
+
+    def __init__(self, persist_dir: str = "schema_store", model_name: str = "", max_entries: int = 20000):
+        """
+        Args:
+            persist_dir: Directory for the cache files
+            model_name: Embedding model identifier (part of every key)
+            max_entries: Upper bound on cached vectors
+        """
+        self.persist_dir = persist_dir
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._matrix_path = os.path.join(persist_dir, CACHE_MATRIX_FILENAME)
+        self._keys_path = os.path.join(persist_dir, CACHE_KEYS_FILENAME)
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not (os.path.exists(self._matrix_path) and os.path.exists(self._keys_path)):
+            return
+        try:
+            with open(self._keys_path, encoding="utf-8") as f:
+                keys = json.load(f)
+            matrix = np.load(self._matrix_path)
+            if matrix.shape[0] != len(keys):
+                print("[WARN]  Embedding cache row mismatch - starting empty")
+                return
+            for key, row in zip(keys, matrix):
+                self._entries[key] = row
+        except Exception as e:
+            print(f"[WARN]  Failed to load embedding cache: {e}")
+
+    def _save(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if not self._entries:
+            return
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            keys = list(self._entries.keys())
+            matrix = np.vstack(list(self._entries.values())).astype(np.float32, copy=False)
+
+            tmp_matrix = self._matrix_path + ".tmp.npy"
+            np.save(tmp_matrix, matrix)
+            tmp_keys = self._keys_path + ".tmp"
+            with open(tmp_keys, "w", encoding="utf-8") as f:
+                json.dump(keys, f)
+
+            os.replace(tmp_matrix, self._matrix_path)
+            os.replace(tmp_keys, self._keys_path)
+        except Exception as e:
+            print(f"[WARN]  Failed to persist embedding cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        encode_fn: Callable[[List[str]], np.ndarray],
+        batch_size: int = 64,
+    ) -> np.ndarray:
+        """
+        Embeddings for texts, encoding only the ones not seen before.
+
+        Args:
+            texts: Documents to embed
+            encode_fn: Batch encoder returning a (len(batch), dim) matrix
+            batch_size: Maximum texts per encode_fn call
+
+        Returns:
+            float32 matrix aligned with texts
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [content_key(self.model_name, text) for text in texts]
+
+        with self._lock:
+            # Deduplicate misses so repeated texts are encoded once
+            missing = OrderedDict()
+            for key, text in zip(keys, texts):
+                if key not in self._entries and key not in missing:
+                    missing[key] = text
+
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                miss_keys = list(missing.keys())
+                miss_texts = list(missing.values())
+                step = max(1, int(batch_size))
+                for start in range(0, len(miss_texts), step):
+                    batch = np.asarray(encode_fn(miss_texts[start:start + step]), dtype=np.float32)
+                    for key, row in zip(miss_keys[start:start + step], batch):
+                        self._entries[key] = row
+
+            for key in keys:
+                self._entries.move_to_end(key)
+            result = np.vstack([self._entries[key] for key in keys])
+
+            if missing:
+                self._save()
+
+        if missing:
+            print(f"   Embedding cache: {len(texts) - len(missing)} hit(s), {len(missing)} encoded")
+        return result
@@ -0,0 +1,308 @@
+"""
+Embedding Service - one process-wide SentenceTransformer, warmed up in the background.
+
+Loading all-MiniLM-L6-v2 with torch takes several seconds. It used to happen inside
+SchemaVectorStore.__init__ on the first request that touched the vector store,
+so the first user after a restart paid for it. The service starts loading on a
+daemon thread at API startup, reports its state for /api/health, and is shared
+by everything that needs embeddings (schema vector store, table selector fallback).
+
+Recent query embeddings are kept in an LRU, so repeated or rephrased-back
+questions do not re-run the model.
+
+CPU tuning (schema_intelligence.* in settings.yaml):
+- embedding_backend: fp32 | int8 - int8 applies torch dynamic quantization to
+  the Linear layers (benchmark: scripts/embedding_benchmark.py)
+- embedding_threads: pins torch.set_num_threads so encoding does not fight
+  DuckDB for cores (0 = torch default)
+- query_batch_window_ms: concurrent encode_query() misses arriving within this
+  window are encoded in one model call (0 = disabled); a single queued query
+  is encoded at once, so the window only costs latency under concurrency
+
+Usage:
+    from schema_intelligence.embedding_service import get_embedding_service
+
+    service = get_embedding_service()
+    service.start_background_load()          # at startup, returns immediately
+    vec = service.encode_query("total sales") # blocks until the model is ready
+    if service.is_ready: ...                  # non-blocking check
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BACKENDS = ("fp32", "int8")
+MAX_QUERY_BATCH = 32
+
+
+class EmbeddingService:
+    """
+    Lazily loaded SentenceTransformer with background warm-up and a query LRU.
+
+    States: not_started -> loading -> ready | failed
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        query_cache_size: int = 512,
+        backend: str = "fp32",
+        num_threads: int = 0,
+        batch_window_ms: float = 0.0,
+    ):
+        """
+        Args:
+            model_name: SentenceTransformer model id (local cache, CPU)
+            query_cache_size: Number of recent query embeddings to keep
+            backend: "fp32" or "int8" (dynamic quantization of Linear layers)
+            num_threads: torch intra-op threads (0 = leave torch default)
+            batch_window_ms: Micro-batching window for concurrent query encodes
+        """
+        backend = (backend or "fp32").lower()
+        if backend not in EMBEDDING_BACKENDS:
+            print(f"[WARN]  Unknown embedding_backend '{backend}', using fp32")
+            backend = "fp32"
+
+        self.model_name = model_name
+        self.query_cache_size = query_cache_size
+        self.backend = backend
+        self.num_threads = num_threads
+        self.batch_window_ms = batch_window_ms
+
+        self._model = None
+        self._state = "not_started"
+        self._error: Optional[str] = None
+        self._load_seconds: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._ready_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Micro-batching of concurrent query encodes
+        self._pending: List[Tuple[str, Future]] = []
+        self._batch_cond = threading.Condition()
+        self._batch_thread: Optional[threading.Thread] = None
+        self._query_batches = 0
+        self._batched_queries = 0
+
+    @property
+    def variant(self) -> str:
+        """Model id + backend; vectors from different variants are not interchangeable."""
+        return self.model_name if self.backend == "fp32" else f"{self.model_name}#{self.backend}"
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Load the model (runs once; concurrent callers wait on the lock)."""
+        with self._load_lock:
+            if self._state in ("ready", "failed"):
+                return
+            self._state = "loading"
+            start = time.perf_counter()
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                # Set environment variable to avoid tokenizers parallelism warning
+                os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+                if self.num_threads and self.num_threads > 0:
+                    import torch
+                    torch.set_num_threads(self.num_threads)
+
+                # Load model with explicit device configuration
+                model = SentenceTransformer(self.model_name, device='cpu')
+
+                if self.backend == "int8":
+                    import torch
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+
+                self._model = model
+                self._load_seconds = time.perf_counter() - start
+                self._state = "ready"
+                print(f"[OK] Embedding model loaded: {self.variant} ({self._load_seconds:.1f}s)")
+            except Exception as e:
+                self._error = str(e)
+                self._state = "failed"
+                print(f"[FAIL] Embedding model failed to load: {e}")
+            finally:
+                self._ready_event.set()
+
+    def start_background_load(self) -> None:
+        """Start loading on a daemon thread (no-op if already started)."""
+        with self._start_lock:
+            if self._thread is not None or self._state != "not_started":
+                return
+            self._thread = threading.Thread(target=self._load, name="embedding-warmup", daemon=True)
+            self._thread.start()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading finishes. Returns True if the model is usable."""
+        if self._state == "not_started":
+            self._load()
+        self._ready_event.wait(timeout)
+        return self._state == "ready"
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the model is loaded (never blocks)."""
+        return self._state == "ready"
+
+    @property
+    def model(self):
+        """The loaded SentenceTransformer (blocks until loaded)."""
+        if not self.wait_until_ready():
+            raise RuntimeError(
+                f"Failed to initialize SentenceTransformer model. "
+                f"Error: {self._error}"
+            )
+        return self._model
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Embed a batch of documents as a float32 matrix (not cached here)."""
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True).astype(np.float32, copy=False)
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Embed one query string, served from the LRU when seen recently."""
+        with self._cache_lock:
+            cached = self._query_cache.get(text)
+            if cached is not None:
+                self._query_cache.move_to_end(text)
+                self._cache_hits += 1
+                return cached
+            self._cache_misses += 1
+
+        if self.batch_window_ms and self.batch_window_ms > 0:
+            vector = self._encode_micro_batched(text)
+        else:
+            vector = self.encode([text])[0]
+        vector.setflags(write=False)
+
+        with self._cache_lock:
+            self._query_cache[text] = vector
+            self._query_cache.move_to_end(text)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def _encode_micro_batched(self, text: str) -> np.ndarray:
+        """Queue text for the batch worker and wait for its vector."""
+        # Make sure load errors surface in the caller, not the worker
+        self.model
+
+        future: Future = Future()
+        with self._batch_cond:
+            self._pending.append((text, future))
+            if self._batch_thread is None:
+                self._batch_thread = threading.Thread(
+                    target=self._batch_worker, name="embedding-batcher", daemon=True
+                )
+                self._batch_thread.start()
+            self._batch_cond.notify()
+        return future.result()
+
+    def _batch_worker(self) -> None:
+        """Collect queries for batch_window_ms, then encode them in one call."""
+        window = self.batch_window_ms / 1000.0
+        while True:
+            with self._batch_cond:
+                while not self._pending:
+                    self._batch_cond.wait()
+                concurrent = len(self._pending) > 1
+
+            # Let concurrent requests join this batch; a lone query goes now
+            # (queries arriving while it encodes form the next batch)
+            if concurrent:
+                time.sleep(window)
+
+            with self._batch_cond:
+                batch = self._pending[:MAX_QUERY_BATCH]
+                del self._pending[:MAX_QUERY_BATCH]
+
+            try:
+                vectors = self.encode([text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector.copy())
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+            with self._cache_lock:
+                self._query_batches += 1
+                self._batched_queries += len(batch)
+
+    def clear_query_cache(self) -> None:
+        with self._cache_lock:
+            self._query_cache.clear()
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness and cache statistics for /api/health."""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            cache = {
+                "size": len(self._query_cache),
+                "max_size": self.query_cache_size,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            }
+            batching = {
+                "window_ms": self.batch_window_ms,
+                "batches": self._query_batches,
+                "avg_batch_size": round(self._batched_queries / self._query_batches, 2) if self._query_batches else 0.0,
+            }
+        status = {
+            "state": self._state,
+            "ready": self._state == "ready",
+            "model": self.model_name,
+            "backend": self.backend,
+            "num_threads": self.num_threads,
+            "query_cache": cache,
+            "query_batching": batching,
+        }
+        if self._load_seconds is not None:
+            status["load_seconds"] = round(self._load_seconds, 2)
+        if self._error:
+            status["error"] = self._error
+        return status
+
+
+# Singleton instance
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get or create the process-wide EmbeddingService."""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                from utils.config_loader import get_config
+                si_config = get_config().schema_intelligence
+                _embedding_service = EmbeddingService(
+                    query_cache_size=si_config.query_embedding_cache_size,
+                    backend=si_config.embedding_backend,
+                    num_threads=si_config.embedding_threads,
+                    batch_window_ms=si_config.query_batch_window_ms,
+                )
+    return _embedding_service
@@ -20,14 +20,23 @@ class ProfileStore:
     def __init__(self, profiles_path: str = PROFILES_PATH):
         self._profiles: Dict[str, dict] = {}
         self._profiles_path = profiles_path
+        # Bumped on every change so derived caches (e.g. the table selector
+        # catalog) can tell when to rebuild
+        self._version = 0
         self._load_profiles()
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter of profile changes."""
+        return self._version
+
     def _load_profiles(self):
         """Load profiles from disk"""
         try:
             if Path(self._profiles_path).exists():
                 with open(self._profiles_path, 'r', encoding='utf-8') as f:
                     self._profiles = json.load(f)
+                self._version += 1
                 print(f"  Loaded {len(self._profiles)} table profiles from disk")
         except Exception as e:
             print(f"  Warning: Could not load profiles: {e}")
@@ -51,6 +60,7 @@ class ProfileStore:
         """Set profile for a table"""
         profile['profiled_at'] = datetime.now().isoformat()
         self._profiles[table_name] = profile
+        self._version += 1
 
     def get_all_profiles(self) -> Dict[str, dict]:
         """Get all profiles"""
@@ -63,11 +73,13 @@ class ProfileStore:
     def clear_profiles(self):
         """Clear all profiles"""
         self._profiles = {}
+        self._version += 1
 
     def delete_profile(self, table_name: str) -> bool:
         """Delete profile for a specific table"""
         if table_name in self._profiles:
             del self._profiles[table_name]
+            self._version += 1
             return True
         return False
 
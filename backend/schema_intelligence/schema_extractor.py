@@ -1,4 +1,4 @@
-import duckdb
+from analytics_engine.duckdb_manager import open_connection
 import yaml
 from utils.sql_utils import quote_identifier
 
@@ -84,17 +84,22 @@ def _infer_table_description(table_name: str, columns: list) -> str:
 
 def extract_schema(
     db_path="data_sources/snapshots/latest.duckdb",
-    metric_path="config/metric_definitions.yaml"
+    metric_path="config/metric_definitions.yaml",
+    source_ids=None
 ):
     """
     Extracts schema metadata with semantic types and source_id tracking.
     Filters out non-analytical tables.
     No row access. No aggregates. No samples.
+
+    Args:
+        source_ids: Optional iterable of source_ids. When given, only tables
+                    belonging to those sources are DESCRIBEd (partial rebuilds).
     """
     import json
     from pathlib import Path
 
-    conn = duckdb.connect(db_path)
+    conn = open_connection(db_path)
     
     # Load table metadata to get source_id for each table
     table_metadata = {}
@@ -125,6 +130,13 @@ def extract_schema(
 
     tables = conn.execute("SHOW TABLES").fetchall()
 
+    if source_ids is not None:
+        wanted = set(source_ids)
+        tables = [
+            (table_name,) for (table_name,) in tables
+            if table_metadata.get(table_name, {}).get('source_id') in wanted
+        ]
+
     for (table_name,) in tables:
         # Include ALL tables (not just those in metrics)
         # This allows querying any sheet in the Google Sheets workbook
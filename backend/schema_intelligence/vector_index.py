@@ -0,0 +1,314 @@
+"""
+In-process vector index for schema-level semantic retrieval.
+
+The schema corpus is tiny (a few hundred table/metric documents), so a brute-force
+dot product over a float32 matrix answers a top-k query in microseconds without
+ChromaDB's SQLite + HNSW stack. Vectors are L2-normalized on insert so the dot
+product is the cosine similarity.
+
+Persistence:
+    <persist_dir>/schema_vectors.<generation>.npy  float32 matrix, np.save format
+    <persist_dir>/schema_vectors_meta.json         ids, documents and metadatas
+                                                   (row-aligned), plus the name,
+                                                   shape and checksum of the matrix
+
+Every save writes the matrix under a new generation name first and then
+atomically replaces the metadata file, which names that matrix. A crash in
+between leaves the previous metadata pointing at the previous matrix, and
+load() rejects a matrix whose shape or checksum does not match its metadata.
+Superseded matrix files are removed after the switch.
+
+The matrix is memory-mapped at startup (np.load(mmap_mode='r')), so a restart
+does not re-embed or copy the corpus into memory until it is queried. Writes
+drop every reference to the mapping before an old matrix file is removed
+(Windows refuses to remove a mapped file).
+
+Distances are reported as squared L2 between unit vectors (2 - 2 * cosine), the
+same scale as ChromaDB's default "l2" space, so callers converting distance to
+similarity keep working unchanged.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+MATRIX_PREFIX = "schema_vectors"
+META_FILENAME = "schema_vectors_meta.json"
+
+
+def _matrix_checksum(matrix: np.ndarray) -> str:
+    """sha1 of the float32 matrix bytes (ties a matrix file to its metadata)."""
+    return hashlib.sha1(np.ascontiguousarray(matrix, dtype=np.float32).tobytes()).hexdigest()
+
+
+def _replace_file(src: Optional[str], dst: str, attempts: int = 5) -> None:
+    """
+    os.replace (or os.remove when src is None), retrying briefly while a reader
+    still holds the old memory map of dst (PermissionError on Windows).
+    """
+    for attempt in range(attempts):
+        try:
+            if src is None:
+                os.remove(dst)
+            else:
+                os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows are left as zeros)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class NumpyVectorIndex:
+    """
+    Brute-force cosine index over a normalized float32 matrix.
+
+    Thread-safe: writers build a new snapshot under a lock and swap it in;
+    readers grab the current snapshot without locking, so a query never sees
+    a half-applied rebuild.
+    """
+
+    def __init__(self, persist_dir: str = "schema_store"):
+        """
+        Args:
+            persist_dir: Directory for the .npy matrix and metadata sidecar
+        """
+        self.persist_dir = persist_dir
+        self._meta_path = os.path.join(persist_dir, META_FILENAME)
+        self._lock = threading.RLock()
+
+        # Snapshot: (ids, documents, metadatas, matrix) - replaced, never mutated
+        self._snapshot = ([], [], [], np.zeros((0, 0), dtype=np.float32))
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Memory-map a previously saved index, if present and consistent."""
+        if not os.path.exists(self._meta_path):
+            return
+
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+
+            matrix_name = meta.get("matrix")
+            matrix_path = os.path.join(self.persist_dir, matrix_name) if matrix_name else None
+            if not matrix_path or not os.path.exists(matrix_path):
+                print(f"[WARN]  Vector index matrix {matrix_name!r} missing - ignoring saved index")
+                return
+            matrix = np.load(matrix_path, mmap_mode="r")
+
+            ids = meta.get("ids", [])
+            if list(matrix.shape) != meta.get("shape") or matrix.shape[0] != len(ids):
+                print(f"[WARN]  Vector index shape mismatch ({matrix.shape} vs {meta.get('shape')}, {len(ids)} ids) - ignoring saved index")
+                return
+            if _matrix_checksum(matrix) != meta.get("sha1"):
+                print("[WARN]  Vector index checksum mismatch - ignoring saved index")
+                return
+
+            self._snapshot = (ids, meta.get("documents", []), meta.get("metadatas", []), matrix)
+            print(f"[OK] Vector index loaded: {len(ids)} document(s) (memory-mapped)")
+        except Exception as e:
+            print(f"[WARN]  Failed to load vector index from {self.persist_dir}: {e}")
+
+    def _matrix_files(self) -> List[str]:
+        """Every matrix generation on disk (current and superseded)."""
+        return glob.glob(os.path.join(glob.escape(self.persist_dir), f"{MATRIX_PREFIX}*.npy"))
+
+    def _save(self) -> None:
+        """
+        Write the current snapshot to disk: a new matrix generation, then an
+        atomic replace of the metadata that names it.
+        """
+        ids, documents, metadatas, matrix = self._snapshot
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            matrix_name = f"{MATRIX_PREFIX}.{uuid.uuid4().hex}.npy"
+            matrix_path = os.path.join(self.persist_dir, matrix_name)
+            np.save(matrix_path, matrix)
+
+            tmp_meta = self._meta_path + ".tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({
+                    "matrix": matrix_name,
+                    "shape": list(matrix.shape),
+                    "sha1": _matrix_checksum(matrix),
+                    "ids": ids,
+                    "documents": documents,
+                    "metadatas": metadatas,
+                }, f, ensure_ascii=False)
+            _replace_file(tmp_meta, self._meta_path)
+        except Exception as e:
+            print(f"[WARN]  Failed to persist vector index to {self.persist_dir}: {e}")
+            return
+
+        # Superseded generations; one still mapped elsewhere is retried next save
+        for path in self._matrix_files():
+            if os.path.basename(path) != matrix_name:
+                try:
+                    _replace_file(None, path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> int:
+        """
+        Upsert documents with their embeddings. Existing ids are replaced.
+
+        Returns:
+            Number of documents written
+        """
+        if not ids:
+            return 0
+
+        vectors = _normalize(embeddings)
+        if vectors.shape[0] != len(ids):
+            raise ValueError(f"Got {vectors.shape[0]} embeddings for {len(ids)} ids")
+
+        with self._lock:
+            old_ids, old_docs, old_metas, old_matrix = self._snapshot
+            replaced = set(ids)
+            keep = [i for i, doc_id in enumerate(old_ids) if doc_id not in replaced]
+
+            if old_matrix.shape[0] and old_matrix.shape[1] != vectors.shape[1]:
+                # Embedding model changed - old vectors are not comparable
+                print(f"[WARN]  Embedding dimension changed ({old_matrix.shape[1]} -> {vectors.shape[1]}), dropping old vectors")
+                keep = []
+
+            kept_matrix = np.asarray(old_matrix[keep], dtype=np.float32) if keep else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            self._snapshot = (
+                [old_ids[i] for i in keep] + list(ids),
+                [old_docs[i] for i in keep] + list(documents),
+                [old_metas[i] for i in keep] + [dict(m) for m in metadatas],
+                np.vstack([kept_matrix, vectors]),
+            )
+            # The new matrix is an in-memory copy; release the memory map
+            old_matrix = kept_matrix = None
+            self._save()
+        return len(ids)
+
+    def delete(self, where: Optional[Dict[str, Any]] = None, ids: Optional[Sequence[str]] = None) -> int:
+        """
+        Delete documents by id and/or exact metadata match.
+
+        Args:
+            where: Metadata filter, e.g. {"source_id": "..."} (all keys must match)
+            ids: Explicit document ids
+
+        Returns:
+            Number of documents deleted
+        """
+        if not where and not ids:
+            return 0
+
+        id_set = set(ids or ())
+        with self._lock:
+            old_ids, old_docs, old_metas, old_matrix = self._snapshot
+
+            def matches(i: int) -> bool:
+                if old_ids[i] in id_set:
+                    return True
+                return bool(where) and all(old_metas[i].get(k) == v for k, v in where.items())
+
+            keep = [i for i in range(len(old_ids)) if not matches(i)]
+            deleted = len(old_ids) - len(keep)
+            if not deleted:
+                return 0
+
+            self._snapshot = (
+                [old_ids[i] for i in keep],
+                [old_docs[i] for i in keep],
+                [old_metas[i] for i in keep],
+                np.asarray(old_matrix[keep], dtype=np.float32),
+            )
+            # The new matrix is an in-memory copy; release the memory map
+            old_matrix = None
+            self._save()
+        return deleted
+
+    def clear(self) -> None:
+        """Drop every document and remove the persisted files."""
+        with self._lock:
+            self._snapshot = ([], [], [], np.zeros((0, 0), dtype=np.float32))
+            # Metadata first, so no manifest is left pointing at a removed matrix
+            for path in [self._meta_path] + self._matrix_files():
+                try:
+                    _replace_file(None, path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"[WARN]  Could not remove {path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        return len(self._snapshot[0])
+
+    def query(self, embedding: np.ndarray, top_k: int = 5) -> List[dict]:
+        """
+        Top-k nearest documents by cosine similarity.
+
+        Returns:
+            List of dicts with document, metadata and distance (2 - 2 * cosine),
+            ordered from most to least similar
+        """
+        ids, documents, metadatas, matrix = self._snapshot
+        n = matrix.shape[0]
+        if n == 0 or top_k <= 0:
+            return []
+
+        query_vec = _normalize(embedding)[0]
+        if query_vec.shape[0] != matrix.shape[1]:
+            print(f"[WARN]  Query embedding dimension {query_vec.shape[0]} != index dimension {matrix.shape[1]}")
+            return []
+
+        scores = matrix @ query_vec
+        k = min(top_k, n)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+
+        return [
+            {
+                'document': documents[i],
+                'metadata': metadatas[i],
+                'distance': float(2.0 - 2.0 * scores[i]),
+            }
+            for i in top
+        ]
@@ -0,0 +1,139 @@
+"""
+Embedding Backend Benchmark - fp32 vs int8 on our schema documents
+
+Embeds the schema documents of the current DuckDB snapshot and every question
+from comprehensive_test.py (English + Tamil) with:
+1. the fp32 baseline (SentenceTransformer defaults)
+2. the int8 backend (torch dynamic quantization of Linear layers)
+
+and reports:
+- model load time
+- single-query encode latency (p50 / p95)
+- document batch encode throughput
+- recall@k of int8 retrieval against the fp32 top-k (fp32 is ground truth)
+
+Usage:
+    python scripts/embedding_benchmark.py
+    python scripts/embedding_benchmark.py --threads 2 --k 5
+    python scripts/embedding_benchmark.py --limit 100   # first 100 questions only
+"""
+
+import sys
+import io
+
+# Fix Windows encoding for Tamil characters
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import os
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # schema extraction uses paths relative to backend/
+
+import numpy as np
+
+from greeting_detector_benchmark import load_test_questions
+from schema_intelligence.embedding_builder import build_schema_documents
+from schema_intelligence.embedding_service import EmbeddingService
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(doc_matrix, query_matrix, k):
+    scores = query_matrix @ doc_matrix.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def run_backend(backend, documents, questions, threads, batch_size):
+    """Load one backend and measure it. Returns timings + embeddings."""
+    service = EmbeddingService(backend=backend, num_threads=threads, query_cache_size=0)
+
+    start = time.perf_counter()
+    service.wait_until_ready()
+    load_seconds = time.perf_counter() - start
+    if not service.is_ready:
+        raise RuntimeError(service.status().get("error"))
+
+    # Warm-up (first call allocates)
+    service.encode(questions[:4])
+
+    start = time.perf_counter()
+    doc_matrix = service.encode(documents, batch_size=batch_size)
+    doc_seconds = time.perf_counter() - start
+
+    latencies = []
+    query_rows = []
+    for question in questions:
+        start = time.perf_counter()
+        query_rows.append(service.encode([question])[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "load_seconds": load_seconds,
+        "doc_per_second": len(documents) / doc_seconds if doc_seconds else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "docs": _normalize(doc_matrix),
+        "queries": _normalize(np.vstack(query_rows)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=5, help="Top-k for recall")
+    parser.add_argument("--threads", type=int, default=0, help="torch.set_num_threads (0 = torch default)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Document encode batch size")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N questions")
+    args = parser.parse_args()
+
+    documents = [doc["text"] for doc in build_schema_documents()]
+    if not documents:
+        print("No schema documents found - load a dataset first (data_sources/snapshots/latest.duckdb)")
+        return 1
+
+    questions = load_test_questions()
+    if args.limit:
+        questions = questions[:args.limit]
+
+    k = min(args.k, len(documents))
+    print(f"Schema documents: {len(documents)} | Questions: {len(questions)} | k={k} | threads={args.threads or 'default'}")
+
+    results = {}
+    for backend in ("fp32", "int8"):
+        print(f"  Running {backend}...")
+        results[backend] = run_backend(backend, documents, questions, args.threads, args.batch_size)
+
+    # int8 retrieval against fp32 ground truth (same int8 index + int8 queries)
+    truth = _top_k(results["fp32"]["docs"], results["fp32"]["queries"], k)
+    candidate = _top_k(results["int8"]["docs"], results["int8"]["queries"], k)
+    recall = np.mean([len(set(t) & set(c)) / k for t, c in zip(truth, candidate)])
+    top1 = np.mean(truth[:, 0] == candidate[:, 0])
+    cosine = np.mean(np.sum(results["fp32"]["queries"] * results["int8"]["queries"], axis=1))
+
+    print("=" * 70)
+    print(f"{'':<26}{'fp32':>14}{'int8':>14}")
+    for label, key, fmt in (
+        ("model load (s)", "load_seconds", "{:14.2f}"),
+        ("query p50 (ms)", "p50_ms", "{:14.2f}"),
+        ("query p95 (ms)", "p95_ms", "{:14.2f}"),
+        ("docs / second", "doc_per_second", "{:14.1f}"),
+    ):
+        print(f"{label:<26}" + fmt.format(results["fp32"][key]) + fmt.format(results["int8"][key]))
+    print("-" * 70)
+    print(f"recall@{k} (int8 vs fp32)      {recall:.3f}")
+    print(f"top-1 agreement               {top1:.3f}")
+    print(f"mean query cosine fp32/int8   {cosine:.4f}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Fast Planner Report - bypass rate and accuracy on comprehensive_test.py
+
+Routes every English question from comprehensive_test.py with the rule-based
+table router (no LLM), asks the FastPlanner for a plan and reports:
+1. Bypass rate - share of questions answered without the LLM planner, per pattern
+2. Validity    - fast plans that pass validate_plan(), compile and execute
+3. Table accuracy - fast-planned table matches the case's expected_table
+4. Result agreement (--llm) - fast plan result equals the LLM plan result
+   on the current DuckDB snapshot (needs GEMINI_API_KEY)
+
+Before that it runs REGRESSION_CASES against a fixed profile (no dataset
+needed): questions the fast path must leave to the LLM, and the pattern it
+must pick for the rest.
+
+Tamil questions are skipped: in production they are translated by the LLM
+before planning, so their fast-path behaviour is that of the translation.
+
+Usage:
+    python scripts/fast_planner_report.py
+    python scripts/fast_planner_report.py --llm       # also compare with LLM plans
+    python scripts/fast_planner_report.py --verbose   # print every fast plan
+"""
+
+import sys
+import io
+
+# Fix Windows encoding for Tamil characters
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import contextlib
+import copy
+import os
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # profiles and snapshot use paths relative to backend/
+
+from greeting_detector_benchmark import load_test_cases
+from analytics_engine.duckdb_manager import DuckDBManager
+from execution_layer.sql_compiler import compile_sql
+from planning_layer import table_router as table_router_module
+from planning_layer.entity_extractor import EntityExtractor
+from planning_layer.fast_planner import FastPlanner
+from planning_layer.table_router import TableRouter
+from schema_intelligence.profile_store import ProfileStore
+from validation_layer.plan_validator import validate_plan
+
+
+# Fixed profile for REGRESSION_CASES
+REGRESSION_TABLE = "Sales_Transactions"
+REGRESSION_PROFILE = {
+    "table_type": "transactional",
+    "columns": {
+        "Transaction_ID": {"role": "identifier"},
+        "Branch": {"role": "dimension", "unique_values": ["Chennai", "Madurai", "Coimbatore"]},
+        "Sales_Amount": {"role": "metric", "metric_type": "currency"},
+    },
+}
+
+# (question, expected pattern or None when the LLM planner must handle it)
+REGRESSION_CASES = [
+    ("count of sales", None),                     # rows? a summed quantity? not SUM(Sales_Amount)
+    ("how many sales in Chennai", None),
+    ("number of sales by branch", None),
+    ("how many transactions in Chennai", "count"),
+    ("total sales in Chennai", "aggregate"),
+    ("highest sales", "row_extrema"),             # the single highest row, LIMIT 1
+    ("which branch has the highest sales", "extrema"),
+    ("top 2 branches by sales", "rank"),
+]
+
+
+class _FixedProfiles:
+    """Minimal ProfileStore stand-in serving REGRESSION_PROFILE."""
+
+    version = 1
+
+    def get_profile(self, table):
+        return REGRESSION_PROFILE if table == REGRESSION_TABLE else None
+
+
+def check_regressions():
+    """Run REGRESSION_CASES; returns (question, expected, got) for each mismatch."""
+    planner = FastPlanner(_FixedProfiles())
+    mismatches = []
+    for question, expected in REGRESSION_CASES:
+        before = planner.stats()["by_pattern"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            plan = planner.plan(question, REGRESSION_TABLE, {}, 1.0)
+        after = planner.stats()["by_pattern"]
+        got = next((p for p in after if after[p] != before.get(p, 0)), None) if plan else None
+        if got != expected:
+            mismatches.append((question, expected, got))
+        elif got in ("extrema", "row_extrema") and plan.get("limit") != 1:
+            mismatches.append((question, "limit 1", plan.get("limit")))
+    return mismatches
+
+
+def _rows(df):
+    """Order-insensitive, rounded representation of a result frame."""
+    rows = []
+    for row in df.itertuples(index=False):
+        rows.append(tuple(round(v, 2) if isinstance(v, float) else str(v) for v in row))
+    return sorted(rows)
+
+
+def _result_values(df):
+    """Numeric answer of aggregation_on_subset results, rows otherwise."""
+    if "result" in df.columns:
+        return _rows(df[["result"]])
+    return _rows(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm", action="store_true", help="Compare results with LLM-generated plans")
+    parser.add_argument("--verbose", action="store_true", help="Print every fast plan and its SQL")
+    args = parser.parse_args()
+
+    mismatches = check_regressions()
+    print(f"Regression cases: {len(REGRESSION_CASES) - len(mismatches)}/{len(REGRESSION_CASES)}")
+    for question, expected, got in mismatches:
+        print(f"  REGRESSION '{question}': expected {expected}, got {got}")
+
+    profile_store = ProfileStore()
+    if not profile_store.get_all_profiles():
+        print("No table profiles found - load a dataset first (data_sources/table_profiles.json)")
+        return 1
+
+    entity_extractor = EntityExtractor()
+    entity_extractor.refresh_from_profiles(profile_store)
+    table_router_module.USE_LLM_SELECTION = False
+    router = TableRouter(profile_store, entity_extractor=entity_extractor)
+    planner = FastPlanner(profile_store)
+    db = DuckDBManager()
+
+    cases = [case for case in load_test_cases() if case.get("en")]
+    valid = executed = table_hits = 0
+    compared = agreed = 0
+    failures = []
+
+    for case in cases:
+        question = case["en"]
+        entities = entity_extractor.extract(question)
+        with contextlib.redirect_stdout(io.StringIO()):
+            routing = router.route(question, entities=entities)
+            plan = planner.plan(question, routing.table, entities, routing.confidence) if routing.is_confident else None
+        if plan is None:
+            continue
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                validate_plan(plan)
+            valid += 1
+            sql = compile_sql(plan)
+            fast_df = db.query(sql)
+            executed += 1
+        except Exception as e:
+            failures.append((case["id"], question, str(e)))
+            continue
+
+        if case.get("expected_table", "").lower() in plan["table"].lower():
+            table_hits += 1
+
+        if args.verbose:
+            print(f"  #{case['id']:<4} {question}")
+            print(f"        {sql}")
+
+        if args.llm:
+            from planning_layer.planner_client import generate_plan
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    schema_context = router.get_table_schema(routing.table)
+                    llm_plan = generate_plan(question, schema_context, entities=copy.deepcopy(entities))
+                    validate_plan(llm_plan)
+                llm_df = db.query(compile_sql(llm_plan))
+            except Exception as e:
+                print(f"  LLM plan unavailable for #{case['id']}: {e}")
+                continue
+            compared += 1
+            if _result_values(fast_df) == _result_values(llm_df):
+                agreed += 1
+            else:
+                print(f"  DISAGREE #{case['id']}: {question}")
+
+    stats = planner.stats()
+    bypassed = stats["bypassed"]
+
+    print("=" * 70)
+    print(f"FAST PLANNER REPORT ({len(cases)} English questions)")
+    print(f"  Bypassed LLM planner: {bypassed}/{len(cases)} ({bypassed / len(cases):.0%})")
+    for pattern, count in sorted(stats["by_pattern"].items(), key=lambda item: -item[1]):
+        print(f"    {pattern:<12} {count}")
+    if bypassed:
+        print(f"  Valid plans:          {valid}/{bypassed}")
+        print(f"  Executed:             {executed}/{bypassed}")
+        print(f"  Expected table:       {table_hits}/{executed}")
+    if args.llm:
+        print(f"  Agrees with LLM plan: {agreed}/{compared}")
+    for case_id, question, error in failures:
+        print(f"  FAILED #{case_id}: {question} -> {error}")
+    print("=" * 70)
+    return 1 if failures or mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Greeting Detector Benchmark & Golden Check
+
+Runs every question from comprehensive_test.py (English + Tamil) plus a set of
+conversational messages through the greeting_detector classifiers and:
+1. Compares the classification against the recorded golden file
+   (scripts/greeting_golden.json) - any difference is a regression
+2. Reports per-call latency for each classifier
+
+Usage:
+    python scripts/greeting_detector_benchmark.py             # verify + benchmark
+    python scripts/greeting_detector_benchmark.py --generate  # re-record golden file
+    python scripts/greeting_detector_benchmark.py --iterations 200
+"""
+
+import sys
+import io
+
+# Fix Windows encoding for Tamil characters
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import ast
+import json
+import os
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+from utils import greeting_detector
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "greeting_golden.json")
+TEST_SUITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "comprehensive_test.py")
+
+# Conversational messages that never hit the data pipeline in comprehensive_test.py
+CONVERSATIONAL_CASES = [
+    "hi", "hey", "Hello", "hello thara", "yo", "ok", "yes", "no",
+    "Good morning", "good night", "greetings", "vanakkam", "வணக்கம்", "namaste",
+    "what's up", "how are you", "how's it going",
+    "can you hear me", "are you there?", "testing 1 2 3", "mic check", "test",
+    "கேக்குதா", "நான் பேசுறது கேக்குதா",
+    "what can you do", "who are you", "what is your name", "tell me about yourself",
+    "what kind of questions can I ask", "enna maari questions kekalam",
+    "help me", "I need help", "help me find sales",
+    "call me Boss", "my name is Priya", "I am Ravi", "you can call me sir",
+    "என் பேரு அருண்", "என்னை கூப்பிடு அண்ணா",
+    "I'm so tired", "feeling low today", "you are amazing", "tell me a joke",
+    "what did you have for breakfast", "what's the weather like",
+    "அடி ஒரு கதை சொல்", "சோர்வா இருக்கு",
+    "Today is November 14th", "remember today is December",
+    "The date is January 1st", "I mean today is 14th November 2025",
+    "November 15th enna sales",
+    "what is sheet 1", "what is present in sheet four", "describe the sales table",
+    "what tables do I have", "show all columns of the branch table in detail",
+    "ஷீட் த்ரீயில் என்ன உள்ளது", "how many tables are there",
+    "1", "two", "first", "asdfgh qwerty zxcvb", "hmm",
+]
+
+
+def load_test_cases():
+    """
+    Read TEST_CASES from comprehensive_test.py without importing it
+    (the suite imports `requests` and talks to the deployed API).
+    """
+    with open(TEST_SUITE_PATH, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "TEST_CASES" for t in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("TEST_CASES not found in comprehensive_test.py")
+
+
+def load_test_questions():
+    """Every English and Tamil question from comprehensive_test.py."""
+    questions = []
+    for case in load_test_cases():
+        for lang in ("en", "ta"):
+            if case.get(lang):
+                questions.append(case[lang])
+    return questions
+
+
+def classify(text):
+    """Full classification of one message, in a JSON-comparable form."""
+    is_date_ctx, date_info = greeting_detector.is_date_context_statement(text)
+    return {
+        "is_greeting": greeting_detector.is_greeting(text),
+        "is_non_query_conversational": greeting_detector.is_non_query_conversational(text),
+        "is_capability_question": greeting_detector.is_capability_question(text),
+        "schema_inquiry": greeting_detector.detect_schema_inquiry(text),
+        "date_context": [is_date_ctx, date_info],
+    }
+
+
+def benchmark(messages, iterations):
+    """Average microseconds per call for each classifier."""
+    classifiers = {
+        "is_greeting": greeting_detector.is_greeting,
+        "is_non_query_conversational": greeting_detector.is_non_query_conversational,
+        "detect_schema_inquiry": greeting_detector.detect_schema_inquiry,
+        "is_date_context_statement": greeting_detector.is_date_context_statement,
+    }
+    # Bypass per-message memoization so we time the classifier itself
+    clear = getattr(greeting_detector, "clear_classifier_cache", lambda: None)
+
+    results = {}
+    for name, fn in classifiers.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            clear()
+            for message in messages:
+                fn(message)
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed / (iterations * len(messages)) * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generate", action="store_true", help="Record the golden classification file")
+    parser.add_argument("--iterations", type=int, default=50, help="Benchmark iterations over the message set")
+    args = parser.parse_args()
+
+    messages = load_test_questions() + CONVERSATIONAL_CASES
+    classifications = {message: classify(message) for message in messages}
+
+    if args.generate:
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(classifications, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"Golden file written: {GOLDEN_PATH} ({len(classifications)} messages)")
+        return 0
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    mismatches = []
+    for message, expected in golden.items():
+        actual = classify(message)
+        if actual != expected:
+            mismatches.append((message, expected, actual))
+
+    print("=" * 70)
+    print(f"GOLDEN CHECK: {len(golden) - len(mismatches)}/{len(golden)} identical")
+    for message, expected, actual in mismatches:
+        print(f"  MISMATCH: {message!r}")
+        print(f"    expected: {expected}")
+        print(f"    actual:   {actual}")
+
+    print("=" * 70)
+    print(f"BENCHMARK ({len(messages)} messages x {args.iterations} iterations)")
+    for name, micros in benchmark(messages, args.iterations).items():
+        print(f"  {name:<30} {micros:8.1f} us/call")
+    print("=" * 70)
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+LLM Replay Benchmark - pipeline overhead vs model latency
+
+Runs the English questions from comprehensive_test.py through
+process_query_service in one of two modes:
+
+1. --record: live provider (llm.provider), every LLM response is appended
+   to llm.replay_path
+2. default:  replay provider - the same responses answered from the
+   recording, so the run is deterministic and has no model latency
+
+For every question it reports wall time, LLM wall time (time during which
+at least one LLM call was in flight - parallel calls count once), the sum
+of all LLM call durations, and overhead = wall - LLM wall time (pipeline
+work not hidden behind a model call: routing, SQL, healing, formatting).
+Comparing a --record run with a replay run shows how much of the latency
+is the model and how much is ours.
+
+The query result cache is cleared before each question so every run
+exercises the full pipeline.
+
+Usage:
+    python scripts/llm_replay_benchmark.py --record        # needs GEMINI_API_KEY
+    python scripts/llm_replay_benchmark.py                 # replay, no network
+    python scripts/llm_replay_benchmark.py --latency       # replay with recorded latency
+    python scripts/llm_replay_benchmark.py --limit 10
+"""
+
+import sys
+import io
+
+# Fix Windows encoding for Tamil characters
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import contextlib
+import os
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # profiles and snapshot use paths relative to backend/
+
+from greeting_detector_benchmark import load_test_cases
+from utils.config_loader import get_config
+from utils.llm_provider import get_provider_stats, llm_busy_ms
+
+
+def _llm_sum_ms():
+    """Summed duration of all LLM calls so far (parallel calls add up)."""
+    return sum(entry["total_ms"] for entry in get_provider_stats()["calls"].values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="Use the live provider and record responses")
+    parser.add_argument("--latency", action="store_true", help="Replay with recorded model latency")
+    parser.add_argument("--limit", type=int, default=0, help="Only run the first N questions")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args = parser.parse_args()
+
+    llm_config = get_config().llm
+    if args.record:
+        llm_config.replay_record = True
+    else:
+        llm_config.provider = "replay"
+        llm_config.simple_query_provider = ""
+        llm_config.replay_latency = args.latency
+    mode = f"{llm_config.provider} (recording)" if args.record else "replay"
+    print(f"Mode: {mode}, recording file: {llm_config.replay_path}")
+
+    from api.services import process_query_service
+    from utils.query_cache import get_query_cache
+
+    cases = load_test_cases()
+    if args.limit:
+        cases = cases[:args.limit]
+
+    rows = []
+    for case in cases:
+        get_query_cache().clear()
+        busy_before, sum_before = llm_busy_ms(), _llm_sum_ms()
+        start = time.time()
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        try:
+            with quiet:
+                response = process_query_service(case["en"], conversation_id=f"replay-bench-{case['id']}")
+            ok = bool(response.get("success"))
+        except Exception as e:
+            ok = False
+            print(f"  #{case['id']} failed: {str(e)[:100]}")
+        wall_ms = (time.time() - start) * 1000
+        llm_ms = llm_busy_ms() - busy_before
+        llm_sum_ms = _llm_sum_ms() - sum_before
+        rows.append((case["id"], ok, wall_ms, llm_ms, llm_sum_ms))
+        print(f"  #{case['id']:<4} {'ok ' if ok else 'ERR'} wall {wall_ms:8.1f} ms   "
+              f"llm wall {llm_ms:8.1f} ms (sum {llm_sum_ms:8.1f})   overhead {wall_ms - llm_ms:8.1f} ms")
+
+    if not rows:
+        print("No test cases found")
+        return 1
+
+    total_wall = sum(r[2] for r in rows)
+    total_llm = sum(r[3] for r in rows)
+    total_llm_sum = sum(r[4] for r in rows)
+    overheads = sorted(r[2] - r[3] for r in rows)
+    print()
+    print("=" * 60)
+    print(f"Questions:          {len(rows)} ({sum(1 for r in rows if r[1])} succeeded)")
+    print(f"Avg wall time:      {total_wall / len(rows):.1f} ms")
+    print(f"Avg LLM wall time:  {total_llm / len(rows):.1f} ms")
+    print(f"Avg LLM call sum:   {total_llm_sum / len(rows):.1f} ms")
+    print(f"Avg overhead:       {(total_wall - total_llm) / len(rows):.1f} ms")
+    print(f"p95 overhead:       {overheads[min(len(overheads) - 1, int(0.95 * len(overheads)))]:.1f} ms")
+    print(f"LLM calls by role:  {get_provider_stats()['calls']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
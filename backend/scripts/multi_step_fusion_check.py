@@ -0,0 +1,162 @@
+"""
+Multi-Step Fusion Check - fused and step-by-step plans return the same rows
+
+Builds a small DuckDB snapshot in a temporary directory and runs two-step
+plans (an extrema_lookup producing ${var}, a filter comparing a column with
+it) twice through execute_multi_step_query: with query.multi_step_fusion_enabled
+and without. The step-by-step path substitutes the variable as text
+(dates as YYYY-MM-DD, numbers as str()), so a fused statement must compare
+the same way. Cases cover DATE, TIMESTAMP (with a time part), DOUBLE and
+INTEGER variables, an empty producer, and =, >=, <, != comparisons; DECIMAL
+variables (whose text Python and DuckDB render differently) must run step
+by step.
+
+No dataset is needed. Exits 1 if any case differs or fused when it should not
+(or the other way round).
+
+Usage:
+    python scripts/multi_step_fusion_check.py
+    python scripts/multi_step_fusion_check.py --verbose   # print every case
+"""
+
+import sys
+import io
+
+# Fix Windows encoding for Tamil characters
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import contextlib
+import os
+import tempfile
+
+import duckdb
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+from analytics_engine.duckdb_manager import DEFAULT_DB_PATH
+from execution_layer.multi_step_executor import execute_multi_step_query
+from utils.config_loader import get_config
+
+
+FIXTURE_SQL = [
+    """CREATE TABLE Sales AS SELECT "Date", "Branch", CAST("Price" AS DOUBLE) AS "Amount", "Quantity", "Price" FROM (VALUES
+        (DATE '2024-03-04', 'Chennai', 900.0, 3),
+        (DATE '2024-03-05', 'Chennai', 1500.0, 7),
+        (DATE '2024-03-06', 'Madurai', 1200.5, 12),
+        (DATE '2024-03-07', 'Madurai', 80.25, 2)
+    ) t("Date", "Branch", "Price", "Quantity")""",
+    """CREATE TABLE Visits AS SELECT * FROM (VALUES
+        (TIMESTAMP '2024-03-05 00:00:00', DATE '2024-03-05', '2024-03-05', 'Chennai'),
+        (TIMESTAMP '2024-03-05 14:30:00', DATE '2024-03-05', '2024-03-05', 'Chennai'),
+        (TIMESTAMP '2024-03-05 18:45:10', DATE '2024-03-05', '2024-03-05', 'Madurai'),
+        (TIMESTAMP '2024-03-04 09:15:00', DATE '2024-03-04', '2024-03-04', 'Madurai'),
+        (TIMESTAMP '2024-03-06 11:00:00', DATE '2024-03-06', '2024-03-06', 'Chennai')
+    ) t("Visit_Time", "Visit_Date", "Visit_Day", "Branch")""",
+    """CREATE TABLE Targets AS SELECT "Branch", CAST("Target" AS DOUBLE) AS "Target", "Staff", "Label" FROM (VALUES
+        ('Chennai', 1500.0, 7, '1500.0'),
+        ('Madurai', 1200.5, 12, '7'),
+        ('Coimbatore', 99.0, 100, '99.0'),
+        ('Salem', 15000.0, 2, 'n/a')
+    ) t("Branch", "Target", "Staff", "Label")""",
+]
+
+# (name, producer table, producer order_by column, extract column, consumer table, consumer column, fuses)
+VARIABLE_CASES = [
+    ("DATE var vs DATE column", "Sales", "Amount", "Date", "Visits", "Visit_Date"),
+    ("DATE var vs TIMESTAMP column", "Sales", "Amount", "Date", "Visits", "Visit_Time"),
+    ("TIMESTAMP var vs TIMESTAMP column", "Visits", "Visit_Time", "Visit_Time", "Visits", "Visit_Time"),
+    ("TIMESTAMP var vs DATE column", "Visits", "Visit_Time", "Visit_Time", "Visits", "Visit_Date"),
+    ("TIMESTAMP var vs VARCHAR column", "Visits", "Visit_Time", "Visit_Time", "Visits", "Visit_Day"),
+    ("DOUBLE var vs DOUBLE column", "Sales", "Amount", "Amount", "Targets", "Target"),
+    ("DOUBLE var vs VARCHAR column", "Sales", "Amount", "Amount", "Targets", "Label"),
+    ("INTEGER var vs INTEGER column", "Sales", "Amount", "Quantity", "Targets", "Staff"),
+    ("INTEGER var vs VARCHAR column", "Sales", "Amount", "Quantity", "Targets", "Label"),
+    ("DECIMAL var vs DOUBLE column", "Sales", "Amount", "Price", "Targets", "Target", False),
+]
+OPERATORS = ["=", ">=", "<", "!="]
+
+
+def build_plan(producer_table, order_column, extract_column, consumer_table, consumer_column, operator,
+               producer_filters=None):
+    return {
+        "query_type": "multi_step",
+        "steps": [
+            {
+                "step_id": 1,
+                "query_type": "extrema_lookup",
+                "table": producer_table,
+                "filters": producer_filters or [],
+                "order_by": [[order_column, "DESC"]],
+                "limit": 1,
+                "output_variable": "value",
+                "extract_column": extract_column,
+            },
+            {
+                "step_id": 2,
+                "query_type": "filter",
+                "table": consumer_table,
+                "filters": [{"column": consumer_column, "operator": operator, "value": "${value}"}],
+                "limit": 100,
+            },
+        ],
+    }
+
+
+def run(plan, fused):
+    """(fused?, success, sorted rows) for a plan with fusion on or off."""
+    get_config().query.multi_step_fusion_enabled = fused
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = execute_multi_step_query(plan)
+    rows = sorted(repr(sorted(row.items())) for row in result.get("data", []))
+    return bool(result.get("analysis", {}).get("fused")), bool(result.get("success")), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fused and step-by-step multi-step results")
+    parser.add_argument("--verbose", action="store_true", help="print every case")
+    args = parser.parse_args()
+
+    get_config()  # settings.yaml is found relative to this package, not the working directory
+    workdir = tempfile.mkdtemp(prefix="fusion_check_")
+    os.chdir(workdir)  # the cursor pool and schema catalog open DEFAULT_DB_PATH relative to it
+    os.makedirs(os.path.dirname(DEFAULT_DB_PATH), exist_ok=True)
+    with duckdb.connect(DEFAULT_DB_PATH) as con:
+        for sql in FIXTURE_SQL:
+            con.execute(sql)
+
+    cases = [
+        (f"{name} ({operator})", build_plan(producer, order_column, extract, consumer, column, operator), fuses[0] if fuses else True)
+        for name, producer, order_column, extract, consumer, column, *fuses in VARIABLE_CASES
+        for operator in OPERATORS
+    ]
+    cases.append((
+        "empty producer (=)",
+        build_plan("Sales", "Amount", "Date", "Visits", "Visit_Day", "=",
+                   producer_filters=[{"column": "Branch", "operator": "=", "value": "Nowhere"}]),
+        True,
+    ))
+
+    failures = []
+    for name, plan, should_fuse in cases:
+        _, sequential_ok, sequential_rows = run(plan, fused=False)
+        was_fused, fused_ok, fused_rows = run(plan, fused=True)
+        problem = None
+        if was_fused != should_fuse:
+            problem = "did not fuse" if should_fuse else "fused"
+        elif (fused_ok, fused_rows) != (sequential_ok, sequential_rows):
+            problem = f"fused {len(fused_rows)} rows, step by step {len(sequential_rows)} rows"
+        if problem:
+            failures.append((name, problem))
+        if args.verbose or problem:
+            print(f"  [{'FAIL' if problem else 'OK'}] {name}: {problem or f'{len(fused_rows)} rows'}")
+
+    print(f"Fused = step by step: {len(cases) - len(failures)}/{len(cases)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,14 @@ class DuckDBConfig:
     snapshot_path: str = "data_sources/snapshots/latest.duckdb"
     max_connections: int = 10
     connection_timeout_seconds: int = 30
+    # Prepared statements kept per pooled cursor (per query shape, LRU)
+    prepared_statements_per_cursor: int = 64
+    # Runtime settings applied to every connection (see duckdb_manager.duckdb_settings)
+    memory_limit: str = ""  # e.g. "4GB"; empty = DuckDB default (80% of RAM)
+    threads: int = 0  # 0 = DuckDB default (all cores)
+    temp_directory: str = ""  # Spill directory for large sorts/joins; empty = DuckDB default
+    enable_object_cache: bool = True
+    preserve_insertion_order: bool = False
 
 
 @dataclass
@@ -52,10 +60,24 @@ class LLMConfig:
     api_key_env: str = "GEMINI_API_KEY"
     max_retries: int = 3
     model: str = "gemini-2.0-flash"
-    provider: str = "gemini"
+    provider: str = "gemini"  # gemini | openai_compatible | replay (see utils/llm_provider.py)
     temperature: float = 0.0
     request_timeout_seconds: int = 60
     enable_streaming: bool = True
+    context_cache_enabled: bool = True  # Provider-side caching of static prompt prefixes
+    context_cache_ttl_seconds: int = 600
+    trim_prompt_examples: bool = True  # Planner prompt keeps only examples for likely query types
+    single_flight_ttl_seconds: float = 5.0  # Identical LLM prompts share one call (and its result this long)
+    translation_batch_window_ms: int = 10  # Translations arriving this close together share one prompt
+    translation_batch_max: int = 8
+    simple_query_provider: str = ""  # Backend for simple queries ("" = provider), e.g. openai_compatible
+    local_base_url: str = "http://127.0.0.1:8080/v1"  # OpenAI-compatible server (llama.cpp / vLLM)
+    local_model: str = ""
+    local_api_key_env: str = "LOCAL_LLM_API_KEY"
+    local_timeout_seconds: int = 60
+    replay_path: str = "data_sources/llm_replay.jsonl"  # Recorded responses for provider: replay
+    replay_record: bool = False
+    replay_latency: bool = False  # Replay sleeps for the recorded model latency
 
 
 @dataclass
@@ -71,6 +93,14 @@ class SchemaIntelligenceConfig:
     embedding_model: str = "text-embedding-3-large"
     top_k: int = 5
     max_tables_in_prompt: int = 5
+    vector_backend: str = "numpy"  # numpy (in-process index) | chromadb
+    embedding_batch_size: int = 64
+    query_embedding_cache_size: int = 512
+    embedding_backend: str = "fp32"  # fp32 | int8 (torch dynamic quantization)
+    embedding_threads: int = 0  # torch.set_num_threads (0 = torch default)
+    query_batch_window_ms: float = 0.0  # micro-batch window for concurrent query encodes
+    selector_max_tables: int = 8  # tables described in the LLM table selector prompt
+    selector_token_budget: int = 3000  # approx. tokens for those table descriptions
 
 
 @dataclass
@@ -81,6 +111,18 @@ class QueryConfig:
     default_limit: int = 100
     max_healing_retries: int = 3
     max_healing_limit: int = 1000
+    fast_planner_enabled: bool = True  # Rule-based plans for simple questions (skips the LLM)
+    fast_planner_min_confidence: float = 0.7
+    speculative_planning_enabled: bool = True  # Plan top candidate tables in parallel when routing is unsure
+    speculative_max_branches: int = 3
+    speculative_max_concurrency: int = 3
+    speculative_max_score_gap: float = 0.25  # Relative routing-score gap to the best candidate
+    rollups_enabled: bool = True  # Pre-aggregated rollups per transactional table (see analytics_engine/rollups.py)
+    rollup_min_rows: int = 5000
+    rollup_max_dimensions: int = 8
+    rollup_max_size_ratio: float = 0.5
+    multi_step_fusion_enabled: bool = True  # Run scalar-passing multi-step chains as one CTE statement
+    query_timeout_seconds: float = 30.0  # Pooled queries running longer are interrupted (0 = no limit)
 
 
 @dataclass
@@ -91,6 +133,8 @@ class CacheConfig:
     tts_cache_max_size_mb: int = 500
     tts_cache_ttl_hours: int = 24
     schema_cache_ttl_seconds: int = 3600
+    result_cache_enabled: bool = True  # Reuse SQL results until a referenced table changes
+    result_cache_max_mb: int = 64
 
 
 @dataclass
@@ -102,6 +146,15 @@ class VoiceConfig:
     request_timeout_seconds: int = 30
 
 
+@dataclass
+class ExplanationConfig:
+    """Answer text generation configuration."""
+    template_fast_path: bool = True  # Deterministic EN/TA answers for simple results (skips the LLM)
+    template_query_types: List[str] = field(default_factory=lambda: [
+        "aggregation_on_subset", "metric", "extrema_lookup", "rank", "comparison",
+    ])
+
+
 @dataclass
 class TableRoutingConfig:
     """Table routing scoring weights."""
@@ -127,6 +180,7 @@ class Config:
     cache: CacheConfig
     voice: VoiceConfig
     table_routing: TableRoutingConfig
+    explanation: ExplanationConfig = field(default_factory=ExplanationConfig)
 
 
 # Singleton instance
@@ -165,6 +219,12 @@ def _parse_config(raw: dict) -> Config:
             snapshot_path=raw.get("duckdb", {}).get("snapshot_path", "data_sources/snapshots/latest.duckdb"),
             max_connections=raw.get("duckdb", {}).get("max_connections", 10),
             connection_timeout_seconds=raw.get("duckdb", {}).get("connection_timeout_seconds", 30),
+            prepared_statements_per_cursor=raw.get("duckdb", {}).get("prepared_statements_per_cursor", 64),
+            memory_limit=raw.get("duckdb", {}).get("memory_limit", ""),
+            threads=raw.get("duckdb", {}).get("threads", 0),
+            temp_directory=raw.get("duckdb", {}).get("temp_directory", ""),
+            enable_object_cache=raw.get("duckdb", {}).get("enable_object_cache", True),
+            preserve_insertion_order=raw.get("duckdb", {}).get("preserve_insertion_order", False),
         ),
         google_sheets=GoogleSheetsConfig(
             credentials_path=raw.get("google_sheets", {}).get("credentials_path", "credentials/service_account.json"),
@@ -182,6 +242,20 @@ def _parse_config(raw: dict) -> Config:
             temperature=raw.get("llm", {}).get("temperature", 0.0),
             request_timeout_seconds=raw.get("llm", {}).get("request_timeout_seconds", 60),
             enable_streaming=raw.get("llm", {}).get("enable_streaming", True),
+            context_cache_enabled=raw.get("llm", {}).get("context_cache_enabled", True),
+            context_cache_ttl_seconds=raw.get("llm", {}).get("context_cache_ttl_seconds", 600),
+            trim_prompt_examples=raw.get("llm", {}).get("trim_prompt_examples", True),
+            single_flight_ttl_seconds=raw.get("llm", {}).get("single_flight_ttl_seconds", 5.0),
+            translation_batch_window_ms=raw.get("llm", {}).get("translation_batch_window_ms", 10),
+            translation_batch_max=raw.get("llm", {}).get("translation_batch_max", 8),
+            simple_query_provider=raw.get("llm", {}).get("simple_query_provider", ""),
+            local_base_url=raw.get("llm", {}).get("local_base_url", "http://127.0.0.1:8080/v1"),
+            local_model=raw.get("llm", {}).get("local_model", ""),
+            local_api_key_env=raw.get("llm", {}).get("local_api_key_env", "LOCAL_LLM_API_KEY"),
+            local_timeout_seconds=raw.get("llm", {}).get("local_timeout_seconds", 60),
+            replay_path=raw.get("llm", {}).get("replay_path", "data_sources/llm_replay.jsonl"),
+            replay_record=raw.get("llm", {}).get("replay_record", False),
+            replay_latency=raw.get("llm", {}).get("replay_latency", False),
         ),
         project=ProjectConfig(
             environment=raw.get("project", {}).get("environment", "local"),
@@ -191,6 +265,14 @@ def _parse_config(raw: dict) -> Config:
             embedding_model=raw.get("schema_intelligence", {}).get("embedding_model", "text-embedding-3-large"),
             top_k=raw.get("schema_intelligence", {}).get("top_k", 5),
             max_tables_in_prompt=raw.get("schema_intelligence", {}).get("max_tables_in_prompt", 5),
+            vector_backend=raw.get("schema_intelligence", {}).get("vector_backend", "numpy"),
+            embedding_batch_size=raw.get("schema_intelligence", {}).get("embedding_batch_size", 64),
+            query_embedding_cache_size=raw.get("schema_intelligence", {}).get("query_embedding_cache_size", 512),
+            embedding_backend=raw.get("schema_intelligence", {}).get("embedding_backend", "fp32"),
+            embedding_threads=raw.get("schema_intelligence", {}).get("embedding_threads", 0),
+            query_batch_window_ms=raw.get("schema_intelligence", {}).get("query_batch_window_ms", 0.0),
+            selector_max_tables=raw.get("schema_intelligence", {}).get("selector_max_tables", 8),
+            selector_token_budget=raw.get("schema_intelligence", {}).get("selector_token_budget", 3000),
         ),
         query=QueryConfig(
             profile_sample_rows=raw.get("query", {}).get("profile_sample_rows", 10000),
@@ -198,6 +280,18 @@ def _parse_config(raw: dict) -> Config:
             default_limit=raw.get("query", {}).get("default_limit", 100),
             max_healing_retries=raw.get("query", {}).get("max_healing_retries", 3),
             max_healing_limit=raw.get("query", {}).get("max_healing_limit", 1000),
+            fast_planner_enabled=raw.get("query", {}).get("fast_planner_enabled", True),
+            fast_planner_min_confidence=raw.get("query", {}).get("fast_planner_min_confidence", 0.7),
+            speculative_planning_enabled=raw.get("query", {}).get("speculative_planning_enabled", True),
+            speculative_max_branches=raw.get("query", {}).get("speculative_max_branches", 3),
+            speculative_max_concurrency=raw.get("query", {}).get("speculative_max_concurrency", 3),
+            speculative_max_score_gap=raw.get("query", {}).get("speculative_max_score_gap", 0.25),
+            rollups_enabled=raw.get("query", {}).get("rollups_enabled", True),
+            rollup_min_rows=raw.get("query", {}).get("rollup_min_rows", 5000),
+            rollup_max_dimensions=raw.get("query", {}).get("rollup_max_dimensions", 8),
+            rollup_max_size_ratio=raw.get("query", {}).get("rollup_max_size_ratio", 0.5),
+            multi_step_fusion_enabled=raw.get("query", {}).get("multi_step_fusion_enabled", True),
+            query_timeout_seconds=raw.get("query", {}).get("query_timeout_seconds", 30.0),
         ),
         cache=CacheConfig(
             query_cache_max_size=raw.get("cache", {}).get("query_cache_max_size", 100),
@@ -205,6 +299,8 @@ def _parse_config(raw: dict) -> Config:
             tts_cache_max_size_mb=raw.get("cache", {}).get("tts_cache_max_size_mb", 500),
             tts_cache_ttl_hours=raw.get("cache", {}).get("tts_cache_ttl_hours", 24),
             schema_cache_ttl_seconds=raw.get("cache", {}).get("schema_cache_ttl_seconds", 3600),
+            result_cache_enabled=raw.get("cache", {}).get("result_cache_enabled", True),
+            result_cache_max_mb=raw.get("cache", {}).get("result_cache_max_mb", 64),
         ),
         voice=VoiceConfig(
             elevenlabs_api_key_env=raw.get("voice", {}).get("elevenlabs_api_key_env", "ELEVENLABS_API_KEY"),
@@ -222,6 +318,12 @@ def _parse_config(raw: dict) -> Config:
             is_transactional=raw.get("table_routing", {}).get("is_transactional", 15),
             data_quality_high=raw.get("table_routing", {}).get("data_quality_high", 10),
         ),
+        explanation=ExplanationConfig(
+            template_fast_path=raw.get("explanation", {}).get("template_fast_path", True),
+            template_query_types=raw.get("explanation", {}).get(
+                "template_query_types", ExplanationConfig().template_query_types
+            ),
+        ),
     )
 
 
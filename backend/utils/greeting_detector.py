@@ -17,7 +17,8 @@ import time
 import random
 import re
 from datetime import datetime
-from typing import Tuple, Optional, Dict
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, Iterable, List
 
 # Greeting patterns with categories (case-insensitive)
 GREETING_CATEGORIES = {
@@ -366,10 +367,430 @@ RESPONSE_TEMPLATES = {
 }
 
 
+# ============================================================================
+# PRECOMPILED CLASSIFIERS
+# Pattern lists are fused into one compiled alternation each at import time,
+# so every classifier below is a handful of regex scans instead of one
+# re.search per pattern. Keyword lists keep their `keyword in text`
+# (substring) semantics via an escaped literal alternation.
+# ============================================================================
+
+def _compile_any(patterns: List[str]) -> 're.Pattern':
+    """Fuse regex strings into one case-insensitive alternation (matches if any would)."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+
+def _compile_keywords(keywords: Iterable[str]) -> 're.Pattern':
+    """Fuse literal keywords into one alternation equivalent to any(kw in text)."""
+    unique = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(k) for k in unique))
+
+
+# is_greeting: personal/capability questions are ALWAYS greetings (checked first)
+_PERSONAL_QUESTION_PATTERNS = [
+    r'\b(what)\s+(is|\'s)\s+(your)\s+(name)\b',  # "what is your name"
+    r'\b(who)\s+(are)\s+you\b',                   # "who are you"
+    r'\b(what)\s+(can|could)\s+you\s+(do|help)\b', # "what can you do"
+    r'\b(your)\s+(name)\b',                       # "your name?"
+    r'\b(tell)\s+(me)\s+(about)\s+(yourself)\b',  # "tell me about yourself"
+    r'\b(what)\s+(kind|type)\s+(of)\s+(questions?)\b',  # "what kind of questions"
+    r'\b(what)\s+(questions?)\s+(can|should)\s+(i|we)\s+(ask)\b',  # "what questions can I ask"
+    # Tanglish patterns - ALL variations
+    r'enna\s+maari',  # "enna maari" (what kind)
+    r'maari\s+questions?',  # "maari questions"
+    r'questions?\s+kek',  # "questions kekalam/kekanum/kekatum"
+    r'enna\s+kek',  # "enna kekalam/kekanum/kekatum"
+    r'kekalam|kekanum|kekatum',  # any "kek" variation alone
+]
+
+# is_greeting: any data keyword means it's a data query, NOT a greeting
+_GREETING_DATA_KEYWORDS = [
+    # Core data words
+    'sales', 'revenue', 'profit', 'total', 'sum', 'average', 'count',
+    'show', 'list', 'find', 'get', 'compare', 'trend', 'top', 'bottom',
+    'maximum', 'minimum', 'highest', 'lowest', 'max', 'min',
+    # Time-related
+    'month', 'year', 'date', 'week', 'day', 'yesterday', 'today',
+    'last month', 'this month', 'last year', 'this year',
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december',
+    # Business
+    'order', 'orders', 'transaction', 'transactions', 'payment',
+    'branch', 'category', 'product', 'quantity', 'amount',
+    # Tamil
+    'விற்பனை', 'மொத்தம்', 'எவ்வளவு', 'எத்தனை', 'காட்டு', 'சேல்ஸ்',
+    # Query patterns (but NOT "what is your name" - handled above)
+    'what were', 'what was', 'how many', 'how much'
+]
+
+# is_greeting: "help me find sales" is a data query, not a help request
+_HELP_DATA_KEYWORDS = ['sales', 'revenue', 'profit', 'total', 'count', 'data', 'table']
+
+# is_greeting: "Hey, call me Boss!" is a name instruction for the memory handler
+_NAME_INTENT_PATTERNS = [
+    r'\bcall\s+me\b', r'\bmy\s+name\s+is\b', r'\bi\s+am\b', r"\bi'm\b",
+    r'\baddress\s+me\s+as\b', r'\byou\s+can\s+call\s+me\b', r"\bname's\b",
+    r'\bjust\s+call\s+me\b', r'\bremember\s+(?:me|my|that)\b'
+]
+
+# is_greeting (Tamil): name instructions
+_TAMIL_NAME_KEYWORDS = [
+    'என் பேரு',      # my name is
+    'என் பெயர்',    # my name is (formal)
+    'நான்',         # I am (when followed by name)
+    'என்னை கூப்பிடு',  # call me
+]
+
+# is_greeting (Tamil): English data keywords
+_TAMIL_GREETING_DATA_KEYWORDS = [
+    'sales', 'revenue', 'profit', 'total', 'count', 'list', 'show',
+    'gross', 'net', 'order', 'product', 'category', 'month', 'date',
+    'sheet', 'table', 'column', 'data',
+]
+
+# is_greeting (Tamil): Tamil data/schema query keywords
+_TAMIL_GREETING_TAMIL_DATA_KEYWORDS = [
+    'எவ்வளவு',    # how much
+    'மொத்தம்',    # total
+    'விற்பனை',    # sales
+    'லாபம்',      # profit
+    'ஷீட்',       # sheet (transliteration)
+    'அட்டவணை',    # table
+    'என்னெல்லாம்', # what all
+    'எத்தனை',     # how many
+    'எந்த',       # which
+    'என்ன',       # what
+    'எங்கே',      # where
+    'எப்படி',     # how
+    'காட்டு',     # show
+    'பட்டியல்',   # list
+    'தரவு',       # data
+    'டேட்டா',     # data (transliteration)
+    'columns',
+    'rows',
+    'இருக்கின்றது', # is there / exists
+    'இருக்கிறது',  # is there / exists
+    'உள்ளது',     # is there / exists
+    # TANGLISH transliterations - CRITICAL for Tamil queries
+    'சேல்ஸ்',     # sales
+    'ரெவனு',      # revenue
+    'ப்ராஃபிட்',   # profit
+    'ட்ரெண்ட்',    # trend
+    'கேடகிரி',     # category
+    'பிராஞ்ச்',    # branch
+    # Comparison and trend words
+    'ஒப்பிடு',     # compare
+    'ஒப்பிட்டு',   # compared
+    'உயர்கிறதா',   # increasing?
+    'குறைகிறதா',   # decreasing?
+    'நிலையான',     # stable
+    'மாறுபடுகிறதா', # varying?
+    'காலப்போக்கில்', # over time
+    'தொடர்ச்சியான', # consecutive
+    'முன்னணி',     # leading/top
+    # Month names in Tamil
+    'நவம்பர்', 'டிசம்பர்', 'ஜனவரி', 'அக்டோபர்',
+    # Action verbs
+    'கூறு', 'சொல்லு', 'விளக்கு',
+]
+
+# detect_schema_inquiry: patterns that clearly indicate a DATA query (not schema inquiry)
+_SCHEMA_DATA_QUERY_PATTERNS = [
+    r'\b(what|show)\s+(is|are|was|were)\s+(the\s+)?(total|sum|average)',
+    # "how many/much" - only for business metrics, NOT for schema objects
+    r'\b(how\s+many|how\s+much)\s+(?:of\s+)?(revenue|sales|profit|orders|units|items|products|customers)',
+    r'\b(total|sum|average|count)\s+(of|for)\s+',
+    r'\b(sales|revenue|profit)\s+(in|for|during|of)\s+',
+    r'\bஎவ்வளவு\b',  # Tamil: how much
+    r'\bமொத்தம்\b',  # Tamil: total
+    # "what is the X value/sales/amount" - asking for data, not schema
+    r'\b(what)\s+(is|are|was|were)\s+(the\s+)?\w+\s+(value|sales|amount|total|profit|revenue)',
+    # Month-based queries are data queries (e.g., "what is the October value")
+    r'\b(what)\s+(is|are|was|were)\s+(the\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
+    # Location-based queries are data queries
+    r'\b(what)\s+(is|are|was|were)\s+(the\s+)?\w+\s+(for|in)\s+',
+    # "show me X sales/data for Y"
+    r'\b(show|get|find)\s+(me\s+)?\w+\s+(sales|data|value|profit)',
+    # Aggregation queries - asking for max/min/most/least are DATA queries, not schema
+    r'\b(maximum|minimum|max|min|most|least|highest|lowest)\s+(number|count|amount|value)',
+    r'\b(which|what)\s+\w+\s+(has|have)\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)',
+    # "state/category with maximum/most" type queries
+    r'\bwith\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)\b',
+    # "has the maximum/most employees/sales" type queries
+    r'\bhas\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)\s+(number|count|employees|sales|profit)',
+]
+
+# detect_schema_inquiry: user wants detailed info
+_SCHEMA_DETAILED_PATTERNS = [
+    r'\ball\s+(columns?|fields?)\b',
+    r'\bin\s+detail\b',
+    r'\bfull\s+(details?|description|info)\b',
+    r'\bshow\s+(me\s+)?everything\b',
+    r'\bcomplete\s+(list|info|details?)\b',
+]
+
+# is_non_query_conversational: name/memory intent - let memory detector handle these
+_NAME_MEMORY_PATTERNS = [
+    r'\bcall\s+me\b',           # "call me Boss"
+    r'\bmy\s+name\s+is\b',      # "my name is Boss"
+    r'\bi\s+am\s+\w+$',         # "I am Boss" (name at end)
+    r"\bi'm\s+\w+$",            # "I'm Boss" (name at end)
+    r'\baddress\s+me\s+as\b',   # "address me as sir"
+    r'\byou\s+can\s+call\s+me\b',  # "you can call me X"
+    r"\bname's\b",              # "name's X"
+    r'\bjust\s+call\s+me\b',    # "just call me X"
+    r'\bhereafter\s+call\s+me\b',  # "hereafter call me X"
+    r'\bfrom\s+now\s+(on\s+)?call\s+me\b',  # "from now on call me X"
+    r'\bremember\s+(that\s+)?my\s+name\b',  # "remember my name is X"
+    # Tamil name patterns
+    r'என்\s*பேரு',              # my name is (Tamil)
+    r'என்\s*பெயர்',            # my name is (formal Tamil)
+    r'என்னை\s+கூப்பிடு',        # call me (Tamil)
+]
+
+# is_non_query_conversational: keywords that indicate this IS a data query
+_CONVERSATIONAL_DATA_KEYWORDS = [
+    # English
+    'sales', 'revenue', 'profit', 'total', 'count', 'sum', 'average',
+    'gross', 'net', 'order', 'orders', 'product', 'category', 'month', 'date',
+    'sheet', 'table', 'column', 'data', 'show', 'list', 'get', 'find',
+    'how many', 'how much', 'what is', 'what are', 'which', 'where',
+    'compare', 'trend', 'top', 'bottom', 'highest', 'lowest', 'maximum', 'minimum',
+    'branch', 'location', 'state', 'city', 'region', 'area',
+    'quantity', 'amount', 'value', 'price', 'cost',
+    # Payment/transaction related
+    'transaction', 'transactions', 'payment', 'cash', 'card', 'upi', 'online', 'wallet',
+    # Category names (from the data)
+    'sarees', 'saree', 'dhoti', 'kurta', 'kurtas', 'shirts', 'nightwear', 'accessories',
+    'inner wear', 'kids wear', 'ladies wear', "men's",
+    # Correction keywords (user is correcting previous query)
+    'check', 'instead', 'not', 'wrong', 'bangalore', 'chennai', 'mumbai',
+    'delhi', 'hyderabad', 'kolkata', 'pune',
+    # Tamil data keywords (Tamil script)
+    'எவ்வளவு',    # how much
+    'மொத்தம்',    # total
+    'மொத்த',      # total (alternate form)
+    'விற்பனை',    # sales
+    'விற்பனையை',  # sales (accusative)
+    'வெற்பனை',    # sales (spoken variant)
+    'லாபம்',      # profit
+    'ஷீட்',       # sheet
+    'அட்டவணை',    # table
+    'என்னெல்லாம்', # what all
+    'எத்தனை',     # how many
+    'என்ன',       # what
+    'எந்த',       # which
+    'எது',        # which (alternate)
+    'எதுல',       # which (spoken)
+    'எங்கே',      # where
+    'எப்படி',     # how
+    'காட்டு',     # show
+    'பட்டியல்',   # list
+    'தரவு',       # data
+    'டேட்டா',     # data
+    'வருமானம்',   # revenue
+    'ஆர்டர்',     # order
+    'பொருள்',     # product
+    'கிளை',       # branch
+    'மாநிலம்',    # state
+    'நகரம்',      # city
+    'மாதம்',      # month
+    # TANGLISH transliterations (English words in Tamil script) - CRITICAL!
+    'சேல்ஸ்',     # sales (Tanglish)
+    'ரெவனு',      # revenue (Tanglish)
+    'ரெவன்யூ',    # revenue (Tanglish variant)
+    'ப்ராஃபிட்',   # profit (Tanglish)
+    'பிராஃபிட்',   # profit (Tanglish variant)
+    'ட்ரெண்ட்',    # trend (Tanglish)
+    'டிரெண்ட்',    # trend (Tanglish variant)
+    'கேடகிரி',     # category (Tanglish)
+    'கேட்டகிரி',   # category (Tanglish variant)
+    'பிராஞ்ச்',    # branch (Tanglish)
+    'ப்ராஞ்ச்',    # branch (Tanglish variant)
+    'பிரான்ச்',    # branch (Tanglish variant 2)
+    'பிரான்ச',     # branch (without virama)
+    'பேட்டர்ன்',   # pattern (Tanglish)
+    'ப்ரொஜெக்ஷன்', # projection (Tanglish)
+    'ஃபோர்காஸ்ட்', # forecast (Tanglish)
+    # Comparison and trend words (Tamil)
+    'ஒப்பிடு',     # compare
+    'ஒப்பிட்டு',   # compared/comparing
+    'ஒப்பிடுக',    # compare (formal)
+    'ஒப்பீடு',     # comparison
+    'உயர்கிறதா',   # is it increasing?
+    'உயர்வு',      # increase/rise
+    'குறைகிறதா',   # is it decreasing?
+    'குறைவு',      # decrease
+    'அதிகரிக்கிறதா', # is it increasing?
+    'குறைந்து',    # decreased
+    'அதிகரித்து',  # increased
+    'நிலையான',     # stable
+    'மாறுபடுகிறது', # varying
+    'மாறுபடுகிறதா', # is it varying?
+    'காலப்போக்கில்', # over time
+    'தொடர்ச்சியான', # consecutive/continuous
+    'முன்னணி',     # leading/top
+    'முதல்',       # first/top
+    'கடைசி',       # last/bottom
+    'அதிகமான',     # highest/most
+    'அதிகமாக',     # highest/most (alternate form)
+    'அதிகமா',      # highest/most (spoken form)
+    'கொண்ட',       # having/with (used in "highest X having branch")
+    'குறைவான',     # lowest/least
+    'குறைவா',      # lowest/least (spoken form)
+    # Time-related Tamil words
+    'நவம்பர்',     # November
+    'டிசம்பர்',    # December
+    'ஜனவரி',       # January
+    'பிப்ரவரி',    # February
+    'மார்ச்',      # March
+    'ஏப்ரல்',      # April
+    'மே',          # May
+    'ஜூன்',        # June
+    'ஜூலை',        # July
+    'ஆகஸ்ட்',      # August
+    'செப்டம்பர்',  # September
+    'அக்டோபர்',    # October
+    # Action/query verbs
+    'கூறு',        # tell/say
+    'சொல்லு',      # tell
+    'விளக்கு',     # explain
+    'கணக்கிடு',    # calculate
+    'பார்',        # see/look
+    'தெரிந்து',    # find out
+    # Tanglish (romanized Tamil) - CRITICAL for voice queries
+    'evlo', 'evalo', 'evalavu',  # how much
+    'ethana', 'ethanai',  # how many
+    'irukku', 'irruku', 'iruku',  # is there / exists
+    'kaattu', 'kattu', 'kaatu',  # show
+    'sollu', 'solu',  # tell
+    'paaru', 'paru',  # see/look
+    'enna', 'yenna',  # what
+    'yetha', 'etha',  # which
+    'enga', 'yenga',  # where
+    'epdi', 'eppadi', 'yeppadi',  # how
+    'total', 'motham', 'motha',  # total
+    'laabam', 'labam',  # profit
+    'vilai', 'vila',  # price
+    'maasam', 'month',  # month
+    'aandu', 'year',  # year
+    'compare', 'compare pannu',
+    'konjam', 'romba',  # some, very (quantity words)
+    'athigam', 'athikam',  # more/highest
+    'kammi', 'kuraivu',  # less/lowest
+]
+
+# is_non_query_conversational: clarification responses (answer to a previous question)
+_CLARIFICATION_PATTERNS = [
+    r'^[1-5]$',           # Just a number (table selection)
+    r'^(one|two|three|four|five)$',  # Number words
+    r'^(first|second|third|fourth|fifth)$',  # Ordinals
+    r'^(yes|no|yeah|nah|ok|okay)$',  # Confirmations
+]
+
+# is_non_query_conversational: Tamil question patterns (data intent without exact keyword)
+_TAMIL_QUESTION_PATTERNS = [
+    r'எது\s*\??$',      # ends with "which?"
+    r'என்ன\s*\??$',    # ends with "what?"
+    r'எவ்வளவு',         # "how much"
+    r'எத்தனை',          # "how many"
+    r'எங்கே',           # "where"
+    r'யார்',            # "who"
+    r'ஏன்',             # "why"
+    r'\?$',             # ends with question mark
+]
+
+# is_non_query_conversational: common words used to spot gibberish/unclear input
+_COMMON_WORDS = frozenset([
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'dare',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
+    'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
+    'this', 'that', 'these', 'those', 'what', 'which', 'who', 'whom',
+    'and', 'but', 'or', 'nor', 'for', 'yet', 'so', 'as', 'if', 'then',
+    'because', 'although', 'while', 'where', 'when', 'how', 'why',
+    'to', 'of', 'in', 'on', 'at', 'by', 'with', 'from', 'into', 'onto',
+    'yes', 'no', 'ok', 'okay', 'hi', 'hello', 'hey', 'thanks', 'thank',
+    'please', 'sorry', 'good', 'great', 'nice', 'fine', 'well',
+    'hmm', 'um', 'uh', 'ah', 'oh', 'wow', 'huh', 'eh',
+])
+
+# is_date_context_statement: data keywords mean it's a data query with a date filter
+_DATE_CONTEXT_DATA_KEYWORDS = [
+    # English data keywords
+    'sales', 'revenue', 'profit', 'total', 'count', 'sum', 'average',
+    'transactions', 'orders', 'cost', 'quantity', 'amount', 'show',
+    'what', 'how many', 'how much', 'get', 'find', 'list', 'give',
+    'compare', 'trend', 'branch', 'category', 'state', 'payment',
+    # Tanglish data keywords
+    'enna', 'evlo', 'ethana', 'kaattu', 'sollu', 'paaru', 'paru',
+    'irukku', 'irruku', 'koodu', 'total', 'motham',
+    # Tamil script
+    'என்ன', 'எவ்வளவு', 'எத்தனை', 'காட்டு', 'சொல்லு',
+]
+
+# is_date_context_statement: date context patterns
+_DATE_CONTEXT_PATTERNS = [
+    r'\b(today|yesterday|tomorrow)\s+(is|was|will\s+be)\s+',
+    r'\b(the\s+)?(date|day)\s+(is|was)\s+',
+    r'\b(it\'?s|it\s+is)\s+(\d{1,2}(st|nd|rd|th)?\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
+    r'\b(remember|note|know)\s+(that\s+)?(today|the\s+date)',
+    r'\b(i\s+mean|actually)\s+(today|the\s+date)\s+(is|was)',
+    r'\b(\d{1,2})(st|nd|rd|th)?\s+(of\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
+    r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})(st|nd|rd|th)?',
+]
+
+_MONTH_NAMES = ('january', 'february', 'march', 'april', 'may', 'june',
+                'july', 'august', 'september', 'october', 'november', 'december')
+
+_TAMIL_CHAR_RE = re.compile(r'[\u0B80-\u0BFF]')
+_DIGIT_RE = re.compile(r'\d')
+
+_CATEGORY_RES = {category: _compile_any(patterns) for category, patterns in GREETING_CATEGORIES.items()}
+# Categories is_greeting checks with the short (<= 5 words) limit
+_SHORT_GREETING_RE = _compile_any([
+    pattern
+    for category, patterns in GREETING_CATEGORIES.items()
+    if category not in ('capability', 'help', 'schema_inquiry')
+    for pattern in patterns
+])
+
+_PERSONAL_QUESTION_RE = _compile_any(_PERSONAL_QUESTION_PATTERNS)
+_GREETING_DATA_KEYWORDS_RE = _compile_keywords(_GREETING_DATA_KEYWORDS)
+_HELP_DATA_KEYWORDS_RE = _compile_keywords(_HELP_DATA_KEYWORDS)
+_NAME_INTENT_RE = _compile_any(_NAME_INTENT_PATTERNS)
+_TAMIL_NAME_KEYWORDS_RE = _compile_keywords(_TAMIL_NAME_KEYWORDS)
+_TAMIL_GREETING_DATA_KEYWORDS_RE = _compile_keywords(_TAMIL_GREETING_DATA_KEYWORDS + _TAMIL_GREETING_TAMIL_DATA_KEYWORDS)
+_TAMIL_GREETING_QUESTION_RE = re.compile(r'\?|என்ன|எத்தனை|எவ்வளவு|எந்த|எங்கே|எப்படி')
+
+_SCHEMA_DATA_QUERY_RE = _compile_any(_SCHEMA_DATA_QUERY_PATTERNS)
+_SCHEMA_DETAILED_RE = _compile_any(_SCHEMA_DETAILED_PATTERNS)
+
+_NAME_MEMORY_RE = _compile_any(_NAME_MEMORY_PATTERNS)
+_CONVERSATIONAL_DATA_KEYWORDS_RE = _compile_keywords(_CONVERSATIONAL_DATA_KEYWORDS)
+_CLARIFICATION_RE = _compile_any(_CLARIFICATION_PATTERNS)
+_TAMIL_QUESTION_RE = _compile_any(_TAMIL_QUESTION_PATTERNS)
+
+_DATE_CONTEXT_DATA_KEYWORDS_RE = _compile_keywords(_DATE_CONTEXT_DATA_KEYWORDS)
+_DATE_CONTEXT_RE = _compile_any(_DATE_CONTEXT_PATTERNS)
+_DAY_RE = re.compile(r'\b(\d{1,2})(st|nd|rd|th)?\b')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+
+def clear_classifier_cache() -> None:
+    """Drop memoized is_greeting results (used by benchmarks)."""
+    is_greeting.cache_clear()
+
+
+@lru_cache(maxsize=512)
 def is_greeting(text: str) -> bool:
     """
     Check if the input is a casual greeting or conversational intent.
 
+    Results are memoized per message: is_non_query_conversational and the
+    query pipeline both ask about the same text.
+
     Args:
         text: User input text
 
@@ -383,162 +804,55 @@ def is_greeting(text: str) -> bool:
 
     # CRITICAL PRIORITY 0: Check for PERSONAL/CAPABILITY questions FIRST
     # These should ALWAYS be treated as greetings, not data queries
-    personal_patterns = [
-        r'\b(what)\s+(is|\'s)\s+(your)\s+(name)\b',  # "what is your name"
-        r'\b(who)\s+(are)\s+you\b',                   # "who are you"
-        r'\b(what)\s+(can|could)\s+you\s+(do|help)\b', # "what can you do"
-        r'\b(your)\s+(name)\b',                       # "your name?"
-        r'\b(tell)\s+(me)\s+(about)\s+(yourself)\b',  # "tell me about yourself"
-        r'\b(what)\s+(kind|type)\s+(of)\s+(questions?)\b',  # "what kind of questions"
-        r'\b(what)\s+(questions?)\s+(can|should)\s+(i|we)\s+(ask)\b',  # "what questions can I ask"
-        # Tanglish patterns - ALL variations
-        r'enna\s+maari',  # "enna maari" (what kind)
-        r'maari\s+questions?',  # "maari questions"
-        r'questions?\s+kek',  # "questions kekalam/kekanum/kekatum"
-        r'enna\s+kek',  # "enna kekalam/kekanum/kekatum"
-        r'kekalam|kekanum|kekatum',  # any "kek" variation alone
-    ]
-    for pattern in personal_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True  # This is a personal question about Thara
+    if _PERSONAL_QUESTION_RE.search(text_lower):
+        return True  # This is a personal question about Thara
 
     # PRIORITY 0.5: Check for DATA QUERY KEYWORDS
     # If the query has ANY data keywords, it is NOT a greeting - it's a data query
     # This prevents "What were the total sales last month?" from being misclassified
-    data_query_keywords = [
-        # Core data words
-        'sales', 'revenue', 'profit', 'total', 'sum', 'average', 'count',
-        'show', 'list', 'find', 'get', 'compare', 'trend', 'top', 'bottom',
-        'maximum', 'minimum', 'highest', 'lowest', 'max', 'min',
-        # Time-related
-        'month', 'year', 'date', 'week', 'day', 'yesterday', 'today',
-        'last month', 'this month', 'last year', 'this year',
-        'january', 'february', 'march', 'april', 'may', 'june',
-        'july', 'august', 'september', 'october', 'november', 'december',
-        # Business
-        'order', 'orders', 'transaction', 'transactions', 'payment',
-        'branch', 'category', 'product', 'quantity', 'amount',
-        # Tamil
-        'விற்பனை', 'மொத்தம்', 'எவ்வளவு', 'எத்தனை', 'காட்டு', 'சேல்ஸ்',
-        # Query patterns (but NOT "what is your name" - handled above)
-        'what were', 'what was', 'how many', 'how much'
-    ]
-    if any(kw in text_lower for kw in data_query_keywords):
+    if _GREETING_DATA_KEYWORDS_RE.search(text_lower):
         return False  # This is a data query, NOT a greeting
 
     # PRIORITY 1: Check capability questions FIRST (before query keyword check)
     # These should ALWAYS be treated as conversational, not data queries
-    for pattern in GREETING_CATEGORIES.get('capability', []):
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True
+    if _CATEGORY_RES['capability'].search(text_lower):
+        return True
 
     # PRIORITY 2: Check help requests
-    for pattern in GREETING_CATEGORIES.get('help', []):
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            # But exclude "help me find sales" type queries
-            data_keywords = ['sales', 'revenue', 'profit', 'total', 'count', 'data', 'table']
-            if not any(kw in text_lower for kw in data_keywords):
-                return True
+    # But exclude "help me find sales" type queries
+    if _CATEGORY_RES['help'].search(text_lower) and not _HELP_DATA_KEYWORDS_RE.search(text_lower):
+        return True
 
     # PRIORITY 3: Check for name/memory intent patterns
     # "Hey, call me Boss!" should NOT be a greeting - it's a name instruction
-    name_patterns = [
-        r'\bcall\s+me\b', r'\bmy\s+name\s+is\b', r'\bi\s+am\b', r"\bi'm\b",
-        r'\baddress\s+me\s+as\b', r'\byou\s+can\s+call\s+me\b', r"\bname's\b",
-        r'\bjust\s+call\s+me\b', r'\bremember\s+(?:me|my|that)\b'
-    ]
-    has_name_intent = any(re.search(p, text_lower, re.IGNORECASE) for p in name_patterns)
-    if has_name_intent:
+    if _NAME_INTENT_RE.search(text_lower):
         return False  # Let memory intent handler process this
 
-    # Check against other greeting patterns
-    for category, patterns in GREETING_CATEGORIES.items():
-        if category in ['capability', 'help', 'schema_inquiry']:
-            continue  # Already checked above (schema_inquiry handled separately)
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                # Make sure it's not part of a longer question
-                # e.g., "Hi, what is the total sales?" should not be treated as just a greeting
-
-                # Allow longer matches for phatic/capability phrases
-                word_limit = 10 if category in ['phatic', 'capability'] else 5
-
-                if len(text_lower.split()) <= word_limit:
-                    return True
+    # Check against other greeting patterns (schema_inquiry handled separately)
+    # Make sure it's not part of a longer question
+    # e.g., "Hi, what is the total sales?" should not be treated as just a greeting
+    # Allow longer matches (10 words) for phatic phrases, 5 words otherwise
+    word_count = len(text_lower.split())
+    if word_count <= 5 and _SHORT_GREETING_RE.search(text_lower):
+        return True
+    if word_count <= 10 and _CATEGORY_RES['phatic'].search(text_lower):
+        return True
 
     # Check for generic Tamil conversational text
-    if re.search(r'[\u0B80-\u0BFF]', text_lower):
-        words = text_lower.split()
-
+    if _TAMIL_CHAR_RE.search(text_lower):
         # Check for Tamil name patterns - NOT a greeting, it's a name instruction
-        tamil_name_keywords = [
-            'என் பேரு',      # my name is
-            'என் பெயர்',    # my name is (formal)
-            'நான்',         # I am (when followed by name)
-            'என்னை கூப்பிடு',  # call me
-        ]
-        if any(kw in text_lower for kw in tamil_name_keywords):
+        if _TAMIL_NAME_KEYWORDS_RE.search(text_lower):
             return False  # Let memory intent handler process this
 
-        # Data query keywords - these mean it's NOT a greeting
-        data_keywords = ['sales', 'revenue', 'profit', 'total', 'count', 'list', 'show',
-                        'gross', 'net', 'order', 'product', 'category', 'month', 'date',
-                        'sheet', 'table', 'column', 'data']
-
-        # Tamil data/schema query keywords - these mean it's NOT a greeting
-        tamil_data_keywords = [
-            'எவ்வளவு',    # how much
-            'மொத்தம்',    # total
-            'விற்பனை',    # sales
-            'லாபம்',      # profit
-            'ஷீட்',       # sheet (transliteration)
-            'அட்டவணை',    # table
-            'என்னெல்லாம்', # what all
-            'எத்தனை',     # how many
-            'எந்த',       # which
-            'என்ன',       # what
-            'எங்கே',      # where
-            'எப்படி',     # how
-            'காட்டு',     # show
-            'பட்டியல்',   # list
-            'தரவு',       # data
-            'டேட்டா',     # data (transliteration)
-            'columns',
-            'rows',
-            'இருக்கின்றது', # is there / exists
-            'இருக்கிறது',  # is there / exists
-            'உள்ளது',     # is there / exists
-            # TANGLISH transliterations - CRITICAL for Tamil queries
-            'சேல்ஸ்',     # sales
-            'ரெவனு',      # revenue
-            'ப்ராஃபிட்',   # profit
-            'ட்ரெண்ட்',    # trend
-            'கேடகிரி',     # category
-            'பிராஞ்ச்',    # branch
-            # Comparison and trend words
-            'ஒப்பிடு',     # compare
-            'ஒப்பிட்டு',   # compared
-            'உயர்கிறதா',   # increasing?
-            'குறைகிறதா',   # decreasing?
-            'நிலையான',     # stable
-            'மாறுபடுகிறதா', # varying?
-            'காலப்போக்கில்', # over time
-            'தொடர்ச்சியான', # consecutive
-            'முன்னணி',     # leading/top
-            # Month names in Tamil
-            'நவம்பர்', 'டிசம்பர்', 'ஜனவரி', 'அக்டோபர்',
-            # Action verbs
-            'கூறு', 'சொல்லு', 'விளக்கு',
-        ]
-
-        is_data_query = any(keyword in text_lower for keyword in data_keywords + tamil_data_keywords)
+        # Data query keywords (English + Tamil) - these mean it's NOT a greeting
+        is_data_query = bool(_TAMIL_GREETING_DATA_KEYWORDS_RE.search(text_lower))
 
         # If it's short and not a data query, treat as conversational
         # But be more conservative - only treat as greeting if VERY short (<=4 words)
         # and no question-indicating patterns
-        if len(words) <= 4 and not re.search(r'\d', text_lower) and not is_data_query:
+        if word_count <= 4 and not _DIGIT_RE.search(text_lower) and not is_data_query:
             # Additional check: if it ends with ? or has question patterns, it's likely a query
-            if not text.strip().endswith('?') and not re.search(r'\?|என்ன|எத்தனை|எவ்வளவு|எந்த|எங்கே|எப்படி', text_lower):
+            if not text.strip().endswith('?') and not _TAMIL_GREETING_QUESTION_RE.search(text_lower):
                 return True
 
     return False
@@ -558,12 +872,7 @@ def is_capability_question(text: str) -> bool:
         return False
 
     text_lower = text.lower().strip()
-
-    for pattern in GREETING_CATEGORIES.get('capability', []):
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True
-
-    return False
+    return bool(_CATEGORY_RES['capability'].search(text_lower))
 
 
 def detect_schema_inquiry(text: str) -> Optional[Dict]:
@@ -585,52 +894,18 @@ def detect_schema_inquiry(text: str) -> Optional[Dict]:
     q_lower = text.lower().strip()
 
     # Patterns that clearly indicate a DATA query (not schema inquiry)
-    # Be specific - don't block valid schema inquiries like "how many tables"
-    data_query_patterns = [
-        r'\b(what|show)\s+(is|are|was|were)\s+(the\s+)?(total|sum|average)',
-        # "how many/much" - only for business metrics, NOT for schema objects
-        r'\b(how\s+many|how\s+much)\s+(?:of\s+)?(revenue|sales|profit|orders|units|items|products|customers)',
-        r'\b(total|sum|average|count)\s+(of|for)\s+',
-        r'\b(sales|revenue|profit)\s+(in|for|during|of)\s+',
-        r'\bஎவ்வளவு\b',  # Tamil: how much
-        r'\bமொத்தம்\b',  # Tamil: total
-        # "what is the X value/sales/amount" - asking for data, not schema
-        r'\b(what)\s+(is|are|was|were)\s+(the\s+)?\w+\s+(value|sales|amount|total|profit|revenue)',
-        # Month-based queries are data queries (e.g., "what is the October value")
-        r'\b(what)\s+(is|are|was|were)\s+(the\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
-        # Location-based queries are data queries
-        r'\b(what)\s+(is|are|was|were)\s+(the\s+)?\w+\s+(for|in)\s+',
-        # "show me X sales/data for Y"
-        r'\b(show|get|find)\s+(me\s+)?\w+\s+(sales|data|value|profit)',
-        # Aggregation queries - asking for max/min/most/least are DATA queries, not schema
-        r'\b(maximum|minimum|max|min|most|least|highest|lowest)\s+(number|count|amount|value)',
-        r'\b(which|what)\s+\w+\s+(has|have)\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)',
-        # "state/category with maximum/most" type queries
-        r'\bwith\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)\b',
-        # "has the maximum/most employees/sales" type queries
-        r'\bhas\s+(the\s+)?(maximum|minimum|max|min|most|least|highest|lowest)\s+(number|count|employees|sales|profit)',
-    ]
-    for pattern in data_query_patterns:
-        if re.search(pattern, q_lower, re.IGNORECASE):
-            return None
+    if _SCHEMA_DATA_QUERY_RE.search(q_lower):
+        return None
 
     # Check for schema inquiry patterns
-    for pattern in GREETING_CATEGORIES.get('schema_inquiry', []):
-        if re.search(pattern, q_lower, re.IGNORECASE):
-            # Extract table/sheet reference
-            table_name = _extract_table_reference(q_lower)
-
-            # Check if user wants detailed info
-            detailed_patterns = [
-                r'\ball\s+(columns?|fields?)\b',
-                r'\bin\s+detail\b',
-                r'\bfull\s+(details?|description|info)\b',
-                r'\bshow\s+(me\s+)?everything\b',
-                r'\bcomplete\s+(list|info|details?)\b',
-            ]
-            is_detailed = any(re.search(p, q_lower, re.IGNORECASE) for p in detailed_patterns)
+    if _CATEGORY_RES['schema_inquiry'].search(q_lower):
+        # Extract table/sheet reference
+        table_name = _extract_table_reference(q_lower)
+
+        # Check if user wants detailed info
+        is_detailed = bool(_SCHEMA_DETAILED_RE.search(q_lower))
 
-            return {'type': 'schema_inquiry', 'table': table_name, 'detailed': is_detailed}
+        return {'type': 'schema_inquiry', 'table': table_name, 'detailed': is_detailed}
 
     return None
 
@@ -889,211 +1164,36 @@ def is_non_query_conversational(text: str) -> bool:
         return False
 
     text_lower = text.lower().strip()
-    has_tamil = bool(re.search(r'[\u0B80-\u0BFF]', text_lower))
+    has_tamil = bool(_TAMIL_CHAR_RE.search(text_lower))
 
     # PRIORITY CHECK: Name/memory intent patterns - let memory detector handle these
     # "Call me Boss", "hereafter call me X", "my name is Y" etc.
-    name_memory_patterns = [
-        r'\bcall\s+me\b',           # "call me Boss"
-        r'\bmy\s+name\s+is\b',      # "my name is Boss"
-        r'\bi\s+am\s+\w+$',         # "I am Boss" (name at end)
-        r"\bi'm\s+\w+$",            # "I'm Boss" (name at end)
-        r'\baddress\s+me\s+as\b',   # "address me as sir"
-        r'\byou\s+can\s+call\s+me\b',  # "you can call me X"
-        r"\bname's\b",              # "name's X"
-        r'\bjust\s+call\s+me\b',    # "just call me X"
-        r'\bhereafter\s+call\s+me\b',  # "hereafter call me X"
-        r'\bfrom\s+now\s+(on\s+)?call\s+me\b',  # "from now on call me X"
-        r'\bremember\s+(that\s+)?my\s+name\b',  # "remember my name is X"
-        # Tamil name patterns
-        r'என்\s*பேரு',              # my name is (Tamil)
-        r'என்\s*பெயர்',            # my name is (formal Tamil)
-        r'என்னை\s+கூப்பிடு',        # call me (Tamil)
-    ]
-    if any(re.search(p, text_lower, re.IGNORECASE) for p in name_memory_patterns):
+    if _NAME_MEMORY_RE.search(text_lower):
         return False  # Let memory intent detector handle this
 
     # First, check if it's already handled by greeting detection
     if is_greeting(text):
         return False  # Let greeting handler deal with it
 
-    # Data query keywords that indicate this IS a data query (not random chat)
-    data_keywords = [
-        # English
-        'sales', 'revenue', 'profit', 'total', 'count', 'sum', 'average',
-        'gross', 'net', 'order', 'orders', 'product', 'category', 'month', 'date',
-        'sheet', 'table', 'column', 'data', 'show', 'list', 'get', 'find',
-        'how many', 'how much', 'what is', 'what are', 'which', 'where',
-        'compare', 'trend', 'top', 'bottom', 'highest', 'lowest', 'maximum', 'minimum',
-        'branch', 'location', 'state', 'city', 'region', 'area',
-        'quantity', 'amount', 'value', 'price', 'cost',
-        # Payment/transaction related
-        'transaction', 'transactions', 'payment', 'cash', 'card', 'upi', 'online', 'wallet',
-        # Category names (from the data)
-        'sarees', 'saree', 'dhoti', 'kurta', 'kurtas', 'shirts', 'nightwear', 'accessories',
-        'inner wear', 'kids wear', 'ladies wear', "men's",
-        # Correction keywords (user is correcting previous query)
-        'check', 'instead', 'not', 'wrong', 'bangalore', 'chennai', 'mumbai',
-        'delhi', 'hyderabad', 'kolkata', 'pune',
-        # Tamil data keywords (Tamil script)
-        'எவ்வளவு',    # how much
-        'மொத்தம்',    # total
-        'மொத்த',      # total (alternate form)
-        'விற்பனை',    # sales
-        'விற்பனையை',  # sales (accusative)
-        'வெற்பனை',    # sales (spoken variant)
-        'லாபம்',      # profit
-        'ஷீட்',       # sheet
-        'அட்டவணை',    # table
-        'என்னெல்லாம்', # what all
-        'எத்தனை',     # how many
-        'என்ன',       # what
-        'எந்த',       # which
-        'எது',        # which (alternate)
-        'எதுல',       # which (spoken)
-        'எங்கே',      # where
-        'எப்படி',     # how
-        'காட்டு',     # show
-        'பட்டியல்',   # list
-        'தரவு',       # data
-        'டேட்டா',     # data
-        'வருமானம்',   # revenue
-        'ஆர்டர்',     # order
-        'பொருள்',     # product
-        'கிளை',       # branch
-        'மாநிலம்',    # state
-        'நகரம்',      # city
-        'மாதம்',      # month
-        # TANGLISH transliterations (English words in Tamil script) - CRITICAL!
-        'சேல்ஸ்',     # sales (Tanglish)
-        'ரெவனு',      # revenue (Tanglish)
-        'ரெவன்யூ',    # revenue (Tanglish variant)
-        'ப்ராஃபிட்',   # profit (Tanglish)
-        'பிராஃபிட்',   # profit (Tanglish variant)
-        'ட்ரெண்ட்',    # trend (Tanglish)
-        'டிரெண்ட்',    # trend (Tanglish variant)
-        'கேடகிரி',     # category (Tanglish)
-        'கேட்டகிரி',   # category (Tanglish variant)
-        'பிராஞ்ச்',    # branch (Tanglish)
-        'ப்ராஞ்ச்',    # branch (Tanglish variant)
-        'பிரான்ச்',    # branch (Tanglish variant 2)
-        'பிரான்ச',     # branch (without virama)
-        'பேட்டர்ன்',   # pattern (Tanglish)
-        'ப்ரொஜெக்ஷன்', # projection (Tanglish)
-        'ஃபோர்காஸ்ட்', # forecast (Tanglish)
-        # Comparison and trend words (Tamil)
-        'ஒப்பிடு',     # compare
-        'ஒப்பிட்டு',   # compared/comparing
-        'ஒப்பிடுக',    # compare (formal)
-        'ஒப்பீடு',     # comparison
-        'உயர்கிறதா',   # is it increasing?
-        'உயர்வு',      # increase/rise
-        'குறைகிறதா',   # is it decreasing?
-        'குறைவு',      # decrease
-        'அதிகரிக்கிறதா', # is it increasing?
-        'குறைந்து',    # decreased
-        'அதிகரித்து',  # increased
-        'நிலையான',     # stable
-        'மாறுபடுகிறது', # varying
-        'மாறுபடுகிறதா', # is it varying?
-        'காலப்போக்கில்', # over time
-        'தொடர்ச்சியான', # consecutive/continuous
-        'முன்னணி',     # leading/top
-        'முதல்',       # first/top
-        'கடைசி',       # last/bottom
-        'அதிகமான',     # highest/most
-        'அதிகமாக',     # highest/most (alternate form)
-        'அதிகமா',      # highest/most (spoken form)
-        'கொண்ட',       # having/with (used in "highest X having branch")
-        'குறைவான',     # lowest/least
-        'குறைவா',      # lowest/least (spoken form)
-        # Time-related Tamil words
-        'நவம்பர்',     # November
-        'டிசம்பர்',    # December
-        'ஜனவரி',       # January
-        'பிப்ரவரி',    # February
-        'மார்ச்',      # March
-        'ஏப்ரல்',      # April
-        'மே',          # May
-        'ஜூன்',        # June
-        'ஜூலை',        # July
-        'ஆகஸ்ட்',      # August
-        'செப்டம்பர்',  # September
-        'அக்டோபர்',    # October
-        # Action/query verbs
-        'கூறு',        # tell/say
-        'சொல்லு',      # tell
-        'விளக்கு',     # explain
-        'கணக்கிடு',    # calculate
-        'பார்',        # see/look
-        'தெரிந்து',    # find out
-        # Tanglish (romanized Tamil) - CRITICAL for voice queries
-        'evlo', 'evalo', 'evalavu',  # how much
-        'ethana', 'ethanai',  # how many
-        'irukku', 'irruku', 'iruku',  # is there / exists
-        'kaattu', 'kattu', 'kaatu',  # show
-        'sollu', 'solu',  # tell
-        'paaru', 'paru',  # see/look
-        'enna', 'yenna',  # what
-        'yetha', 'etha',  # which
-        'enga', 'yenga',  # where
-        'epdi', 'eppadi', 'yeppadi',  # how
-        'total', 'motham', 'motha',  # total
-        'laabam', 'labam',  # profit
-        'vilai', 'vila',  # price
-        'maasam', 'month',  # month
-        'aandu', 'year',  # year
-        'compare', 'compare pannu',
-        'konjam', 'romba',  # some, very (quantity words)
-        'athigam', 'athikam',  # more/highest
-        'kammi', 'kuraivu',  # less/lowest
-    ]
-
     # Check if any data keyword is present
-    has_data_keyword = any(keyword in text_lower for keyword in data_keywords)
-
-    if has_data_keyword:
+    if _CONVERSATIONAL_DATA_KEYWORDS_RE.search(text_lower):
         return False  # It's likely a data query
 
-    # Check for question marks or question patterns
-    # Questions about data should go to the query pipeline
-    if text.strip().endswith('?'):
-        # Even with ? it might be conversational ("how are you?")
-        # but if it has numbers or specific metric words, it's data
-        if re.search(r'\d', text_lower):
-            return False
-
     # Check for numbers - usually indicates data query
-    if re.search(r'\d+', text_lower):
+    # (even "?"-terminated text with numbers is data, not "how are you?")
+    if _DIGIT_RE.search(text_lower):
         return False
 
     # Check for specific patterns that indicate clarification responses
     # (user might be responding to a previous question)
-    clarification_patterns = [
-        r'^[1-5]$',           # Just a number (table selection)
-        r'^(one|two|three|four|five)$',  # Number words
-        r'^(first|second|third|fourth|fifth)$',  # Ordinals
-        r'^(yes|no|yeah|nah|ok|okay)$',  # Confirmations
-    ]
-    for pattern in clarification_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return False  # Let clarification handler deal with it
+    if _CLARIFICATION_RE.search(text_lower):
+        return False  # Let clarification handler deal with it
 
     # If we get here, it's likely random conversational text
     # For Tamil text, check if it looks like a question (data query intent)
     if has_tamil:
         # Tamil question patterns - these indicate data queries even without exact keyword match
-        tamil_question_patterns = [
-            r'எது\s*\??$',      # ends with "which?"
-            r'என்ன\s*\??$',    # ends with "what?"
-            r'எவ்வளவு',         # "how much"
-            r'எத்தனை',          # "how many"
-            r'எங்கே',           # "where"
-            r'யார்',            # "who"
-            r'ஏன்',             # "why"
-            r'\?$',             # ends with question mark
-        ]
-        if any(re.search(p, text_lower) for p in tamil_question_patterns):
+        if _TAMIL_QUESTION_RE.search(text_lower):
             return False  # Looks like a data question - let query pipeline handle
         return True  # Tamil text without data keywords or question patterns = conversational
 
@@ -1106,23 +1206,8 @@ def is_non_query_conversational(text: str) -> bool:
 
     # Check for gibberish/unclear text (no recognizable words)
     # This catches noisy voice input like "asdfgh", "hmm", etc.
-    common_words = set([
-        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'must', 'shall', 'can', 'need', 'dare',
-        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
-        'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
-        'this', 'that', 'these', 'those', 'what', 'which', 'who', 'whom',
-        'and', 'but', 'or', 'nor', 'for', 'yet', 'so', 'as', 'if', 'then',
-        'because', 'although', 'while', 'where', 'when', 'how', 'why',
-        'to', 'of', 'in', 'on', 'at', 'by', 'with', 'from', 'into', 'onto',
-        'yes', 'no', 'ok', 'okay', 'hi', 'hello', 'hey', 'thanks', 'thank',
-        'please', 'sorry', 'good', 'great', 'nice', 'fine', 'well',
-        'hmm', 'um', 'uh', 'ah', 'oh', 'wow', 'huh', 'eh',
-    ])
-
     # If most words are not recognizable, it's likely gibberish
-    recognized = sum(1 for w in words if w in common_words or len(w) <= 2)
+    recognized = sum(1 for w in words if w in _COMMON_WORDS or len(w) <= 2)
     if len(words) > 0 and recognized / len(words) < 0.3 and len(words) <= 10:
         # Less than 30% recognizable words = likely gibberish/unclear
         return True
@@ -1263,59 +1348,31 @@ def is_date_context_statement(text: str) -> Tuple[bool, Optional[Dict]]:
 
     # CRITICAL: First check if this contains DATA QUERY keywords
     # If it does, it's NOT a date context statement - it's a data query with a date filter
-    data_query_keywords = [
-        # English data keywords
-        'sales', 'revenue', 'profit', 'total', 'count', 'sum', 'average',
-        'transactions', 'orders', 'cost', 'quantity', 'amount', 'show',
-        'what', 'how many', 'how much', 'get', 'find', 'list', 'give',
-        'compare', 'trend', 'branch', 'category', 'state', 'payment',
-        # Tanglish data keywords
-        'enna', 'evlo', 'ethana', 'kaattu', 'sollu', 'paaru', 'paru',
-        'irukku', 'irruku', 'koodu', 'total', 'motham',
-        # Tamil script
-        'என்ன', 'எவ்வளவு', 'எத்தனை', 'காட்டு', 'சொல்லு',
-    ]
-
-    # If any data keyword is present, this is a DATA QUERY, not date context
-    if any(keyword in text_lower for keyword in data_query_keywords):
+    if _DATE_CONTEXT_DATA_KEYWORDS_RE.search(text_lower):
         return False, None
 
     # Date context patterns (only match if NO data keywords present)
-    date_context_patterns = [
-        r'\b(today|yesterday|tomorrow)\s+(is|was|will\s+be)\s+',
-        r'\b(the\s+)?(date|day)\s+(is|was)\s+',
-        r'\b(it\'?s|it\s+is)\s+(\d{1,2}(st|nd|rd|th)?\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
-        r'\b(remember|note|know)\s+(that\s+)?(today|the\s+date)',
-        r'\b(i\s+mean|actually)\s+(today|the\s+date)\s+(is|was)',
-        r'\b(\d{1,2})(st|nd|rd|th)?\s+(of\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)',
-        r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})(st|nd|rd|th)?',
-    ]
-
-    is_date_context = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in date_context_patterns)
-
-    if not is_date_context:
+    if not _DATE_CONTEXT_RE.search(text_lower):
         return False, None
 
     # Extract date info
     date_info = {}
 
     # Extract month
-    months = ['january', 'february', 'march', 'april', 'may', 'june',
-              'july', 'august', 'september', 'october', 'november', 'december']
-    for month in months:
+    for month in _MONTH_NAMES:
         if month in text_lower:
             date_info['month'] = month.capitalize()
             break
 
     # Extract day
-    day_match = re.search(r'\b(\d{1,2})(st|nd|rd|th)?\b', text_lower)
+    day_match = _DAY_RE.search(text_lower)
     if day_match:
         day = int(day_match.group(1))
         if 1 <= day <= 31:
             date_info['day'] = day
 
     # Extract year
-    year_match = re.search(r'\b(20\d{2})\b', text_lower)
+    year_match = _YEAR_RE.search(text_lower)
     if year_match:
         date_info['year'] = int(year_match.group(1))
 
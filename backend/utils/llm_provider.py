@@ -0,0 +1,370 @@
+"""
+LLM Provider - pluggable backends for planner, explainer, selector and translation.
+
+All LLM callers create their models through create_model(role, ...) instead
+of google.generativeai directly. Backends:
+
+- gemini:            google.generativeai (default)
+- openai_compatible: local OpenAI-compatible server (llama.cpp server, vLLM)
+                     at llm.local_base_url, e.g. for running offline or
+                     keeping simple queries on-box
+- replay:            answers from recorded responses (llm.replay_path) for
+                     deterministic benchmarks; no network, no model latency
+                     unless llm.replay_latency is on
+
+Routing: calls made with complexity='simple' (planner_client's
+estimate_query_complexity) use llm.simple_query_provider when it is set;
+everything else uses llm.provider.
+
+Recording: with llm.replay_record on, live responses are appended to
+llm.replay_path (keyed by role + prompt) so a later run with
+provider: replay reproduces them exactly. Comparing a replay run with a
+live run separates pipeline overhead from model latency.
+
+Every model returned exposes generate_content(prompt, **kwargs) returning an
+object with .text and .usage_metadata, plus model_name / _generation_config
+(used for single-flight keys) and provider.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+_BACKEND_DIR = Path(__file__).parent.parent
+
+PROVIDERS = ("gemini", "openai_compatible", "replay")
+
+
+class LLMReplayMissError(LookupError):
+    """Replay backend has no recorded response for a prompt."""
+
+
+class LLMResponse:
+    """Minimal response object (text + usage) for non-Gemini backends."""
+
+    def __init__(self, text: str, prompt_tokens: int = 0, cached_tokens: int = 0):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens, cached_content_token_count=cached_tokens
+        )
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+_gemini_configured_key: Optional[str] = None
+_gemini_lock = threading.Lock()
+
+
+def _gemini_model(model_name: str, generation_config: Optional[dict]):
+    global _gemini_configured_key
+    import google.generativeai as genai
+    from utils.config_loader import get_config
+
+    api_key_env = get_config().llm.api_key_env
+    api_key = (os.getenv(api_key_env) or os.getenv("GOOGLE_API_KEY") or "").strip()
+    if not api_key:
+        raise ValueError(f"Gemini API key not found. Please set the {api_key_env} environment variable.")
+    with _gemini_lock:
+        if api_key != _gemini_configured_key:
+            genai.configure(api_key=api_key)
+            _gemini_configured_key = api_key
+
+    # No system_instruction (for compatibility with google-generativeai 0.3.x)
+    if generation_config:
+        return genai.GenerativeModel(model_name=model_name, generation_config=generation_config)
+    return genai.GenerativeModel(model_name=model_name)
+
+
+class OpenAICompatibleModel:
+    """Chat-completions client for a local OpenAI-compatible server (stdlib HTTP only)."""
+
+    provider = "openai_compatible"
+
+    def __init__(self, base_url: str, model_name: str, generation_config: Optional[dict],
+                 api_key: str = "", timeout_seconds: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self._generation_config = dict(generation_config or {})
+        self._api_key = api_key
+        self._timeout = timeout_seconds
+
+    def generate_content(self, prompt, **kwargs):
+        config = self._generation_config
+        body: Dict[str, Any] = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": str(prompt)}],
+            "temperature": config.get("temperature", 0.0),
+        }
+        if config.get("max_output_tokens"):
+            body["max_tokens"] = config["max_output_tokens"]
+        if config.get("response_mime_type") == "application/json":
+            body["response_format"] = {"type": "json_object"}
+
+        headers = {"Content-Type": "application/json"}
+        if self._api_key:
+            headers["Authorization"] = f"Bearer {self._api_key}"
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions", data=json.dumps(body).encode("utf-8"), headers=headers
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+
+        usage = payload.get("usage") or {}
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        return LLMResponse(
+            payload["choices"][0]["message"]["content"] or "",
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            cached_tokens=cached or 0,
+        )
+
+
+class ReplayStore:
+    """Recorded responses (JSONL, one {key, role, text, latency_ms} per line)."""
+
+    def __init__(self, path: str):
+        self.path = path if os.path.isabs(path) else str(_BACKEND_DIR / path)
+        self._lock = threading.Lock()
+        self._records: Dict[str, dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        record = json.loads(line)
+                        self._records[record["key"]] = record
+
+    @staticmethod
+    def make_key(role: str, prompt) -> str:
+        return hashlib.sha256(f"{role}\x00{prompt}".encode("utf-8", errors="replace")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._records.get(key)
+
+    def append(self, record: dict) -> None:
+        with self._lock:
+            if record["key"] in self._records:
+                return
+            self._records[record["key"]] = record
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+
+class ReplayModel:
+    """Answers from a ReplayStore; raises LLMReplayMissError for unseen prompts."""
+
+    provider = "replay"
+
+    def __init__(self, store: ReplayStore, role: str, model_name: str, generation_config: Optional[dict],
+                 simulate_latency: bool = False):
+        self._store = store
+        self._role = role
+        self.model_name = model_name
+        self._generation_config = dict(generation_config or {})
+        self._simulate_latency = simulate_latency
+
+    def generate_content(self, prompt, **kwargs):
+        key = ReplayStore.make_key(self._role, prompt)
+        record = self._store.get(key)
+        if record is None:
+            raise LLMReplayMissError(f"No recorded {self._role} response for prompt {key[:12]}")
+        if self._simulate_latency:
+            time.sleep(record.get("latency_ms", 0) / 1000.0)
+        return LLMResponse(record["text"])
+
+
+class RecordingModel:
+    """Wraps a live model and records every response for later replay."""
+
+    def __init__(self, model, store: ReplayStore, role: str):
+        self._model = model
+        self._store = store
+        self._role = role
+
+    def generate_content(self, prompt, **kwargs):
+        start = time.time()
+        response = self._model.generate_content(prompt, **kwargs)
+        self._store.append({
+            "key": ReplayStore.make_key(self._role, prompt),
+            "role": self._role,
+            "text": response.text,
+            "latency_ms": round((time.time() - start) * 1000, 1),
+        })
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+class _TimedModel:
+    """
+    Counts calls and latency per provider/role; forwards everything else.
+
+    provider is "gemini" only for plain Gemini models - prompt_assembly only
+    uses Gemini context caching for those (a recorder must see full prompts).
+    """
+
+    def __init__(self, model, provider: str, role: str):
+        self._model = model
+        self.provider = provider
+        self._role = role
+
+    def generate_content(self, prompt, **kwargs):
+        start = time.time()
+        _call_started(start)
+        ok = False
+        try:
+            response = self._model.generate_content(prompt, **kwargs)
+            ok = True
+            return response
+        finally:
+            end = time.time()
+            _call_finished(end)
+            _record_call(self.provider, self._role, (end - start) * 1000, ok)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+# =============================================================================
+# Routing
+# =============================================================================
+
+_replay_store: Optional[ReplayStore] = None
+_replay_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, Any]] = {}
+# Wall time with at least one LLM call in flight (overlapping calls count once)
+_busy = {"active": 0, "since": 0.0, "ms": 0.0}
+
+
+def _get_replay_store(path: str) -> ReplayStore:
+    global _replay_store
+    with _replay_lock:
+        if _replay_store is None or _replay_store.path != (path if os.path.isabs(path) else str(_BACKEND_DIR / path)):
+            _replay_store = ReplayStore(path)
+        return _replay_store
+
+
+def _record_call(provider: str, role: str, elapsed_ms: float, ok: bool) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(f"{provider}/{role}", {"calls": 0, "errors": 0, "total_ms": 0.0})
+        entry["calls"] += 1
+        entry["total_ms"] += elapsed_ms
+        if not ok:
+            entry["errors"] += 1
+
+
+def _call_started(now: float) -> None:
+    with _stats_lock:
+        if _busy["active"] == 0:
+            _busy["since"] = now
+        _busy["active"] += 1
+
+
+def _call_finished(now: float) -> None:
+    with _stats_lock:
+        _busy["active"] -= 1
+        if _busy["active"] == 0:
+            _busy["ms"] += (now - _busy["since"]) * 1000
+
+
+def llm_busy_ms() -> float:
+    """Wall-clock ms during which at least one LLM call was running (so far)."""
+    with _stats_lock:
+        busy = _busy["ms"]
+        if _busy["active"]:
+            busy += (time.time() - _busy["since"]) * 1000
+    return busy
+
+
+def resolve_provider(complexity: Optional[str] = None) -> str:
+    """Backend name for a call (simple queries may be routed on-box)."""
+    from utils.config_loader import get_config
+    llm_config = get_config().llm
+    provider = llm_config.provider
+    if complexity == "simple" and llm_config.simple_query_provider:
+        provider = llm_config.simple_query_provider
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{provider}' (expected one of {', '.join(PROVIDERS)})")
+    return provider
+
+
+def create_model(role: str, model_name: str, generation_config: Optional[dict] = None,
+                 complexity: Optional[str] = None):
+    """
+    Model for one LLM role, on the backend chosen by config and complexity.
+
+    Args:
+        role: planner | explainer | selector | translation | memory
+        model_name: Gemini model name (local backends use llm.local_model)
+        generation_config: temperature, max_output_tokens, response_mime_type
+        complexity: 'simple' / 'complex' from estimate_query_complexity (optional)
+
+    Returns:
+        Model exposing generate_content(prompt) -> response with .text
+
+    Raises:
+        ValueError: Unknown provider or missing Gemini API key
+    """
+    from utils.config_loader import get_config
+    llm_config = get_config().llm
+    provider = resolve_provider(complexity)
+
+    if provider == "replay":
+        store = _get_replay_store(llm_config.replay_path)
+        model = ReplayModel(store, role, model_name, generation_config, llm_config.replay_latency)
+    elif provider == "openai_compatible":
+        model = OpenAICompatibleModel(
+            llm_config.local_base_url,
+            llm_config.local_model or model_name,
+            generation_config,
+            api_key=(os.getenv(llm_config.local_api_key_env) or "").strip(),
+            timeout_seconds=llm_config.local_timeout_seconds,
+        )
+    else:
+        model = _gemini_model(model_name, generation_config)
+
+    if llm_config.replay_record and provider != "replay":
+        model = RecordingModel(model, _get_replay_store(llm_config.replay_path), role)
+        provider = f"{provider}+record"
+    return _TimedModel(model, provider, role)
+
+
+def get_provider_stats() -> Dict[str, Any]:
+    """Configured routing and per provider/role call counts and latency (for /api/health)."""
+    from utils.config_loader import get_config
+    llm_config = get_config().llm
+    with _stats_lock:
+        calls = {
+            key: {
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "total_ms": round(entry["total_ms"], 1),
+                "avg_ms": round(entry["total_ms"] / entry["calls"], 1) if entry["calls"] else 0.0,
+            }
+            for key, entry in _stats.items()
+        }
+    stats = {
+        "provider": llm_config.provider,
+        "simple_query_provider": llm_config.simple_query_provider or llm_config.provider,
+        "replay_record": llm_config.replay_record,
+        "calls": calls,
+        "busy_ms": round(llm_busy_ms(), 1),
+    }
+    if _replay_store is not None:
+        stats["replay_records"] = len(_replay_store)
+    return stats
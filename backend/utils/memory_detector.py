@@ -11,12 +11,13 @@ CRITICAL RULES:
 - Semantic detection, not keyword-based
 """
 
-import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any
 import json
 
+from utils.llm_provider import create_model
+from utils.single_flight import generate_once
+
 load_dotenv()
 
 # Detection prompt
@@ -116,29 +117,25 @@ def detect_memory_intent(question: str) -> Optional[Dict[str, Any]]:
         }
     """
     try:
-        # Get API key (strip whitespace from HF Spaces)
-        api_key = (os.getenv("GEMINI_API_KEY") or "").strip()
-        if not api_key:
-            print("Warning: GEMINI_API_KEY not found, memory detection disabled")
+        # Create model with JSON output on the configured provider
+        try:
+            model = create_model(
+                "memory",
+                "gemini-2.0-flash",  # Fast model for detection
+                {
+                    "temperature": 0.0,
+                    "response_mime_type": "application/json"
+                },
+            )
+        except ValueError as e:
+            print(f"Warning: {e} - memory detection disabled")
             return {"has_memory_intent": False}
-        
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-
-        # Create model with JSON output (no system_instruction for compatibility with 0.3.x)
-        model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",  # Fast model for detection
-            generation_config={
-                "temperature": 0.0,
-                "response_mime_type": "application/json"
-            },
-        )
 
         # Build prompt with system instruction prepended (for compatibility)
         full_prompt = f"{MEMORY_DETECTION_PROMPT}\n\n---\n\nUser input: {question}\n\nDetect memory intent and output JSON:"
 
-        # Call API
-        response = model.generate_content(full_prompt)
+        # Call API (identical concurrent/recent detections share one call)
+        response = generate_once(model, full_prompt)
         
         # Parse JSON response
         result = json.loads(response.text)
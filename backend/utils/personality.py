@@ -409,6 +409,17 @@ class TharaPersonality:
             ]
             return random.choice(responses_ta if self.language == 'ta' else responses_en)
 
+        elif error_type == 'timeout':
+            responses_ta = [
+                f"{name_part}, indha query romba neram eduthuchu, adhanaala stop panniten. Konjam narrow ah kelunga (date range or filter).",
+                f"{name_part}, result vara romba late aagudhu. Oru specific filter add panni try pannunga."
+            ]
+            responses_en = [
+                f"{name_part}, that query was taking too long, so I stopped it. Could you narrow it down with a date range or filter?",
+                f"{name_part}, that one ran past the time limit. Try asking about a smaller slice of the data."
+            ]
+            return random.choice(responses_ta if self.language == 'ta' else responses_en)
+
         elif error_type == 'general' and details:
             # Use provided details message for general errors
             if name:
@@ -0,0 +1,172 @@
+"""
+Phrase Matcher - Aho-Corasick multi-pattern matching for learned vocabularies.
+
+Replaces the "one re.search per known value" loops used for entity lookup.
+The automaton is built once per vocabulary and then finds every known phrase
+in a single pass over the text, so lookup time depends on the length of the
+question rather than on how many branches, SKUs or categories were learned.
+
+Matches honour the same word boundaries as r'\\b' + re.escape(value) + r'\\b'.
+"""
+
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+
+class PhraseMatch(NamedTuple):
+    """A single phrase occurrence in the scanned text."""
+    start: int
+    end: int
+    phrase: str
+    payloads: tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror of the re module's Unicode \\w test."""
+    return ch.isalnum() or ch == '_'
+
+
+def _has_boundary(text: str, pos: int) -> bool:
+    """True if r'\\b' would match at position pos of text."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+
+    Each phrase can carry any number of payloads (e.g. entity kinds), so a
+    single automaton can serve locations, categories and custom dimensions.
+
+    Usage:
+        matcher = PhraseMatcher()
+        matcher.add('anna nagar', 'location')
+        matcher.add('dairy', 'category')
+        matcher.build()
+        matcher.find_all('sales in anna nagar for dairy')
+    """
+
+    def __init__(self, phrases: Optional[Dict[str, Iterable[Hashable]]] = None):
+        """
+        Args:
+            phrases: Optional mapping of phrase -> payloads to add immediately.
+                     build() must still be called before matching.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._phrases: List[str] = []
+        self._payloads: List[List[Hashable]] = []
+        self._index: Dict[str, int] = {}
+        self._built = False
+
+        if phrases:
+            for phrase, payloads in phrases.items():
+                for payload in payloads:
+                    self.add(phrase, payload)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def add(self, phrase: str, payload: Hashable = None) -> None:
+        """Register a phrase (matched case-sensitively) with an optional payload."""
+        if not phrase:
+            return
+
+        if phrase in self._index:
+            payloads = self._payloads[self._index[phrase]]
+            if payload not in payloads:
+                payloads.append(payload)
+            return
+
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+
+        phrase_id = len(self._phrases)
+        self._phrases.append(phrase)
+        self._payloads.append([payload])
+        self._index[phrase] = phrase_id
+        self._out[node].append(phrase_id)
+        self._built = False
+
+    def build(self) -> 'PhraseMatcher':
+        """Compute failure links. Returns self for chaining."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # Inherit outputs so every node lists all phrases ending there
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._built = True
+        return self
+
+    def find_all(self, text: str, word_boundaries: bool = True) -> List[PhraseMatch]:
+        """
+        Find every (possibly overlapping) phrase occurrence in one pass.
+
+        Args:
+            text: Text to scan (callers normally pass lowercased text)
+            word_boundaries: Only keep hits with a regex-style \\b on both sides
+
+        Returns:
+            List of PhraseMatch ordered by end position
+        """
+        if not self._built:
+            self.build()
+
+        matches: List[PhraseMatch] = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for phrase_id in out[node]:
+                phrase = self._phrases[phrase_id]
+                start = end - len(phrase)
+                if word_boundaries and not (_has_boundary(text, start) and _has_boundary(text, end)):
+                    continue
+                matches.append(PhraseMatch(start, end, phrase, tuple(self._payloads[phrase_id])))
+        return matches
+
+    @staticmethod
+    def longest(matches: Iterable[PhraseMatch]) -> Optional[PhraseMatch]:
+        """
+        Pick the most specific hit: longest phrase first, earliest position on ties.
+        """
+        best = None
+        for match in matches:
+            if best is None:
+                best = match
+                continue
+            length, best_length = match.end - match.start, best.end - best.start
+            if length > best_length or (length == best_length and match.start < best.start):
+                best = match
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        """Size information for logging."""
+        return {'phrases': len(self._phrases), 'nodes': len(self._goto)}
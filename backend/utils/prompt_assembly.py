@@ -0,0 +1,282 @@
+"""
+Prompt Assembly - static/dynamic prompt split with prefix reuse.
+
+The planner and explainer used to rebuild "system prompt + memory + user
+query" for every call and send it as one string. The planner system prompt
+alone is ~65 KB (half of it worked examples), so every plan call resent
+~16k identical tokens.
+
+PromptAssembler splits each call into:
+- a static prefix: system prompt (optionally trimmed to the examples that
+  matter for the query) + permanent-memory constraints. Built once per
+  example profile and memory text (memory is re-read on every call, so any
+  write - memory commands, onboarding - takes effect on the next prompt) and
+  reused byte-for-byte, so providers with implicit prefix caching can reuse it.
+- a dynamic suffix: schema context, entity hints and the question.
+
+Where the provider supports explicit context caching (Gemini models via
+google-generativeai `caching.CachedContent`), the static prefix is uploaded once per
+(model, prefix) and later calls send only the dynamic part. The upload runs
+outside the assembler lock, once per key (concurrent callers send the full
+prompt meanwhile). Any failure
+(old SDK, model without caching, prompt below the provider minimum) falls
+back to sending the full prompt.
+
+Every call prints a local token estimate (~4 characters per token) of the
+static and dynamic parts, and get_prompt_stats() aggregates them together
+with provider-reported usage for /api/health.
+"""
+
+import datetime
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from utils.permanent_memory import format_memory_for_prompt
+from utils.single_flight import generate_once
+
+_QUERY_TYPE_RE = re.compile(r'"query_type"\s*:\s*"([a-z_]+)"')
+
+# Re-create provider caches slightly before they expire
+_CACHE_REFRESH_MARGIN_SECONDS = 30
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class PromptAssembler:
+    """
+    Static prefix builder and caller for one prompt family (planner, explainer).
+
+    Args:
+        name: Prompt family name (used in logs and stats)
+        system_prompt: Full system prompt text
+        trim_examples: Split the prompt's examples section so calls can keep
+            only examples of the relevant query types
+        examples_heading: Line that starts the examples section
+        examples_footer: Text that ends the examples section
+    """
+
+    def __init__(self, name: str, system_prompt: str, trim_examples: bool = False,
+                 examples_heading: str = "## Examples", examples_footer: str = "Remember:"):
+        self.name = name
+        self._system_prompt = system_prompt
+        self._head = system_prompt
+        self._examples: List[Tuple[FrozenSet[str], str]] = []
+        self._tail = ""
+
+        start = system_prompt.find(examples_heading) if trim_examples else -1
+        end = system_prompt.rfind(examples_footer) if start >= 0 else -1
+        if start >= 0 and end > start:
+            body_start = start + len(examples_heading)
+            blocks = system_prompt[body_start:end].split("\n**Question:**")
+            self._head = system_prompt[:body_start] + blocks[0]
+            self._tail = system_prompt[end:]
+            for block in blocks[1:]:
+                text = "\n**Question:**" + block.rstrip("\n") + "\n"
+                self._examples.append((frozenset(_QUERY_TYPE_RE.findall(text)), text))
+
+        self._lock = threading.Lock()
+        self._prefixes: Dict[Any, Tuple[str, int]] = {}
+        self._memory_text: Optional[str] = None
+        self._provider_caches: Dict[Any, Tuple[Any, float]] = {}
+        self._provider_pending: set = set()
+        self._provider_unavailable: Dict[str, float] = {}
+        self._stats = {
+            "calls": 0,
+            "static_tokens": 0,
+            "dynamic_tokens": 0,
+            "trimmed_tokens": 0,
+            "provider_cache_calls": 0,
+            "provider_cache_creates": 0,
+            "provider_prompt_tokens": 0,
+            "provider_cached_tokens": 0,
+        }
+
+    @property
+    def example_types(self) -> FrozenSet[str]:
+        """All query types that have examples in the prompt."""
+        types = set()
+        for example_types, _ in self._examples:
+            types |= example_types
+        return frozenset(types)
+
+    def invalidate(self) -> None:
+        """Drop built prefixes and provider caches (e.g. after a model switch)."""
+        with self._lock:
+            self._prefixes.clear()
+            self._memory_text = None
+            self._provider_caches.clear()
+
+    def static_prefix(self, example_types: Optional[FrozenSet[str]] = None) -> Tuple[str, int]:
+        """
+        Static part of the prompt for an example profile.
+
+        Args:
+            example_types: Query types whose examples to keep (None keeps all)
+
+        Returns:
+            (prefix text, number of examples trimmed)
+        """
+        key = example_types if self._examples else None
+        memory = format_memory_for_prompt()
+        with self._lock:
+            if memory != self._memory_text:
+                # Memory changed since the prefixes were built: rebuild them
+                self._prefixes.clear()
+                self._provider_caches.clear()
+                self._memory_text = memory
+            cached = self._prefixes.get(key)
+        if cached is not None:
+            return cached
+
+        if key is None:
+            kept, trimmed = self._system_prompt, 0
+        else:
+            selected = [text for types, text in self._examples if not types or types & key]
+            trimmed = len(self._examples) - len(selected)
+            kept = self._head + "".join(selected) + "\n" + self._tail
+
+        prefix = (kept + memory, trimmed)
+        with self._lock:
+            if memory == self._memory_text:
+                self._prefixes[key] = prefix
+        return prefix
+
+    def _provider_model(self, model_name: str, generation_config: dict, prefix: str):
+        """
+        Model bound to a provider-side cache of prefix, or None if unavailable
+        (or while another thread is creating the cache for this key).
+        """
+        from utils.config_loader import get_config
+        llm_config = get_config().llm
+        if not llm_config.context_cache_enabled:
+            return None
+
+        ttl = int(llm_config.context_cache_ttl_seconds)
+        now = time.time()
+        digest = hashlib.sha1(prefix.encode("utf-8")).hexdigest()[:12]
+        cache_key = (model_name, digest, tuple(sorted(generation_config.items())))
+        with self._lock:
+            if now - self._provider_unavailable.get(model_name, 0.0) < ttl:
+                return None
+            entry = self._provider_caches.get(cache_key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+            if cache_key in self._provider_pending:
+                return None  # being created; send the full prompt meanwhile
+            self._provider_pending.add(cache_key)
+
+        # Network round-trip outside the lock: other lookups are not held up
+        try:
+            import google.generativeai as genai
+            from google.generativeai import caching
+
+            cached_content = caching.CachedContent.create(
+                model=f"models/{model_name}",
+                display_name=f"{self.name}-{digest}",
+                system_instruction=prefix,
+                ttl=datetime.timedelta(seconds=ttl),
+            )
+            model = genai.GenerativeModel.from_cached_content(
+                cached_content=cached_content, generation_config=generation_config
+            )
+        except Exception as e:
+            with self._lock:
+                self._provider_pending.discard(cache_key)
+                self._provider_unavailable[model_name] = now
+            print(f"  [Prompt] Provider context cache unavailable for {model_name}: {str(e)[:120]}")
+            return None
+
+        with self._lock:
+            self._provider_pending.discard(cache_key)
+            self._provider_caches[cache_key] = (model, now + ttl - _CACHE_REFRESH_MARGIN_SECONDS)
+            self._stats["provider_cache_creates"] += 1
+        return model
+
+    def generate(self, base_model, model_name: str, generation_config: dict, prompt: str,
+                 example_types: Optional[FrozenSet[str]] = None, dedupe: bool = True, **kwargs):
+        """
+        Call the model with the static prefix + dynamic prompt.
+
+        Args:
+            base_model: GenerativeModel without a system instruction
+            model_name: Provider model name (for context caching)
+            generation_config: Generation config of base_model
+            prompt: Dynamic part (schema, hints, question)
+            example_types: Example profile (None keeps every example)
+            dedupe: Share identical concurrent/recent calls (see utils/single_flight.py)
+
+        Returns:
+            Provider response
+        """
+        prefix, trimmed = self.static_prefix(example_types)
+        dynamic = f"User Query:\n{prompt}"
+        static_tokens = estimate_tokens(prefix)
+        dynamic_tokens = estimate_tokens(dynamic)
+        trimmed_tokens = (estimate_tokens(self.static_prefix(None)[0]) - static_tokens) if trimmed else 0
+
+        cached_model = None
+        if getattr(base_model, "provider", "gemini") == "gemini":
+            cached_model = self._provider_model(model_name, generation_config, prefix)
+        if cached_model is not None:
+            # The prefix digest keeps answers given under older memory from being shared
+            key_prefix = f"{self.name}|{model_name}|{hashlib.sha1(prefix.encode('utf-8')).hexdigest()[:12]}"
+            response = generate_once(cached_model, dynamic, dedupe=dedupe, key_prefix=key_prefix, **kwargs)
+        else:
+            response = generate_once(base_model, f"{prefix}\n\n---\n\n{dynamic}", dedupe=dedupe, **kwargs)
+
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) or 0
+
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["static_tokens"] += static_tokens
+            self._stats["dynamic_tokens"] += dynamic_tokens
+            self._stats["trimmed_tokens"] += trimmed_tokens
+            self._stats["provider_prompt_tokens"] += prompt_tokens
+            self._stats["provider_cached_tokens"] += cached_tokens
+            if cached_model is not None:
+                self._stats["provider_cache_calls"] += 1
+
+        print(f"  [Prompt] {self.name}: static ~{static_tokens} tok"
+              f"{f' ({trimmed} examples trimmed, -{trimmed_tokens} tok)' if trimmed else ''}, "
+              f"dynamic ~{dynamic_tokens} tok, "
+              f"provider cache: {'hit' if cached_model is not None else 'off'}"
+              f"{f', provider prompt {prompt_tokens} tok ({cached_tokens} cached)' if prompt_tokens else ''}")
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["prefix_profiles"] = len(self._prefixes)
+        calls = stats["calls"]
+        stats["avg_static_tokens"] = round(stats["static_tokens"] / calls) if calls else 0
+        stats["avg_dynamic_tokens"] = round(stats["dynamic_tokens"] / calls) if calls else 0
+        return stats
+
+
+_assemblers: Dict[str, PromptAssembler] = {}
+_assemblers_lock = threading.Lock()
+
+
+def get_prompt_assembler(name: str, system_prompt: str, trim_examples: bool = False) -> PromptAssembler:
+    """Process-wide assembler for a prompt family."""
+    with _assemblers_lock:
+        assembler = _assemblers.get(name)
+        if assembler is None:
+            assembler = PromptAssembler(name, system_prompt, trim_examples=trim_examples)
+            _assemblers[name] = assembler
+        return assembler
+
+
+def get_prompt_stats() -> Dict[str, Any]:
+    """Token and cache stats of every prompt family (for /api/health)."""
+    with _assemblers_lock:
+        assemblers = list(_assemblers.values())
+    return {assembler.name: assembler.stats() for assembler in assemblers}
@@ -0,0 +1,130 @@
+"""
+Query Analysis - Per-request, memoized analysis of a single user message.
+
+One query used to be rescanned by every stage: entities were extracted in the
+translation step, again in TableRouter.route and again in get_fallback_schema,
+and is_greeting / the Tamil check were re-run several times. QueryAnalysis
+runs the Tamil check once and computes each detector result at most once per
+request, so downstream stages consume the same answers instead of re-deriving.
+
+Usage:
+    analysis = QueryAnalysis(question, entity_extractor=app_state.entity_extractor)
+    if analysis.is_greeting: ...
+    entities = analysis.entities()                  # original text
+    translated = analysis.entities(translated_text) # memoized per text
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+TAMIL_CHAR_PATTERN = re.compile(r'[\u0B80-\u0BFF]')
+
+_MISSING = object()
+
+
+class QueryAnalysis:
+    """
+    Lazily memoized detector results for one message.
+
+    Thread-safe: entity extraction may be requested from a worker thread
+    (parallel translation step) while the request thread reads other results.
+    """
+
+    def __init__(self, question: str, entity_extractor=None):
+        """
+        Args:
+            question: Raw user message
+            entity_extractor: EntityExtractor used for entities(); optional
+        """
+        self.question = question or ''
+        self.is_tamil = bool(TAMIL_CHAR_PATTERN.search(self.question))
+
+        self._entity_extractor = entity_extractor
+        self._memo: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+
+    def for_question(self, question: str) -> 'QueryAnalysis':
+        """
+        Analysis for a rewritten message (e.g. after top-reference resolution).
+        Returns self if the text did not change.
+        """
+        if question == self.question:
+            return self
+        return QueryAnalysis(question, entity_extractor=self._entity_extractor)
+
+    def _memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it once on first use."""
+        value = self._memo.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            value = self._memo.get(key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                self._memo[key] = value
+        return value
+
+    # ------------------------------------------------------------------
+    # Conversational detectors
+    # ------------------------------------------------------------------
+
+    @property
+    def is_greeting(self) -> bool:
+        from utils.greeting_detector import is_greeting
+        return self._memoize('greeting', lambda: is_greeting(self.question))
+
+    @property
+    def is_non_query_conversational(self) -> bool:
+        from utils.greeting_detector import is_non_query_conversational
+        return self._memoize('non_query', lambda: is_non_query_conversational(self.question))
+
+    @property
+    def date_context(self) -> Tuple[bool, Optional[Dict]]:
+        from utils.greeting_detector import is_date_context_statement
+        return self._memoize('date_context', lambda: is_date_context_statement(self.question))
+
+    @property
+    def schema_inquiry(self) -> Optional[Dict]:
+        from utils.greeting_detector import detect_schema_inquiry
+        return self._memoize('schema_inquiry', lambda: detect_schema_inquiry(self.question))
+
+    @property
+    def memory_intent(self) -> Optional[Dict[str, Any]]:
+        from utils.memory_detector import detect_memory_intent
+        return self._memoize('memory_intent', lambda: detect_memory_intent(self.question))
+
+    # ------------------------------------------------------------------
+    # Context-dependent detectors (keyed by the turn they compare against)
+    # ------------------------------------------------------------------
+
+    def correction(self, detector, previous_turn: Any = None):
+        """CorrectionIntent for this message against previous_turn (memoized)."""
+        return self._memoize(
+            ('correction', id(previous_turn)),
+            lambda: detector.detect(self.question, previous_turn)
+        )
+
+    def projection(self, previous_turn: Any = None):
+        """ProjectionIntent for this message against previous_turn (memoized)."""
+        from utils.projection_detector import detect_projection_intent
+        return self._memoize(
+            ('projection', id(previous_turn)),
+            lambda: detect_projection_intent(self.question, previous_turn)
+        )
+
+    # ------------------------------------------------------------------
+    # Entities
+    # ------------------------------------------------------------------
+
+    def entities(self, text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        EntityExtractor output for text (defaults to the original question).
+
+        Memoized per text, so the translated query and the router share one
+        extraction. Callers that mutate the result should copy it first.
+        """
+        if self._entity_extractor is None:
+            return {}
+        text = self.question if text is None else text
+        return self._memoize(('entities', text), lambda: self._entity_extractor.extract(text))
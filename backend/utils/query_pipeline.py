@@ -0,0 +1,307 @@
+"""
+Query Pipeline - per-request stage scheduler with structured timings.
+
+process_query_service is a sequence of stages:
+
+    detect -> translate / extract_entities -> route -> plan -> validate
+           -> execute -> explain / visualize
+
+Most stages depend on the previous one, but several do not, and the
+pipeline lets them start as soon as their prerequisites are done:
+- translate and extract_entities run side by side
+- route starts on the original text while translation is still running
+  (Tamil), or while the data-freshness check runs (English)
+- visualize (chart config) runs while the explanation is generated
+
+Each request gets its own small executor (MAX_STAGE_WORKERS threads, shut
+down by finish()), so one request's stages never queue behind another
+request's LLM calls. Stages are started with after=(...) naming their
+prerequisites; a stage is submitted only once every prerequisite finished,
+so no worker thread ever blocks waiting on another stage.
+
+A result() that times out marks the stage "timed_out": it shows up in the
+response timings ('timeouts') and in get_stage_stats(), so a fallback taken
+under load (untranslated text, empty entities) is visible rather than silent.
+
+Inline work (code that stays in process_query_service) is timed with
+record(). finish() returns every stage as structured data for the API
+response (process_query_service calls it on every exit, early returns and
+errors included), and get_stage_stats() aggregates recent queries for
+/api/health.
+
+Usage:
+    pipeline = QueryPipeline()
+    pipeline.start("translate", translate_to_english, question)
+    pipeline.start("extract_entities", analysis.entities)
+    pipeline.start("route", route_fn, after=("extract_entities",))
+    english = pipeline.result("translate", timeout=10)
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+# Background stage workers per request (at most translate, extract_entities,
+# route_original and route overlap)
+MAX_STAGE_WORKERS = 4
+
+
+class StageDependencyError(RuntimeError):
+    """A background stage could not run because a prerequisite failed."""
+
+
+class _StageRecord:
+    __slots__ = ("name", "mode", "after", "started", "ended", "waited_ms", "status", "timed_out")
+
+    def __init__(self, name: str, mode: str, after: Iterable[str] = ()):
+        self.name = name
+        self.mode = mode  # inline | background
+        self.after = tuple(after)
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.waited_ms = 0.0  # time the request thread blocked on result()
+        self.status = "pending"
+        self.timed_out = False  # the request thread gave up waiting on result()
+
+
+class QueryPipeline:
+    """Schedules the stages of one query and records their timings."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._records: Dict[str, _StageRecord] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _submit(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=MAX_STAGE_WORKERS, thread_name_prefix="query-stage")
+            executor = self._executor
+        executor.submit(fn)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def start(self, name: str, fn: Callable[..., Any], *args, after: Iterable[str] = (), **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) in the background once the stages named in
+        `after` have finished. Restarting a name replaces the earlier stage.
+
+        Raises:
+            ValueError: `after` names a stage that was never started
+        """
+        after = tuple(after)
+        future: Future = Future()
+        record = _StageRecord(name, "background", after)
+        with self._lock:
+            unknown = [dep for dep in after if dep not in self._futures]
+            if unknown:
+                raise ValueError(f"Stage '{name}' depends on stage(s) never started: {', '.join(unknown)}")
+            deps = [(dep, self._futures[dep]) for dep in after]
+            self._records[name] = record
+            self._futures[name] = future
+
+        def body():
+            record.started = time.time()
+            record.status = "running"
+            try:
+                value = fn(*args, **kwargs)
+            except BaseException as e:
+                record.ended = time.time()
+                record.status = "error"
+                future.set_exception(e)
+            else:
+                record.ended = time.time()
+                record.status = "done"
+                future.set_result(value)
+
+        def launch():
+            failed = [dep for dep, dep_future in deps if dep_future.exception() is not None]
+            if failed:
+                record.status = "skipped"
+                future.set_exception(StageDependencyError(f"{name}: prerequisite {failed[0]} failed"))
+                return
+            self._submit(body)
+
+        if not deps:
+            launch()
+            return future
+
+        remaining = [len(deps)]
+        remaining_lock = threading.Lock()
+
+        def on_dep_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                launch()
+
+        for _, dep_future in deps:
+            dep_future.add_done_callback(on_dep_done)
+        return future
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Wait for a background stage and return its value (re-raises its error)."""
+        with self._lock:
+            future = self._futures[name]
+            record = self._records[name]
+        wait_start = time.time()
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            record.timed_out = True
+            print(f"[WARN]  Stage '{name}' timed out after {timeout}s")
+            raise
+        finally:
+            record.waited_ms += (time.time() - wait_start) * 1000
+
+    def has_stage(self, name: str) -> bool:
+        with self._lock:
+            return name in self._futures
+
+    def done(self, name: str) -> bool:
+        """True once a background stage finished (or was skipped)."""
+        with self._lock:
+            future = self._futures.get(name)
+        return future is not None and future.done()
+
+    def discard(self, name: str) -> None:
+        """Mark a background stage's result as unused (e.g. routed on stale data)."""
+        with self._lock:
+            record = self._records.get(name)
+            self._futures.pop(name, None)
+        if record is not None:
+            record.status = "discarded" if record.status in ("done", "running", "pending") else record.status
+
+    def run(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn inline on the request thread and time it."""
+        record = _StageRecord(name, "inline")
+        record.started = time.time()
+        with self._lock:
+            self._records[name] = record
+        try:
+            value = fn(*args, **kwargs)
+            record.status = "done"
+            return value
+        except BaseException:
+            record.status = "error"
+            raise
+        finally:
+            record.ended = time.time()
+
+    def record(self, name: str, started: float) -> float:
+        """Record inline work that began at `started` (time.time()); returns its ms."""
+        record = _StageRecord(name, "inline")
+        record.started = started
+        record.ended = time.time()
+        record.status = "done"
+        with self._lock:
+            self._records[name] = record
+        return (record.ended - started) * 1000
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def elapsed_ms(self) -> float:
+        return (time.time() - self.started) * 1000
+
+    def durations(self) -> Dict[str, float]:
+        """Stage name -> duration in ms (finished stages, insertion order)."""
+        with self._lock:
+            records = list(self._records.values())
+        return {r.name: (r.ended - r.started) * 1000 for r in records if r.started and r.ended}
+
+    def timings(self) -> Dict[str, Any]:
+        """
+        Structured per-stage timings.
+
+        Returns:
+            {
+                'total_ms': wall-clock time so far,
+                'overlapped_ms': stage time hidden by running stages concurrently,
+                'timeouts': stages whose result() timed out (fallback used),
+                'stages': [{'stage', 'mode', 'after', 'start_ms', 'duration_ms',
+                            'waited_ms', 'status', 'timed_out'}, ...]
+            }
+        """
+        with self._lock:
+            records = list(self._records.values())
+
+        stages: List[Dict[str, Any]] = []
+        busy = 0.0
+        for r in records:
+            duration = (r.ended - r.started) * 1000 if r.started and r.ended else None
+            if duration is not None and r.status != "discarded":
+                busy += duration
+            stages.append({
+                "stage": r.name,
+                "mode": r.mode,
+                "after": list(r.after),
+                "start_ms": round((r.started - self.started) * 1000, 1) if r.started else None,
+                "duration_ms": round(duration, 1) if duration is not None else None,
+                "waited_ms": round(r.waited_ms, 1),
+                "status": r.status,
+                "timed_out": r.timed_out,
+            })
+        total = self.elapsed_ms()
+        return {
+            "total_ms": round(total, 1),
+            "overlapped_ms": round(max(0.0, busy - total), 1),
+            "timeouts": [r.name for r in records if r.timed_out],
+            "stages": stages,
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Final timings for the response; also feeds get_stage_stats()."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)  # stages still running finish on their own
+        timings = self.timings()
+        with _recent_lock:
+            _recent_timings.append(timings)
+        return timings
+
+
+# Rolling window of finished queries for /api/health
+_recent_timings: Deque[Dict[str, Any]] = deque(maxlen=200)
+_recent_lock = threading.Lock()
+
+
+def get_stage_stats() -> Dict[str, Any]:
+    """Per-stage average and p95 durations over recently finished queries."""
+    with _recent_lock:
+        recent = list(_recent_timings)
+    if not recent:
+        return {"queries": 0, "stages": {}}
+
+    per_stage: Dict[str, List[float]] = {}
+    timeouts: Dict[str, int] = {}
+    for timings in recent:
+        for stage in timings["stages"]:
+            if stage.get("timed_out"):
+                timeouts[stage["stage"]] = timeouts.get(stage["stage"], 0) + 1
+            if stage["duration_ms"] is not None and stage["status"] != "discarded":
+                per_stage.setdefault(stage["stage"], []).append(stage["duration_ms"])
+
+    def p95(values: List[float]) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    return {
+        "queries": len(recent),
+        "avg_total_ms": round(sum(t["total_ms"] for t in recent) / len(recent), 1),
+        "avg_overlapped_ms": round(sum(t["overlapped_ms"] for t in recent) / len(recent), 1),
+        "timeouts": timeouts,
+        "stages": {
+            name: {"count": len(values), "avg_ms": round(sum(values) / len(values), 1), "p95_ms": round(p95(values), 1)}
+            for name, values in per_stage.items()
+        },
+    }
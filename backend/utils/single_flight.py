@@ -0,0 +1,268 @@
+"""
+Single-flight LLM calls - deduplicate identical prompts across requests.
+
+When several users ask the same trending question at once (or the frontend
+retries), every request used to call Gemini independently for translation,
+planning and explanation. generate_once() puts a single-flight layer in
+front of generate_content:
+
+- Calls are keyed by a hash of (model, generation config, prompt).
+- Concurrent identical calls share one in-flight request and its response.
+- Responses are kept for a short TTL (llm.single_flight_ttl_seconds) so a
+  retry arriving just after the first call finished reuses it too.
+- Errors are shared with callers already waiting but never cached.
+
+Callers that reject a response and retry (e.g. planner JSON parse errors)
+pass dedupe=False so the retry reaches the provider.
+
+RequestCoalescer batches small independent requests (translations) that
+arrive within a few milliseconds of each other into one prompt.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _model_identity(model) -> str:
+    """Model name + generation config (part of the dedup key)."""
+    name = getattr(model, "model_name", None) or type(model).__name__
+    config = getattr(model, "_generation_config", None)
+    return f"{name}|{sorted(config.items()) if isinstance(config, dict) else config}"
+
+
+class SingleFlight:
+    """
+    Shares in-flight and recently finished calls with identical keys.
+
+    Args:
+        ttl_seconds: How long a finished result is reused (0 = in-flight only)
+        max_entries: Finished results kept (oldest evicted first)
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {"calls": 0, "executed": 0, "shared_inflight": 0, "ttl_hits": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8", errors="replace"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once per key among concurrent callers; reuse the result for ttl_seconds."""
+        now = time.time()
+        with self._lock:
+            self._stats["calls"] += 1
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    self._results.move_to_end(key)
+                    self._stats["ttl_hits"] += 1
+                    return cached[0]
+                del self._results[key]
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared_inflight"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fn()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self.ttl_seconds > 0:
+                self._results[key] = (value, time.time() + self.ttl_seconds)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["bypassed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["inflight"] = len(self._inflight)
+            stats["cached_results"] = len(self._results)
+        saved = stats["shared_inflight"] + stats["ttl_hits"]
+        stats["llm_calls_saved"] = saved
+        stats["dedup_rate"] = round(saved / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide single-flight group for LLM calls (TTL from llm config)."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                from utils.config_loader import get_config
+                _single_flight = SingleFlight(ttl_seconds=get_config().llm.single_flight_ttl_seconds)
+    return _single_flight
+
+
+def generate_once(model, prompt, dedupe: bool = True, key_prefix: str = "", **kwargs):
+    """
+    model.generate_content(prompt, **kwargs) behind the single-flight layer.
+
+    Args:
+        model: Provider model (GenerativeModel or compatible wrapper)
+        prompt: Full prompt sent to the model
+        dedupe: False forces a fresh provider call (e.g. retry after a bad response)
+        key_prefix: Extra key context not visible in the model (e.g. system prefix id)
+
+    Returns:
+        Provider response (shared between deduplicated callers - treat as read-only)
+    """
+    group = get_single_flight()
+    if not dedupe:
+        group.record_bypass()
+        return model.generate_content(prompt, **kwargs)
+    key = group.make_key(key_prefix, _model_identity(model), prompt, sorted(kwargs.items()))
+    return group.do(key, lambda: model.generate_content(prompt, **kwargs))
+
+
+class RequestCoalescer:
+    """
+    Coalesces requests arriving within window_ms into one batched call.
+
+    The first caller (leader) waits window_ms, then takes every distinct item
+    collected so far. It runs the batch holding its own item itself and hands
+    the other batches (max_batch items each) to a small executor, so neither
+    the leader's caller nor throughput is held up by a long queue. The next
+    arrival becomes the next leader. A lone request, or a batch whose result
+    cannot be mapped back, falls back to single_fn per caller.
+
+    Args:
+        single_fn: item -> result
+        batch_fn: list of items -> list of results (same order and length)
+        window_ms: Collection window (adds at most this much latency)
+        max_batch: Items per batched call
+        max_parallel_batches: Executor workers for batches beyond the leader's
+    """
+
+    def __init__(self, single_fn: Callable[[Any], Any], batch_fn: Callable[[List[Any]], List[Any]],
+                 window_ms: float = 10.0, max_batch: int = 8, max_parallel_batches: int = 4):
+        self.single_fn = single_fn
+        self.batch_fn = batch_fn
+        self.window_ms = window_ms
+        self.max_batch = max(1, int(max_batch))
+        self.max_parallel_batches = max(1, int(max_parallel_batches))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[Any, Future]" = OrderedDict()
+        self._leader_waiting = False
+        self._stats = {"requests": 0, "batches": 0, "batched_items": 0, "singles": 0, "fallbacks": 0}
+
+    def submit(self, item: Any) -> Any:
+        if self.window_ms <= 0 or self.max_batch == 1:
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["singles"] += 1
+            return self.single_fn(item)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            future = self._pending.get(item)
+            if future is None:
+                future = Future()
+                self._pending[item] = future
+            leader = not self._leader_waiting
+            if leader:
+                self._leader_waiting = True
+
+        if leader:
+            time.sleep(self.window_ms / 1000.0)
+            with self._lock:
+                collected = list(self._pending.items())
+                self._pending.clear()
+                self._leader_waiting = False  # later arrivals elect a new leader
+                # The leader's own item goes in the batch it runs itself
+                own = [entry for entry in collected if entry[1] is future]
+                rest = [entry for entry in collected if entry[1] is not future]
+                batches = [own + rest[:self.max_batch - len(own)]]
+                rest = rest[self.max_batch - len(own):]
+                batches += [rest[i:i + self.max_batch] for i in range(0, len(rest), self.max_batch)]
+                if len(batches) > 1 and self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_parallel_batches, thread_name_prefix="coalescer"
+                    )
+                executor = self._executor
+            for batch in batches[1:]:
+                executor.submit(self._run, batch)
+            if batches[0]:
+                self._run(batches[0])
+
+        try:
+            return future.result()
+        except _FallbackToSingle:
+            return self.single_fn(item)
+
+    def _run(self, batch: List[tuple]) -> None:
+        if len(batch) == 1:
+            item, future = batch[0]
+            with self._lock:
+                self._stats["singles"] += 1
+            try:
+                future.set_result(self.single_fn(item))
+            except BaseException as e:
+                future.set_exception(e)
+            return
+
+        items = [item for item, _ in batch]
+        try:
+            results = self.batch_fn(items)
+            if not isinstance(results, list) or len(results) != len(items):
+                raise ValueError(f"batch returned {len(results) if isinstance(results, list) else type(results)} results")
+        except Exception as e:
+            print(f"  [Coalescer] Batch of {len(items)} failed ({str(e)[:80]}) - falling back to single calls")
+            with self._lock:
+                self._stats["fallbacks"] += 1
+            for _, future in batch:
+                future.set_exception(_FallbackToSingle())
+            return
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["batched_items"] += len(items)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+
+class _FallbackToSingle(Exception):
+    """Batch result unusable - each caller makes its own single call."""
@@ -3,6 +3,10 @@ Shared SQL utility functions.
 Consolidates common SQL helpers used across the codebase.
 """
 
+import datetime
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 
 def quote_identifier(name: str) -> str:
     """
@@ -32,3 +36,73 @@ def quote_identifier(name: str) -> str:
     if any(char in name for char in special_chars) or (name and name[0].isdigit()):
         return f'"{name}"'
     return name
+
+
+# Positional placeholders ($1, $2, ...) outside string literals and quoted identifiers
+_PLACEHOLDER_RE = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\$(\d+)""")
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Render a Python value as a SQL literal.
+
+    Strings are single-quoted with quotes doubled and null bytes removed;
+    dates/datetimes are quoted ISO strings.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return f"'{value.isoformat()}'"
+    text = str(value).replace("\x00", "").replace("'", "''")
+    return f"'{text}'"
+
+
+def inline_params(sql: str, params: Optional[Sequence[Any]]) -> str:
+    """
+    Substitute $n placeholders with literals (for logs, responses and the
+    healer's text-based fixes). Execution should bind params instead.
+    """
+    if not params:
+        return sql
+
+    def substitute(match):
+        if match.group(1) is None:
+            return match.group(0)  # literal or quoted identifier - leave as is
+        return sql_literal(params[int(match.group(1)) - 1])
+
+    return _PLACEHOLDER_RE.sub(substitute, sql)
+
+
+def compact_params(sql: str, params: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    Renumber placeholders to $1..$k in order of first use and drop params no
+    longer referenced (after a condition was removed from the SQL).
+    """
+    mapping: Dict[int, int] = {}
+    compacted: List[Any] = []
+
+    def renumber(match):
+        if match.group(1) is None:
+            return match.group(0)
+        old = int(match.group(1))
+        if old not in mapping:
+            compacted.append(params[old - 1])
+            mapping[old] = len(compacted)
+        return f"${mapping[old]}"
+
+    return _PLACEHOLDER_RE.sub(renumber, sql), compacted
+
+
+def shift_params(sql: str, offset: int) -> str:
+    """Renumber placeholders $n to $(n + offset) (to combine statements)."""
+
+    def shift(match):
+        if match.group(1) is None:
+            return match.group(0)
+        return f"${int(match.group(1)) + offset}"
+
+    return _PLACEHOLDER_RE.sub(shift, sql)
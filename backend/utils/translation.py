@@ -1,28 +1,33 @@
 """
 Translation utilities using Gemini Flash for Tamil <-> English translation.
+
+Identical translations share one LLM call (utils/single_flight.py), and
+translations arriving within llm.translation_batch_window_ms of each other
+are coalesced into one batched prompt per direction.
 """
 
-import os
+import json
 import time
-import google.generativeai as genai
-from typing import Optional
+import threading
+from typing import List, Optional
 
-# Configure Gemini - try both env var names for compatibility (strip whitespace from HF Spaces)
-api_key = (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or "").strip()
-if api_key:
-    genai.configure(api_key=api_key)
+from utils.llm_provider import create_model
+from utils.single_flight import RequestCoalescer, generate_once
 
-model = genai.GenerativeModel('gemini-2.0-flash')  # Fast model for low-latency translation
+_model = None
+_model_lock = threading.Lock()
 
 
-def translate_to_english(text: str) -> str:
-    """
-    Translates Tamil text to English for RAG processing.
-    """
-    try:
-        start = time.time()
-        response = model.generate_content(
-            f"""Translate the following Tamil query to English strictly for data analysis.
+def _get_model():
+    """Translation model on the configured provider (created on first use)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = create_model("translation", "gemini-2.0-flash")  # Fast model for low-latency translation
+    return _model
+
+TO_ENGLISH_INSTRUCTIONS = """Translate the following Tamil query to English strictly for data analysis.
 
 RULES:
 1. Map months to their English names (e.g., 'டிசம்பர்' -> 'December')
@@ -36,11 +41,71 @@ RULES:
    - "தமிழ்நாட்டில்" (in Tamil Nadu) = filter by Tamil Nadu
    - "சென்னையில்" (in Chennai) = filter by Chennai
 
-Output ONLY the English translation, no explanations.
+Output ONLY the English translation, no explanations."""
+
+TO_TAMIL_INSTRUCTIONS = "Translate to Tamil. STRICT RULE: Convert ALL numbers to Tamil words (e.g. 6450 -> ஆறாயிரத்து நானூற்று ஐம்பது). NO DIGITS ALLOWED."
+
+
+def _translate_one(instructions: str, text: str) -> str:
+    """One text per prompt (identical prompts share a call)."""
+    response = generate_once(_get_model(), f"{instructions}\n\nText: {text}")
+    return response.text.strip()
+
+
+def _translate_batch(instructions: str, texts: List[str]) -> List[str]:
+    """Several independent texts in one prompt; returns translations in order."""
+    numbered = "\n".join(f"{i}. {json.dumps(text, ensure_ascii=False)}" for i, text in enumerate(texts, 1))
+    prompt = (
+        f"{instructions}\n\n"
+        f"BATCH MODE: translate each of the {len(texts)} texts below independently, "
+        f"following the rules above. Output ONLY a JSON array of {len(texts)} strings "
+        f"with the translations in the same order.\n\nTexts:\n{numbered}"
+    )
+    response_text = generate_once(_get_model(), prompt).text.strip()
+    if response_text.startswith("```"):
+        response_text = response_text.strip("`")
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+    translations = json.loads(response_text)
+    return [str(t).strip() for t in translations] if isinstance(translations, list) else translations
 
-Text: {text}"""
-        )
-        english_text = response.text.strip()
+
+_coalescers = {}
+_coalescers_lock = threading.Lock()
+
+
+def _get_coalescer(instructions: str) -> RequestCoalescer:
+    """Per-direction coalescer (window and batch size from llm config)."""
+    coalescer = _coalescers.get(instructions)
+    if coalescer is None:
+        with _coalescers_lock:
+            coalescer = _coalescers.get(instructions)
+            if coalescer is None:
+                from utils.config_loader import get_config
+                llm_config = get_config().llm
+                coalescer = RequestCoalescer(
+                    single_fn=lambda text: _translate_one(instructions, text),
+                    batch_fn=lambda texts: _translate_batch(instructions, texts),
+                    window_ms=llm_config.translation_batch_window_ms,
+                    max_batch=llm_config.translation_batch_max,
+                )
+                _coalescers[instructions] = coalescer
+    return coalescer
+
+
+def get_translation_stats() -> dict:
+    """Coalescing counters per direction (for /api/health)."""
+    names = {TO_ENGLISH_INSTRUCTIONS: "to_english", TO_TAMIL_INSTRUCTIONS: "to_tamil"}
+    return {names[key]: coalescer.stats() for key, coalescer in list(_coalescers.items())}
+
+
+def translate_to_english(text: str) -> str:
+    """
+    Translates Tamil text to English for RAG processing.
+    """
+    try:
+        start = time.time()
+        english_text = _get_coalescer(TO_ENGLISH_INSTRUCTIONS).submit(text)
         elapsed = (time.time() - start) * 1000
         print(f"[TRANSLATE] Translation (Tamil -> English): {text} -> {english_text} [{elapsed:.0f}ms]")
         return english_text
@@ -55,10 +120,7 @@ def translate_to_tamil(text: str) -> str:
     """
     try:
         start = time.time()
-        response = model.generate_content(
-            f"Translate to Tamil. STRICT RULE: Convert ALL numbers to Tamil words (e.g. 6450 -> ஆறாயிரத்து நானூற்று ஐம்பது). NO DIGITS ALLOWED.\n\nText: {text}"
-        )
-        tamil_text = response.text.strip()
+        tamil_text = _get_coalescer(TO_TAMIL_INSTRUCTIONS).submit(text)
         elapsed = (time.time() - start) * 1000
         print(f"[TRANSLATE] Translation (English -> Tamil): {text} -> {tamil_text} [{elapsed:.0f}ms]")
         return tamil_text
@@ -254,9 +254,14 @@ def _handle_comparison_data(data: List[Dict], plan: Dict[str, Any]) -> Optional[
     if analysis:
         period_a = analysis.get('period_a_label')
         period_b = analysis.get('period_b_label')
-        if period_a and period_b:
+        if analysis.get('periods'):
+            # N-period comparison: every period, in order
+            labels = [p.get('label') for p in analysis['periods']]
+            values = [p.get('value') for p in analysis['periods']]
+        elif period_a and period_b:
             labels = [period_a, period_b]
             values = [analysis.get('period_a_value', 0), analysis.get('period_b_value', 0)]
+        if labels:
             for label, value in zip(labels, values):
                 if value is not None:
                     chart_data.append({
@@ -421,7 +426,9 @@ def _extract_labels_from_context(plan: Dict[str, Any], entities: Dict[str, Any],
     if analysis:
         period_a = analysis.get('period_a_label')
         period_b = analysis.get('period_b_label')
-        if period_a and period_b:
+        if analysis.get('periods'):
+            labels = [str(p.get('label')) for p in analysis['periods']]
+        elif period_a and period_b:
             labels = [str(period_a), str(period_b)]
 
     # Remove duplicates while preserving order
@@ -2,8 +2,7 @@ import json
 import re
 from jsonschema import validate, ValidationError
 from analytics_engine.metric_registry import MetricRegistry
-from analytics_engine.duckdb_manager import DuckDBManager
-from utils.sql_utils import quote_identifier
+from analytics_engine.schema_catalog import get_schema_catalog, is_numeric_type
 
 
 def normalize_date_format_in_value(value: str) -> str:
@@ -230,26 +229,15 @@ def normalize_text_filters_to_like(plan: dict, table_name: str) -> dict:
 
 def get_table_schema(table_name: str) -> dict:
     """
-    Get schema information for a table from DuckDB.
+    Get schema information for a table from the schema catalog.
     Returns dict with column names and their types.
     """
-    db = DuckDBManager()
-    try:
-        # Get column information
-        quoted_table = quote_identifier(table_name)
-        result = db.conn.execute(f"DESCRIBE {quoted_table}").fetchdf()
-        schema = {}
-        for _, row in result.iterrows():
-            schema[row['column_name']] = row['column_type']
-        return schema
-    except Exception as e:
-        raise ValueError(f"Table '{table_name}' does not exist in database: {e}")
+    return get_schema_catalog().table_schema(table_name)
 
 
 def validate_table_exists(table_name: str):
     """Validate that table exists in DuckDB"""
-    db = DuckDBManager()
-    tables = db.list_tables()
+    tables = get_schema_catalog().list_tables()
     if table_name not in tables:
         raise ValueError(f"Table '{table_name}' does not exist. Available tables: {tables}")
 
@@ -332,13 +320,9 @@ def validate_columns_exist(columns: list, table_name: str):
                 break
 
         if not found:
-            # 3. Try fuzzy matching for typos (80% similarity)
-            from difflib import SequenceMatcher
-            for actual_col in available_columns:
-                ratio = SequenceMatcher(None, column_lower, actual_col.lower()).ratio()
-                if ratio >= 0.8:
-                    found = True
-                    break
+            # 3. Try fuzzy matching for typos (80% similarity, memoized by the catalog)
+            _, ratio = get_schema_catalog().closest_column(table_name, column)
+            found = ratio >= 0.8
 
         if not found:
             raise ValueError(
@@ -587,7 +571,7 @@ def validate_filter_values(filters: list, table_name: str):
         col_type = table_schema[column].upper()
 
         # Numeric columns should have numeric values (unless using LIKE)
-        if any(t in col_type for t in ["INT", "FLOAT", "DOUBLE", "DECIMAL", "NUMERIC"]):
+        if is_numeric_type(col_type):
             if operator != "LIKE":
                 # Allow string numbers - try to convert them
                 if isinstance(value, str):
@@ -878,8 +862,12 @@ def validate_plan(plan: dict, schema_path="planning_layer/plan_schema.json"):
         if not comparison_config:
             raise ValueError("Comparison queries must have a 'comparison' configuration")
         
-        # Validate required nested structure
-        if not comparison_config.get("period_a") or not comparison_config.get("period_b"):
+        # Validate required nested structure (N-period comparisons list 'periods' instead)
+        periods = comparison_config.get("periods")
+        if periods is not None:
+            if not isinstance(periods, list) or len(periods) < 2 or not all(isinstance(p, dict) for p in periods):
+                raise ValueError("Comparison 'periods' must be a list of at least two period objects")
+        elif not comparison_config.get("period_a") or not comparison_config.get("period_b"):
             raise ValueError("Comparison queries must specify both 'period_a' and 'period_b'")
 
     elif query_type == "percentage":